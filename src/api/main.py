@@ -23,13 +23,19 @@ from slowapi.errors import RateLimitExceeded
 
 # API routes
 from .routes import search, health, metrics
-from .middleware import ErrorHandlerMiddleware, ValidationMiddleware, LoggingMiddleware
+from .middleware import (
+    ErrorHandlerMiddleware,
+    ValidationMiddleware,
+    LoggingMiddleware,
+    metrics_middleware,
+)
 from .rate_limit_middleware import RateLimitMiddleware
 from .models import ErrorResponse
 from .dependencies import set_query_dispatcher, get_query_dispatcher
 
 # Core components  
 from ..core.query_dispatcher import QueryDispatcher
+from ..utils.asgi_pipeline import MiddlewarePipeline
 from ..utils.logging_middleware import api_logger
 
 # Configuration
@@ -417,10 +423,16 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
-    # Custom middleware (applied in reverse order)
-    app.add_middleware(ErrorHandlerMiddleware)
-    app.add_middleware(ValidationMiddleware)
-    app.add_middleware(LoggingMiddleware)
+    # Custom middleware, composed into one pure-ASGI pipeline (first stage outermost)
+    app.add_middleware(
+        MiddlewarePipeline,
+        stages=[
+            LoggingMiddleware(),
+            metrics_middleware,
+            ValidationMiddleware(),
+            ErrorHandlerMiddleware(),
+        ],
+    )
     
     # Include routers
     app.include_router(search.router, prefix="/api/v1", tags=["search"])
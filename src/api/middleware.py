@@ -3,35 +3,36 @@
 API Middleware Components
 
 Custom middleware for error handling, request validation, logging,
-and observability features.
+and observability features. Each middleware is a pure-ASGI pipeline stage;
+compose several with MiddlewarePipeline to run them in one ASGI call.
 """
 
-import json
 import time
 import traceback
 import uuid
-from typing import Callable, Dict, Any, Optional
+from typing import Dict, Any, Optional
 
 from fastapi import Request, Response, status
 from fastapi.responses import JSONResponse
 from pydantic import ValidationError
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp
 
 from .models import ErrorResponse, ErrorDetail, ErrorCode
+from ..utils.asgi_pipeline import PipelineStage, RequestContext, ResponseLike
 from ..utils.logging_middleware import api_logger
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+class LoggingMiddleware(PipelineStage):
     """Request/response logging middleware with structured logging."""
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Process request with comprehensive logging."""
+    async def on_request(self, ctx: RequestContext) -> Optional[Response]:
+        """Assign a trace ID and log the request."""
+        request = ctx.request
+        
         # Generate trace ID
         trace_id = str(uuid.uuid4())[:8]
         request.state.trace_id = trace_id
         
-        start_time = time.time()
-        
         # Log request
         api_logger.info(
             "API request started",
@@ -41,127 +42,119 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             user_agent=request.headers.get("user-agent", "unknown"),
             trace_id=trace_id
         )
+        return None
+    
+    async def on_response(self, ctx: RequestContext, response: ResponseLike) -> None:
+        """Log the response and add the trace ID header."""
+        trace_id = ctx.request.state.trace_id
         
-        try:
-            # Process request
-            response = await call_next(request)
-            
-            # Calculate timing
-            duration_ms = (time.time() - start_time) * 1000
-            
-            # Log response
-            api_logger.info(
-                "API request completed",
-                status_code=response.status_code,
-                duration_ms=duration_ms,
-                trace_id=trace_id
-            )
-            
-            # Add trace ID to response headers
-            response.headers["X-Trace-ID"] = trace_id
-            
-            return response
-            
-        except Exception as e:
-            duration_ms = (time.time() - start_time) * 1000
-            
-            api_logger.error(
-                "API request failed",
-                error=str(e),
-                error_type=type(e).__name__,
-                duration_ms=duration_ms,
-                trace_id=trace_id,
-                traceback=traceback.format_exc()
-            )
-            
-            # Re-raise to be handled by error middleware
-            raise
+        # Calculate timing
+        duration_ms = (time.time() - ctx.start_time) * 1000
+        
+        # Log response
+        api_logger.info(
+            "API request completed",
+            status_code=response.status_code,
+            duration_ms=duration_ms,
+            trace_id=trace_id
+        )
+        
+        # Add trace ID to response headers
+        response.headers["X-Trace-ID"] = trace_id
+    
+    async def on_error(self, ctx: RequestContext, error: Exception) -> Optional[Response]:
+        """Log the failure and leave it to the error handler."""
+        duration_ms = (time.time() - ctx.start_time) * 1000
+        
+        api_logger.error(
+            "API request failed",
+            error=str(error),
+            error_type=type(error).__name__,
+            duration_ms=duration_ms,
+            trace_id=ctx.request.state.trace_id,
+            traceback="".join(traceback.format_exception(type(error), error, error.__traceback__))
+        )
+        
+        # Re-raise to be handled by error middleware
+        return None
 
 
-class ValidationMiddleware(BaseHTTPMiddleware):
+class ValidationMiddleware(PipelineStage):
     """Request validation middleware with detailed error responses."""
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Process request with validation error handling."""
-        try:
-            return await call_next(request)
-            
-        except ValidationError as e:
-            trace_id = getattr(request.state, 'trace_id', 'unknown')
-            
-            # Format validation errors
-            error_details = []
-            for error in e.errors():
-                error_details.append({
-                    "field": ".".join(str(x) for x in error["loc"]),
-                    "message": error["msg"],
-                    "type": error["type"],
-                    "input": error.get("input")
-                })
-            
-            error_response = ErrorResponse(
-                error=ErrorDetail(
-                    code=ErrorCode.VALIDATION_ERROR,
-                    message="Request validation failed",
-                    details={"validation_errors": error_details},
-                    trace_id=trace_id
-                )
-            )
-            
-            api_logger.warning(
-                "Request validation failed",
-                validation_errors=error_details,
+    async def on_error(self, ctx: RequestContext, error: Exception) -> Optional[Response]:
+        """Turn validation errors into a 422 response."""
+        if not isinstance(error, ValidationError):
+            # Let other exceptions pass through to error handler
+            return None
+        
+        trace_id = getattr(ctx.request.state, 'trace_id', 'unknown')
+        
+        # Format validation errors
+        error_details = []
+        for detail in error.errors():
+            error_details.append({
+                "field": ".".join(str(x) for x in detail["loc"]),
+                "message": detail["msg"],
+                "type": detail["type"],
+                "input": detail.get("input")
+            })
+        
+        error_response = ErrorResponse(
+            error=ErrorDetail(
+                code=ErrorCode.VALIDATION_ERROR,
+                message="Request validation failed",
+                details={"validation_errors": error_details},
                 trace_id=trace_id
             )
-            
-            return JSONResponse(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                content=error_response.model_dump()
-            )
+        )
         
-        except Exception:
-            # Let other exceptions pass through to error handler
-            raise
+        api_logger.warning(
+            "Request validation failed",
+            validation_errors=error_details,
+            trace_id=trace_id
+        )
+        
+        return JSONResponse(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            content=error_response.model_dump()
+        )
 
 
-class ErrorHandlerMiddleware(BaseHTTPMiddleware):
+class ErrorHandlerMiddleware(PipelineStage):
     """Global error handling middleware with structured error responses."""
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Process request with comprehensive error handling."""
-        try:
-            return await call_next(request)
-            
-        except Exception as e:
-            trace_id = getattr(request.state, 'trace_id', str(uuid.uuid4())[:8])
-            
-            # Determine error type and response
-            error_code, status_code, message, details = self._classify_error(e)
-            
-            error_response = ErrorResponse(
-                error=ErrorDetail(
-                    code=error_code,
-                    message=message,
-                    details=details,
-                    trace_id=trace_id
-                )
-            )
-            
-            api_logger.error(
-                f"API error: {error_code}",
-                error_message=message,
-                error_type=type(e).__name__,
-                status_code=status_code,
-                trace_id=trace_id,
+    async def on_error(self, ctx: RequestContext, error: Exception) -> Optional[Response]:
+        """Turn any error into a structured error response."""
+        trace_id = getattr(ctx.request.state, 'trace_id', str(uuid.uuid4())[:8])
+        
+        # Determine error type and response
+        error_code, status_code, message, details = self._classify_error(error)
+        
+        error_response = ErrorResponse(
+            error=ErrorDetail(
+                code=error_code,
+                message=message,
                 details=details,
-                exception=str(e)
-            )
-            
-            return JSONResponse(
-                status_code=status_code,
-                content=error_response.model_dump(),
-                headers={"X-Trace-ID": trace_id}
+                trace_id=trace_id
             )
+        )
+        
+        api_logger.error(
+            f"API error: {error_code}",
+            error_message=message,
+            error_type=type(error).__name__,
+            status_code=status_code,
+            trace_id=trace_id,
+            details=details,
+            exception=str(error)
+        )
+        
+        return JSONResponse(
+            status_code=status_code,
+            content=error_response.model_dump(),
+            headers={"X-Trace-ID": trace_id}
+        )
     
     def _classify_error(self, error: Exception) -> tuple[ErrorCode, int, str, Optional[Dict[str, Any]]]:
         """Classify error and determine appropriate response."""
@@ -232,18 +225,19 @@ class ErrorHandlerMiddleware(BaseHTTPMiddleware):
         )
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+class RateLimitMiddleware(PipelineStage):
     """Rate limiting middleware with configurable limits."""
     
-    def __init__(self, app, requests_per_minute: int = 60):
+    def __init__(self, app: Optional[ASGIApp] = None, requests_per_minute: int = 60):
         super().__init__(app)
         self.requests_per_minute = requests_per_minute
         self.client_requests: Dict[str, list] = {}
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Process request with rate limiting."""
+    async def on_request(self, ctx: RequestContext) -> Optional[Response]:
+        """Reject the request when the client is over its limit."""
+        request = ctx.request
         client_ip = self._get_client_ip(request)
-        current_time = time.time()
+        current_time = ctx.start_time
         
         # Clean old requests
         self._cleanup_old_requests(client_ip, current_time)
@@ -285,17 +279,16 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         
         # Record request
         self._record_request(client_ip, current_time)
-        
-        # Process request
-        response = await call_next(request)
-        
-        # Add rate limit headers
+        ctx.state[self] = client_ip
+        return None
+    
+    async def on_response(self, ctx: RequestContext, response: ResponseLike) -> None:
+        """Add rate limit headers."""
+        client_ip = ctx.state[self]
         remaining = max(0, self.requests_per_minute - len(self.client_requests.get(client_ip, [])))
         response.headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
         response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Reset"] = str(int(current_time + 60))
-        
-        return response
+        response.headers["X-RateLimit-Reset"] = str(int(ctx.start_time + 60))
     
     def _get_client_ip(self, request: Request) -> str:
         """Extract client IP address."""
@@ -336,7 +329,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         self.client_requests[client_ip].append(current_time)
 
 
-class MetricsMiddleware(BaseHTTPMiddleware):
+class MetricsMiddleware(PipelineStage):
     """Metrics collection middleware for observability."""
     
     # Class-level shared state so all instances share the same metrics
@@ -345,29 +338,18 @@ class MetricsMiddleware(BaseHTTPMiddleware):
     status_counts = {}
     endpoint_metrics = {}
     
-    def __init__(self, app):
-        super().__init__(app)
+    async def on_response(self, ctx: RequestContext, response: ResponseLike) -> None:
+        """Collect metrics for the response."""
+        duration_ms = (time.time() - ctx.start_time) * 1000
+        self._record_metrics(ctx.request, response, duration_ms)
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Process request with metrics collection."""
-        start_time = time.time()
-        
-        try:
-            response = await call_next(request)
-            
-            # Collect metrics
-            duration_ms = (time.time() - start_time) * 1000
-            self._record_metrics(request, response, duration_ms)
-            
-            return response
-            
-        except Exception as e:
-            # Record error metrics
-            duration_ms = (time.time() - start_time) * 1000
-            self._record_error_metrics(request, e, duration_ms)
-            raise
+    async def on_error(self, ctx: RequestContext, error: Exception) -> Optional[Response]:
+        """Record error metrics and let the error propagate."""
+        duration_ms = (time.time() - ctx.start_time) * 1000
+        self._record_error_metrics(ctx.request, error, duration_ms)
+        return None
     
-    def _record_metrics(self, request: Request, response: Response, duration_ms: float):
+    def _record_metrics(self, request: Request, response: ResponseLike, duration_ms: float):
         """Record successful request metrics."""
         MetricsMiddleware.request_count += 1
         MetricsMiddleware.response_times.append(duration_ms)
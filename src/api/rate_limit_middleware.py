@@ -12,20 +12,20 @@ ALL requests, not just those that reach route handlers.
 import os
 import time
 import asyncio
-from typing import Callable, Dict, Tuple
+from typing import Dict, Optional, Tuple
 from collections import defaultdict
-from fastapi import Request, Response, status
+from fastapi import Response, status
 from fastapi.responses import JSONResponse
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 
+from ..utils.asgi_pipeline import PipelineStage, RequestContext, ResponseLike
 from ..utils.logging_middleware import api_logger
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+class RateLimitMiddleware(PipelineStage):
     """
     Middleware that applies rate limiting to ALL HTTP requests.
 
@@ -45,7 +45,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
     def __init__(
         self,
-        app: ASGIApp,
+        app: Optional[ASGIApp],
         limiter: Limiter,
         limit: str = "20/minute"
     ) -> None:
@@ -127,7 +127,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 security_risk="rate_limit_bypass_in_multi_instance"
             )
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def on_request(self, ctx: RequestContext) -> Optional[Response]:
         """
         Apply rate limiting to every request.
 
@@ -142,7 +142,10 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         - Health check endpoints (/health, /health/live, /health/ready, /health/detailed)
         - Metrics endpoints (/metrics, /prometheus)
         - Internal monitoring traffic (Sentinel, Docker health checks)
+
+        Returns a 429 response when the limit is exceeded, None otherwise.
         """
+        request = ctx.request
 
         # CRITICAL FIX: Exempt health and metrics endpoints from rate limiting
         # Docker health checks and monitoring tools must NEVER be rate limited
@@ -157,7 +160,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
         if request.url.path in exempt_paths:
             # Skip rate limiting for health/metrics endpoints
-            return await call_next(request)
+            return None
 
         # Get client IP address
         client_ip = get_remote_address(request)
@@ -184,13 +187,13 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         # - Sentinel: Monitoring service that makes 22+ queries per cycle
         # - VoiceBot: Voice interface that may burst requests during conversations
         if client_ip in sentinel_ips:
-            return await call_next(request)
+            return None
 
         if auth_header and sentinel_key and auth_header == sentinel_key:
-            return await call_next(request)
+            return None
 
         if auth_header and voicebot_key and auth_header == voicebot_key:
-            return await call_next(request)
+            return None
 
         # Get current time window
         current_time = int(time.time())
@@ -250,15 +253,9 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 # Calculate remaining requests
                 remaining = max(0, self.rate - self.request_counts[count_key])
 
-            # Process request
-            response = await call_next(request)
-
-            # Add rate limit headers
-            response.headers["X-RateLimit-Limit"] = str(self.rate)
-            response.headers["X-RateLimit-Remaining"] = str(remaining)
-            response.headers["X-RateLimit-Reset"] = str(window_start + self.period_seconds)
-
-            return response
+            # Rate limit headers are added when the response starts
+            ctx.state[self] = (remaining, window_start)
+            return None
 
         except RateLimitExceeded:
             # slowapi raised RateLimitExceeded (shouldn't happen with our implementation)
@@ -289,5 +286,16 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             )
 
             # Process request anyway
-            response = await call_next(request)
-            return response
+            return None
+
+    async def on_response(self, ctx: RequestContext, response: ResponseLike) -> None:
+        """Add rate limit headers to responses of rate limited requests."""
+        limit_state = ctx.state.get(self)
+        if limit_state is None:
+            # Exempt request, or the rate limit check failed open
+            return
+
+        remaining, window_start = limit_state
+        response.headers["X-RateLimit-Limit"] = str(self.rate)
+        response.headers["X-RateLimit-Remaining"] = str(remaining)
+        response.headers["X-RateLimit-Reset"] = str(window_start + self.period_seconds)
@@ -6,13 +6,33 @@ This module implements the BackendSearchInterface for Neo4j graph operations,
 providing graph traversal and relationship-based search capabilities.
 """
 
+import os
+import re
 import time
 from typing import List, Dict, Any, Optional
 
 from ..interfaces.backend_interface import BackendSearchInterface, SearchOptions, BackendHealthStatus, BackendSearchError
 from ..interfaces.memory_result import MemoryResult, ResultSource, ContentType
+from ..core.storage_executor import run_storage_call
 from ..utils.logging_middleware import backend_logger, log_backend_timing
 
+# "fulltext" queries the Lucene full-text index (falling back to CONTAINS scans
+# when the index is unavailable); "contains" always uses CONTAINS scans
+GRAPH_SEARCH_MODE = os.getenv("GRAPH_SEARCH_MODE", "fulltext").lower()
+FULLTEXT_INDEX_NAME = os.getenv("GRAPH_FULLTEXT_INDEX", "context_fulltext")
+
+# Context node properties searched by text queries
+TEXT_SEARCH_FIELDS = [
+    "title",           # Manual contexts
+    "description",     # Manual contexts
+    "keyword",         # Manual contexts
+    "user_input",      # Voice bot contexts
+    "bot_response",    # Voice bot contexts
+    "searchable_text"  # PR #340: Unified searchable field (standard + custom properties)
+]
+
+_LUCENE_SPECIAL_CHARS = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
+
 
 class GraphBackend(BackendSearchInterface):
     """
@@ -22,17 +42,22 @@ class GraphBackend(BackendSearchInterface):
     for complex context queries.
     """
     
-    def __init__(self, neo4j_client, cypher_validator=None):
+    def __init__(self, neo4j_client, cypher_validator=None, search_mode: Optional[str] = None):
         """
         Initialize graph backend.
         
         Args:
             neo4j_client: Neo4j client instance for graph operations
             cypher_validator: Optional validator for Cypher queries
+            search_mode: "fulltext" or "contains" (defaults to GRAPH_SEARCH_MODE)
         """
         self.client = neo4j_client
         self.cypher_validator = cypher_validator
         self._node_label = "Context"  # Default node label
+        self.search_mode = (search_mode or GRAPH_SEARCH_MODE).lower()
+        self.fulltext_index_name = FULLTEXT_INDEX_NAME
+        # None until the full-text index has been provisioned or found missing
+        self._fulltext_available: Optional[bool] = None
     
     @property
     def backend_name(self) -> str:
@@ -55,15 +80,35 @@ class GraphBackend(BackendSearchInterface):
         """
         async with log_backend_timing(self.backend_name, "search", backend_logger) as metadata:
             try:
-                # Build Cypher query based on search parameters
-                cypher_query, parameters = self._build_search_query(query, options)
+                # Build Cypher query based on search parameters; the full-text
+                # index avoids scanning every Context node with CONTAINS
+                if self.search_mode == "fulltext" and self._fulltext_available is None:
+                    await run_storage_call(self._create_fulltext_index, operation="neo4j.create_index")
+                use_fulltext = bool(query.split()) and self._fulltext_enabled()
+                if use_fulltext:
+                    cypher_query, parameters = self._build_fulltext_query(query, options)
+                else:
+                    cypher_query, parameters = self._build_search_query(query, options)
                 
                 metadata["cypher_query_length"] = len(cypher_query)
                 metadata["parameter_count"] = len(parameters)
                 
                 # Execute query
                 search_start = time.time()
-                raw_results = self._execute_query(cypher_query, parameters)
+                try:
+                    raw_results = await self._execute_query_async(cypher_query, parameters)
+                except Exception as e:
+                    if not use_fulltext or not self._is_missing_index_error(e):
+                        raise
+                    backend_logger.warning(
+                        "Full-text index unavailable, falling back to CONTAINS search",
+                        index_name=self.fulltext_index_name,
+                        error=str(e)
+                    )
+                    self._fulltext_available = False
+                    use_fulltext = False
+                    cypher_query, parameters = self._build_search_query(query, options)
+                    raw_results = await self._execute_query_async(cypher_query, parameters)
                 search_time = (time.time() - search_start) * 1000
                 
                 metadata["search_time_ms"] = search_time
@@ -80,7 +125,7 @@ class GraphBackend(BackendSearchInterface):
                 
                 backend_logger.info(
                     f"Graph search completed",
-                    query_type="cypher_text_match",
+                    query_type="fulltext_index" if use_fulltext else "cypher_text_match",
                     **metadata
                 )
                 
@@ -103,7 +148,7 @@ class GraphBackend(BackendSearchInterface):
         try:
             # Test basic connectivity with simple query
             test_query = "RETURN 1 as test"
-            result = self._execute_query(test_query, {})
+            result = await self._execute_query_async(test_query, {})
             response_time = (time.time() - start_time) * 1000
             
             # Check if we got expected result
@@ -112,7 +157,7 @@ class GraphBackend(BackendSearchInterface):
             # Check node count in our collection
             count_query = f"MATCH (n:{self._node_label}) RETURN count(n) as node_count"
             try:
-                count_result = self._execute_query(count_query, {})
+                count_result = await self._execute_query_async(count_query, {})
                 node_count = count_result[0].get('node_count', 0) if count_result else 0
             except Exception:
                 node_count = -1  # Indicates count query failed
@@ -132,7 +177,9 @@ class GraphBackend(BackendSearchInterface):
                     "connectivity_test_passed": connectivity_ok,
                     "node_label": self._node_label,
                     "node_count": node_count,
-                    "cypher_validator_available": self.cypher_validator is not None
+                    "cypher_validator_available": self.cypher_validator is not None,
+                    "search_mode": self.search_mode,
+                    "fulltext_index_available": self._fulltext_available
                 }
             )
             
@@ -157,7 +204,7 @@ class GraphBackend(BackendSearchInterface):
             await self.health_check()
             
             # Optionally create indexes for better performance
-            self._create_indexes()
+            await run_storage_call(self._create_indexes, operation="neo4j.create_index")
             
             backend_logger.info("Graph backend initialized successfully")
             
@@ -200,7 +247,7 @@ class GraphBackend(BackendSearchInterface):
                 metadata["query_length"] = len(cypher_query)
                 metadata["has_parameters"] = bool(parameters)
                 
-                raw_results = self._execute_query(cypher_query, parameters or {})
+                raw_results = await self._execute_query_async(cypher_query, parameters or {})
                 results = self._convert_to_memory_results(raw_results)
                 
                 metadata["result_count"] = len(results)
@@ -226,15 +273,7 @@ class GraphBackend(BackendSearchInterface):
         # Text search - search across all actual Context node fields
         # Fix for retrieval issue: Context nodes have title, description, keyword, user_input, bot_response
         # NOT the generic 'text' or 'content' fields that were being searched
-        # PR #340: Added searchable_text field for custom property search
-        text_fields = [
-            "n.title",           # Manual contexts
-            "n.description",     # Manual contexts
-            "n.keyword",         # Manual contexts
-            "n.user_input",      # Voice bot contexts
-            "n.bot_response",    # Voice bot contexts
-            "n.searchable_text"  # PR #340: Unified searchable field (standard + custom properties)
-        ]
+        text_fields = [f"n.{field}" for field in TEXT_SEARCH_FIELDS]
 
         # Enhanced multi-word search: split query into words
         # Each word must appear in at least one field (AND logic across words, OR across fields)
@@ -268,20 +307,7 @@ class GraphBackend(BackendSearchInterface):
             combined_condition = " AND ".join(word_conditions)
             where_conditions.append(f"({combined_condition})")
         
-        # Apply namespace filter
-        if options.namespace:
-            where_conditions.append("n.namespace = $namespace")
-            parameters["namespace"] = options.namespace
-        
-        # Apply type filter
-        if options.filters.get("type"):
-            where_conditions.append("n.type = $type_filter")
-            parameters["type_filter"] = options.filters["type"]
-        
-        # Apply user_id filter
-        if options.filters.get("user_id"):
-            where_conditions.append("n.user_id = $user_id_filter")
-            parameters["user_id_filter"] = options.filters["user_id"]
+        where_conditions.extend(self._build_filter_conditions(options, parameters))
         
         # Combine conditions
         where_clause = " AND ".join(where_conditions) if where_conditions else "true"
@@ -296,6 +322,102 @@ class GraphBackend(BackendSearchInterface):
         
         return cypher_query.strip(), parameters
     
+    def _build_fulltext_query(self, query: str, options: SearchOptions) -> tuple[str, Dict[str, Any]]:
+        """
+        Build a Cypher query that searches the Context full-text index.
+        
+        Every query word must match (AND across words, any indexed field),
+        mirroring the CONTAINS search, but matches are tokenized and results
+        are ordered by Lucene relevance instead of timestamp.
+        """
+        parameters = {
+            "limit": options.limit,
+            "index_name": self.fulltext_index_name,
+            "fulltext_query": " AND ".join(
+                self._escape_lucene(word) for word in query.split() if word.strip()
+            )
+        }
+        
+        where_conditions = self._build_filter_conditions(options, parameters)
+        where_clause = f"WHERE {' AND '.join(where_conditions)}" if where_conditions else ""
+        
+        cypher_query = f"""
+        CALL db.index.fulltext.queryNodes($index_name, $fulltext_query) YIELD node AS n, score
+        {where_clause}
+        RETURN n, score
+        ORDER BY score DESC
+        LIMIT $limit
+        """
+        
+        return cypher_query.strip(), parameters
+    
+    def _build_filter_conditions(self, options: SearchOptions, parameters: Dict[str, Any]) -> List[str]:
+        """Build WHERE conditions for namespace/type/user_id filters, adding their parameters."""
+        conditions = []
+        
+        # Apply namespace filter
+        if options.namespace:
+            conditions.append("n.namespace = $namespace")
+            parameters["namespace"] = options.namespace
+        
+        # Apply type filter
+        if options.filters.get("type"):
+            conditions.append("n.type = $type_filter")
+            parameters["type_filter"] = options.filters["type"]
+        
+        # Apply user_id filter
+        if options.filters.get("user_id"):
+            conditions.append("n.user_id = $user_id_filter")
+            parameters["user_id_filter"] = options.filters["user_id"]
+        
+        return conditions
+    
+    @staticmethod
+    def _escape_lucene(word: str) -> str:
+        """Escape Lucene query syntax so user input is matched literally."""
+        escaped = _LUCENE_SPECIAL_CHARS.sub(r"\\\1", word)
+        # Bare boolean operators would otherwise be parsed as syntax
+        return f'"{escaped}"' if escaped in ("AND", "OR", "NOT") else escaped
+    
+    def _fulltext_enabled(self) -> bool:
+        """Whether searches should use the full-text index, provisioning it on first use."""
+        if self.search_mode != "fulltext":
+            return False
+        if self._fulltext_available is None:
+            self._create_fulltext_index()
+        return bool(self._fulltext_available)
+    
+    def _create_fulltext_index(self) -> bool:
+        """Create the Context full-text index if it does not exist yet."""
+        properties = ", ".join(f"n.{field}" for field in TEXT_SEARCH_FIELDS)
+        index_query = (
+            f"CREATE FULLTEXT INDEX {self.fulltext_index_name} IF NOT EXISTS "
+            f"FOR (n:{self._node_label}) ON EACH [{properties}]"
+        )
+        try:
+            self._execute_query(index_query, {})
+            self._fulltext_available = True
+            backend_logger.debug(f"Created full-text index: {self.fulltext_index_name}")
+        except Exception as e:
+            self._fulltext_available = False
+            backend_logger.warning(
+                f"Failed to create full-text index, using CONTAINS search: {e}",
+                query=index_query
+            )
+        return self._fulltext_available
+    
+    @staticmethod
+    def _is_missing_index_error(error: Exception) -> bool:
+        """Whether a query failed because the full-text index does not exist."""
+        message = str(error).lower()
+        return "index" in message and any(
+            marker in message for marker in ("no such", "not found", "does not exist", "no index")
+        )
+    
+    async def _execute_query_async(self, cypher_query: str, parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Execute Cypher query on the storage executor so the event loop is not blocked."""
+        return await run_storage_call(self._execute_query, cypher_query, parameters, operation="neo4j.query")
+    
     def _execute_query(self, cypher_query: str, parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Execute Cypher query and return results."""
         try:
@@ -311,9 +433,11 @@ class GraphBackend(BackendSearchInterface):
         for result in raw_results:
             try:
                 # Handle different result formats
+                fulltext_score = None
                 if isinstance(result, dict) and 'n' in result:
-                    # Standard query result format: {'n': {...}}
+                    # Standard query result format: {'n': {...}}, plus 'score' from the full-text index
                     node_data = result['n']
+                    fulltext_score = result.get('score')
                 elif isinstance(result, dict):
                     # Direct node data
                     node_data = result
@@ -352,7 +476,11 @@ class GraphBackend(BackendSearchInterface):
                 
                 # Calculate relevance score (graph results don't have similarity scores)
                 score = 1.0
-                if node_data.get('relevance_score'):
+                if fulltext_score is not None:
+                    # Lucene scores are unbounded; squash them into [0, 1)
+                    fulltext_score = float(fulltext_score)
+                    score = fulltext_score / (fulltext_score + 1.0)
+                elif node_data.get('relevance_score'):
                     score = float(node_data['relevance_score'])
                 elif 'created_at' in node_data or 'timestamp' in node_data:
                     # Simple time-based scoring - more recent = higher score
@@ -390,6 +518,7 @@ class GraphBackend(BackendSearchInterface):
                     tags=tags,
                     metadata={
                         **node_data,
+                        **({'fulltext_score': fulltext_score} if fulltext_score is not None else {}),
                         'graph_search': True,
                         'node_label': self._node_label
                     },
@@ -452,6 +581,10 @@ class GraphBackend(BackendSearchInterface):
                 except Exception as e:
                     backend_logger.warning(f"Failed to create index: {e}", query=index_query)
                     # Continue with other indexes even if one fails
+            
+            # Full-text index used by search (range indexes cannot serve CONTAINS on toLower)
+            if self.search_mode == "fulltext":
+                self._create_fulltext_index()
         
         except Exception as e:
             backend_logger.warning(f"Index creation failed: {e}")
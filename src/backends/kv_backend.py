@@ -12,6 +12,8 @@ from typing import List, Dict, Any, Optional
 
 from ..interfaces.backend_interface import BackendSearchInterface, SearchOptions, BackendHealthStatus, BackendSearchError
 from ..interfaces.memory_result import MemoryResult, ResultSource, ContentType
+from ..core.storage_executor import run_storage_call
+from .kv_index import KVContentIndex
 from ..utils.logging_middleware import backend_logger, log_backend_timing
 
 
@@ -42,6 +44,16 @@ class KVBackend(BackendSearchInterface):
             "cache": "cache:",
             "fact": "fact:"
         }
+        
+        # Prefixes whose writers in this service keep the token index current
+        # (set_key and the scratchpad endpoint); the others are written
+        # elsewhere, so content search still scans them
+        self.indexed_prefixes = (self.prefixes["scratchpad"],)
+        
+        # Server-side token index for content search (needs the raw Redis client)
+        raw_client = getattr(self.simple_redis, 'redis_client', None) or getattr(self.simple_redis, 'client', None)
+        self.content_index = KVContentIndex(raw_client) if raw_client is not None else None
+        self._index_ready = False
     
     @property
     def backend_name(self) -> str:
@@ -121,17 +133,10 @@ class KVBackend(BackendSearchInterface):
         
         try:
             # Test Redis connectivity
-            if self.simple_redis and hasattr(self.simple_redis, 'redis_client'):
-                redis_client = self.simple_redis.redis_client
-                ping_result = redis_client.ping()
-                connectivity_ok = ping_result is True
-            elif self.simple_redis:
-                # Try basic operation
-                test_key = f"health_check_{int(time.time())}"
-                self.simple_redis.set(test_key, "test", ex=5)  # 5 second TTL
-                test_value = self.simple_redis.get(test_key)
-                connectivity_ok = test_value == "test"
-                self.simple_redis.delete(test_key)  # Cleanup
+            if self.simple_redis:
+                connectivity_ok = await run_storage_call(
+                    self._check_connectivity, operation="redis.health_check"
+                )
             else:
                 connectivity_ok = False
             
@@ -141,7 +146,9 @@ class KVBackend(BackendSearchInterface):
             redis_info = {}
             if connectivity_ok and self.simple_redis and hasattr(self.simple_redis, 'redis_client'):
                 try:
-                    info = self.simple_redis.redis_client.info()
+                    info = await run_storage_call(
+                        self.simple_redis.redis_client.info, operation="redis.info"
+                    )
                     redis_info = {
                         "version": info.get("redis_version", "unknown"),
                         "connected_clients": info.get("connected_clients", 0),
@@ -158,7 +165,7 @@ class KVBackend(BackendSearchInterface):
                 try:
                     for prefix_name, prefix in self.prefixes.items():
                         pattern = f"{prefix}*"
-                        count = len(self._scan_keys(pattern, limit=100))  # Sample count
+                        count = len(await self._scan_keys_async(pattern, limit=100))  # Sample count
                         key_counts[prefix_name] = count
                 except Exception as e:
                     backend_logger.warning(f"Failed to count keys: {e}")
@@ -227,7 +234,7 @@ class KVBackend(BackendSearchInterface):
             full_key = f"{namespace}:{key}" if namespace else key
             
             if self.simple_redis:
-                value = self.simple_redis.get(full_key)
+                value = await run_storage_call(self.simple_redis.get, full_key, operation="redis.get")
                 if value:
                     return self._convert_value_to_result(full_key, value)
             
@@ -255,9 +262,16 @@ class KVBackend(BackendSearchInterface):
             
             if self.simple_redis:
                 if ttl:
-                    return self.simple_redis.set(full_key, content, ex=ttl)
+                    success = await run_storage_call(
+                        self.simple_redis.set, full_key, content, ex=ttl, operation="redis.set"
+                    )
                 else:
-                    return self.simple_redis.set(full_key, content)
+                    success = await run_storage_call(
+                        self.simple_redis.set, full_key, content, operation="redis.set"
+                    )
+                if success and full_key.startswith(self.indexed_prefixes):
+                    await self._index_content(full_key, content, ttl)
+                return success
             
             return False
             
@@ -278,7 +292,7 @@ class KVBackend(BackendSearchInterface):
             if not self.simple_redis:
                 return []
             
-            value = self.simple_redis.get(key)
+            value = await run_storage_call(self.simple_redis.get, key, operation="redis.get")
             if value:
                 result = self._convert_value_to_result(key, value)
                 if result:
@@ -294,12 +308,13 @@ class KVBackend(BackendSearchInterface):
         """Search within a specific namespace."""
         try:
             pattern = f"{namespace}:*"
-            matching_keys = self._scan_keys(pattern, limit=options.limit * 2)
+            matching_keys = await self._scan_keys_async(pattern, limit=options.limit * 2)
+            values = await self._get_values_async(matching_keys)
             
             results = []
             for key in matching_keys:
                 try:
-                    value = self.simple_redis.get(key) if self.simple_redis else None
+                    value = values.get(key)
                     if value and query.lower() in value.lower():
                         result = self._convert_value_to_result(key, value)
                         if result:
@@ -326,10 +341,11 @@ class KVBackend(BackendSearchInterface):
             
             all_results = []
             for pattern in patterns:
-                matching_keys = self._scan_keys(pattern, limit=options.limit)
+                matching_keys = await self._scan_keys_async(pattern, limit=options.limit)
+                values = await self._get_values_async(matching_keys)
                 for key in matching_keys:
                     try:
-                        value = self.simple_redis.get(key) if self.simple_redis else None
+                        value = values.get(key)
                         if value:
                             result = self._convert_value_to_result(key, value)
                             if result:
@@ -348,18 +364,85 @@ class KVBackend(BackendSearchInterface):
             return []
     
     async def _content_search(self, query: str, options: SearchOptions) -> List[MemoryResult]:
-        """Search within stored content values."""
+        """Search within stored content values, through the token index when available."""
+        results: List[MemoryResult] = []
+        scan_prefixes = list(self.prefixes.values())
+        if self.content_index is not None:
+            try:
+                indexed_results = await self._indexed_content_search(query, options)
+                if indexed_results is not None:
+                    results = indexed_results
+                    scan_prefixes = [p for p in scan_prefixes if p not in self.indexed_prefixes]
+            except Exception as e:
+                backend_logger.warning(f"Indexed content search failed, falling back to scan: {e}")
+        
+        if scan_prefixes and len(results) < options.limit:
+            results.extend(await self._scan_content_search(query, options, scan_prefixes))
+        return results[:options.limit]
+    
+    async def _indexed_content_search(self, query: str, options: SearchOptions) -> Optional[List[MemoryResult]]:
+        """Look up every key containing all query tokens, hydrated with pipelined MGETs."""
+        await self._ensure_index_ready()
+        hits = await run_storage_call(self.content_index.search, query, operation="redis.index_search")
+        if hits is None:
+            return None
+        
+        results = []
+        for key, value in hits:
+            if not key.startswith(self.indexed_prefixes):
+                continue
+            try:
+                result = self._convert_value_to_result(key, value)
+                if result:
+                    query_matches = value.lower().count(query.lower()) or 1
+                    result.score = min(1.0, 0.5 + (query_matches * 0.1))
+                    results.append(result)
+            except Exception as e:
+                backend_logger.warning(f"Failed to search content in {key}: {e}")
+        
+        results.sort(key=lambda r: r.score, reverse=True)
+        return results[:options.limit]
+    
+    async def _ensure_index_ready(self) -> None:
+        """Backfill the token index from existing keys once per keyspace."""
+        if self._index_ready:
+            return
+        if not await run_storage_call(self.content_index.is_ready, operation="redis.exists"):
+            patterns = [f"{prefix}*" for prefix in self.indexed_prefixes]
+            indexed = await run_storage_call(
+                self.content_index.rebuild, patterns, operation="redis.index_rebuild"
+            )
+            backend_logger.info("KV content index backfilled", keys_indexed=indexed)
+        self._index_ready = True
+    
+    async def _index_content(self, key: str, content: Any, ttl: Optional[int] = None) -> None:
+        """Add a written key to the token index; failures leave the write intact."""
+        if self.content_index is None:
+            return
+        try:
+            await run_storage_call(
+                self.content_index.index, key, content, ttl, operation="redis.index"
+            )
+        except Exception as e:
+            backend_logger.warning(f"Failed to index key {key}: {e}")
+    
+    async def _scan_content_search(
+        self, query: str, options: SearchOptions, prefixes: Optional[List[str]] = None
+    ) -> List[MemoryResult]:
+        """Search a sample of stored values by substring (for prefixes the index does not cover)."""
         try:
             # Sample keys from different prefixes
             sample_keys = []
-            for prefix in self.prefixes.values():
-                pattern_keys = self._scan_keys(f"{prefix}*", limit=50)
+            for prefix in prefixes or self.prefixes.values():
+                pattern_keys = await self._scan_keys_async(f"{prefix}*", limit=50)
                 sample_keys.extend(pattern_keys)
             
+            sample_keys = sample_keys[:200]  # Limit scanning
+            values = await self._get_values_async(sample_keys)
             results = []
-            for key in sample_keys[:min(200, len(sample_keys))]:  # Limit scanning
+            for key in sample_keys:
                 try:
-                    value = self.simple_redis.get(key) if self.simple_redis else None
+                    value = values.get(key)
                     if value and query.lower() in value.lower():
                         result = self._convert_value_to_result(key, value)
                         if result:
@@ -380,6 +463,36 @@ class KVBackend(BackendSearchInterface):
             backend_logger.warning(f"Content search failed: {e}")
             return []
     
+    def _check_connectivity(self) -> bool:
+        """Ping Redis, or round-trip a test key when no raw client is exposed."""
+        if hasattr(self.simple_redis, 'redis_client'):
+            return self.simple_redis.redis_client.ping() is True
+        test_key = f"health_check_{int(time.time())}"
+        self.simple_redis.set(test_key, "test", ex=5)  # 5 second TTL
+        test_value = self.simple_redis.get(test_key)
+        self.simple_redis.delete(test_key)  # Cleanup
+        return test_value == "test"
+    
+    async def _scan_keys_async(self, pattern: str, limit: int = 100) -> List[str]:
+        """Scan Redis keys on the storage executor."""
+        return await run_storage_call(self._scan_keys, pattern, limit, operation="redis.scan")
+    
+    async def _get_values_async(self, keys: List[str]) -> Dict[str, Any]:
+        """Fetch values for keys in one storage executor call."""
+        if not keys or not self.simple_redis:
+            return {}
+        return await run_storage_call(self._get_values, keys, operation="redis.get_many")
+    
+    def _get_values(self, keys: List[str]) -> Dict[str, Any]:
+        """Fetch values for keys, skipping keys that fail to read."""
+        values = {}
+        for key in keys:
+            try:
+                values[key] = self.simple_redis.get(key)
+            except Exception as e:
+                backend_logger.warning(f"Failed to read key {key}: {e}")
+        return values
+    
     def _scan_keys(self, pattern: str, limit: int = 100) -> List[str]:
         """Scan Redis keys matching pattern."""
         try:
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Token index for KV content search.
+
+Maintains a server-side inverted index in Redis so that content search does
+not have to SCAN and GET keys one by one:
+
+    kvidx:tok:<token>  SET of persistent keys whose value contains <token>
+    kvidx:ttok:<token> SET of expiring keys whose value contains <token>
+    kvidx:doc:<key>    SET of tokens indexed for <key> (to unindex on overwrite)
+    kvidx:ready        marker written once existing keys have been backfilled
+
+Entries for a key with a TTL expire with it: its doc set gets the same TTL,
+and the expiring token sets only ever grow their TTL to the longest-lived
+member, so they disappear once every key in them has expired.
+
+A search unions each query token's two sets and intersects the unions in one
+pipelined round trip, then hydrates the matching keys with pipelined MGETs,
+so cost is bounded by the number of matches rather than the size of the
+keyspace. Keys that expired or were deleted outside the index are pruned
+lazily when hydration misses them.
+"""
+
+import json
+import os
+import re
+import uuid
+from typing import Any, Iterable, List, Optional, Tuple
+
+from ..utils.logging_middleware import backend_logger
+
+KV_INDEX_PREFIX = "kvidx"
+KV_INDEX_MAX_CANDIDATES = int(os.getenv("KV_INDEX_MAX_CANDIDATES", "1000"))
+KV_INDEX_MGET_CHUNK = int(os.getenv("KV_INDEX_MGET_CHUNK", "200"))
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+_MIN_TOKEN_LENGTH = 2
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased unique word tokens, in first-seen order."""
+    seen = {}
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        if len(token) >= _MIN_TOKEN_LENGTH:
+            seen.setdefault(token, None)
+    return list(seen)
+
+
+def _decode(value: Any) -> Any:
+    return value.decode("utf-8", errors="replace") if isinstance(value, bytes) else value
+
+
+class KVContentIndex:
+    """Redis-maintained token -> key set index."""
+
+    def __init__(self, redis_client, prefix: str = KV_INDEX_PREFIX):
+        """
+        Args:
+            redis_client: Raw redis.Redis client (supports pipeline/sinter/mget)
+            prefix: Namespace for the index keys
+        """
+        self.redis = redis_client
+        self.prefix = prefix
+
+    def token_key(self, token: str) -> str:
+        return f"{self.prefix}:tok:{token}"
+
+    def expiring_token_key(self, token: str) -> str:
+        return f"{self.prefix}:ttok:{token}"
+
+    def doc_key(self, key: str) -> str:
+        return f"{self.prefix}:doc:{key}"
+
+    @property
+    def ready_key(self) -> str:
+        return f"{self.prefix}:ready"
+
+    def is_index_key(self, key: str) -> bool:
+        return key.startswith(f"{self.prefix}:")
+
+    def index(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """
+        Index (or re-index) a key's value in two round trips.
+
+        Args:
+            key: Redis key that was written
+            value: Value written to the key
+            ttl: Seconds until the key expires, or None if it is persistent
+        """
+        tokens = tokenize(self._text(value))
+        old_tokens = [_decode(t) for t in self.redis.smembers(self.doc_key(key)) or ()]
+
+        pipe = self.redis.pipeline(transaction=False)
+        self._unindex_tokens(pipe, key, old_tokens)
+        self._index_tokens(pipe, key, tokens, ttl)
+        pipe.execute()
+
+    def remove(self, key: str) -> None:
+        """Drop a key from the index."""
+        tokens = [_decode(t) for t in self.redis.smembers(self.doc_key(key)) or ()]
+        pipe = self.redis.pipeline(transaction=False)
+        self._unindex_tokens(pipe, key, tokens)
+        pipe.execute()
+
+    def _unindex_tokens(self, pipe, key: str, tokens: Iterable[str]) -> None:
+        """Queue removal of key from its token sets and its doc set."""
+        for token in tokens:
+            pipe.srem(self.token_key(token), key)
+            pipe.srem(self.expiring_token_key(token), key)
+        pipe.delete(self.doc_key(key))
+
+    def _index_tokens(self, pipe, key: str, tokens: List[str], ttl: Optional[int]) -> None:
+        """Queue adding key to the token sets, expiring the entries with the key."""
+        if not tokens:
+            return
+        for token in tokens:
+            if ttl:
+                token_key = self.expiring_token_key(token)
+                pipe.sadd(token_key, key)
+                # Set the TTL on a new set, otherwise only ever extend it
+                pipe.expire(token_key, ttl, nx=True)
+                pipe.expire(token_key, ttl, gt=True)
+            else:
+                pipe.sadd(self.token_key(token), key)
+        pipe.sadd(self.doc_key(key), *tokens)
+        if ttl:
+            pipe.expire(self.doc_key(key), ttl)
+
+    def search(
+        self, query: str, max_candidates: int = KV_INDEX_MAX_CANDIDATES
+    ) -> Optional[List[Tuple[str, str]]]:
+        """
+        Return (key, value) pairs whose value contains every query token.
+
+        Returns None when the query has no indexable tokens, so callers can
+        fall back to another strategy.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return None
+
+        # Union each token's persistent and expiring sets into temporary keys
+        # and intersect them, all in one round trip
+        scratch = f"{self.prefix}:q:{uuid.uuid4().hex}"
+        unions = [f"{scratch}:{i}" for i in range(len(tokens))]
+        pipe = self.redis.pipeline(transaction=False)
+        for union, token in zip(unions, tokens):
+            pipe.sunionstore(union, [self.token_key(token), self.expiring_token_key(token)])
+            pipe.expire(union, 60)
+        pipe.sinter(unions)
+        pipe.delete(*unions)
+        matches = pipe.execute()[-2]
+
+        keys = sorted(_decode(k) for k in matches)
+        if len(keys) > max_candidates:
+            backend_logger.warning(
+                "KV index search truncated", matches=len(keys), max_candidates=max_candidates
+            )
+            keys = keys[:max_candidates]
+
+        values = self._mget(keys)
+        hits = []
+        stale = []
+        for key, value in zip(keys, values):
+            if value is None:
+                stale.append(key)
+            else:
+                hits.append((key, _decode(value)))
+
+        for key in stale:
+            self.remove(key)
+        return hits
+
+    def rebuild(self, patterns: Iterable[str], scan_count: int = 500) -> int:
+        """Backfill the index from existing keys matching patterns; returns keys indexed."""
+        indexed = 0
+        for pattern in patterns:
+            batch: List[str] = []
+            for key in self.redis.scan_iter(match=pattern, count=scan_count):
+                key = _decode(key)
+                if self.is_index_key(key):
+                    continue
+                batch.append(key)
+                if len(batch) >= KV_INDEX_MGET_CHUNK:
+                    indexed += self._index_batch(batch)
+                    batch = []
+            if batch:
+                indexed += self._index_batch(batch)
+        self.redis.set(self.ready_key, "1")
+        return indexed
+
+    def is_ready(self) -> bool:
+        """Whether existing keys have been backfilled."""
+        return bool(self.redis.exists(self.ready_key))
+
+    def _index_batch(self, keys: List[str]) -> int:
+        values = self._mget(keys)
+        pipe = self.redis.pipeline(transaction=False)
+        for key in keys:
+            pipe.ttl(key)
+        ttls = pipe.execute()
+
+        pipe = self.redis.pipeline(transaction=False)
+        count = 0
+        for key, value, ttl in zip(keys, values, ttls):
+            if value is None or ttl == -2:
+                continue
+            tokens = tokenize(self._text(_decode(value)))
+            pipe.delete(self.doc_key(key))
+            self._index_tokens(pipe, key, tokens, ttl if ttl and ttl > 0 else None)
+            count += 1
+        pipe.execute()
+        return count
+
+    def _mget(self, keys: List[str]) -> List[Any]:
+        """MGET in fixed-size chunks through one pipeline round trip."""
+        if not keys:
+            return []
+        pipe = self.redis.pipeline(transaction=False)
+        for start in range(0, len(keys), KV_INDEX_MGET_CHUNK):
+            pipe.mget(keys[start:start + KV_INDEX_MGET_CHUNK])
+        values: List[Any] = []
+        for chunk in pipe.execute():
+            values.extend(chunk)
+        return values
+
+    @staticmethod
+    def _text(value: Any) -> str:
+        if isinstance(value, (dict, list)):
+            return json.dumps(value)
+        return str(_decode(value) or "")
+
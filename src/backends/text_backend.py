@@ -7,12 +7,18 @@ to complement vector and graph backends with traditional information retrieval.
 """
 
 import asyncio
+import contextlib
+import heapq
+import itertools
 import logging
 import math
+import os
+import re
 import time
+import uuid
 from collections import Counter, defaultdict
-from typing import List, Dict, Any, Optional, Set
-from dataclasses import dataclass
+from typing import List, Dict, Any, Callable, Optional, Set
+from dataclasses import dataclass, field
 
 from ..interfaces.backend_interface import (
     BackendSearchInterface, 
@@ -22,17 +28,46 @@ from ..interfaces.backend_interface import (
 )
 from ..interfaces.memory_result import MemoryResult
 from ..utils.logging_middleware import search_logger
+from .text_segments import (
+    Segment,
+    SegmentFormatError,
+    lock_index,
+    manifest_mtime,
+    read_manifest,
+    unlock_index,
+    write_manifest,
+    write_segment,
+)
+
+
+_TOKEN_PATTERN = re.compile(r'\b[a-zA-Z0-9]+\b')
+
+# Persistent segment configuration (TEXT_INDEX_DIR unset = in-memory only)
+TEXT_INDEX_DIR = os.getenv("TEXT_INDEX_DIR")
+TEXT_INDEX_FLUSH_DOCS = int(os.getenv("TEXT_INDEX_FLUSH_DOCS", "1000"))
+TEXT_INDEX_MAX_SEGMENTS = int(os.getenv("TEXT_INDEX_MAX_SEGMENTS", "8"))
+TEXT_INDEX_MAINTENANCE_INTERVAL = float(os.getenv("TEXT_INDEX_MAINTENANCE_INTERVAL", "30"))
+
+
+def tokenize_text(text: str) -> List[str]:
+    """Lowercase alphanumeric tokens (module-level so worker processes can use it)."""
+    return _TOKEN_PATTERN.findall(text.lower())
 
 
 @dataclass
 class DocumentIndex:
-    """Represents an indexed document for BM25 search."""
+    """
+    Represents an indexed document for BM25 search.
+    
+    Term statistics live in the backend's postings lists; ``tokens`` is kept
+    for callers that build documents by hand and is not populated by the index.
+    """
     doc_id: str
     text: str
-    tokens: List[str]
     token_frequencies: Dict[str, int]
     doc_length: int
     metadata: Dict[str, Any]
+    tokens: List[str] = field(default_factory=list)
 
 
 class BM25Scorer:
@@ -126,19 +161,82 @@ class TextSearchBackend(BackendSearchInterface):
     
     Provides full-text search capabilities using the BM25 ranking algorithm,
     complementing vector-based semantic search with traditional keyword matching.
+    
+    Documents are held in an inverted index (term -> {doc_id: term frequency}),
+    so a query only touches the postings of its own terms and scores them
+    term-at-a-time instead of scanning the whole corpus.
+    
+    When an ``index_dir`` is configured, new documents go to the in-memory
+    segment (``documents``/``postings``), which is periodically flushed to an
+    immutable memory-mapped segment on disk; small segments are merged in the
+    background. On startup the existing segments are mapped, so lexical search
+    is available immediately without re-reading the source stores. Documents
+    still in the in-memory segment are flushed on ``cleanup()``.
+    
+    Worker processes may share one ``index_dir``. Each keeps its own
+    in-memory segment; flushes, merges and deletes update the manifest under
+    the directory's inter-process lock, and searches reload the segment list
+    when another process has changed the manifest. When two processes flush
+    the same document, the later flush wins.
     """
     
     backend_name = "text"
     
-    def __init__(self):
-        """Initialize the text search backend."""
+    def __init__(
+        self,
+        index_dir: Optional[str] = None,
+        flush_threshold: int = TEXT_INDEX_FLUSH_DOCS,
+        max_segments: int = TEXT_INDEX_MAX_SEGMENTS
+    ):
+        """
+        Initialize the text search backend.
+        
+        Args:
+            index_dir: Directory for persistent segments (None = in-memory only)
+            flush_threshold: In-memory documents that trigger a flush to disk
+            max_segments: On-disk segment count that triggers a merge
+        """
         self.documents: Dict[str, DocumentIndex] = {}
+        self.postings: Dict[str, Dict[str, int]] = {}
         self.term_doc_frequencies: Dict[str, int] = defaultdict(int)
         self.total_doc_length = 0
         self.scorer = BM25Scorer()
         self.last_indexed_count = 0
         self.index_dirty = False
         
+        self.index_dir = index_dir
+        self.flush_threshold = flush_threshold
+        self.max_segments = max_segments
+        self.segments: List[Segment] = []
+        self._generation = 0
+        self._manifest_dirty = False
+        self._manifest_mtime: Optional[int] = None
+        self._retired_segments: List[Segment] = []
+        self._maintenance_lock: Optional[asyncio.Lock] = None
+        self._maintenance_task: Optional[asyncio.Task] = None
+    
+    @property
+    def document_count(self) -> int:
+        """Total live documents across the in-memory and on-disk segments."""
+        return len(self.documents) + sum(segment.live_doc_count for segment in self.segments)
+    
+    def _corpus_doc_length(self) -> int:
+        """Total token count of live documents across all segments."""
+        return self.total_doc_length + sum(segment.live_doc_length for segment in self.segments)
+    
+    def _document_frequency(self, term: str) -> int:
+        """
+        Number of live documents containing a term across all segments.
+        
+        Deleted on-disk documents are left out so df never exceeds
+        document_count, which would make the BM25 idf undefined.
+        """
+        postings = self.postings.get(term)
+        return (len(postings) if postings else 0) + sum(
+            segment.doc_frequency(term) for segment in self.segments
+        )
+    
+
     def tokenize(self, text: str) -> List[str]:
         """
         Simple tokenization for BM25 indexing.
@@ -150,9 +248,28 @@ class TextSearchBackend(BackendSearchInterface):
         - Language-specific processing
         """
         # Convert to lowercase and split on whitespace/punctuation
-        import re
-        tokens = re.findall(r'\b[a-zA-Z0-9]+\b', text.lower())
-        return tokens
+        return tokenize_text(text)
+    
+    def _add_postings(self, doc_id: str, token_frequencies: Dict[str, int]) -> None:
+        """Add a document's terms to the postings lists."""
+        for term, tf in token_frequencies.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+            postings[doc_id] = tf
+            self.term_doc_frequencies[term] += 1
+    
+    def _remove_postings(self, doc_id: str, token_frequencies: Dict[str, int]) -> None:
+        """Remove a document's terms from the postings lists."""
+        for term in token_frequencies:
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self.postings[term]
+            self.term_doc_frequencies[term] -= 1
+            if self.term_doc_frequencies[term] <= 0:
+                del self.term_doc_frequencies[term]
     
     async def index_document(
         self, 
@@ -173,46 +290,8 @@ class TextSearchBackend(BackendSearchInterface):
         try:
             # Tokenize the document
             tokens = self.tokenize(text)
-            token_frequencies = Counter(tokens)
-            
-            # Create document index
-            doc_index = DocumentIndex(
-                doc_id=doc_id,
-                text=text,
-                tokens=tokens,
-                token_frequencies=token_frequencies,
-                doc_length=len(tokens),
-                metadata=metadata or {}
-            )
-            
-            # Update global statistics if this is a new document
-            if doc_id not in self.documents:
-                self.total_doc_length += len(tokens)
-                
-                # Update term document frequencies
-                for term in set(tokens):  # Use set to count each term only once per document
-                    self.term_doc_frequencies[term] += 1
-            else:
-                # Remove old document statistics
-                old_doc = self.documents[doc_id]
-                self.total_doc_length -= old_doc.doc_length
-                self.total_doc_length += len(tokens)
-                
-                # Update term frequencies (remove old, add new)
-                old_terms = set(old_doc.tokens)
-                new_terms = set(tokens)
-                
-                for term in old_terms - new_terms:
-                    self.term_doc_frequencies[term] -= 1
-                    if self.term_doc_frequencies[term] <= 0:
-                        del self.term_doc_frequencies[term]
-                
-                for term in new_terms - old_terms:
-                    self.term_doc_frequencies[term] += 1
-            
-            # Store the document
-            self.documents[doc_id] = doc_index
-            self.index_dirty = True
+            token_frequencies = dict(Counter(tokens))
+            self.add_tokenized_document(doc_id, text, token_frequencies, len(tokens), metadata)
             
             search_logger.debug(
                 f"Indexed document for text search",
@@ -226,6 +305,98 @@ class TextSearchBackend(BackendSearchInterface):
             search_logger.error(f"Failed to index document {doc_id}: {e}")
             raise BackendSearchError(self.backend_name, f"Indexing failed: {e}")
     
+    def add_tokenized_document(
+        self,
+        doc_id: str,
+        text: str,
+        token_frequencies: Dict[str, int],
+        doc_length: int,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Add a document whose tokens were already counted (e.g. in a worker process).
+        
+        Replaces any previous version of the document in memory or on disk.
+        """
+        doc_index = DocumentIndex(
+            doc_id=doc_id,
+            text=text,
+            token_frequencies=token_frequencies,
+            doc_length=doc_length,
+            metadata=metadata or {}
+        )
+        
+        # Replace statistics of a previous version of this document
+        old_doc = self.documents.get(doc_id)
+        if old_doc is not None:
+            self.total_doc_length -= old_doc.doc_length
+            self._remove_postings(doc_id, old_doc.token_frequencies)
+        else:
+            self._delete_from_segments(doc_id)
+        
+        self.total_doc_length += doc_length
+        self._add_postings(doc_id, token_frequencies)
+        
+        # Store the document; corpus statistics changed so cached IDFs are stale
+        self.documents[doc_id] = doc_index
+        self.scorer.idf_cache.clear()
+        self.index_dirty = True
+    
+    def _remove_from_memory(self, doc_id: str) -> None:
+        """Drop a document and its statistics from the in-memory segment."""
+        doc = self.documents.pop(doc_id)
+        self.total_doc_length -= doc.doc_length
+        self._remove_postings(doc_id, doc.token_frequencies)
+    
+    def _delete_from_segments(self, doc_id: str) -> bool:
+        """Mark the live on-disk copy of a document deleted; returns True if found."""
+        for segment in self.segments:
+            ordinal = segment.find_doc(doc_id)
+            if ordinal is not None and segment.delete(ordinal):
+                # Persisted with the next flush, together with the replacing document
+                self._manifest_dirty = True
+                return True
+        return False
+    
+    def get_document(self, doc_id: str) -> Optional[DocumentIndex]:
+        """
+        Get an indexed document from the in-memory or on-disk segments.
+        
+        Args:
+            doc_id: Document identifier
+            
+        Returns:
+            DocumentIndex, or None if the document is not indexed
+        """
+        if doc_id in self.documents:
+            return self.documents[doc_id]
+        for segment in self.segments:
+            ordinal = segment.find_doc(doc_id)
+            if ordinal is not None and ordinal not in segment.deleted:
+                return self._load_segment_document(segment, ordinal)
+        return None
+    
+    def has_document(self, doc_id: str) -> bool:
+        """Whether a live version of the document is indexed, without loading it."""
+        if doc_id in self.documents:
+            return True
+        for segment in self.segments:
+            ordinal = segment.find_doc(doc_id)
+            if ordinal is not None and ordinal not in segment.deleted:
+                return True
+        return False
+    
+    def _load_segment_document(self, segment: Segment, ordinal: int) -> DocumentIndex:
+        """Materialize a DocumentIndex from a segment's stored fields."""
+        text, metadata = segment.stored_fields(ordinal)
+        return DocumentIndex(
+            doc_id=segment.doc_id(ordinal),
+            text=text,
+            token_frequencies=dict(Counter(self.tokenize(text))),
+            doc_length=segment.doc_lengths[ordinal],
+            metadata=metadata
+        )
+    
     async def remove_document(self, doc_id: str) -> bool:
         """
         Remove a document from the index.
@@ -236,26 +407,21 @@ class TextSearchBackend(BackendSearchInterface):
         Returns:
             True if document was removed, False if not found
         """
-        if doc_id not in self.documents:
-            return False
-        
         try:
-            doc = self.documents[doc_id]
-            
-            # Update global statistics
-            self.total_doc_length -= doc.doc_length
-            
-            # Update term document frequencies
-            for term in set(doc.tokens):
-                self.term_doc_frequencies[term] -= 1
-                if self.term_doc_frequencies[term] <= 0:
-                    del self.term_doc_frequencies[term]
-            
-            # Remove document
-            del self.documents[doc_id]
+            removed = False
+            if doc_id in self.documents:
+                self._remove_from_memory(doc_id)
+                removed = True
+            if self.index_dir:
+                # Persisted right away, so a merge in another process cannot revive the copy
+                if await self._update_manifest(lambda: self._delete_from_segments(doc_id)):
+                    removed = True
+            if not removed:
+                return False
+            self.scorer.idf_cache.clear()
             self.index_dirty = True
             
-            search_logger.debug(f"Removed document from text index", doc_id=doc_id)
+            search_logger.debug("Removed document from text index", doc_id=doc_id)
             return True
             
         except Exception as e:
@@ -279,7 +445,9 @@ class TextSearchBackend(BackendSearchInterface):
         start_time = time.time()
         
         try:
-            if not self.documents:
+            self._refresh_segments()
+            total_docs = self.document_count
+            if not total_docs:
                 return []
             
             # Tokenize query
@@ -290,36 +458,41 @@ class TextSearchBackend(BackendSearchInterface):
             search_logger.debug(
                 f"Executing BM25 text search",
                 query_terms=query_terms,
-                index_size=len(self.documents),
+                index_size=total_docs,
+                segment_count=len(self.segments),
                 term_vocabulary_size=len(self.term_doc_frequencies)
             )
             
             # Calculate average document length
-            avg_doc_length = self.total_doc_length / len(self.documents) if self.documents else 1.0
+            avg_doc_length = self._corpus_doc_length() / total_docs or 1.0
             
-            # Score all documents
-            scored_docs = []
-            total_docs = len(self.documents)
-            
-            for doc_id, document in self.documents.items():
-                score = self.scorer.score_document(
-                    query_terms=query_terms,
-                    document=document,
-                    avg_doc_length=avg_doc_length,
-                    total_docs=total_docs,
-                    term_doc_frequencies=self.term_doc_frequencies
-                )
-                
-                # Apply score threshold
-                if score >= options.score_threshold:
-                    scored_docs.append((doc_id, document, score))
+            # Score term-at-a-time over the postings of the query terms only;
+            # accumulators[0] is the in-memory segment, then one per disk segment
+            accumulators = self._score_postings(Counter(query_terms), avg_doc_length, options.limit)
+            candidate_count = sum(len(acc) for acc in accumulators)
             
-            # Sort by score (highest first)
-            scored_docs.sort(key=lambda x: x[2], reverse=True)
+            # Keep the top-k above the score threshold (highest score first)
+            top_docs = heapq.nlargest(
+                options.limit,
+                (
+                    (score, source, key)
+                    for source, acc in enumerate(accumulators)
+                    for key, score in acc.items()
+                    if score >= options.score_threshold
+                ),
+                key=lambda item: item[0]
+            )
+            scored_docs = []
+            for score, source, key in top_docs:
+                if source == 0:
+                    scored_docs.append((key, self.documents[key], score))
+                else:
+                    document = self._load_segment_document(self.segments[source - 1], key)
+                    scored_docs.append((document.doc_id, document, score))
             
             # Convert to MemoryResult objects
             results = []
-            for doc_id, document, score in scored_docs[:options.limit]:
+            for doc_id, document, score in scored_docs:
                 # Normalize BM25 score to [0, 1] range (approximate)
                 # BM25 scores can vary widely, so we use a sigmoid-like normalization
                 normalized_score = min(1.0, score / (score + 1.0))
@@ -345,8 +518,8 @@ class TextSearchBackend(BackendSearchInterface):
             search_logger.info(
                 f"BM25 text search completed",
                 query_terms=query_terms,
-                total_candidates=len(self.documents),
-                results_above_threshold=len(scored_docs),
+                total_candidates=candidate_count,
+                index_size=total_docs,
                 final_results=len(results),
                 search_time_ms=search_time
             )
@@ -366,6 +539,401 @@ class TextSearchBackend(BackendSearchInterface):
             
             raise BackendSearchError(self.backend_name, error_msg, e)
     
+    def _score_postings(
+        self,
+        query_term_counts: Dict[str, int],
+        avg_doc_length: float,
+        limit: Optional[int] = None
+    ) -> List[Dict[Any, float]]:
+        """
+        Accumulate BM25 scores term-at-a-time over the query terms' postings.
+        
+        Produces the same scores as ``BM25Scorer.score_document``. Terms are
+        processed rarest first. When ``limit`` is given and the current top-k
+        can no longer be overtaken by a document that has not been seen yet
+        (the remaining terms' upper bounds sum below the k-th best score),
+        the remaining, typically very common, terms only update documents
+        already in the accumulator instead of walking their full postings.
+        
+        Args:
+            query_term_counts: Query terms mapped to their count in the query
+            avg_doc_length: Average document length in the corpus
+            limit: Number of top results needed, or None to score every match
+            
+        Returns:
+            Non-negative BM25 scores per segment: the first mapping is keyed by
+            doc_id for the in-memory segment, followed by one mapping keyed by
+            ordinal for each on-disk segment in ``self.segments`` order
+        """
+        k1 = self.scorer.k1
+        b = self.scorer.b
+        total_docs = self.document_count
+        base = k1 * (1 - b)
+        length_factor = k1 * b / avg_doc_length
+        
+        # A term contributes at most weight when weight > 0 and can lower a
+        # score by at most |weight| when negative
+        terms = []
+        for term, query_count in query_term_counts.items():
+            doc_frequency = self._document_frequency(term)
+            if doc_frequency:
+                idf = self.scorer.calculate_idf(term, total_docs, doc_frequency)
+                terms.append((idf * query_count * (k1 + 1), term))
+        terms.sort(key=lambda item: item[0], reverse=True)
+        
+        remaining_upper = sum(weight for weight, _ in terms if weight > 0)
+        remaining_lower = sum(weight for weight, _ in terms if weight < 0)
+        accumulators: List[Dict[Any, float]] = [defaultdict(float) for _ in range(len(self.segments) + 1)]
+        pruning = False
+        
+        for weight, term in terms:
+            if limit and not pruning and sum(len(acc) for acc in accumulators) >= limit:
+                # Lowest final score the current k-th best document can reach
+                all_scores = itertools.chain.from_iterable(acc.values() for acc in accumulators)
+                kth_best = heapq.nlargest(limit, all_scores)[-1] + remaining_lower
+                pruning = kth_best > remaining_upper
+            
+            self._accumulate_memory(term, weight, accumulators[0], pruning, base, length_factor)
+            for segment, accumulator in zip(self.segments, accumulators[1:]):
+                segment.accumulate(term, weight, accumulator, pruning, base, length_factor)
+            
+            if weight > 0:
+                remaining_upper -= weight
+            else:
+                remaining_lower -= weight
+        
+        return [
+            {key: max(0.0, score) for key, score in accumulator.items()}
+            for accumulator in accumulators
+        ]
+    
+    def _accumulate_memory(
+        self,
+        term: str,
+        weight: float,
+        accumulator: Dict[str, float],
+        existing_only: bool,
+        base: float,
+        length_factor: float
+    ) -> None:
+        """Add one term's BM25 contribution for the in-memory segment."""
+        postings = self.postings.get(term)
+        if not postings:
+            return
+        documents = self.documents
+        
+        if existing_only and len(accumulator) < len(postings):
+            for doc_id, partial in accumulator.items():
+                tf = postings.get(doc_id)
+                if tf:
+                    denominator = tf + base + length_factor * documents[doc_id].doc_length
+                    accumulator[doc_id] = partial + weight * tf / denominator
+        elif existing_only:
+            for doc_id, tf in postings.items():
+                if doc_id in accumulator:
+                    denominator = tf + base + length_factor * documents[doc_id].doc_length
+                    accumulator[doc_id] += weight * tf / denominator
+        else:
+            for doc_id, tf in postings.items():
+                denominator = tf + base + length_factor * documents[doc_id].doc_length
+                accumulator[doc_id] += weight * tf / denominator
+    
+    async def initialize(self) -> None:
+        """
+        Open the persistent segments and start background maintenance.
+        
+        No-op when the backend has no ``index_dir``.
+        """
+        if not self.index_dir:
+            return
+        
+        os.makedirs(self.index_dir, exist_ok=True)
+        async with self._index_lock(shared=True):
+            self._reload_segments()
+        
+        search_logger.info(
+            "Opened text index segments",
+            index_dir=self.index_dir,
+            segment_count=len(self.segments),
+            document_count=self.document_count
+        )
+        self.start_maintenance()
+    
+    async def cleanup(self) -> None:
+        """Stop maintenance, flush the in-memory segment and unmap segments."""
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+            try:
+                await self._maintenance_task
+            except asyncio.CancelledError:
+                pass
+            self._maintenance_task = None
+        
+        if self.index_dir:
+            await self.flush()
+            if self._manifest_dirty:
+                await self._update_manifest()
+        
+        for segment in self.segments:
+            segment.close()
+        self.segments = []
+        self._close_retired_segments()
+    
+    def start_maintenance(self, interval_seconds: float = TEXT_INDEX_MAINTENANCE_INTERVAL) -> None:
+        """Start the background flush/merge loop (requires a running event loop)."""
+        if self.index_dir and self._maintenance_task is None:
+            self._maintenance_task = asyncio.create_task(self._maintenance_loop(interval_seconds))
+    
+    async def _maintenance_loop(self, interval_seconds: float) -> None:
+        """Periodically flush the in-memory segment and merge small segments."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.maintain()
+            except Exception as e:
+                search_logger.warning(f"Text index maintenance failed: {e}")
+    
+    async def maintain(self) -> None:
+        """Flush if the in-memory segment is over threshold, merge if there are too many segments."""
+        self._refresh_segments()
+        if len(self.documents) >= self.flush_threshold:
+            await self.flush()
+        if len(self.segments) > self.max_segments:
+            await self.merge_segments()
+        if self._manifest_dirty:
+            await self._update_manifest()
+    
+    def _get_maintenance_lock(self) -> asyncio.Lock:
+        if self._maintenance_lock is None:
+            self._maintenance_lock = asyncio.Lock()
+        return self._maintenance_lock
+    
+    def _next_segment_path(self) -> str:
+        # Unique without the index lock, since other processes write segments too
+        name = f"seg_{self._generation + 1:08d}_{uuid.uuid4().hex[:8]}.bm25"
+        return os.path.join(self.index_dir, name)
+    
+    @contextlib.asynccontextmanager
+    async def _index_lock(self, shared: bool = False):
+        """Hold the index directory's inter-process lock, waiting for it off the event loop."""
+        loop = asyncio.get_event_loop()
+        handle = await loop.run_in_executor(None, lambda: lock_index(self.index_dir, shared=shared))
+        try:
+            yield
+        finally:
+            unlock_index(handle)
+    
+    def _reload_segments(self) -> None:
+        """
+        Sync the segment list with the manifest (caller holds the index lock).
+        
+        Segments flushed by other processes are opened, segments they merged
+        away are dropped, and their deletions are applied. Deletions made
+        here that are not persisted yet are kept.
+        """
+        self._manifest_mtime = manifest_mtime(self.index_dir)
+        manifest = read_manifest(self.index_dir)
+        current = {segment.name: segment for segment in self.segments}
+        segments = []
+        for entry in manifest.get("segments", []):
+            segment = current.pop(entry["name"], None)
+            if segment is None:
+                path = os.path.join(self.index_dir, entry["name"])
+                try:
+                    segment = Segment(path, deleted=entry.get("deleted", []))
+                except SegmentFormatError as e:
+                    search_logger.error(f"Skipping unreadable text index segment: {e}")
+                    continue
+            else:
+                for ordinal in entry.get("deleted", []):
+                    segment.delete(ordinal)
+            segments.append(segment)
+        
+        self.segments = segments
+        self._generation = manifest.get("generation", 0)
+        self.scorer.idf_cache.clear()
+        # A running flush or merge may still read dropped segments; it closes them when done
+        self._retired_segments.extend(current.values())
+        if not self._get_maintenance_lock().locked():
+            self._close_retired_segments()
+    
+    def _close_retired_segments(self) -> None:
+        for segment in self._retired_segments:
+            segment.close()
+        self._retired_segments = []
+    
+    def _refresh_segments(self) -> None:
+        """Reload the segment list if another process changed the manifest."""
+        if not self.index_dir or self._get_maintenance_lock().locked():
+            return
+        if manifest_mtime(self.index_dir) == self._manifest_mtime:
+            return
+        handle = lock_index(self.index_dir, shared=True, blocking=False)
+        if handle is None:
+            # A writer is replacing the manifest; a later search picks it up
+            return
+        try:
+            self._reload_segments()
+        finally:
+            unlock_index(handle)
+    
+    def _persist_manifest(self) -> None:
+        """Write the manifest under a new generation (caller holds the index lock)."""
+        self._generation += 1
+        write_manifest(self.index_dir, self._generation, self.segments)
+        self._manifest_mtime = manifest_mtime(self.index_dir)
+        self._manifest_dirty = False
+    
+    async def _update_manifest(self, change: Optional[Callable[[], Any]] = None) -> Any:
+        """
+        Apply a change to the segment list and persist it for every process.
+        
+        Under the exclusive index lock the manifest is re-read first, so
+        segments and deletions written by other processes are kept. The
+        manifest is written if ``change`` returns a true value or local
+        deletions are pending.
+        
+        Returns:
+            The result of ``change`` (True without one)
+        """
+        async with self._index_lock():
+            self._reload_segments()
+            result = change() if change is not None else True
+            if result or self._manifest_dirty:
+                self._persist_manifest()
+        return result
+    
+    async def flush(self) -> Optional[str]:
+        """
+        Write the in-memory segment to a new on-disk segment.
+        
+        The segment file is written in a worker thread; documents stay
+        searchable in memory until the new segment is mapped. Documents that
+        are re-indexed or removed while the write is in flight stay in memory
+        and their flushed copy is marked deleted.
+        
+        Returns:
+            Name of the new segment, or None if there was nothing to flush
+        """
+        if not self.index_dir or not self.documents:
+            return None
+        
+        async with self._get_maintenance_lock():
+            snapshot = dict(self.documents)
+            if not snapshot:
+                return None
+            
+            path = self._next_segment_path()
+            docs = [
+                (doc.doc_id, doc.token_frequencies, doc.doc_length, doc.text, doc.metadata)
+                for doc in snapshot.values()
+            ]
+            start_time = time.time()
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(None, write_segment, path, docs)
+            segment = Segment(path)
+            
+            def publish() -> bool:
+                for doc_id, doc in snapshot.items():
+                    if self.documents.get(doc_id) is doc:
+                        self._remove_from_memory(doc_id)
+                    else:
+                        segment.delete(segment.find_doc(doc_id))
+                # Supersede older copies, including ones flushed by other processes
+                for other in self.segments:
+                    for doc_id in snapshot:
+                        ordinal = other.find_doc(doc_id)
+                        if ordinal is not None:
+                            other.delete(ordinal)
+                self.segments.append(segment)
+                return True
+            
+            await self._update_manifest(publish)
+            self._close_retired_segments()
+            self.scorer.idf_cache.clear()
+            
+            search_logger.info(
+                "Flushed text index segment",
+                segment=segment.name,
+                documents=len(docs),
+                flush_time_ms=(time.time() - start_time) * 1000
+            )
+            return segment.name
+    
+    def _read_live_documents(self, sources: List[Segment], deleted: List[Set[int]]):
+        """Yield live documents of the given segments as segment documents."""
+        for segment, segment_deleted in zip(sources, deleted):
+            for ordinal in range(segment.doc_count):
+                if ordinal in segment_deleted:
+                    continue
+                text, metadata = segment.stored_fields(ordinal)
+                tokens = self.tokenize(text)
+                yield segment.doc_id(ordinal), dict(Counter(tokens)), len(tokens), text, metadata
+    
+    async def merge_segments(self) -> Optional[str]:
+        """
+        Merge all on-disk segments into one, dropping deleted documents.
+        
+        Deletions made while the merge is running are carried over to the
+        merged segment. Segments flushed during the merge are kept as-is.
+        
+        Returns:
+            Name of the merged segment, or None if there was nothing to merge
+        """
+        if not self.index_dir:
+            return None
+        
+        async with self._get_maintenance_lock():
+            sources = list(self.segments)
+            if not sources or (len(sources) == 1 and not sources[0].deleted):
+                return None
+            
+            deleted_before = [set(segment.deleted) for segment in sources]
+            path = self._next_segment_path()
+            start_time = time.time()
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(
+                None,
+                lambda: write_segment(path, self._read_live_documents(sources, deleted_before))
+            )
+            merged = Segment(path)
+            
+            def swap() -> bool:
+                if any(segment not in self.segments for segment in sources):
+                    # Another process merged some of the sources first
+                    return False
+                # Deletions made meanwhile, here or in other processes
+                for segment, before in zip(sources, deleted_before):
+                    for ordinal in segment.deleted - before:
+                        merged.delete(merged.find_doc(segment.doc_id(ordinal)))
+                self.segments = [merged] + [segment for segment in self.segments if segment not in sources]
+                for segment in sources:
+                    try:
+                        os.remove(segment.path)
+                    except OSError as e:
+                        search_logger.warning(f"Failed to remove merged segment {segment.name}: {e}")
+                return True
+            
+            swapped = await self._update_manifest(swap)
+            self._close_retired_segments()
+            if not swapped:
+                merged.close()
+                os.remove(path)
+                search_logger.info("Text index merge superseded by another process")
+                return None
+            self.scorer.idf_cache.clear()
+            for segment in sources:
+                segment.close()
+            
+            search_logger.info(
+                "Merged text index segments",
+                merged_segment=merged.name,
+                source_segments=len(sources),
+                documents=merged.live_doc_count,
+                merge_time_ms=(time.time() - start_time) * 1000
+            )
+            return merged.name
+    
     async def health_check(self) -> BackendHealthStatus:
         """
         Perform health check on the text search backend.
@@ -377,9 +945,9 @@ class TextSearchBackend(BackendSearchInterface):
         
         try:
             # Basic health metrics
-            document_count = len(self.documents)
+            document_count = self.document_count
             vocabulary_size = len(self.term_doc_frequencies)
-            avg_doc_length = self.total_doc_length / document_count if document_count > 0 else 0
+            avg_doc_length = self._corpus_doc_length() / document_count if document_count > 0 else 0
             
             # Test basic search functionality with simple query
             if document_count > 0:
@@ -426,7 +994,7 @@ class TextSearchBackend(BackendSearchInterface):
         Returns:
             Dictionary with comprehensive index statistics
         """
-        if not self.documents:
+        if not self.document_count:
             return {
                 "document_count": 0,
                 "vocabulary_size": 0,
@@ -435,10 +1003,10 @@ class TextSearchBackend(BackendSearchInterface):
                 "top_terms": []
             }
         
-        # Calculate statistics
-        document_count = len(self.documents)
+        # Calculate statistics (vocabulary and top terms cover the in-memory segment)
+        document_count = self.document_count
         vocabulary_size = len(self.term_doc_frequencies)
-        average_doc_length = self.total_doc_length / document_count
+        average_doc_length = self._corpus_doc_length() / document_count
         
         # Find most common terms
         top_terms = sorted(
@@ -450,8 +1018,14 @@ class TextSearchBackend(BackendSearchInterface):
         return {
             "document_count": document_count,
             "vocabulary_size": vocabulary_size,
-            "total_tokens": self.total_doc_length,
+            "total_tokens": self._corpus_doc_length(),
             "average_document_length": average_doc_length,
+            "memory_documents": len(self.documents),
+            "segments": [
+                {"name": segment.name, "documents": segment.live_doc_count, "deleted": len(segment.deleted)}
+                for segment in self.segments
+            ],
+            "total_postings": sum(len(postings) for postings in self.postings.values()),
             "top_terms": [{"term": term, "document_frequency": freq} for term, freq in top_terms],
             "index_dirty": self.index_dirty,
             "scorer_parameters": {
@@ -479,6 +1053,7 @@ class TextSearchBackend(BackendSearchInterface):
             
             # Reset index
             self.documents.clear()
+            self.postings.clear()
             self.term_doc_frequencies.clear()
             self.total_doc_length = 0
             self.scorer.idf_cache.clear()
@@ -493,6 +1068,9 @@ class TextSearchBackend(BackendSearchInterface):
                 )
                 rebuild_count += 1
             
+            # Compact on-disk segments, dropping deleted documents
+            merged_segment = await self.merge_segments()
+            
             rebuild_time = (time.time() - start_time) * 1000
             self.index_dirty = False
             
@@ -507,7 +1085,8 @@ class TextSearchBackend(BackendSearchInterface):
                 "documents_rebuilt": rebuild_count,
                 "rebuild_time_ms": rebuild_time,
                 "new_vocabulary_size": len(self.term_doc_frequencies),
-                "new_total_tokens": self.total_doc_length
+                "new_total_tokens": self._corpus_doc_length(),
+                "merged_segment": merged_segment
             }
             
         except Exception as e:
@@ -540,7 +1119,7 @@ def initialize_text_backend() -> TextSearchBackend:
         TextSearchBackend instance
     """
     global _text_backend_instance
-    _text_backend_instance = TextSearchBackend()
+    _text_backend_instance = TextSearchBackend(index_dir=TEXT_INDEX_DIR)
     search_logger.info("Text search backend initialized")
     return _text_backend_instance
 
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Streaming incremental indexer for the BM25 text backend.
+
+Populates ``TextSearchBackend`` from the source stores without materializing
+whole result sets:
+
+- Each source is read one page at a time with cursor (keyset) pagination,
+  and the next page is fetched while the current one is tokenized.
+- Pages are tokenized in a process pool and fed into the index as they
+  arrive, so lexical search answers from a partial index while the rest
+  streams in.
+- After each flush to disk, the indexer persists a per-source high-water
+  mark next to the index segments. A restart maps the existing segments
+  (search is usable immediately) and only streams contexts stored after the
+  last checkpoint.
+- Sources share context ids, so a document that is already indexed is not
+  added again; the first source listed wins.
+
+store_context adds new contexts to the backend directly, so the indexer is
+only needed for the initial build and to catch up on writes that path missed.
+
+Neo4j Context nodes carry ``created_at`` and are paged on
+``(created_at, id)``, which makes them the incremental source. The
+timestamps are set by the writer, not at commit, so each run re-reads an
+overlap window before the high-water mark to pick up contexts that committed
+after a later-stamped one was checkpointed. Qdrant point
+IDs are random UUIDs and payloads have no timestamp, so the Qdrant scroll
+is only used for the initial build (resuming from its cursor if a restart
+interrupts it) to pick up contexts that have no graph node.
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from ..core.storage_executor import run_storage_call
+from ..utils.logging_middleware import search_logger
+from ..utils.text_generation import generate_searchable_text
+from .text_backend import TextSearchBackend, tokenize_text
+
+TEXT_INDEXER_PAGE_SIZE = int(os.getenv("TEXT_INDEXER_PAGE_SIZE", "500"))
+TEXT_INDEXER_WORKERS = int(os.getenv("TEXT_INDEXER_WORKERS", str(min(4, os.cpu_count() or 1))))
+TEXT_INDEXER_INTERVAL = float(os.getenv("TEXT_INDEXER_INTERVAL", "60"))
+TEXT_INDEXER_OVERLAP_SECONDS = float(os.getenv("TEXT_INDEXER_OVERLAP_SECONDS", "300"))
+
+STATE_FILE_NAME = "indexer_state.json"
+
+# (doc_id, text, metadata) as produced by a source
+SourceDocument = Tuple[str, str, Dict[str, Any]]
+
+
+def tokenize_batch(texts: Sequence[str]) -> List[Tuple[Dict[str, int], int]]:
+    """Token frequencies and document length for each text (runs in a worker process)."""
+    counted = []
+    for text in texts:
+        tokens = tokenize_text(text)
+        counted.append((dict(Counter(tokens)), len(tokens)))
+    return counted
+
+
+class Neo4jContextSource:
+    """
+    Context nodes paged in ``(created_at, id)`` order.
+
+    The checkpoint is the highest sort key read, so every page is an index
+    seek rather than a growing SKIP. ``created_at`` is stamped by the
+    writer, so a context can commit after a later-stamped one was
+    checkpointed; rewind() starts each run ``overlap_seconds`` before the
+    checkpoint and the indexer skips the documents it already has. While a
+    run is inside that window the checkpoint keeps the high-water mark and
+    carries the scan position in ``scan_from``.
+    """
+
+    name = "neo4j"
+
+    PAGE_QUERY = """
+        MATCH (n:Context)
+        WHERE n.id IS NOT NULL
+        WITH n, coalesce(n.created_at, '') AS created_at
+        WHERE created_at > $after_created_at
+           OR (created_at = $after_created_at AND n.id > $after_id)
+        RETURN n, created_at
+        ORDER BY created_at, n.id
+        LIMIT $limit
+    """
+
+    def __init__(
+        self,
+        neo4j_client: Any,
+        page_size: int = TEXT_INDEXER_PAGE_SIZE,
+        overlap_seconds: float = TEXT_INDEXER_OVERLAP_SECONDS
+    ):
+        self.client = neo4j_client
+        self.page_size = page_size
+        self.overlap_seconds = overlap_seconds
+
+    def rewind(self, checkpoint: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Start scanning ``overlap_seconds`` before the checkpoint's high-water mark."""
+        if not checkpoint or not checkpoint.get("created_at") or self.overlap_seconds <= 0:
+            return checkpoint
+        try:
+            high_water = datetime.fromisoformat(checkpoint["created_at"])
+        except ValueError:
+            return checkpoint
+        scan_from = (high_water - timedelta(seconds=self.overlap_seconds)).isoformat()
+        return {"created_at": checkpoint["created_at"], "id": checkpoint.get("id", ""),
+                "scan_from": [scan_from, ""]}
+
+    async def fetch_page(
+        self, checkpoint: Optional[Dict[str, Any]]
+    ) -> Tuple[List[SourceDocument], Dict[str, Any], bool]:
+        """
+        Fetch the page after ``checkpoint`` (after its ``scan_from`` if set).
+
+        Returns:
+            (documents, checkpoint after this page, whether the source is
+            caught up)
+        """
+        checkpoint = checkpoint or {}
+        high_water = (checkpoint.get("created_at", ""), checkpoint.get("id", ""))
+        after = tuple(checkpoint.get("scan_from") or high_water)
+        rows = await run_storage_call(
+            self.client.query,
+            self.PAGE_QUERY,
+            {
+                "after_created_at": after[0],
+                "after_id": after[1],
+                "limit": self.page_size,
+            },
+            operation="neo4j.query",
+        )
+        documents = []
+        for row in rows or []:
+            node = row.get("n") or {}
+            after = (row.get("created_at") or "", node["id"])
+            text = node.get("searchable_text") or generate_searchable_text(node)
+            if text:
+                documents.append((node["id"], text, {
+                    "content_type": node.get("type", "text"),
+                    "created_at": node.get("created_at"),
+                    "source_store": self.name,
+                }))
+        exhausted = len(rows or []) < self.page_size
+        if after > high_water:
+            checkpoint = {"created_at": after[0], "id": after[1]}
+        elif exhausted:
+            checkpoint = {"created_at": high_water[0], "id": high_water[1]}
+        else:
+            checkpoint = {"created_at": high_water[0], "id": high_water[1], "scan_from": list(after)}
+        return documents, checkpoint, exhausted
+
+
+class QdrantContextSource:
+    """
+    Qdrant points paged with the scroll cursor.
+
+    Used for the initial build only: once the scroll reaches the end the
+    checkpoint is marked complete and later runs return nothing.
+    """
+
+    name = "qdrant"
+
+    def __init__(self, qdrant_client: Any, page_size: int = TEXT_INDEXER_PAGE_SIZE):
+        self.client = qdrant_client
+        self.page_size = page_size
+
+    async def fetch_page(
+        self, checkpoint: Optional[Dict[str, Any]]
+    ) -> Tuple[List[SourceDocument], Dict[str, Any], bool]:
+        """Fetch the page at the checkpoint's cursor (see Neo4jContextSource.fetch_page)."""
+        checkpoint = checkpoint or {}
+        if checkpoint.get("complete"):
+            return [], checkpoint, True
+        points, next_offset = await run_storage_call(
+            self.client.scroll,
+            limit=self.page_size,
+            offset=checkpoint.get("offset"),
+            operation="qdrant.scroll",
+        )
+        documents = []
+        for point in points:
+            payload = point.get("payload") or {}
+            content = payload.get("content")
+            if isinstance(content, dict):
+                text = generate_searchable_text(content)
+            else:
+                text = str(content or "")
+            if text:
+                documents.append((str(point["id"]), text, {
+                    "content_type": payload.get("type", "text"),
+                    "source_store": self.name,
+                }))
+        complete = next_offset is None or not points
+        return documents, {"offset": next_offset, "complete": complete}, complete
+
+
+class StreamingTextIndexer:
+    """
+    Streams source stores into a TextSearchBackend with persisted checkpoints.
+
+    Checkpoints are only persisted after the backend has flushed the indexed
+    documents to a segment, so a crash never skips contexts. Without an
+    ``index_dir`` the index is memory-only and every start is a full build.
+    
+    The tokenizer pool is created on the first run and reused until stop().
+    """
+
+    def __init__(
+        self,
+        backend: TextSearchBackend,
+        sources: Sequence[Any],
+        workers: int = TEXT_INDEXER_WORKERS,
+        state_path: Optional[str] = None,
+        prefetch_pages: int = 2
+    ):
+        """
+        Args:
+            backend: Text backend to populate
+            sources: Page sources (``name``, ``fetch_page(checkpoint)`` and
+                optionally ``rewind(checkpoint)``, applied at the start of a run)
+            workers: Tokenizer processes (0 tokenizes on the event loop thread)
+            state_path: Checkpoint file (defaults to the backend's index_dir)
+            prefetch_pages: Pages fetched ahead of the tokenizer per source
+        """
+        self.backend = backend
+        self.sources = list(sources)
+        self.workers = workers
+        self.prefetch_pages = prefetch_pages
+        if state_path is None and backend.index_dir:
+            state_path = os.path.join(backend.index_dir, STATE_FILE_NAME)
+        self.state_path = state_path
+        self.checkpoints: Dict[str, Dict[str, Any]] = self._load_state()
+        self.stats: Dict[str, Any] = {"runs": 0, "documents_indexed": 0, "last_run": None}
+        self._lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self._pool: Optional[Executor] = None
+
+    def _load_state(self) -> Dict[str, Dict[str, Any]]:
+        if not self.state_path or not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, "r") as f:
+                return json.load(f).get("sources", {})
+        except (OSError, ValueError) as e:
+            search_logger.warning(f"Ignoring unreadable text indexer state: {e}")
+            return {}
+
+    def _save_state(self, checkpoints: Dict[str, Dict[str, Any]]) -> None:
+        """Atomically replace the checkpoint file."""
+        if not self.state_path:
+            return
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"sources": checkpoints, "updated_at": time.time()}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.state_path)
+
+    async def _checkpoint(self, committed: Dict[str, Dict[str, Any]]) -> None:
+        """Flush indexed documents to disk, then persist their high-water marks."""
+        if self.backend.index_dir:
+            await self.backend.flush()
+        self.checkpoints = dict(committed)
+        self._save_state(self.checkpoints)
+
+    async def run_once(self, reset: bool = False) -> Dict[str, Any]:
+        """
+        Stream everything stored since the last checkpoint into the index.
+
+        Args:
+            reset: Ignore existing checkpoints and re-stream every source,
+                replacing documents that are already indexed
+
+        Returns:
+            Per-source document and page counts for this run
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if reset:
+                self.checkpoints = {}
+            start_time = time.time()
+            if self._pool is None and self.workers > 0:
+                self._pool = ProcessPoolExecutor(self.workers)
+            committed = dict(self.checkpoints)
+            run_stats: Dict[str, Dict[str, int]] = {}
+            # Ids indexed by an earlier source in this run
+            streamed: Set[str] = set()
+            for source in self.sources:
+                try:
+                    run_stats[source.name] = await self._stream_source(
+                        source, self._pool, committed, streamed, replace=reset
+                    )
+                except BrokenProcessPool as e:
+                    search_logger.error(f"Text indexing from {source.name} failed: {e}")
+                    run_stats[source.name] = {"error": str(e)}
+                    self._shutdown_pool()
+                    break
+                except Exception as e:
+                    search_logger.error(f"Text indexing from {source.name} failed: {e}")
+                    run_stats[source.name] = {"error": str(e)}
+            await self._checkpoint(committed)
+
+            indexed = sum(stats.get("documents", 0) for stats in run_stats.values())
+            self.stats["runs"] += 1
+            self.stats["documents_indexed"] += indexed
+            self.stats["last_run"] = {
+                "sources": run_stats,
+                "duration_ms": (time.time() - start_time) * 1000,
+                "finished_at": time.time(),
+            }
+            search_logger.info(
+                "Text index catch-up completed",
+                documents=indexed,
+                duration_ms=self.stats["last_run"]["duration_ms"],
+                document_count=self.backend.document_count
+            )
+            return run_stats
+
+    async def _stream_source(
+        self,
+        source: Any,
+        pool: Optional[Executor],
+        committed: Dict[str, Dict[str, Any]],
+        streamed: Set[str],
+        replace: bool = False
+    ) -> Dict[str, int]:
+        """
+        Fetch pages ahead of the tokenizer and add each page as it is tokenized.
+        
+        Documents already streamed this run, or already indexed unless
+        ``replace`` is set, are skipped: re-adding a flushed document would
+        only mark its on-disk copy deleted until the next merge.
+        """
+        pages: asyncio.Queue = asyncio.Queue(maxsize=self.prefetch_pages)
+
+        async def produce() -> None:
+            checkpoint = committed.get(source.name)
+            if hasattr(source, "rewind"):
+                checkpoint = source.rewind(checkpoint)
+            try:
+                exhausted = False
+                while not exhausted:
+                    documents, checkpoint, exhausted = await source.fetch_page(checkpoint)
+                    await pages.put((documents, checkpoint))
+            except Exception as e:
+                # Raised by the consumer after the pages already fetched are indexed
+                await pages.put(e)
+                return
+            await pages.put(None)
+
+        producer = asyncio.ensure_future(produce())
+        loop = asyncio.get_event_loop()
+        stats = {"documents": 0, "pages": 0}
+        since_flush = 0
+        try:
+            while True:
+                page = await pages.get()
+                if page is None:
+                    break
+                if isinstance(page, Exception):
+                    raise page
+                documents, checkpoint = page
+                documents = [
+                    document for document in documents
+                    if document[0] not in streamed
+                    and (replace or not self.backend.has_document(document[0]))
+                ]
+                streamed.update(doc_id for doc_id, _, _ in documents)
+                if documents:
+                    texts = [text for _, text, _ in documents]
+                    if pool is not None:
+                        counted = await loop.run_in_executor(pool, tokenize_batch, texts)
+                    else:
+                        counted = tokenize_batch(texts)
+                    for (doc_id, text, metadata), (frequencies, length) in zip(documents, counted):
+                        self.backend.add_tokenized_document(doc_id, text, frequencies, length, metadata)
+                    stats["documents"] += len(documents)
+                    since_flush += len(documents)
+                stats["pages"] += 1
+                committed[source.name] = checkpoint
+
+                if since_flush >= self.backend.flush_threshold:
+                    await self._checkpoint(committed)
+                    since_flush = 0
+        finally:
+            if not producer.done():
+                producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+        return stats
+
+    def start(self, interval_seconds: float = TEXT_INDEXER_INTERVAL) -> None:
+        """
+        Catch up in the background, then every ``interval_seconds`` (0 = once).
+
+        Requires a running event loop.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_loop(interval_seconds))
+
+    async def _run_loop(self, interval_seconds: float) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                search_logger.warning(f"Text index catch-up failed: {e}")
+            if interval_seconds <= 0:
+                return
+            await asyncio.sleep(interval_seconds)
+
+    async def stop(self) -> None:
+        """Cancel the background loop and shut down the tokenizer pool."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._shutdown_pool()
+    
+    def _shutdown_pool(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "checkpoints": dict(self.checkpoints), "running": self._task is not None}
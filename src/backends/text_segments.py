@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+Immutable on-disk segments for the BM25 text index.
+
+A segment is a single file holding a term dictionary, postings lists,
+document lengths and stored fields for a fixed set of documents. Segments are
+opened with mmap, so opening one is O(1) regardless of its size and the pages
+are shared through the OS page cache by every worker process that maps the
+same file. Deletions never rewrite a segment; they are recorded as deleted
+ordinals in the index manifest and dropped when segments are merged.
+
+Several processes may write to the same index directory. Segment files get
+unique names and are written without coordination; every change to the
+manifest (and the removal of merged segment files) happens under an
+exclusive ``flock`` on LOCK_NAME, after re-reading the manifest so changes
+made by other processes are kept. Readers take the lock shared while they
+open the segments a manifest lists.
+
+File layout (little-endian, every section 8-byte aligned)::
+
+    header        magic, version, counts, total length, section offsets
+    term table    term_count x (term_offset u64, term_len u32, df u32, postings_offset u64)
+    term blob     utf-8 terms, sorted bytewise
+    postings      per term: df x ordinal u32, then df x tf u32
+    doc lengths   doc_count x u32
+    doc table     doc_count x (id_offset u64, id_len u32, stored_offset u64, stored_len u32)
+    id blob       utf-8 doc ids, sorted bytewise (ordinal = position)
+    stored blob   JSON {"text": ..., "metadata": ...} per document
+"""
+
+import bisect
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import IO, Any, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX hosts run a single process
+    fcntl = None
+
+MAGIC = b"VBM25SEG"
+FORMAT_VERSION = 1
+MANIFEST_NAME = "segments.json"
+LOCK_NAME = "segments.lock"
+
+_HEADER = struct.Struct("<8sIIIQ7Q")
+_TERM_ENTRY = struct.Struct("<QIIQ")
+_DOC_ENTRY = struct.Struct("<QIQI")
+
+# (doc_id, token_frequencies, doc_length, text, metadata)
+SegmentDocument = Tuple[str, Dict[str, int], int, str, Dict[str, Any]]
+
+
+class SegmentFormatError(Exception):
+    """Raised when a segment file is missing, truncated or of an unknown format."""
+
+
+def _u32_array(values: Iterable[int]) -> array:
+    """Build a little-endian uint32 array."""
+    data = array("I", values)
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data
+
+
+def _pad(buffer: bytearray) -> None:
+    """Pad a buffer to the next 8-byte boundary."""
+    buffer.extend(b"\0" * (-len(buffer) % 8))
+
+
+def write_segment(path: str, documents: Iterable[SegmentDocument]) -> int:
+    """
+    Write an immutable segment file.
+
+    The file is written to a temporary name, fsynced and renamed into place,
+    so a crash never leaves a partial segment behind.
+
+    Args:
+        path: Destination file path
+        documents: Documents to store; doc_ids must be unique
+
+    Returns:
+        Number of documents written
+    """
+    docs = sorted(documents, key=lambda doc: doc[0].encode("utf-8"))
+
+    postings: Dict[str, Tuple[List[int], List[int]]] = {}
+    for ordinal, (_, token_frequencies, _, _, _) in enumerate(docs):
+        for term, tf in token_frequencies.items():
+            entry = postings.get(term)
+            if entry is None:
+                entry = postings[term] = ([], [])
+            entry[0].append(ordinal)
+            entry[1].append(tf)
+
+    terms = sorted(postings, key=lambda term: term.encode("utf-8"))
+
+    term_blob = bytearray()
+    postings_blob = bytearray()
+    term_table = bytearray()
+    for term in terms:
+        encoded = term.encode("utf-8")
+        ordinals, tfs = postings[term]
+        term_table += _TERM_ENTRY.pack(len(term_blob), len(encoded), len(ordinals), len(postings_blob))
+        term_blob += encoded
+        postings_blob += _u32_array(ordinals).tobytes()
+        postings_blob += _u32_array(tfs).tobytes()
+
+    id_blob = bytearray()
+    stored_blob = bytearray()
+    doc_table = bytearray()
+    for doc_id, _, _, text, metadata in docs:
+        encoded_id = doc_id.encode("utf-8")
+        stored = json.dumps({"text": text, "metadata": metadata}, default=str).encode("utf-8")
+        doc_table += _DOC_ENTRY.pack(len(id_blob), len(encoded_id), len(stored_blob), len(stored))
+        id_blob += encoded_id
+        stored_blob += stored
+    doc_lengths = _u32_array(doc[2] for doc in docs).tobytes()
+
+    body = bytearray()
+    offsets = []
+    for section in (term_table, term_blob, postings_blob, doc_lengths, doc_table, id_blob, stored_blob):
+        offsets.append(_HEADER.size + len(body))
+        body += section
+        _pad(body)
+
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, len(docs), len(terms),
+        sum(doc[2] for doc in docs), *offsets
+    )
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(body)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return len(docs)
+
+
+class Segment:
+    """
+    Read-only, memory-mapped view of a segment file.
+
+    Postings and document lengths are exposed as zero-copy uint32 views over
+    the mapping; doc ids and stored fields are decoded on demand.
+    """
+
+    def __init__(self, path: str, deleted: Optional[Iterable[int]] = None):
+        """
+        Open a segment.
+
+        Args:
+            path: Segment file path
+            deleted: Ordinals already marked deleted in the manifest
+
+        Raises:
+            SegmentFormatError: If the file is not a valid segment
+        """
+        if sys.byteorder == "big":
+            raise SegmentFormatError("Segments are little-endian; big-endian hosts are not supported")
+
+        self.path = path
+        self.name = os.path.basename(path)
+        try:
+            self._file = open(path, "rb")
+        except OSError as e:
+            raise SegmentFormatError(f"Cannot open segment {path}: {e}")
+
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(self._mmap) < _HEADER.size:
+                raise SegmentFormatError(f"Segment {path} is truncated")
+
+            (magic, version, self.doc_count, self.term_count,
+             self.total_doc_length, *self._offsets) = _HEADER.unpack_from(self._mmap, 0)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise SegmentFormatError(f"Segment {path} has unknown format {magic!r} v{version}")
+        except (ValueError, SegmentFormatError):
+            self._file.close()
+            raise
+
+        (self._term_table, self._term_blob, self._postings, doc_lengths,
+         self._doc_table, self._id_blob, self._stored_blob) = self._offsets
+        self._view = memoryview(self._mmap)
+        self.doc_lengths = self._view[doc_lengths:doc_lengths + 4 * self.doc_count].cast("I")
+
+        self.deleted: Set[int] = set()
+        self.live_doc_length = self.total_doc_length
+        for ordinal in deleted or ():
+            self.delete(ordinal)
+
+    @property
+    def live_doc_count(self) -> int:
+        """Number of documents not marked deleted."""
+        return self.doc_count - len(self.deleted)
+
+    def delete(self, ordinal: int) -> bool:
+        """Mark a document deleted; returns False if it already was."""
+        if ordinal in self.deleted or not 0 <= ordinal < self.doc_count:
+            return False
+        self.deleted.add(ordinal)
+        self.live_doc_length -= self.doc_lengths[ordinal]
+        return True
+
+    def _term(self, index: int) -> bytes:
+        offset, length, _, _ = _TERM_ENTRY.unpack_from(self._mmap, self._term_table + index * _TERM_ENTRY.size)
+        start = self._term_blob + offset
+        return self._mmap[start:start + length]
+
+    def _find_term(self, term: str) -> Optional[Tuple[int, int]]:
+        """Binary search the term dictionary; returns (df, postings_offset)."""
+        target = term.encode("utf-8")
+        lo, hi = 0, self.term_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.term_count and self._term(lo) == target:
+            _, _, df, postings_offset = _TERM_ENTRY.unpack_from(
+                self._mmap, self._term_table + lo * _TERM_ENTRY.size
+            )
+            return df, postings_offset
+        return None
+
+    def doc_frequency(self, term: str) -> int:
+        """Number of live documents in this segment containing the term."""
+        found = self._find_term(term)
+        if found is None:
+            return 0
+        df = found[0]
+        if not self.deleted:
+            return df
+
+        ordinals, tfs = self.postings(term)
+        try:
+            deleted = 0
+            if len(self.deleted) < df:
+                for ordinal in self.deleted:
+                    i = bisect.bisect_left(ordinals, ordinal)
+                    if i < df and ordinals[i] == ordinal:
+                        deleted += 1
+            else:
+                deleted = sum(1 for ordinal in ordinals if ordinal in self.deleted)
+        finally:
+            ordinals.release()
+            tfs.release()
+        return df - deleted
+
+    def postings(self, term: str) -> Optional[Tuple[memoryview, memoryview]]:
+        """
+        Get the postings for a term.
+
+        Returns:
+            (ordinals, term_frequencies) uint32 views sorted by ordinal, or None
+        """
+        found = self._find_term(term)
+        if found is None:
+            return None
+        df, postings_offset = found
+        start = self._postings + postings_offset
+        ordinals = self._view[start:start + 4 * df].cast("I")
+        tfs = self._view[start + 4 * df:start + 8 * df].cast("I")
+        return ordinals, tfs
+
+    def accumulate(
+        self,
+        term: str,
+        weight: float,
+        accumulator: Dict[int, float],
+        existing_only: bool,
+        base: float,
+        length_factor: float
+    ) -> None:
+        """
+        Add one term's BM25 contribution to a per-segment accumulator.
+
+        Args:
+            term: Query term
+            weight: idf * query count * (k1 + 1)
+            accumulator: Ordinal -> partial score
+            existing_only: Only update ordinals already in the accumulator
+            base: k1 * (1 - b)
+            length_factor: k1 * b / average document length
+        """
+        found = self.postings(term)
+        if found is None:
+            return
+        ordinals, tfs = found
+        doc_lengths = self.doc_lengths
+        deleted = self.deleted
+
+        if existing_only and len(accumulator) < len(ordinals):
+            for ordinal in list(accumulator):
+                i = bisect.bisect_left(ordinals, ordinal)
+                if i < len(ordinals) and ordinals[i] == ordinal:
+                    tf = tfs[i]
+                    accumulator[ordinal] += weight * tf / (tf + base + length_factor * doc_lengths[ordinal])
+        else:
+            for ordinal, tf in zip(ordinals, tfs):
+                if ordinal in deleted or (existing_only and ordinal not in accumulator):
+                    continue
+                score = weight * tf / (tf + base + length_factor * doc_lengths[ordinal])
+                accumulator[ordinal] = accumulator.get(ordinal, 0.0) + score
+
+        ordinals.release()
+        tfs.release()
+
+    def doc_id(self, ordinal: int) -> str:
+        """Decode the doc id stored at an ordinal."""
+        id_offset, id_len, _, _ = _DOC_ENTRY.unpack_from(self._mmap, self._doc_table + ordinal * _DOC_ENTRY.size)
+        start = self._id_blob + id_offset
+        return self._mmap[start:start + id_len].decode("utf-8")
+
+    def find_doc(self, doc_id: str) -> Optional[int]:
+        """Binary search a doc id; returns its ordinal or None (deleted docs included)."""
+        target = doc_id.encode("utf-8")
+        lo, hi = 0, self.doc_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            id_offset, id_len, _, _ = _DOC_ENTRY.unpack_from(self._mmap, self._doc_table + mid * _DOC_ENTRY.size)
+            start = self._id_blob + id_offset
+            if self._mmap[start:start + id_len] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.doc_count and self.doc_id(lo) == doc_id:
+            return lo
+        return None
+
+    def stored_fields(self, ordinal: int) -> Tuple[str, Dict[str, Any]]:
+        """Decode the stored text and metadata of a document."""
+        _, _, stored_offset, stored_len = _DOC_ENTRY.unpack_from(
+            self._mmap, self._doc_table + ordinal * _DOC_ENTRY.size
+        )
+        start = self._stored_blob + stored_offset
+        stored = json.loads(self._mmap[start:start + stored_len])
+        return stored["text"], stored["metadata"]
+
+    def live_ordinals(self) -> Iterable[int]:
+        """Iterate ordinals of documents not marked deleted."""
+        return (ordinal for ordinal in range(self.doc_count) if ordinal not in self.deleted)
+
+    def close(self) -> None:
+        """Unmap and close the segment file."""
+        self.doc_lengths.release()
+        self._view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # A caller still holds a postings view; the mapping is released with it
+            pass
+        self._file.close()
+
+
+def lock_index(index_dir: str, shared: bool = False, blocking: bool = True) -> Optional[IO]:
+    """
+    Take the inter-process lock of an index directory.
+
+    Args:
+        index_dir: Index directory
+        shared: Take a shared (reader) lock instead of an exclusive one
+        blocking: Wait for the lock; otherwise return None if it is held
+
+    Returns:
+        Handle to pass to unlock_index, or None if not blocking and busy
+    """
+    handle = open(os.path.join(index_dir, LOCK_NAME), "a+")
+    if fcntl is not None:
+        flags = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+        if not blocking:
+            flags |= fcntl.LOCK_NB
+        try:
+            fcntl.flock(handle.fileno(), flags)
+        except BlockingIOError:
+            handle.close()
+            return None
+    return handle
+
+
+def unlock_index(handle: IO) -> None:
+    """Release a lock taken with lock_index."""
+    if fcntl is not None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+    handle.close()
+
+
+def manifest_mtime(index_dir: str) -> Optional[int]:
+    """Modification time of the manifest in nanoseconds, or None if there is none."""
+    try:
+        return os.stat(os.path.join(index_dir, MANIFEST_NAME)).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def read_manifest(index_dir: str) -> Dict[str, Any]:
+    """Read the segment manifest, returning an empty one if none exists."""
+    path = os.path.join(index_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {"version": FORMAT_VERSION, "generation": 0, "segments": []}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def write_manifest(index_dir: str, generation: int, segments: List[Segment]) -> None:
+    """Atomically replace the segment manifest."""
+    manifest = {
+        "version": FORMAT_VERSION,
+        "generation": generation,
+        "segments": [
+            {"name": segment.name, "deleted": sorted(segment.deleted)}
+            for segment in segments
+        ]
+    }
+    path = os.path.join(index_dir, MANIFEST_NAME)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
@@ -17,6 +17,7 @@ from ..interfaces.backend_interface import (
     BackendSearchInterface,
     SearchOptions,
 )
+from ..core.storage_executor import run_storage_call
 from ..interfaces.memory_result import ContentType, MemoryResult, ResultSource
 from ..utils.logging_middleware import backend_logger, log_backend_timing
 
@@ -152,6 +153,52 @@ class VectorBackend(BackendSearchInterface):
                 backend_logger.error(error_msg, error=str(e))
                 raise BackendSearchError(self.backend_name, error_msg, e)
 
+    async def search_many(
+        self, queries: List[str], options: SearchOptions
+    ) -> List[List[MemoryResult]]:
+        """
+        Search several queries with one embedding batch and one Qdrant request.
+
+        Used by multi-query expansion so that paraphrases of a query cost one
+        embedding call and one vector round trip instead of one of each per
+        paraphrase.
+
+        Args:
+            queries: Query texts to search
+            options: Search configuration options, applied to every query
+
+        Returns:
+            One list of MemoryResult objects per query, in input order
+
+        Raises:
+            BackendSearchError: If vector search operation fails
+        """
+        async with log_backend_timing(self.backend_name, "search_many", backend_logger) as metadata:
+            try:
+                embed_start = time.time()
+                query_vectors = await self._generate_query_embeddings(queries)
+                metadata["embedding_time_ms"] = (time.time() - embed_start) * 1000
+                metadata["query_count"] = len(queries)
+
+                search_start = time.time()
+                raw_batches = await self._perform_vector_search_batch(query_vectors, options)
+                metadata["search_time_ms"] = (time.time() - search_start) * 1000
+
+                results = [
+                    self._apply_filters(self._convert_to_memory_results(raw_results), options)
+                    for raw_results in raw_batches
+                ]
+
+                metadata["result_count"] = sum(len(r) for r in results)
+                backend_logger.info("Vector multi-query search completed", **metadata)
+
+                return results
+
+            except Exception as e:
+                error_msg = f"Vector multi-query search failed: {str(e)}"
+                backend_logger.error(error_msg, error=str(e))
+                raise BackendSearchError(self.backend_name, error_msg, e)
+
     async def health_check(self) -> BackendHealthStatus:
         """
         Check the health of the vector backend.
@@ -163,7 +210,9 @@ class VectorBackend(BackendSearchInterface):
 
         try:
             # Test basic connectivity
-            collections = self.client.get_collections()
+            collections = await run_storage_call(
+                self.client.get_collections, operation="qdrant.get_collections"
+            )
             response_time = (time.time() - start_time) * 1000
 
             # Check if our collection exists
@@ -223,7 +272,11 @@ class VectorBackend(BackendSearchInterface):
         try:
             # Ensure collection exists
             if hasattr(self.client, "create_collection"):
-                self.client.create_collection(force=False)  # Don't overwrite existing
+                await run_storage_call(
+                    self.client.create_collection,
+                    force=False,  # Don't overwrite existing
+                    operation="qdrant.create_collection",
+                )
 
             # Test embedding service
             await self._generate_query_embedding("initialization test")
@@ -262,16 +315,61 @@ class VectorBackend(BackendSearchInterface):
             backend_logger.error(f"Embedding generation failed: {e}")
             raise
 
+    async def _generate_query_embeddings(self, queries: List[str]) -> List[List[float]]:
+        """Generate embeddings for several queries, in one batch when supported."""
+        if not self.embedding_generator:
+            raise ValueError("No embedding generator available")
+
+        for method_name in ("generate_batch_embeddings", "generate_embeddings"):
+            batch_method = getattr(self.embedding_generator, method_name, None)
+            if batch_method is not None and asyncio.iscoroutinefunction(batch_method):
+                try:
+                    return await batch_method(queries)
+                except Exception as e:
+                    backend_logger.warning(f"Batch query embedding failed, embedding one by one: {e}")
+                    break
+
+        return [await self._generate_query_embedding(query) for query in queries]
+
+    async def _perform_vector_search_batch(
+        self, query_vectors: List[List[float]], options: SearchOptions
+    ) -> List[List[Any]]:
+        """Search several vectors in one request, falling back to one call each."""
+        if hasattr(self.client, "search_batch"):
+            batches = await run_storage_call(
+                self.client.search_batch,
+                query_vectors=query_vectors,
+                limit=options.limit,
+                filter_dict=None,
+                operation="qdrant.search_batch",
+            )
+            if options.score_threshold > 0:
+                batches = [
+                    [r for r in results if self._result_score(r) >= options.score_threshold]
+                    for results in batches
+                ]
+            return batches
+
+        return await asyncio.gather(
+            *(self._perform_vector_search(vector, options) for vector in query_vectors)
+        )
+
+    @staticmethod
+    def _result_score(result: Any) -> float:
+        return result.get("score", 0.0) if isinstance(result, dict) else getattr(result, "score", 0.0)
+
     async def _perform_vector_search(
         self, query_vector: List[float], options: SearchOptions
     ) -> List[Any]:
         """Perform the actual vector search operation."""
         try:
             # Call VectorDBInitializer.search() using correct method signature
-            results = self.client.search(
+            results = await run_storage_call(
+                self.client.search,
                 query_vector=query_vector,
                 limit=options.limit,
                 filter_dict=None,  # Use VectorDBInitializer signature
+                operation="qdrant.search",
             )
 
             # Apply score threshold manually since VectorDBInitializer doesn't support it
@@ -13,19 +13,19 @@ import re
 
 # Try absolute imports first, fall back to relative
 try:
-    from .intent_classifier import IntentClassifier, IntentType
+    from .intent_classifier import IntentClassifier, IntentResult, IntentType
     from .query_rewriter import FactQueryRewriter
     from ..storage.graph_enhancer import EntityExtractor, GraphSignalEnhancer
     from ..storage.neo4j_client import Neo4jInitializer
 except ImportError:
     try:
-        from intent_classifier import IntentClassifier, IntentType
+        from intent_classifier import IntentClassifier, IntentResult, IntentType
         from query_rewriter import FactQueryRewriter
         from storage.graph_enhancer import EntityExtractor, GraphSignalEnhancer
         from storage.neo4j_client import Neo4jInitializer
     except ImportError:
         # For test scripts - import from full paths
-        from core.intent_classifier import IntentClassifier, IntentType
+        from core.intent_classifier import IntentClassifier, IntentResult, IntentType
         from core.query_rewriter import FactQueryRewriter
         from storage.graph_enhancer import EntityExtractor, GraphSignalEnhancer
         from storage.neo4j_client import Neo4jInitializer
@@ -96,19 +96,22 @@ class GraphQueryExpander:
             'HAS_FACT_RELATION': ['related facts', 'connected information']
         }
     
-    def expand_query(self, query: str, strategy: Optional[ExpansionStrategy] = None) -> QueryExpansionResult:
+    def expand_query(self, query: str, strategy: Optional[ExpansionStrategy] = None,
+                     intent_result: Optional[IntentResult] = None) -> QueryExpansionResult:
         """
         Expand query using graph-enhanced understanding.
         
         Args:
             query: Original query text
             strategy: Expansion strategy to use (auto-selected if None)
+            intent_result: Intent already classified for this query, if any
             
         Returns:
             QueryExpansionResult with expanded queries and metadata
         """
-        # Classify intent and extract entities
-        intent_result = self.intent_classifier.classify(query)
+        # Classify intent (unless the caller already did) and extract entities
+        if intent_result is None:
+            intent_result = self.intent_classifier.classify(query)
         entities = self.entity_extractor.extract_entities(query)
         
         # Select expansion strategy if not provided
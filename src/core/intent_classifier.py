@@ -31,6 +31,17 @@ class IntentResult:
     reasoning: str = ""
 
 
+class _PatternGroup:
+    """Compiled (pattern, attribute, confidence) list with a combined prefilter."""
+
+    def __init__(self, patterns: List[Tuple[str, str, float]], compiled: List[Tuple]):
+        self.any_match = re.compile(
+            "|".join(f"(?:{pattern})" for pattern, _, _ in patterns), re.IGNORECASE
+        )
+        # Stable sort keeps the earliest pattern first among equal confidences
+        self.ranked = sorted(compiled, key=lambda entry: -entry[2])
+
+
 class IntentClassifier:
     """
     Lightweight intent detector for fact vs. general queries.
@@ -128,6 +139,13 @@ class IntentClassifier:
         self._compiled_update = [(re.compile(pattern, re.IGNORECASE), attr, conf) 
                                 for pattern, attr, conf in self.update_patterns]
 
+        # One alternation per group rejects non-matching queries in a single scan
+        self._groups = {
+            IntentType.UPDATE_FACT: _PatternGroup(self.update_patterns, self._compiled_update),
+            IntentType.STORE_FACT: _PatternGroup(self.fact_storage_patterns, self._compiled_storage),
+            IntentType.FACT_LOOKUP: _PatternGroup(self.fact_lookup_patterns, self._compiled_lookup),
+        }
+
     def classify(self, query: str) -> IntentResult:
         """
         Classify query intent and extract relevant attributes.
@@ -147,20 +165,11 @@ class IntentClassifier:
 
         query = query.strip()
         
-        # Check for update/correction patterns first
-        update_result = self._check_patterns(query, self._compiled_update, IntentType.UPDATE_FACT)
-        if update_result.confidence > 0.7:
-            return update_result
-
-        # Check for fact storage patterns
-        storage_result = self._check_patterns(query, self._compiled_storage, IntentType.STORE_FACT)
-        if storage_result.confidence > 0.7:
-            return storage_result
-
-        # Check for fact lookup patterns
-        lookup_result = self._check_patterns(query, self._compiled_lookup, IntentType.FACT_LOOKUP)
-        if lookup_result.confidence > 0.7:
-            return lookup_result
+        # Check update/correction, then fact storage, then fact lookup patterns
+        for intent_type, group in self._groups.items():
+            result = self._check_group(query, group, intent_type)
+            if result.confidence > 0.7:
+                return result
 
         # Default to general query
         return IntentResult(
@@ -169,6 +178,25 @@ class IntentClassifier:
             reasoning="No fact patterns matched"
         )
 
+    def _check_group(self, query: str, group: "_PatternGroup", intent_type: IntentType) -> IntentResult:
+        """Same result as _check_patterns, from the group's prefilter and ranked patterns."""
+        if group.any_match.search(query):
+            # Ranked by descending confidence, so the first hit is the best match
+            for pattern, attribute, confidence in group.ranked:
+                if pattern.search(query):
+                    return IntentResult(
+                        intent=intent_type,
+                        confidence=confidence,
+                        attribute=attribute,
+                        reasoning=f"Matched pattern for {attribute}"
+                    )
+
+        return IntentResult(
+            intent=IntentType.GENERAL_QUERY,
+            confidence=0.0,
+            reasoning="No patterns matched"
+        )
+
     def _check_patterns(self, query: str, patterns: List[Tuple], intent_type: IntentType) -> IntentResult:
         """Check query against a set of compiled patterns."""
         best_match = None
@@ -220,9 +248,9 @@ class IntentClassifier:
             return None
 
         # Try to extract the value using the same patterns
-        for pattern, attribute, confidence in self.fact_storage_patterns:
+        for pattern, attribute, confidence in self._compiled_storage:
             if attribute == result.attribute:
-                match = re.search(pattern, statement, re.IGNORECASE)
+                match = pattern.search(statement)
                 if match and len(match.groups()) > 0:
                     value = match.group(1).strip()
                     return (attribute, value)
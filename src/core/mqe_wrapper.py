@@ -27,6 +27,7 @@ class MQEConfig:
     num_paraphrases: int = 2
     apply_field_boosts: bool = True
     parallel_search: bool = True
+    batched_search: bool = True  # Use a multi-query search function when one is given
     max_concurrent_searches: int = 3
     aggregation_strategy: str = "max_score"  # "max_score", "average", "weighted"
     metrics_enabled: bool = True
@@ -71,6 +72,7 @@ class MQERetrievalWrapper:
                 enabled=os.getenv("MQE_ENABLED", "true").lower() == "true",
                 num_paraphrases=int(os.getenv("MQE_NUM_PARAPHRASES", "2")),
                 apply_field_boosts=os.getenv("MQE_APPLY_FIELD_BOOSTS", "true").lower() == "true",
+                batched_search=os.getenv("MQE_BATCHED_SEARCH", "true").lower() == "true",
             )
 
         self.config = config
@@ -79,6 +81,7 @@ class MQERetrievalWrapper:
         self._metrics = {
             "total_searches": 0,
             "mq_searches": 0,
+            "batched_searches": 0,
             "single_query_fallbacks": 0,
             "average_paraphrases_used": 0.0,
             "average_unique_docs": 0.0,
@@ -117,6 +120,9 @@ class MQERetrievalWrapper:
         query: str,
         search_func: Callable[[str, int], Awaitable[List[Dict[str, Any]]]],
         limit: int = 10,
+        multi_search_func: Optional[
+            Callable[[List[str], int], Awaitable[List[List[Dict[str, Any]]]]]
+        ] = None,
     ) -> MQESearchResult:
         """
         Execute search with multi-query expansion.
@@ -125,6 +131,9 @@ class MQERetrievalWrapper:
             query: Original search query
             search_func: Async function to perform a single search (query, limit) -> results
             limit: Maximum number of results to return
+            multi_search_func: Optional async function searching all paraphrases at
+                once (queries, limit) -> one result list per query. Used instead of
+                per-paraphrase searches when config.batched_search is set.
 
         Returns:
             MQESearchResult with aggregated results and metadata
@@ -146,8 +155,11 @@ class MQERetrievalWrapper:
                 f"Generated {len(paraphrases)} paraphrases for query: {query[:50]}..."
             )
 
-            # Execute searches (parallel or sequential)
-            if self.config.parallel_search:
+            # Execute searches (batched, parallel or sequential)
+            if multi_search_func is not None and self.config.batched_search:
+                all_results = await multi_search_func(paraphrases, limit)
+                self._metrics["batched_searches"] += 1
+            elif self.config.parallel_search:
                 all_results = await self._parallel_search(paraphrases, search_func, limit)
             else:
                 all_results = await self._sequential_search(paraphrases, search_func, limit)
@@ -367,6 +379,7 @@ class MQERetrievalWrapper:
                 "num_paraphrases": self.config.num_paraphrases,
                 "apply_field_boosts": self.config.apply_field_boosts,
                 "parallel_search": self.config.parallel_search,
+                "batched_search": self.config.batched_search,
                 "aggregation_strategy": self.config.aggregation_strategy,
             },
             "components_available": self.is_available,
@@ -377,6 +390,7 @@ class MQERetrievalWrapper:
         self._metrics = {
             "total_searches": 0,
             "mq_searches": 0,
+            "batched_searches": 0,
             "single_query_fallbacks": 0,
             "average_paraphrases_used": 0.0,
             "average_unique_docs": 0.0,
@@ -0,0 +1,198 @@
+"""
+Per-stage timing spans for the retrieval pipeline.
+
+RetrievalCore.search opens one ``PipelineTrace`` per request and wraps each
+stage (normalization, result cache, HyDE, MQE, dispatch, cross-encoder
+rerank, search enhancements) in ``trace.span(stage)``. Every span:
+
+- carries the request trace_id (the same one the structured loggers use),
+- is mirrored as an OpenTelemetry span when the API is installed, so an
+  exporter configured elsewhere sees the stages nested under the request,
+- is observed into a process-wide fixed-bucket histogram per stage, which
+  /metrics exports in Prometheus format.
+
+Recording a span costs two perf_counter calls, a bisect and a few counter
+increments, so it stays on in production. Per-request span logs are opt-in
+(PIPELINE_SPAN_LOGGING), and the per-stage totals only reach the response
+when the caller asks for debug output.
+"""
+
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from ..utils.logging_middleware import get_current_trace_id, search_logger
+
+try:
+    from opentelemetry import trace as otel_trace
+
+    _tracer = otel_trace.get_tracer(__name__)
+except ImportError:
+    _tracer = None
+
+PIPELINE_SPAN_LOGGING = os.getenv("PIPELINE_SPAN_LOGGING", "false").lower() == "true"
+
+# Upper bounds (ms) of the histogram buckets; +Inf is implicit
+STAGE_BUCKETS_MS: Sequence[float] = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+TOTAL_STAGE = "total"
+
+
+class StageHistograms:
+    """Cumulative latency histograms per pipeline stage."""
+
+    def __init__(self, buckets_ms: Sequence[float] = STAGE_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self._counts: Dict[str, List[int]] = {}
+        self._sums: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, duration_ms: float) -> None:
+        """Record one stage duration."""
+        index = bisect.bisect_left(self.buckets_ms, duration_ms)
+        with self._lock:
+            counts = self._counts.get(stage)
+            if counts is None:
+                counts = self._counts[stage] = [0] * (len(self.buckets_ms) + 1)
+                self._sums[stage] = 0.0
+            counts[index] += 1
+            self._sums[stage] += duration_ms
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage cumulative bucket counts, total count and sum."""
+        with self._lock:
+            counts = {stage: list(values) for stage, values in self._counts.items()}
+            sums = dict(self._sums)
+        snapshot = {}
+        for stage, values in counts.items():
+            cumulative, running = [], 0
+            for value in values:
+                running += value
+                cumulative.append(running)
+            snapshot[stage] = {
+                "buckets": dict(zip([*map(_format_bound, self.buckets_ms), "+Inf"], cumulative)),
+                "count": running,
+                "sum_ms": sums[stage],
+            }
+        return snapshot
+
+    def prometheus_lines(self, metric: str = "veris_memory_retrieval_stage_duration_ms") -> List[str]:
+        """Render the histograms in Prometheus text format (empty until a stage is observed)."""
+        snapshot = self.snapshot()
+        if not snapshot:
+            return []
+        lines = [
+            f"# HELP {metric} Retrieval pipeline stage duration in milliseconds",
+            f"# TYPE {metric} histogram",
+        ]
+        for stage, data in sorted(snapshot.items()):
+            for bound, count in data["buckets"].items():
+                lines.append(f'{metric}_bucket{{stage="{stage}",le="{bound}"}} {count}')
+            lines.append(f'{metric}_sum{{stage="{stage}"}} {data["sum_ms"]:.3f}')
+            lines.append(f'{metric}_count{{stage="{stage}"}} {data["count"]}')
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._sums.clear()
+
+
+def _format_bound(bound: float) -> str:
+    return f"{bound:g}"
+
+
+class PipelineTrace:
+    """Timed spans for one retrieval request."""
+
+    __slots__ = ("trace_id", "histograms", "spans", "_start")
+
+    def __init__(self, trace_id: Optional[str] = None, histograms: Optional[StageHistograms] = None):
+        """
+        Args:
+            trace_id: Request trace identifier (defaults to the logging trace id)
+            histograms: Histograms to observe into (defaults to the global ones)
+        """
+        self.trace_id = trace_id or get_current_trace_id()
+        self.histograms = histograms if histograms is not None else get_stage_histograms()
+        self.spans: List[Dict[str, Any]] = []
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def span(self, stage: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Time a stage. Yields a dict for attributes discovered while it runs.
+
+        The span is recorded even if the stage raises.
+        """
+        start = time.perf_counter()
+        otel_span = None
+        otel_context = _tracer.start_as_current_span(f"retrieval.{stage}") if _tracer else None
+        if otel_context is not None:
+            otel_span = otel_context.__enter__()
+        try:
+            yield attributes
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            self.spans.append({
+                "stage": stage,
+                "start_ms": round((start - self._start) * 1000, 3),
+                "duration_ms": round(duration_ms, 3),
+                **({"attributes": attributes} if attributes else {}),
+            })
+            self.histograms.observe(stage, duration_ms)
+            if otel_context is not None:
+                otel_span.set_attribute("veris.trace_id", self.trace_id)
+                for key, value in attributes.items():
+                    if isinstance(value, (str, bool, int, float)):
+                        otel_span.set_attribute(f"veris.{key}", value)
+                otel_context.__exit__(None, None, None)
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+    def stage_totals(self) -> Dict[str, float]:
+        """Total milliseconds per stage (stages can run more than once), plus the request total."""
+        totals: Dict[str, float] = {}
+        for span in self.spans:
+            totals[span["stage"]] = round(totals.get(span["stage"], 0.0) + span["duration_ms"], 3)
+        totals[TOTAL_STAGE] = round(self.elapsed_ms, 3)
+        return totals
+
+    def finish(self) -> Dict[str, float]:
+        """Observe the request total, log spans if enabled, and return the stage totals."""
+        totals = self.stage_totals()
+        self.histograms.observe(TOTAL_STAGE, totals[TOTAL_STAGE])
+        if PIPELINE_SPAN_LOGGING:
+            search_logger.info(
+                "Retrieval pipeline spans",
+                trace_id=self.trace_id,
+                duration_ms=totals[TOTAL_STAGE],
+                spans=self.spans,
+            )
+        return totals
+
+
+_stage_histograms: Optional[StageHistograms] = None
+_stage_histograms_lock = threading.Lock()
+
+
+def get_stage_histograms() -> StageHistograms:
+    """Get or create the global per-stage histograms."""
+    global _stage_histograms
+    if _stage_histograms is None:
+        with _stage_histograms_lock:
+            if _stage_histograms is None:
+                _stage_histograms = StageHistograms()
+    return _stage_histograms
+
+
+def reset_stage_histograms() -> None:
+    """Reset the global histograms (useful for testing)."""
+    global _stage_histograms
+    with _stage_histograms_lock:
+        _stage_histograms = None
@@ -0,0 +1,129 @@
+"""
+Single query-analysis stage for the retrieval path.
+
+Fact intent, semantic normalization, technical-ness and code-likeness were
+each derived by separate components re-reading the raw query at different
+points of a request. QueryAnalyzer.analyze runs them once, up front, on the
+precompiled pattern sets of IntentClassifier and QueryNormalizer, and later
+stages read the resulting QueryAnalysis instead of re-parsing the query.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from .intent_classifier import IntentClassifier, IntentResult
+from .query_normalizer import NormalizedQuery, QueryNormalizer, get_query_normalizer
+
+try:
+    from ..mcp_server.search_enhancements import is_technical_query
+except ImportError:
+    from mcp_server.search_enhancements import is_technical_query
+
+logger = logging.getLogger(__name__)
+
+# Normalized forms below this confidence are not used in place of the query
+NORMALIZATION_MIN_CONFIDENCE = 0.5
+
+_CODE_INDICATORS = [
+    'def ', 'function ', 'class ', 'import ', 'from ',
+    '{', '}', '()', '[]', 'return', 'if __name__',
+    'SELECT', 'INSERT', 'UPDATE', 'DELETE', 'CREATE'
+]
+_CODE_INDICATOR_RE = re.compile("|".join(re.escape(i.lower()) for i in _CODE_INDICATORS))
+
+
+def contains_code_patterns(text: str) -> bool:
+    """Heuristically detect if text contains code (one scan for all indicators)."""
+    return bool(_CODE_INDICATOR_RE.search(text.lower()))
+
+
+@dataclass
+class QueryAnalysis:
+    """Everything the retrieval path derives from the query text."""
+
+    query: str
+    intent: Optional[IntentResult]
+    normalized: Optional[NormalizedQuery]
+    effective_query: str
+    is_technical: bool
+    is_code_like: bool
+
+    @property
+    def normalization_applied(self) -> bool:
+        return self.effective_query != self.query
+
+
+class QueryAnalyzer:
+    """Runs intent classification, normalization and lexical checks in one pass."""
+
+    def __init__(
+        self,
+        intent_classifier: Optional[IntentClassifier] = None,
+        normalizer: Optional[QueryNormalizer] = None,
+    ):
+        """
+        Args:
+            intent_classifier: Fact intent classifier (a new one if None)
+            normalizer: Query normalizer (the global one if None)
+        """
+        self.intent_classifier = intent_classifier or IntentClassifier()
+        self._normalizer = normalizer
+
+    @property
+    def normalizer(self) -> QueryNormalizer:
+        return self._normalizer or get_query_normalizer()
+
+    def analyze(self, query: str, normalize: bool = True, classify: bool = True) -> QueryAnalysis:
+        """
+        Analyze a query once for every later stage.
+
+        Args:
+            query: Raw user query
+            normalize: Map the query to its canonical form when confident
+            classify: Run fact intent classification (intent is None if False)
+
+        Returns:
+            QueryAnalysis; is_technical and is_code_like describe effective_query
+        """
+        intent = self.intent_classifier.classify(query) if classify else None
+
+        normalized = None
+        effective_query = query
+        if normalize:
+            normalized = self.normalizer.normalize(query)
+            if normalized.confidence > NORMALIZATION_MIN_CONFIDENCE and normalized.normalized != query:
+                effective_query = normalized.normalized
+
+        return QueryAnalysis(
+            query=query,
+            intent=intent,
+            normalized=normalized,
+            effective_query=effective_query,
+            is_technical=is_technical_query(effective_query),
+            is_code_like=contains_code_patterns(effective_query),
+        )
+
+
+# Global instance
+_query_analyzer: Optional[QueryAnalyzer] = None
+
+
+def get_query_analyzer() -> QueryAnalyzer:
+    """
+    Get or create the global query analyzer.
+
+    Returns:
+        Global QueryAnalyzer instance
+    """
+    global _query_analyzer
+    if _query_analyzer is None:
+        _query_analyzer = QueryAnalyzer()
+    return _query_analyzer
+
+
+def reset_query_analyzer() -> None:
+    """Reset the global query analyzer (useful for testing)."""
+    global _query_analyzer
+    _query_analyzer = None
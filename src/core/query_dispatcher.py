@@ -7,17 +7,23 @@ across vector, graph, and key-value backends with intelligent result merging.
 """
 
 import asyncio
+import os
 import time
 from typing import List, Dict, Any, Optional, Set, Callable
 from enum import Enum
 
-from ..interfaces.backend_interface import BackendSearchInterface, SearchOptions, BackendSearchError
+from ..interfaces.backend_interface import BackendSearchInterface, SearchOptions, BackendSearchError, BackendTimeoutError
 from ..interfaces.memory_result import MemoryResult, SearchResultResponse, merge_results, sort_results_by_score
 from ..utils.logging_middleware import search_logger, log_backend_timing, TimingCollector
 from ..ranking.policy_engine import RankingPolicyEngine, RankingContext, ranking_engine
 from ..filters.pre_filter import PreFilterEngine, TimeWindowFilter, FilterCriteria, FilterOperator, pre_filter_engine
 
 
+# Default per-backend deadline in milliseconds (unset = wait for every backend)
+_default_timeout_env = os.getenv("DISPATCH_BACKEND_TIMEOUT_MS")
+DEFAULT_BACKEND_TIMEOUT_MS = float(_default_timeout_env) if _default_timeout_env else None
+
+
 class SearchMode(str, Enum):
     """Available search modes for query dispatch."""
     VECTOR = "vector"
@@ -62,6 +68,8 @@ class QueryDispatcher:
         }
         self.default_policy = DispatchPolicy.PARALLEL
         self.timing_collector = TimingCollector()
+        self.default_timeout_ms: Optional[float] = DEFAULT_BACKEND_TIMEOUT_MS
+        self.backend_timeouts: Dict[str, float] = {}
     
     def register_backend(self, name: str, backend: BackendSearchInterface) -> None:
         """
@@ -96,6 +104,21 @@ class QueryDispatcher:
             return True
         return False
     
+    def set_backend_timeout(self, name: str, timeout_ms: Optional[float]) -> None:
+        """
+        Configure the search deadline for a single backend.
+        
+        Args:
+            name: Backend name
+            timeout_ms: Deadline in milliseconds, or None to remove the override
+        """
+        if timeout_ms is None:
+            self.backend_timeouts.pop(name, None)
+        elif timeout_ms <= 0:
+            raise ValueError("timeout_ms must be positive")
+        else:
+            self.backend_timeouts[name] = timeout_ms
+    
     def list_backends(self) -> List[str]:
         """List all registered backend names."""
         return list(self.backends.keys())
@@ -191,6 +214,89 @@ class QueryDispatcher:
                 message=f"HyDE search failed: {str(e)}"
             )
 
+    async def search_expanded(
+        self,
+        queries: List[str],
+        options: SearchOptions,
+        search_mode: SearchMode
+    ) -> tuple[List[List[MemoryResult]], List[str]]:
+        """
+        Search a query together with its paraphrases.
+        
+        The vector backend scores every query from one embedding batch and one
+        Qdrant batch request. The other backends selected by search_mode only
+        run for the original query (queries[0]), since lexical and graph
+        matches barely change between paraphrases.
+        
+        Args:
+            queries: Original query first, followed by its paraphrases
+            options: Search configuration options
+            search_mode: Which backends to use
+            
+        Returns:
+            (per_query, timed_out): one result list per query, the first merged
+            with the non-vector results, and the backends that timed out
+        """
+        if not queries:
+            return [], []
+        
+        trace_id = f"expanded_{int(time.time() * 1000)}"
+        target_backends = self._select_backends(search_mode, queries[0], options)
+        vector_backend = self.backends.get("vector")
+        batch_vector = "vector" in target_backends and hasattr(vector_backend, "search_many")
+        other_backends = [name for name in target_backends if not (batch_vector and name == "vector")]
+        timed_out: List[str] = []
+        
+        async def vector_search() -> List[List[MemoryResult]]:
+            if not batch_vector:
+                return [[] for _ in queries]
+            start_time = time.time()
+            timeout_ms = self._get_backend_timeout("vector", options)
+            search = vector_backend.search_many(queries, options)
+            try:
+                if timeout_ms is None:
+                    results = await search
+                else:
+                    results = await asyncio.wait_for(search, timeout=timeout_ms / 1000)
+            except asyncio.TimeoutError:
+                search_logger.warning(f"Backend vector timed out after {timeout_ms:.0f}ms", trace_id=trace_id)
+                timed_out.append("vector")
+                return [[] for _ in queries]
+            except Exception as e:
+                search_logger.warning(f"Backend vector failed: {e}", trace_id=trace_id)
+                return [[] for _ in queries]
+            self.timing_collector.record_timing(
+                "backend_vector_batch",
+                (time.time() - start_time) * 1000,
+                query_count=len(queries),
+                result_count=sum(len(r) for r in results),
+                trace_id=trace_id
+            )
+            return results
+        
+        async def original_search() -> List[MemoryResult]:
+            if not other_backends:
+                return []
+            all_results, _, _, backends_timed_out = await self._execute_search(
+                queries[0], options, other_backends, DispatchPolicy.PARALLEL, trace_id
+            )
+            timed_out.extend(backends_timed_out)
+            return merge_results(*all_results.values()) if all_results else []
+        
+        per_query, original_results = await asyncio.gather(vector_search(), original_search())
+        per_query = [list(results) for results in per_query]
+        per_query[0] = merge_results(per_query[0], original_results)
+        
+        search_logger.info(
+            "Expanded query dispatch completed",
+            query_count=len(queries),
+            vector_batched=batch_vector,
+            original_only_backends=other_backends,
+            timed_out_backends=timed_out,
+            trace_id=trace_id
+        )
+        return per_query, timed_out
+    
     async def dispatch_query(
         self,
         query: str,
@@ -252,7 +358,7 @@ class QueryDispatcher:
                 )
             
             # Execute search across backends
-            all_results, backend_timings, backends_used = await self._execute_search(
+            all_results, backend_timings, backends_used, timed_out = await self._execute_search(
                 query, options, target_backends, dispatch_policy, trace_id
             )
             
@@ -287,6 +393,7 @@ class QueryDispatcher:
                 f"Query dispatch completed",
                 total_time_ms=total_time,
                 backends_used=list(backends_used),
+                timed_out_backends=timed_out,
                 total_results=len(merged_results),
                 final_results=len(final_results),
                 source_breakdown=source_breakdown,
@@ -303,6 +410,7 @@ class QueryDispatcher:
                 trace_id=trace_id,
                 backend_timings=backend_timings,
                 backends_used=list(backends_used),
+                timed_out_backends=timed_out,
                 source_breakdown=source_breakdown
             )
             
@@ -364,6 +472,8 @@ class QueryDispatcher:
             "registered_backends": self.list_backends(),
             "backend_priorities": self.backend_priorities,
             "default_policy": self.default_policy.value,
+            "default_timeout_ms": self.default_timeout_ms,
+            "backend_timeouts": dict(self.backend_timeouts),
             "ranking_policies": ranking_engine.list_policies(),
             "default_ranking_policy": ranking_engine.default_policy_name
         }
@@ -460,45 +570,46 @@ class QueryDispatcher:
         target_backends: List[str],
         policy: DispatchPolicy,
         trace_id: str
-    ) -> tuple[Dict[str, List[MemoryResult]], Dict[str, float], Set[str]]:
+    ) -> tuple[Dict[str, List[MemoryResult]], Dict[str, float], Set[str], List[str]]:
         """Execute search across selected backends according to policy."""
         all_results = {}
         backend_timings = {}
         backends_used = set()
+        timed_out: List[str] = []
         
         if policy == DispatchPolicy.PARALLEL:
-            # Run all backends in parallel
-            tasks = []
-            for backend_name in target_backends:
-                if backend_name in self.backends:
-                    task = self._search_single_backend(
-                        backend_name, query, options, trace_id
-                    )
-                    tasks.append((backend_name, task))
+            # Fan out to all backends concurrently; latency is bounded by the
+            # slowest backend that meets its deadline rather than the sum.
+            names = [name for name in target_backends if name in self.backends]
+            outcomes = await asyncio.gather(
+                *(self._search_with_deadline(name, query, options, trace_id) for name in names),
+                return_exceptions=True
+            )
             
-            # Wait for all results
-            for backend_name, task in tasks:
-                try:
-                    results, timing = await task
+            for backend_name, outcome in zip(names, outcomes):
+                if isinstance(outcome, BackendTimeoutError):
+                    search_logger.warning(
+                        f"Backend {backend_name} timed out after {outcome.timeout_ms:.0f}ms",
+                        trace_id=trace_id
+                    )
+                    backend_timings[backend_name] = outcome.timeout_ms
+                    timed_out.append(backend_name)
+                elif isinstance(outcome, BaseException):
+                    search_logger.warning(f"Backend {backend_name} failed: {outcome}")
+                    backend_timings[backend_name] = 0.0
+                else:
+                    results, timing = outcome
                     all_results[backend_name] = results
                     backend_timings[backend_name] = timing
                     backends_used.add(backend_name)
                     # Issue #311: Log backend results for debugging hybrid search
                     search_logger.info(
-                        "Backend '%s' returned %d results in %.1fms",
-                        backend_name,
-                        len(results),
-                        timing,
-                        extra={
-                            "backend": backend_name,
-                            "result_count": len(results),
-                            "timing_ms": timing,
-                            "trace_id": trace_id
-                        }
+                        f"Backend '{backend_name}' returned {len(results)} results in {timing:.1f}ms",
+                        backend=backend_name,
+                        result_count=len(results),
+                        timing_ms=timing,
+                        trace_id=trace_id
                     )
-                except Exception as e:
-                    search_logger.warning(f"Backend {backend_name} failed: {e}")
-                    backend_timings[backend_name] = 0.0
         
         elif policy == DispatchPolicy.SEQUENTIAL:
             # Run backends in sequence, stop early if we have enough results
@@ -506,7 +617,7 @@ class QueryDispatcher:
             for backend_name in target_backends:
                 if backend_name in self.backends:
                     try:
-                        results, timing = await self._search_single_backend(
+                        results, timing = await self._search_with_deadline(
                             backend_name, query, options, trace_id
                         )
                         all_results[backend_name] = results
@@ -517,7 +628,11 @@ class QueryDispatcher:
                         # Stop early if we have enough results
                         if total_results >= options.limit:
                             break
-                            
+                    
+                    except BackendTimeoutError as e:
+                        search_logger.warning(f"Backend {backend_name} timed out: {e}")
+                        backend_timings[backend_name] = e.timeout_ms
+                        timed_out.append(backend_name)
                     except Exception as e:
                         search_logger.warning(f"Backend {backend_name} failed: {e}")
                         backend_timings[backend_name] = 0.0
@@ -527,7 +642,7 @@ class QueryDispatcher:
             for backend_name in target_backends:
                 if backend_name in self.backends:
                     try:
-                        results, timing = await self._search_single_backend(
+                        results, timing = await self._search_with_deadline(
                             backend_name, query, options, trace_id
                         )
                         all_results[backend_name] = results
@@ -537,7 +652,11 @@ class QueryDispatcher:
                         # Stop at first successful backend
                         if results:
                             break
-                            
+                    
+                    except BackendTimeoutError as e:
+                        search_logger.warning(f"Backend {backend_name} timed out, trying next: {e}")
+                        backend_timings[backend_name] = e.timeout_ms
+                        timed_out.append(backend_name)
                     except Exception as e:
                         search_logger.warning(f"Backend {backend_name} failed, trying next: {e}")
                         backend_timings[backend_name] = 0.0
@@ -546,7 +665,47 @@ class QueryDispatcher:
             # Implement smart policy (for now, same as parallel)
             return await self._execute_search(query, options, target_backends, DispatchPolicy.PARALLEL, trace_id)
         
-        return all_results, backend_timings, backends_used
+        return all_results, backend_timings, backends_used, timed_out
+    
+    def _get_backend_timeout(self, backend_name: str, options: SearchOptions) -> Optional[float]:
+        """
+        Resolve the deadline for a backend in milliseconds.
+        
+        Request-level settings win over dispatcher configuration, and
+        per-backend values win over the general default at each level.
+        """
+        if backend_name in options.backend_timeouts:
+            return options.backend_timeouts[backend_name]
+        if options.timeout_ms is not None:
+            return options.timeout_ms
+        if backend_name in self.backend_timeouts:
+            return self.backend_timeouts[backend_name]
+        return self.default_timeout_ms
+    
+    async def _search_with_deadline(
+        self,
+        backend_name: str,
+        query: str,
+        options: SearchOptions,
+        trace_id: str
+    ) -> tuple[List[MemoryResult], float]:
+        """Search a single backend, cancelling it if it misses its deadline."""
+        timeout_ms = self._get_backend_timeout(backend_name, options)
+        search = self._search_single_backend(backend_name, query, options, trace_id)
+        
+        if timeout_ms is None:
+            return await search
+        
+        try:
+            return await asyncio.wait_for(search, timeout=timeout_ms / 1000)
+        except asyncio.TimeoutError:
+            self.timing_collector.record_timing(
+                f"backend_{backend_name}_timeout",
+                timeout_ms,
+                query_length=len(query),
+                trace_id=trace_id
+            )
+            raise BackendTimeoutError(backend_name, timeout_ms)
     
     async def _search_single_backend(
         self,
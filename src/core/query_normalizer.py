@@ -187,11 +187,28 @@ class QueryNormalizer:
             r"\bcache\b",
         ]
 
+        self._compile_patterns()
+
         logger.info(
             f"QueryNormalizer initialized: enabled={config.enabled}, "
             f"confidence_threshold={config.confidence_threshold}"
         )
 
+    def _compile_patterns(self) -> None:
+        """Precompile intent and entity patterns (call again after editing them)."""
+        self._compiled_intents: Dict[QueryIntent, Tuple[re.Pattern, List[re.Pattern]]] = {
+            intent: (
+                re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE),
+                [re.compile(p, re.IGNORECASE) for p in patterns],
+            )
+            for intent, patterns in self.intent_patterns.items()
+            if patterns
+        }
+        # Entity patterns are whole words, so one alternation finds every match
+        self._entity_re = re.compile(
+            "|".join(f"(?:{p})" for p in self.entity_patterns), re.IGNORECASE
+        )
+
     def normalize(self, query: str) -> NormalizedQuery:
         """
         Normalize a query to its canonical form.
@@ -264,13 +281,13 @@ class QueryNormalizer:
         """
         intent_scores: Dict[QueryIntent, float] = {}
 
-        for intent, patterns in self.intent_patterns.items():
-            matches = sum(
-                1 for pattern in patterns if re.search(pattern, query, re.IGNORECASE)
-            )
-            if patterns:
-                score = matches / len(patterns)
-                intent_scores[intent] = score
+        for intent, (any_match, patterns) in self._compiled_intents.items():
+            # Patterns are only counted for intents the combined scan matched
+            if not any_match.search(query):
+                intent_scores[intent] = 0.0
+                continue
+            matches = sum(1 for pattern in patterns if pattern.search(query))
+            intent_scores[intent] = matches / len(patterns)
 
         if not intent_scores or max(intent_scores.values()) == 0:
             return QueryIntent.UNKNOWN, 0.0
@@ -288,11 +305,7 @@ class QueryNormalizer:
         Returns:
             List of detected entity names
         """
-        entities = []
-        for pattern in self.entity_patterns:
-            matches = re.findall(pattern, query, re.IGNORECASE)
-            entities.extend([m.lower().strip() for m in matches])
-        return list(set(entities))
+        return list({m.group(0).lower().strip() for m in self._entity_re.finditer(query)})
 
     def _find_canonical(
         self,
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Shared token bucket backends for MCPRateLimiter.
+
+The in-process limiters in rate_limiter.py enforce a separate budget in every
+uvicorn worker and replica, so effective limits multiply with the number of
+processes. RedisTokenBucketBackend keeps one bucket per key in Redis and
+checks it with a single atomic Lua script, using Redis server time so all
+processes agree on refill.
+
+Two things keep Redis off the hot path:
+
+- A short-TTL local reservation. When a Redis check leaves a client with
+  more than a headroom fraction of capacity, the same script also takes up
+  to a reserve fraction of capacity out of the bucket for this process.
+  Requests inside the TTL are admitted locally from that reservation, and
+  the unused part is returned on the next round trip. Every admitted token is
+  taken from the shared bucket first, so all processes together never admit
+  more than the bucket holds. Reserved tokens that are never returned (the
+  key is evicted or not seen again) are lost until the bucket refills.
+- An LRU-bounded LocalTokenBucketBackend used when Redis is unavailable, so
+  memory stays bounded however many clients are seen.
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_LOCAL_MAX_KEYS = int(os.getenv("RATE_LIMIT_LOCAL_MAX_KEYS", "10000"))
+RATE_LIMIT_CACHE_TTL_MS = float(os.getenv("RATE_LIMIT_CACHE_TTL_MS", "250"))
+RATE_LIMIT_CACHE_HEADROOM = float(os.getenv("RATE_LIMIT_CACHE_HEADROOM", "0.5"))
+RATE_LIMIT_CACHE_RESERVE = float(os.getenv("RATE_LIMIT_CACHE_RESERVE", "0.1"))
+RATE_LIMIT_REDIS_RETRY_S = float(os.getenv("RATE_LIMIT_REDIS_RETRY_S", "5"))
+
+# KEYS[1] bucket hash; ARGV: capacity, refill rate (tokens/s), requested, refunded
+# reservation, tokens to reserve, tokens that must remain after reserving
+# Returns {allowed, tokens left, seconds until `requested` tokens are available, reserved}
+TOKEN_BUCKET_LUA = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local refund = tonumber(ARGV[4])
+local reserve = tonumber(ARGV[5])
+local reserve_floor = tonumber(ARGV[6])
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+  tokens = capacity
+  ts = now
+end
+
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate + refund)
+
+local allowed = 0
+local reserved = 0
+if tokens >= requested then
+  tokens = tokens - requested
+  allowed = 1
+  reserved = math.max(0, math.min(reserve, math.floor(tokens - reserve_floor)))
+  tokens = tokens - reserved
+end
+
+local wait = 0
+if allowed == 0 then
+  wait = (requested - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate) + 1)
+return {allowed, tostring(tokens), tostring(wait), reserved}
+"""
+
+
+class LRUDict(OrderedDict):
+    """Dict bounded to max_size entries, evicting the least recently used.
+
+    With a default_factory, missing keys are created on access like defaultdict.
+    """
+
+    def __init__(self, max_size: int = RATE_LIMIT_LOCAL_MAX_KEYS, default_factory: Optional[Callable[[], Any]] = None):
+        super().__init__()
+        self.max_size = max(1, max_size)
+        self.default_factory = default_factory
+
+    def __getitem__(self, key: Any) -> Any:
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.max_size:
+            self.popitem(last=False)
+
+    def __missing__(self, key: Any) -> Any:
+        if self.default_factory is None:
+            raise KeyError(key)
+        self[key] = value = self.default_factory()
+        return value
+
+
+@dataclass
+class RateLimitDecision:
+    """Outcome of one token bucket check."""
+    allowed: bool
+    remaining: float
+    retry_after: float
+    source: str  # "redis", "cache" or "local"
+
+
+class LocalTokenBucketBackend:
+    """In-process token buckets, bounded to max_keys by least-recent use."""
+
+    def __init__(self, max_keys: int = RATE_LIMIT_LOCAL_MAX_KEYS):
+        self.max_keys = max(1, max_keys)
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def consume(self, key: str, capacity: float, refill_rate: float, tokens: int = 1) -> RateLimitDecision:
+        """Refill and consume from the bucket for key."""
+        now = time.monotonic()
+        with self._lock:
+            level, updated = self._buckets.pop(key, (float(capacity), now))
+            level = min(capacity, level + (now - updated) * refill_rate)
+            allowed = level >= tokens
+            if allowed:
+                level -= tokens
+            self._buckets[key] = (level, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+
+        retry_after = 0.0 if allowed else (tokens - level) / refill_rate
+        return RateLimitDecision(allowed, level, retry_after, "local")
+
+    # No I/O, so the cached and fallback paths are the full check
+    consume_cached = consume
+    consume_fallback = consume
+
+    def get_stats(self) -> dict:
+        return {"backend": "local", "keys": len(self._buckets), "max_keys": self.max_keys}
+
+
+class RedisTokenBucketBackend:
+    """Token buckets shared through Redis, one atomic Lua call per check."""
+
+    def __init__(
+        self,
+        redis_client: Any,
+        prefix: str = "ratelimit",
+        cache_ttl_ms: float = RATE_LIMIT_CACHE_TTL_MS,
+        cache_headroom: float = RATE_LIMIT_CACHE_HEADROOM,
+        cache_reserve: float = RATE_LIMIT_CACHE_RESERVE,
+        fallback: Optional[LocalTokenBucketBackend] = None,
+        max_cached_keys: int = RATE_LIMIT_LOCAL_MAX_KEYS,
+    ):
+        """
+        Args:
+            redis_client: Synchronous redis.Redis client
+            prefix: Namespace for bucket keys
+            cache_ttl_ms: How long a local reservation may be used (0 disables)
+            cache_headroom: Fraction of capacity that must remain in Redis after reserving
+            cache_reserve: Fraction of capacity reserved per round trip for local admits
+            fallback: Backend used while Redis is failing
+            max_cached_keys: Bound on the local decision cache
+        """
+        self.redis = redis_client
+        self.prefix = prefix
+        self.cache_ttl = cache_ttl_ms / 1000.0
+        self.cache_headroom = cache_headroom
+        self.cache_reserve = cache_reserve
+        self.fallback = fallback or LocalTokenBucketBackend()
+        self.max_cached_keys = max(1, max_cached_keys)
+        self._script = redis_client.register_script(TOKEN_BUCKET_LUA)
+        # key -> [expires_at, tokens left in Redis at last sync, reserved tokens unused]
+        self._decisions: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis_retry_at = 0.0
+        self.redis_calls = 0
+        self.cache_hits = 0
+        self.fallback_calls = 0
+
+    def bucket_key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def consume_cached(
+        self, key: str, capacity: float, refill_rate: float, tokens: int = 1
+    ) -> Optional[RateLimitDecision]:
+        """Admit from this process's reservation if it covers the request, else None."""
+        if self.cache_ttl <= 0:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._decisions.get(key)
+            if entry is None or entry[0] <= now or entry[2] < tokens:
+                return None
+            entry[2] -= tokens
+            self._decisions.move_to_end(key)
+            self.cache_hits += 1
+            left = entry[1] + entry[2]
+        return RateLimitDecision(True, left, 0.0, "cache")
+
+    def consume(self, key: str, capacity: float, refill_rate: float, tokens: int = 1) -> RateLimitDecision:
+        """Check the shared bucket (one Redis round trip) or fall back locally."""
+        cached = self.consume_cached(key, capacity, refill_rate, tokens)
+        if cached is not None:
+            return cached
+
+        if time.monotonic() < self._redis_retry_at:
+            return self.consume_fallback(key, capacity, refill_rate, tokens)
+
+        # The unused reservation goes back to the shared bucket with this call
+        with self._lock:
+            entry = self._decisions.pop(key, None)
+        refund = entry[2] if entry else 0
+        reserve = math.floor(capacity * self.cache_reserve) if self.cache_ttl > 0 else 0
+
+        try:
+            allowed, remaining, wait, reserved = self._script(
+                keys=[self.bucket_key(key)],
+                args=[capacity, refill_rate, tokens, refund, reserve, capacity * self.cache_headroom],
+            )
+        except Exception as e:
+            logger.warning(f"Redis rate limit check failed, using local buckets: {e}")
+            self._redis_retry_at = time.monotonic() + RATE_LIMIT_REDIS_RETRY_S
+            if entry is not None:
+                # Not returned to Redis; keep it so a later call refunds it
+                with self._lock:
+                    self._decisions.setdefault(key, entry)
+            return self.consume_fallback(key, capacity, refill_rate, tokens)
+
+        self.redis_calls += 1
+        remaining = float(remaining)
+        reserved = int(reserved)
+        if reserved > 0:
+            with self._lock:
+                self._decisions[key] = [time.monotonic() + self.cache_ttl, remaining, reserved]
+                while len(self._decisions) > self.max_cached_keys:
+                    self._decisions.popitem(last=False)
+        return RateLimitDecision(bool(int(allowed)), remaining + reserved, float(wait), "redis")
+
+    def consume_fallback(self, key: str, capacity: float, refill_rate: float, tokens: int = 1) -> RateLimitDecision:
+        """Check the in-process bucket only (Redis down or executor saturated)."""
+        self.fallback_calls += 1
+        return self.fallback.consume(key, capacity, refill_rate, tokens)
+
+    def get_stats(self) -> dict:
+        return {
+            "backend": "redis",
+            "redis_calls": self.redis_calls,
+            "cache_hits": self.cache_hits,
+            "fallback_calls": self.fallback_calls,
+            "cached_keys": len(self._decisions),
+            "fallback_keys": len(self.fallback),
+            "redis_available": time.monotonic() >= self._redis_retry_at,
+        }
@@ -4,16 +4,25 @@ Rate limiting for MCP tool endpoints.
 
 Implements token bucket and sliding window rate limiting
 to prevent abuse of store_context and retrieve_context operations.
+
+By default limits are enforced per process. With a shared backend set via
+MCPRateLimiter.set_backend (see rate_limit_backends.py), every check becomes a
+token bucket in Redis so limits hold across workers and replicas.
 """
 
 import logging
 import time
 import threading
-from collections import defaultdict, deque
-from typing import Dict, Optional, Tuple, Union
+from collections import deque
+from typing import Any, Dict, Optional, Tuple, Union
+
+from .rate_limit_backends import LRUDict, RateLimitDecision
+from .storage_executor import StorageExecutorSaturatedError, run_storage_call
 
 logger = logging.getLogger(__name__)
 
+BURST_MAX_REQUESTS = 50
+
 
 class TokenBucket:
     """Token bucket rate limiter implementation."""
@@ -146,10 +155,13 @@ class MCPRateLimiter:
             "query_graph": {"rpm": 30, "burst": 5},  # 0.5 per second, burst of 5
         }
 
-        # Per-client limiters (keyed by client identifier)
-        self.client_limiters: Dict[str, Dict[str, TokenBucket]] = defaultdict(dict)
+        # Per-client limiters (keyed by client identifier), LRU-bounded
+        self.client_limiters: Dict[str, Dict[str, TokenBucket]] = LRUDict(default_factory=dict)
         self.global_limiters: Dict[str, SlidingWindowLimiter] = {}
 
+        # Shared backend (e.g. RedisTokenBucketBackend); None keeps state in-process
+        self.backend: Optional[Any] = None
+
         # Simple rate limiters for backward compatibility
         self._simple_limiters: Dict[str, SlidingWindowLimiter] = {}
 
@@ -160,6 +172,29 @@ class MCPRateLimiter:
                 max_requests=limits["rpm"] * 10, window_seconds=60
             )
 
+    def set_backend(self, backend: Optional[Any]) -> None:
+        """Enforce limits through a shared token bucket backend (None for in-process).
+
+        Args:
+            backend: Object with consume/consume_cached/consume_fallback, such as
+                     RedisTokenBucketBackend or LocalTokenBucketBackend
+        """
+        self.backend = backend
+
+    async def _consume_shared(
+        self, key: str, capacity: float, refill_rate: float, tokens: int = 1
+    ) -> RateLimitDecision:
+        """Consume from the shared backend without blocking the event loop."""
+        decision = self.backend.consume_cached(key, capacity, refill_rate, tokens)
+        if decision is not None:
+            return decision
+        try:
+            return await run_storage_call(
+                self.backend.consume, key, capacity, refill_rate, tokens, operation="redis.rate_limit"
+            )
+        except StorageExecutorSaturatedError:
+            return self.backend.consume_fallback(key, capacity, refill_rate, tokens)
+
     def get_client_id(self, request_info: Dict) -> str:
         """Extract client identifier from request.
 
@@ -238,6 +273,9 @@ class MCPRateLimiter:
 
         limits = self.endpoint_limits[endpoint]
 
+        if self.backend is not None:
+            return await self._shared_check_rate_limit(endpoint, client_id, limits, tokens_required)
+
         # Check global rate limit first
         global_limiter = self.global_limiters[endpoint]
         if not global_limiter.can_proceed():
@@ -266,6 +304,32 @@ class MCPRateLimiter:
                 f"Rate limit exceeded for {endpoint}. Try again in {wait_time:.1f}s",
             )
 
+    async def _shared_check_rate_limit(
+        self, endpoint: str, client_id: str, limits: Dict[str, int], tokens_required: int
+    ) -> Tuple[bool, Optional[str]]:
+        """Backend version of _async_check_rate_limit.
+
+        The global sliding window (10x rpm per minute) maps to a bucket of that
+        capacity refilling over the same minute.
+        """
+        global_max = limits["rpm"] * 10
+        decision = await self._consume_shared(f"global:{endpoint}", global_max, global_max / 60.0)
+        if not decision.allowed:
+            return (
+                False,
+                f"Global rate limit exceeded for {endpoint}. Try again in {decision.retry_after:.1f}s",
+            )
+
+        decision = await self._consume_shared(
+            f"client:{client_id}:{endpoint}", limits["burst"], limits["rpm"] / 60.0, tokens_required
+        )
+        if decision.allowed:
+            return True, None
+        return (
+            False,
+            f"Rate limit exceeded for {endpoint}. Try again in {decision.retry_after:.1f}s",
+        )
+
     def check_burst_protection(
         self, client_id: str, window_seconds: int = 10
     ) -> Tuple[bool, Optional[str]]:
@@ -293,12 +357,20 @@ class MCPRateLimiter:
             Tuple of (allowed, error_message)
         """
         # Simple burst protection: max 50 requests per 10 seconds per client
+        if self.backend is not None:
+            decision = await self._consume_shared(
+                f"burst:{client_id}", BURST_MAX_REQUESTS, BURST_MAX_REQUESTS / window_seconds
+            )
+            if decision.allowed:
+                return True, None
+            return False, f"Burst protection triggered. Try again in {decision.retry_after:.1f}s"
+
         if not hasattr(self, "_burst_limiters"):
-            self._burst_limiters: Dict[str, SlidingWindowLimiter] = {}
+            self._burst_limiters: Dict[str, SlidingWindowLimiter] = LRUDict()
 
         if client_id not in self._burst_limiters:
             self._burst_limiters[client_id] = SlidingWindowLimiter(
-                max_requests=50, window_seconds=window_seconds
+                max_requests=BURST_MAX_REQUESTS, window_seconds=window_seconds
             )
 
         limiter = self._burst_limiters[client_id]
@@ -347,6 +419,9 @@ class MCPRateLimiter:
                 "refill_rate": bucket.refill_rate,
             }
 
+        if self.backend is not None:
+            info["backend"] = self.backend.get_stats()
+
         return info
 
     async def async_check_rate_limit(
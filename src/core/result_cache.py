@@ -0,0 +1,242 @@
+"""
+Two-tier cache for final RetrievalCore search results.
+
+Entries are keyed by the semantic cache key of the query embedding (see
+``semantic_cache.SemanticCacheKeyGenerator``) together with search mode,
+filters, score threshold and limit, so repeated and paraphrased queries are
+served without dispatching to the backends or re-ranking.
+
+Tier 1 is an in-process LRU bounded by entry count; tier 2 is Redis so that
+workers share results. Both tiers expire entries after a TTL.
+
+Invalidation uses generation counters rather than key scans. Every key embeds
+the global epoch and the generation of its namespace (the context type it was
+filtered by, or ``*`` for unfiltered searches). Storing a context of type T
+bumps the generations of T and ``*``; deleting a context, whose type is not
+known, bumps the epoch. Old entries are never served again and age out of the
+LRU and Redis by themselves.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..interfaces.memory_result import SearchResultResponse
+from .semantic_cache import SemanticCacheKeyGenerator, get_semantic_cache_generator
+from .storage_executor import run_storage_call
+
+logger = logging.getLogger(__name__)
+
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+RESULT_CACHE_TTL_SECONDS = int(os.getenv("RESULT_CACHE_TTL_SECONDS", "300"))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1024"))
+RESULT_CACHE_KEY_PREFIX = "result_cache"
+
+ALL_NAMESPACES = "*"
+_EPOCH = "_epoch"
+
+
+class SearchResultCache:
+    """In-process LRU plus Redis cache for SearchResultResponse objects."""
+
+    def __init__(
+        self,
+        redis_client=None,
+        ttl_seconds: int = RESULT_CACHE_TTL_SECONDS,
+        max_entries: int = RESULT_CACHE_MAX_ENTRIES,
+        key_generator: Optional[SemanticCacheKeyGenerator] = None,
+    ):
+        """
+        Args:
+            redis_client: Optional SimpleRedisClient for the shared tier
+            ttl_seconds: Lifetime of cached results in both tiers
+            max_entries: Maximum entries kept in the in-process tier
+            key_generator: Semantic key generator (defaults to the global one)
+        """
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.key_generator = key_generator or get_semantic_cache_generator()
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "invalidations": 0,
+            "errors": 0,
+        }
+
+    async def make_key(
+        self,
+        embedding: List[float],
+        limit: int,
+        search_mode: str,
+        context_type: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        score_threshold: float = 0.0,
+    ) -> Optional[str]:
+        """
+        Build the cache key for a search, or None if no semantic key is available.
+
+        Args:
+            embedding: Query embedding
+            limit: Number of results requested
+            search_mode: Search mode used
+            context_type: Context type filter, which is also the invalidation namespace
+            filters: Remaining metadata filters
+            score_threshold: Minimum score threshold
+        """
+        key_result = self.key_generator.generate_cache_key(
+            embedding=embedding,
+            limit=limit,
+            search_mode=search_mode,
+            context_type=context_type,
+            additional_params={
+                "filters": json.loads(json.dumps(filters or {}, sort_keys=True, default=str)),
+                "score_threshold": score_threshold,
+            },
+        )
+        if not key_result.is_semantic:
+            return None
+
+        namespace = context_type or ALL_NAMESPACES
+        epoch, generation = await self._read_generations(namespace)
+        return f"{RESULT_CACHE_KEY_PREFIX}:{epoch}.{generation}:{namespace}:{key_result.cache_key}"
+
+    async def get(self, key: str) -> Optional[SearchResultResponse]:
+        """Return the cached response for key, checking memory before Redis."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, payload = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return SearchResultResponse.model_validate_json(payload)
+                del self._entries[key]
+
+        payload = None
+        if self._redis_available:
+            try:
+                payload = await run_storage_call(self.redis.get, key, operation="redis.get")
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"Result cache Redis read failed: {e}")
+
+        if not payload:
+            self._stats["misses"] += 1
+            return None
+
+        self._stats["redis_hits"] += 1
+        self._remember(key, payload)
+        return SearchResultResponse.model_validate_json(payload)
+
+    async def set(self, key: str, response: SearchResultResponse) -> None:
+        """Store a response in both tiers."""
+        payload = response.model_dump_json()
+        self._remember(key, payload)
+        self._stats["stores"] += 1
+        if self._redis_available:
+            try:
+                await run_storage_call(
+                    self.redis.setex, key, self.ttl_seconds, payload, operation="redis.setex"
+                )
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"Result cache Redis write failed: {e}")
+
+    async def invalidate(self, namespaces: Optional[Iterable[Optional[str]]] = None) -> None:
+        """
+        Invalidate cached results.
+
+        Args:
+            namespaces: Context types that changed. Unfiltered searches are always
+                invalidated too. None invalidates every namespace.
+        """
+        if namespaces is None:
+            counters = [_EPOCH]
+        else:
+            counters = sorted({ns or ALL_NAMESPACES for ns in namespaces} | {ALL_NAMESPACES})
+
+        with self._lock:
+            for counter in counters:
+                self._generations[counter] = self._generations.get(counter, 0) + 1
+            if namespaces is None:
+                self._entries.clear()
+            self._stats["invalidations"] += 1
+
+        if self._shared_generations:
+            try:
+                await run_storage_call(
+                    self._incr_redis_generations, counters, operation="redis.incr"
+                )
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"Result cache Redis invalidation failed: {e}")
+
+    def clear(self) -> None:
+        """Drop all in-process entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and tier sizes."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._entries)
+        lookups = stats["memory_hits"] + stats["redis_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["redis_hits"]) / lookups if lookups else 0.0
+        stats["max_entries"] = self.max_entries
+        stats["ttl_seconds"] = self.ttl_seconds
+        stats["redis_enabled"] = self._redis_available
+        return stats
+
+    @property
+    def _redis_available(self) -> bool:
+        return self.redis is not None
+
+    @property
+    def _shared_generations(self) -> bool:
+        """Whether generation counters live in Redis (needs the raw client for MGET/INCR)."""
+        return self._redis_available and getattr(self.redis, "client", None) is not None
+
+    def _remember(self, key: str, payload: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    async def _read_generations(self, namespace: str) -> Tuple[int, int]:
+        """Current (epoch, namespace generation), from Redis when shared."""
+        if self._shared_generations:
+            try:
+                values = await run_storage_call(
+                    self.redis.client.mget,
+                    [self._generation_key(_EPOCH), self._generation_key(namespace)],
+                    operation="redis.mget",
+                )
+                return int(values[0] or 0), int(values[1] or 0)
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"Result cache generation read failed, using local counters: {e}")
+        with self._lock:
+            return self._generations.get(_EPOCH, 0), self._generations.get(namespace, 0)
+
+    def _incr_redis_generations(self, counters: List[str]) -> None:
+        for counter in counters:
+            self.redis.client.incr(self._generation_key(counter))
+
+    @staticmethod
+    def _generation_key(counter: str) -> str:
+        return f"{RESULT_CACHE_KEY_PREFIX}:gen:{counter}"
@@ -21,6 +21,7 @@ from typing import Dict, List, Any, Optional
 from ..interfaces.backend_interface import SearchOptions
 from ..interfaces.memory_result import SearchResultResponse, MemoryResult
 from ..core.query_dispatcher import QueryDispatcher, SearchMode
+from ..core.pipeline_tracing import PipelineTrace
 from ..utils.logging_middleware import search_logger
 
 # Import MQE wrapper (Phase 2)
@@ -42,14 +43,14 @@ except ImportError:
     apply_search_enhancements = None
     is_technical_query = None
 
-# Import query normalizer (Phase 4)
+# Import query analysis: normalization and lexical checks (Phase 4)
 try:
-    from .query_normalizer import get_query_normalizer
+    from .query_analysis import get_query_analyzer
 
     QUERY_NORMALIZER_AVAILABLE = True
 except ImportError:
     QUERY_NORMALIZER_AVAILABLE = False
-    get_query_normalizer = None
+    get_query_analyzer = None
 
 # Import HyDE generator (Phase 5)
 try:
@@ -70,6 +71,15 @@ except ImportError:
     CROSS_ENCODER_AVAILABLE = False
     get_bulletproof_reranker = None
 
+# Query embeddings for semantic result cache keys
+try:
+    from ..embedding import generate_embedding as generate_query_embedding
+
+    QUERY_EMBEDDING_AVAILABLE = True
+except ImportError:
+    QUERY_EMBEDDING_AVAILABLE = False
+    generate_query_embedding = None
+
 
 logger = logging.getLogger(__name__)
 
@@ -93,14 +103,16 @@ class RetrievalCore:
     while properly utilizing the backend timing infrastructure.
     """
     
-    def __init__(self, query_dispatcher: QueryDispatcher):
+    def __init__(self, query_dispatcher: QueryDispatcher, result_cache=None):
         """
         Initialize the unified retrieval core.
         
         Args:
             query_dispatcher: The configured query dispatcher with all backends
+            result_cache: Optional SearchResultCache serving final ranked results
         """
         self.dispatcher = query_dispatcher
+        self.result_cache = result_cache
     
     async def search(
         self,
@@ -109,7 +121,9 @@ class RetrievalCore:
         search_mode: str = "hybrid",
         context_type: Optional[str] = None,
         metadata_filters: Optional[Dict[str, Any]] = None,
-        score_threshold: float = 0.0
+        score_threshold: float = 0.0,
+        use_cache: bool = True,
+        debug: bool = False
     ) -> SearchResultResponse:
         """
         Execute unified search across all configured backends.
@@ -127,6 +141,8 @@ class RetrievalCore:
             context_type: Optional context type filter
             metadata_filters: Optional metadata filters
             score_threshold: Minimum score threshold for results
+            use_cache: Serve and store results through the result cache
+            debug: Include per-stage pipeline timings in the response
 
         Returns:
             SearchResultResponse with results and backend timing information
@@ -134,28 +150,33 @@ class RetrievalCore:
         Raises:
             Exception: If search fails across all backends
         """
+        # Per-stage spans share the request trace_id and feed the /metrics histograms
+        trace = PipelineTrace()
+
         try:
-            # PHASE 4: Query Normalization
+            # PHASE 4: Query analysis and normalization, once per request
             effective_query = query
             query_normalization_applied = False
+            analysis = None
 
             if (
                 ENABLE_QUERY_NORMALIZATION
                 and QUERY_NORMALIZER_AVAILABLE
-                and get_query_normalizer is not None
+                and get_query_analyzer is not None
             ):
-                try:
-                    normalizer = get_query_normalizer()
-                    normalized = normalizer.normalize(query)
-                    if normalized.confidence > 0.5 and normalized.normalized != query:
-                        effective_query = normalized.normalized
-                        query_normalization_applied = True
-                        logger.info(
-                            f"Query normalized: '{query[:30]}...' -> '{effective_query[:30]}...' "
-                            f"(confidence={normalized.confidence:.2f}, intent={normalized.intent.value})"
-                        )
-                except Exception as norm_error:
-                    logger.warning(f"Query normalization failed: {norm_error}")
+                with trace.span("normalization"):
+                    try:
+                        analysis = get_query_analyzer().analyze(query, classify=False)
+                        if analysis.normalization_applied:
+                            normalized = analysis.normalized
+                            effective_query = analysis.effective_query
+                            query_normalization_applied = True
+                            logger.info(
+                                f"Query normalized: '{query[:30]}...' -> '{effective_query[:30]}...' "
+                                f"(confidence={normalized.confidence:.2f}, intent={normalized.intent.value})"
+                            )
+                    except Exception as norm_error:
+                        logger.warning(f"Query normalization failed: {norm_error}")
 
             # Convert search_mode string to SearchMode enum
             if search_mode not in SearchMode.__members__:
@@ -176,6 +197,24 @@ class RetrievalCore:
             if context_type:
                 search_options.filters["type"] = context_type
 
+            # Result cache: repeated and paraphrased queries skip dispatch and re-ranking
+            cache_key = None
+            if use_cache and self.result_cache is not None:
+                cached_response = None
+                with trace.span("cache_lookup") as cache_span:
+                    cache_key = await self._result_cache_key(
+                        effective_query, limit, search_mode, context_type, search_options
+                    )
+                    if cache_key:
+                        cached_response = await self.result_cache.get(cache_key)
+                    cache_span["hit"] = cached_response is not None
+                if cached_response is not None:
+                    logger.info(
+                        f"RetrievalCore result cache hit: results={len(cached_response.results)}, "
+                        f"mode={search_mode}"
+                    )
+                    return self._finish_trace(trace, cached_response, debug)
+
             logger.info(
                 f"RetrievalCore executing search: query_length={len(effective_query)}, "
                 f"mode={search_mode}, limit={limit}, score_threshold={score_threshold}, "
@@ -189,86 +228,109 @@ class RetrievalCore:
             hyde_used = False
             search_response = None
             if ENABLE_HYDE and HYDE_AVAILABLE and get_hyde_generator is not None:
-                try:
-                    hyde_generator = get_hyde_generator()
-                    if hyde_generator.config.enabled:
-                        hyde_result = await hyde_generator.generate_hyde_embedding(effective_query)
-
-                        if hyde_result.embedding and not hyde_result.error:
-                            # Search using hypothetical doc embedding
-                            search_response = await self.dispatcher.search_by_embedding(
-                                embedding=hyde_result.embedding,
-                                options=search_options,
-                                search_mode=search_mode_enum
-                            )
-                            hyde_used = True
-                            logger.info(
-                                f"HyDE search completed: {len(search_response.results)} results, "
-                                f"cache_hit={hyde_result.cache_hit}, "
-                                f"time={hyde_result.generation_time_ms:.2f}ms"
-                            )
-                        elif hyde_result.error:
-                            logger.warning(f"HyDE generation failed: {hyde_result.error}")
-                except Exception as hyde_error:
-                    logger.warning(f"HyDE search failed, falling back to MQE: {hyde_error}")
+                with trace.span("hyde"):
+                    try:
+                        hyde_generator = get_hyde_generator()
+                        if hyde_generator.config.enabled:
+                            hyde_result = await hyde_generator.generate_hyde_embedding(effective_query)
+
+                            if hyde_result.embedding and not hyde_result.error:
+                                # Search using hypothetical doc embedding
+                                search_response = await self.dispatcher.search_by_embedding(
+                                    embedding=hyde_result.embedding,
+                                    options=search_options,
+                                    search_mode=search_mode_enum
+                                )
+                                hyde_used = True
+                                logger.info(
+                                    f"HyDE search completed: {len(search_response.results)} results, "
+                                    f"cache_hit={hyde_result.cache_hit}, "
+                                    f"time={hyde_result.generation_time_ms:.2f}ms"
+                                )
+                            elif hyde_result.error:
+                                logger.warning(f"HyDE generation failed: {hyde_result.error}")
+                    except Exception as hyde_error:
+                        logger.warning(f"HyDE search failed, falling back to MQE: {hyde_error}")
 
             # PHASE 2: Multi-Query Expansion (fallback if HyDE not used)
             mqe_used = False
             if not hyde_used and ENABLE_MQE and MQE_AVAILABLE and get_mqe_wrapper is not None:
-                try:
-                    mqe_wrapper = get_mqe_wrapper()
-                    if mqe_wrapper.is_available and mqe_wrapper.config.enabled:
-                        # Define search function for MQE to wrap
-                        async def single_search(q: str, lim: int) -> List[Dict[str, Any]]:
-                            response = await self.dispatcher.search(
-                                query=q,
-                                options=SearchOptions(
-                                    limit=lim,
-                                    score_threshold=score_threshold,
-                                    filters=search_options.filters
-                                ),
-                                search_mode=search_mode_enum
+                with trace.span("mqe"):
+                    try:
+                        mqe_wrapper = get_mqe_wrapper()
+                        if mqe_wrapper.is_available and mqe_wrapper.config.enabled:
+                            # Define search function for MQE to wrap
+                            async def single_search(q: str, lim: int) -> List[Dict[str, Any]]:
+                                response = await self.dispatcher.search(
+                                    query=q,
+                                    options=SearchOptions(
+                                        limit=lim,
+                                        score_threshold=score_threshold,
+                                        filters=search_options.filters
+                                    ),
+                                    search_mode=search_mode_enum
+                                )
+                                # Convert MemoryResult to dict
+                                return [self._memory_result_to_dict(r) for r in response.results]
+
+                            # One embedding batch and Qdrant request for all paraphrases;
+                            # other backends only search the original query
+                            async def multi_search(queries: List[str], lim: int) -> List[List[Dict[str, Any]]]:
+                                per_query, timed_out = await self.dispatcher.search_expanded(
+                                    queries=queries,
+                                    options=SearchOptions(
+                                        limit=lim,
+                                        score_threshold=score_threshold,
+                                        filters=search_options.filters
+                                    ),
+                                    search_mode=search_mode_enum
+                                )
+                                if timed_out:
+                                    logger.warning(f"MQE search backends timed out: {timed_out}")
+                                return [
+                                    [self._memory_result_to_dict(r) for r in results]
+                                    for results in per_query
+                                ]
+
+                            # Execute MQE search
+                            mqe_result = await mqe_wrapper.search_with_expansion(
+                                query=effective_query,
+                                search_func=single_search,
+                                limit=limit,
+                                multi_search_func=multi_search,
                             )
-                            # Convert MemoryResult to dict
-                            return [self._memory_result_to_dict(r) for r in response.results]
 
-                        # Execute MQE search
-                        mqe_result = await mqe_wrapper.search_with_expansion(
-                            query=effective_query,
-                            search_func=single_search,
-                            limit=limit
-                        )
-
-                        # Convert results back to MemoryResult
-                        results = [self._dict_to_memory_result(d) for d in mqe_result.results]
+                            # Convert results back to MemoryResult
+                            results = [self._dict_to_memory_result(d) for d in mqe_result.results]
 
-                        mqe_used = True
-                        logger.info(
-                            f"MQE search completed: {len(results)} results from "
-                            f"{len(mqe_result.paraphrases_used)} paraphrases in "
-                            f"{mqe_result.search_time_ms:.2f}ms"
-                        )
+                            mqe_used = True
+                            logger.info(
+                                f"MQE search completed: {len(results)} results from "
+                                f"{len(mqe_result.paraphrases_used)} paraphrases in "
+                                f"{mqe_result.search_time_ms:.2f}ms"
+                            )
 
-                        # Create response with MQE metadata
-                        search_response = SearchResultResponse(
-                            success=True,
-                            results=results,
-                            total_count=mqe_result.unique_docs_found,
-                            search_mode_used=search_mode,
-                            backends_used=["vector"],  # MQE primarily uses vector
-                            backend_timings={"mqe": mqe_result.search_time_ms},
-                            message=f"MQE search with {len(mqe_result.paraphrases_used)} paraphrases"
-                        )
-                except Exception as mqe_error:
-                    logger.warning(f"MQE search failed, falling back to standard: {mqe_error}")
+                            # Create response with MQE metadata
+                            search_response = SearchResultResponse(
+                                success=True,
+                                results=results,
+                                total_count=mqe_result.unique_docs_found,
+                                search_mode_used=search_mode,
+                                backends_used=["vector"],  # MQE primarily uses vector
+                                backend_timings={"mqe": mqe_result.search_time_ms},
+                                message=f"MQE search with {len(mqe_result.paraphrases_used)} paraphrases"
+                            )
+                    except Exception as mqe_error:
+                        logger.warning(f"MQE search failed, falling back to standard: {mqe_error}")
 
             # Standard search if neither HyDE nor MQE used
             if not hyde_used and not mqe_used:
-                search_response = await self.dispatcher.search(
-                    query=effective_query,
-                    options=search_options,
-                    search_mode=search_mode_enum
-                )
+                with trace.span("dispatch", search_mode=search_mode):
+                    search_response = await self.dispatcher.search(
+                        query=effective_query,
+                        options=search_options,
+                        search_mode=search_mode_enum
+                    )
 
             # PHASE 3.5: Cross-Encoder Re-ranking (ML-based semantic re-ranking)
             cross_encoder_used = False
@@ -280,63 +342,64 @@ class RetrievalCore:
                 and search_response.results
                 and len(search_response.results) > 1
             ):
-                rerank_start = time.time()
-                try:
-                    # Get reranker instance
-                    reranker = get_bulletproof_reranker()
-
-                    # Convert MemoryResult to dict format expected by reranker
-                    candidates = []
-                    for result in search_response.results[:CROSS_ENCODER_TOP_K]:
-                        candidates.append({
-                            "id": result.id,
-                            "payload": {
-                                "text": result.text,
-                                "type": result.type.value if hasattr(result.type, 'value') else str(result.type),
-                                "metadata": result.metadata,
-                            },
-                            "score": result.score,
-                        })
-
-                    # Apply cross-encoder re-ranking
-                    reranked = reranker.rerank(
-                        query=effective_query,
-                        candidates=candidates
-                    )
-
-                    # Update search_response with re-ranked results (limited to RETURN_K)
-                    reranked_results = []
-                    id_to_original = {r.id: r for r in search_response.results}
-
-                    for reranked_item in reranked[:CROSS_ENCODER_RETURN_K]:
-                        original = id_to_original.get(reranked_item["id"])
-                        if original:
-                            # Create updated result with cross-encoder score
-                            reranked_results.append(MemoryResult(
-                                id=original.id,
-                                score=reranked_item.get("rerank_score", original.score),
-                                text=original.text,
-                                type=original.type,
-                                metadata={
-                                    **original.metadata,
-                                    "original_vector_score": reranked_item.get("original_score", original.score),
-                                    "cross_encoder_reranked": True,
+                with trace.span("rerank", candidates=min(len(search_response.results), CROSS_ENCODER_TOP_K)):
+                    rerank_start = time.time()
+                    try:
+                        # Get reranker instance
+                        reranker = get_bulletproof_reranker()
+
+                        # Convert MemoryResult to dict format expected by reranker
+                        candidates = []
+                        for result in search_response.results[:CROSS_ENCODER_TOP_K]:
+                            candidates.append({
+                                "id": result.id,
+                                "payload": {
+                                    "text": result.text,
+                                    "type": result.type.value if hasattr(result.type, 'value') else str(result.type),
+                                    "metadata": result.metadata,
                                 },
-                                source=original.source,
-                            ))
+                                "score": result.score,
+                            })
 
-                    if reranked_results:
-                        search_response.results = reranked_results
-                        cross_encoder_used = True
-                        rerank_time_ms = (time.time() - rerank_start) * 1000
-
-                        logger.info(
-                            f"Cross-encoder re-ranking: {len(candidates)} candidates -> "
-                            f"{len(reranked_results)} results in {rerank_time_ms:.1f}ms"
+                        # Apply cross-encoder re-ranking on the reranker's worker threads
+                        reranked = await reranker.arerank(
+                            query=effective_query,
+                            candidates=candidates
                         )
 
-                except Exception as e:
-                    logger.warning(f"Cross-encoder re-ranking failed, using original results: {e}")
+                        # Update search_response with re-ranked results (limited to RETURN_K)
+                        reranked_results = []
+                        id_to_original = {r.id: r for r in search_response.results}
+
+                        for reranked_item in reranked[:CROSS_ENCODER_RETURN_K]:
+                            original = id_to_original.get(reranked_item["id"])
+                            if original:
+                                # Create updated result with cross-encoder score
+                                reranked_results.append(MemoryResult(
+                                    id=original.id,
+                                    score=reranked_item.get("rerank_score", original.score),
+                                    text=original.text,
+                                    type=original.type,
+                                    metadata={
+                                        **original.metadata,
+                                        "original_vector_score": reranked_item.get("original_score", original.score),
+                                        "cross_encoder_reranked": True,
+                                    },
+                                    source=original.source,
+                                ))
+
+                        if reranked_results:
+                            search_response.results = reranked_results
+                            cross_encoder_used = True
+                            rerank_time_ms = (time.time() - rerank_start) * 1000
+
+                            logger.info(
+                                f"Cross-encoder re-ranking: {len(candidates)} candidates -> "
+                                f"{len(reranked_results)} results in {rerank_time_ms:.1f}ms"
+                            )
+
+                    except Exception as e:
+                        logger.warning(f"Cross-encoder re-ranking failed, using original results: {e}")
 
             # PHASE 3: Apply Search Enhancements
             if (
@@ -345,38 +408,42 @@ class RetrievalCore:
                 and apply_search_enhancements is not None
                 and search_response.results
             ):
-                try:
-                    technical_query = (
-                        is_technical_query(effective_query)
-                        if is_technical_query is not None
-                        else False
-                    )
+                with trace.span("enhancements", results=len(search_response.results)):
+                    try:
+                        if analysis is not None:
+                            technical_query = analysis.is_technical
+                        else:
+                            technical_query = (
+                                is_technical_query(effective_query)
+                                if is_technical_query is not None
+                                else False
+                            )
 
-                    # Convert results to dict format for enhancements
-                    results_as_dicts = [
-                        self._memory_result_to_enhancement_dict(r)
-                        for r in search_response.results
-                    ]
+                        # Convert results to dict format for enhancements
+                        results_as_dicts = [
+                            self._memory_result_to_enhancement_dict(r)
+                            for r in search_response.results
+                        ]
 
-                    enhanced_dicts = apply_search_enhancements(
-                        results=results_as_dicts,
-                        query=effective_query,
-                        enable_exact_match=True,
-                        enable_type_weighting=True,
-                        enable_recency_decay=True,
-                        enable_technical_boost=technical_query
-                    )
+                        enhanced_dicts = apply_search_enhancements(
+                            results=results_as_dicts,
+                            query=effective_query,
+                            enable_exact_match=True,
+                            enable_type_weighting=True,
+                            enable_recency_decay=True,
+                            enable_technical_boost=technical_query
+                        )
 
-                    # Convert back to MemoryResult
-                    search_response.results = [
-                        self._enhancement_dict_to_memory_result(d, original)
-                        for d, original in zip(enhanced_dicts, search_response.results)
-                    ]
+                        # Convert back to MemoryResult
+                        search_response.results = [
+                            self._enhancement_dict_to_memory_result(d, original)
+                            for d, original in zip(enhanced_dicts, search_response.results)
+                        ]
 
-                    logger.debug(f"Applied search enhancements to {len(enhanced_dicts)} results")
+                        logger.debug(f"Applied search enhancements to {len(enhanced_dicts)} results")
 
-                except Exception as enhance_error:
-                    logger.warning(f"Search enhancements failed: {enhance_error}")
+                    except Exception as enhance_error:
+                        logger.warning(f"Search enhancements failed: {enhance_error}")
 
             logger.info(
                 f"RetrievalCore search completed: results={len(search_response.results)}, "
@@ -385,12 +452,54 @@ class RetrievalCore:
                 f"cross_encoder_used={cross_encoder_used}, query_normalized={query_normalization_applied}"
             )
 
-            return search_response
+            if cache_key and search_response.success and search_response.results:
+                with trace.span("cache_store"):
+                    try:
+                        await self.result_cache.set(cache_key, search_response)
+                    except Exception as cache_error:
+                        logger.warning(f"Failed to cache search results: {cache_error}")
+
+            return self._finish_trace(trace, search_response, debug)
 
         except Exception as e:
             logger.error(f"RetrievalCore search failed: {e}")
             raise
 
+    def _finish_trace(
+        self, trace: PipelineTrace, response: SearchResultResponse, debug: bool
+    ) -> SearchResultResponse:
+        """Close the request trace and attach its id (and stage timings when debugging)."""
+        stage_timings = trace.finish()
+        response.trace_id = trace.trace_id
+        if debug:
+            response.stage_timings = stage_timings
+        return response
+
+    async def _result_cache_key(
+        self,
+        query: str,
+        limit: int,
+        search_mode: str,
+        context_type: Optional[str],
+        search_options: SearchOptions
+    ) -> Optional[str]:
+        """Build the semantic result cache key, or None if the query cannot be embedded."""
+        if not QUERY_EMBEDDING_AVAILABLE or generate_query_embedding is None:
+            return None
+        try:
+            embedding = await generate_query_embedding(query, adjust_dimensions=True)
+            return await self.result_cache.make_key(
+                embedding=embedding,
+                limit=limit,
+                search_mode=search_mode,
+                context_type=context_type,
+                filters=search_options.filters,
+                score_threshold=search_options.score_threshold,
+            )
+        except Exception as e:
+            logger.warning(f"Result cache key generation failed, searching uncached: {e}")
+            return None
+
     def _memory_result_to_dict(self, result: MemoryResult) -> Dict[str, Any]:
         """Convert MemoryResult to dict for MQE processing."""
         return {
@@ -532,17 +641,20 @@ def set_retrieval_core(retrieval_core: RetrievalCore) -> None:
     logger.info("RetrievalCore instance set globally")
 
 
-def initialize_retrieval_core(query_dispatcher: QueryDispatcher) -> RetrievalCore:
+def initialize_retrieval_core(
+    query_dispatcher: QueryDispatcher, result_cache=None
+) -> RetrievalCore:
     """
     Initialize and set the global retrieval core instance.
     
     Args:
         query_dispatcher: Configured query dispatcher with all backends
+        result_cache: Optional SearchResultCache for final results
         
     Returns:
         The initialized RetrievalCore instance
     """
-    retrieval_core = RetrievalCore(query_dispatcher)
+    retrieval_core = RetrievalCore(query_dispatcher, result_cache=result_cache)
     set_retrieval_core(retrieval_core)
     logger.info("RetrievalCore initialized and set globally")
     return retrieval_core
\ No newline at end of file
@@ -0,0 +1,229 @@
+"""
+Bounded executor for synchronous storage client calls.
+
+The Redis, Neo4j and Qdrant clients used by the backends and MCP handlers are
+synchronous. Calling them directly from ``async def`` code blocks the event
+loop, so one slow database call stalls every in-flight request. All such
+calls go through a shared thread pool instead, which is bounded (calls beyond
+``max_pending`` are rejected rather than queued without limit) and
+instrumented (queue depth, wait and run times per operation) so saturation
+shows up in metrics.
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+STORAGE_EXECUTOR_WORKERS = int(os.getenv("STORAGE_EXECUTOR_WORKERS", "16"))
+STORAGE_EXECUTOR_MAX_PENDING = int(os.getenv("STORAGE_EXECUTOR_MAX_PENDING", "256"))
+
+
+class StorageExecutorSaturatedError(RuntimeError):
+    """Raised when a storage call is submitted while the executor is full."""
+
+
+class StorageExecutor:
+    """Run blocking storage calls on a bounded, instrumented thread pool."""
+
+    def __init__(
+        self,
+        max_workers: int = STORAGE_EXECUTOR_WORKERS,
+        max_pending: int = STORAGE_EXECUTOR_MAX_PENDING,
+    ):
+        """
+        Args:
+            max_workers: Threads available for storage calls
+            max_pending: Maximum running plus queued calls before rejecting
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(self.max_workers, max_pending)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="storage"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._peak_queue_depth = 0
+        self._submitted = 0
+        self._started = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._total_wait_ms = 0.0
+        self._max_wait_ms = 0.0
+        self._operations: Dict[str, Dict[str, float]] = {}
+
+    async def run(
+        self, func: Callable[..., Any], *args: Any, operation: str = "storage", **kwargs: Any
+    ) -> Any:
+        """
+        Run ``func(*args, **kwargs)`` on the pool and await its result.
+
+        Args:
+            func: Blocking callable to run
+            operation: Label used for per-operation metrics (e.g. "neo4j.query")
+
+        Raises:
+            StorageExecutorSaturatedError: If max_pending calls are already in flight
+        """
+        with self._lock:
+            if self._queued + self._active >= self.max_pending:
+                self._rejected += 1
+                logger.warning(f"Storage executor saturated, rejecting {operation}")
+                raise StorageExecutorSaturatedError(
+                    f"Storage executor saturated: {self._queued + self._active} calls pending "
+                    f"(max {self.max_pending}), rejected {operation}"
+                )
+            self._queued += 1
+            self._submitted += 1
+            self._peak_queue_depth = max(self._peak_queue_depth, self._queued)
+
+        submitted_at = time.perf_counter()
+        # Carry context variables (request ids, log context) into the worker thread
+        context = contextvars.copy_context()
+        call = functools.partial(
+            self._invoke, context, func, args, kwargs, operation, submitted_at
+        )
+        try:
+            future = self._executor.submit(call)
+        except RuntimeError:
+            # Executor already shut down; the call never queued
+            with self._lock:
+                self._queued -= 1
+                self._submitted -= 1
+            raise
+        # A caller cancelled (e.g. by a backend timeout) before a worker picked
+        # the call up never runs, so it must leave the queue here
+        future.add_done_callback(
+            lambda done: self._dequeue_unstarted() if done.cancelled() else None
+        )
+        return await asyncio.wrap_future(future)
+
+    def _dequeue_unstarted(self) -> None:
+        with self._lock:
+            self._queued -= 1
+
+    def _invoke(
+        self,
+        context: contextvars.Context,
+        func: Callable[..., Any],
+        args: tuple,
+        kwargs: Dict[str, Any],
+        operation: str,
+        submitted_at: float,
+    ) -> Any:
+        started_at = time.perf_counter()
+        wait_ms = (started_at - submitted_at) * 1000
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+            self._started += 1
+            self._total_wait_ms += wait_ms
+            self._max_wait_ms = max(self._max_wait_ms, wait_ms)
+
+        failed = False
+        try:
+            return context.run(func, *args, **kwargs)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            run_ms = (time.perf_counter() - started_at) * 1000
+            with self._lock:
+                self._active -= 1
+                if failed:
+                    self._failed += 1
+                else:
+                    self._completed += 1
+                stats = self._operations.setdefault(
+                    operation, {"calls": 0, "errors": 0, "total_run_ms": 0.0, "max_run_ms": 0.0}
+                )
+                stats["calls"] += 1
+                stats["errors"] += int(failed)
+                stats["total_run_ms"] += run_ms
+                stats["max_run_ms"] = max(stats["max_run_ms"], run_ms)
+
+    @property
+    def queue_depth(self) -> int:
+        """Calls waiting for a free worker."""
+        return self._queued
+
+    @property
+    def saturated(self) -> bool:
+        """Whether every worker is busy and calls are waiting."""
+        return self._queued > 0 and self._active >= self.max_workers
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return queue depth, throughput and latency metrics."""
+        with self._lock:
+            operations = {
+                name: {
+                    "calls": int(stats["calls"]),
+                    "errors": int(stats["errors"]),
+                    "avg_run_ms": stats["total_run_ms"] / stats["calls"] if stats["calls"] else 0.0,
+                    "max_run_ms": stats["max_run_ms"],
+                }
+                for name, stats in self._operations.items()
+            }
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "active": self._active,
+                "queue_depth": self._queued,
+                "peak_queue_depth": self._peak_queue_depth,
+                "saturated": self._queued > 0 and self._active >= self.max_workers,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "avg_wait_ms": self._total_wait_ms / self._started if self._started else 0.0,
+                "max_wait_ms": self._max_wait_ms,
+                "operations": operations,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting calls and release the worker threads."""
+        self._executor.shutdown(wait=wait)
+
+
+_storage_executor: Optional[StorageExecutor] = None
+_storage_executor_lock = threading.Lock()
+
+
+def get_storage_executor() -> StorageExecutor:
+    """
+    Get or create the global storage executor.
+
+    Returns:
+        Global StorageExecutor instance
+    """
+    global _storage_executor
+    if _storage_executor is None:
+        with _storage_executor_lock:
+            if _storage_executor is None:
+                _storage_executor = StorageExecutor()
+    return _storage_executor
+
+
+def reset_storage_executor() -> None:
+    """Shut down and reset the global storage executor (useful for testing)."""
+    global _storage_executor
+    with _storage_executor_lock:
+        if _storage_executor is not None:
+            _storage_executor.shutdown(wait=False)
+        _storage_executor = None
+
+
+async def run_storage_call(
+    func: Callable[..., Any], *args: Any, operation: str = "storage", **kwargs: Any
+) -> Any:
+    """Run a blocking storage call on the global storage executor."""
+    return await get_storage_executor().run(func, *args, operation=operation, **kwargs)
@@ -13,7 +13,8 @@ from .service import (
     ModelLoadError,
     DimensionMismatchError,
     get_embedding_service,
-    generate_embedding
+    generate_embedding,
+    generate_embeddings
 )
 
 __all__ = [
@@ -24,5 +25,6 @@ __all__ = [
     "ModelLoadError",
     "DimensionMismatchError",
     "get_embedding_service",
-    "generate_embedding"
+    "generate_embedding",
+    "generate_embeddings"
 ]
\ No newline at end of file
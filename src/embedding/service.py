@@ -5,6 +5,7 @@ Provides a robust, configurable embedding generation service that handles:
 - Multiple embedding models with automatic dimension adjustment
 - Retry logic for failed embedding generation
 - Caching for performance optimization
+- Micro-batching of concurrent requests into single model calls
 - Health monitoring and metrics
 """
 
@@ -13,7 +14,8 @@ import logging
 import os
 import time
 import yaml
-from typing import Any, Dict, List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
 from collections import OrderedDict
@@ -86,6 +88,9 @@ class EmbeddingConfig:
     cache_max_size: int = 1000
     cache_max_memory_mb: int = 100
     batch_size: int = 100
+    # How long the micro-batcher waits for concurrent requests to join a
+    # batch; 0 encodes every request on its own
+    batch_window_ms: float = 2.0
 
 class EmbeddingError(Exception):
     """Base exception for embedding operations."""
@@ -108,6 +113,8 @@ class EmbeddingService:
     - Dimension padding/truncation for compatibility
     - Retry logic with exponential backoff
     - Performance monitoring and caching
+    - Micro-batching: concurrent single requests are encoded as one batch
+      in a worker thread, off the event loop
     - Health checks and diagnostics
     """
     
@@ -125,9 +132,21 @@ class EmbeddingService:
             "cache_evictions": 0,
             "cache_memory_usage_mb": 0.0,
             "average_generation_time": 0.0,
-            "model_load_time": None
+            "model_load_time": None,
+            "batches_encoded": 0,
+            "texts_encoded": 0,
+            "average_batch_size": 0.0
         }
         
+        # Micro-batcher state: queued (text, future) pairs waiting for the
+        # batch window, and raw embeddings being computed keyed by cache key
+        self._batch_queue: List[Tuple[str, asyncio.Future]] = []
+        self._batch_timer: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks = set()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        # One worker: the model runs one batch at a time, batches carry the parallelism
+        self._executor: Optional[ThreadPoolExecutor] = None
+        
         # Initialize OpenTelemetry instrumentation
         if OTEL_AVAILABLE:
             self._tracer = trace.get_tracer(__name__)
@@ -271,11 +290,11 @@ class EmbeddingService:
                 # Extract text from content
                 text = self._extract_text(content)
                 span.set_attribute("embedding.text_length", len(text))
+                cache_key = self._get_cache_key(text)
                 
                 # Check cache first
                 cache_hit = False
                 if self._cache is not None:
-                    cache_key = self._get_cache_key(text)
                     cached_embedding = self._get_from_cache(cache_key)
                     if cached_embedding is not None:
                         self._metrics["cache_hits"] += 1
@@ -283,12 +302,21 @@ class EmbeddingService:
                         span.set_attribute("embedding.cache_hit", True)
                         self._cache_counter.add(1, {"operation": "hit"})
                         return cached_embedding
+                    
+                    # Same text already being encoded: share its result
+                    in_flight = self._in_flight.get(cache_key)
+                    if in_flight is not None:
+                        self._metrics["cache_hits"] += 1
+                        span.set_attribute("embedding.cache_hit", True)
+                        self._cache_counter.add(1, {"operation": "coalesced"})
+                        embedding = list(await asyncio.shield(in_flight))
+                        return self._adjust_dimensions(embedding) if adjust_dimensions else embedding
                 
                 span.set_attribute("embedding.cache_hit", False)
                 self._cache_counter.add(1, {"operation": "miss"})
                 
-                # Generate embedding with retries
-                embedding = await self._generate_with_retries(text)
+                # Generate embedding through the micro-batcher (retries included)
+                embedding = await self._submit_to_batcher(text, cache_key)
                 
                 # Adjust dimensions if requested
                 if adjust_dimensions:
@@ -329,8 +357,159 @@ class EmbeddingService:
                 logger.error(f"Embedding generation failed: {e}")
                 raise EmbeddingError(f"Failed to generate embedding: {e}")
     
+    async def generate_embeddings(
+        self,
+        contents: List[Union[str, Dict[str, Any]]],
+        adjust_dimensions: bool = True
+    ) -> List[List[float]]:
+        """
+        Generate embeddings for many contents with batched model calls.
+        
+        Cached texts are served from the cache; the remaining unique texts are
+        encoded in chunks of ``config.batch_size`` in the worker thread.
+        
+        Args:
+            contents: Texts or structured contents to embed
+            adjust_dimensions: Whether to pad/truncate to target dimensions
+            
+        Returns:
+            List[List[float]]: One embedding per content, in input order
+            
+        Raises:
+            EmbeddingError: If embedding generation fails
+        """
+        if not contents:
+            return []
+        
+        start_time = time.time()
+        self._metrics["total_requests"] += len(contents)
+        
+        with self._tracer.start_span("embedding.generate_batch") as span:
+            try:
+                span.set_attribute("embedding.model", self.config.model.value[0])
+                span.set_attribute("embedding.batch_size", len(contents))
+                
+                texts = [self._extract_text(content) for content in contents]
+                keys = [self._get_cache_key(text) for text in texts]
+                results: List[Optional[List[float]]] = [None] * len(texts)
+                
+                # Serve cache hits, collect unique misses
+                missing: Dict[str, str] = {}
+                for i, (text, key) in enumerate(zip(texts, keys)):
+                    cached = self._get_from_cache(key) if self._cache is not None else None
+                    if cached is not None:
+                        self._metrics["cache_hits"] += 1
+                        results[i] = cached
+                    else:
+                        missing.setdefault(key, text)
+                
+                span.set_attribute("embedding.cache_misses", len(missing))
+                self._cache_counter.add(len(texts) - len(missing), {"operation": "hit"})
+                self._cache_counter.add(len(missing), {"operation": "miss"})
+                
+                # Encode misses in model-sized chunks
+                computed: Dict[str, List[float]] = {}
+                miss_keys = list(missing)
+                for offset in range(0, len(miss_keys), self.config.batch_size):
+                    chunk = miss_keys[offset:offset + self.config.batch_size]
+                    embeddings = await self._generate_batch_with_retries([missing[key] for key in chunk])
+                    for key, embedding in zip(chunk, embeddings):
+                        if adjust_dimensions:
+                            embedding = self._adjust_dimensions(embedding)
+                        computed[key] = embedding
+                        if self._cache is not None:
+                            self._store_in_cache(key, embedding)
+                
+                for i, key in enumerate(keys):
+                    if results[i] is None:
+                        results[i] = computed[key]
+                
+                generation_time = time.time() - start_time
+                for _ in range(len(missing)):
+                    self._update_metrics(generation_time, success=True)
+                
+                span.set_attribute("embedding.generation_time_seconds", generation_time)
+                span.set_status(Status(StatusCode.OK))
+                self._embedding_counter.add(len(contents), {"status": "success"})
+                self._embedding_duration.record(generation_time, {"status": "success"})
+                
+                logger.debug(
+                    f"Generated {len(missing)} embeddings ({len(contents) - len(missing)} cached) "
+                    f"in {generation_time:.3f}s"
+                )
+                return results
+                
+            except Exception as e:
+                generation_time = time.time() - start_time
+                self._update_metrics(generation_time, success=False)
+                
+                span.set_attribute("embedding.error", str(e))
+                span.set_status(Status(StatusCode.ERROR, str(e)))
+                
+                self._embedding_counter.add(len(contents), {"status": "error"})
+                self._embedding_duration.record(generation_time, {"status": "error"})
+                
+                logger.error(f"Batch embedding generation failed: {e}")
+                raise EmbeddingError(f"Failed to generate embeddings: {e}")
+    
+    async def _submit_to_batcher(self, text: str, cache_key: str) -> List[float]:
+        """
+        Queue a single text for the next micro-batch and wait for its embedding.
+        
+        Requests arriving within ``config.batch_window_ms`` of each other are
+        encoded by one model call; a full batch is dispatched immediately.
+        """
+        if self.config.batch_window_ms <= 0:
+            return await self._generate_with_retries(text)
+        
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._in_flight[cache_key] = future
+        self._batch_queue.append((text, future))
+        
+        if len(self._batch_queue) >= self.config.batch_size:
+            self._dispatch_batch()
+        elif self._batch_timer is None:
+            self._batch_timer = loop.call_later(self.config.batch_window_ms / 1000, self._dispatch_batch)
+        
+        try:
+            return list(await asyncio.shield(future))
+        finally:
+            if self._in_flight.get(cache_key) is future:
+                del self._in_flight[cache_key]
+    
+    def _dispatch_batch(self) -> None:
+        """Hand the queued requests to a batch task."""
+        if self._batch_timer is not None:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+        
+        batch, self._batch_queue = self._batch_queue, []
+        if batch:
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Encode one micro-batch and resolve every caller's future."""
+        try:
+            embeddings = await self._generate_batch_with_retries([text for text, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), embedding in zip(batch, embeddings):
+            if not future.done():
+                future.set_result(embedding)
+    
     async def _generate_with_retries(self, text: str) -> List[float]:
         """Generate embedding with retry logic."""
+        return (await self._generate_batch_with_retries([text]))[0]
+    
+    async def _generate_batch_with_retries(self, texts: List[str]) -> List[List[float]]:
+        """Encode a batch of texts in the worker thread with retry logic."""
         last_error = None
         
         for attempt in range(self.config.max_retries):
@@ -338,16 +517,18 @@ class EmbeddingService:
                 if not self._model_loaded:
                     await self.initialize()
                 
-                # Generate embedding
-                embedding = self._model.encode(text, convert_to_tensor=False)
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding")
                 
-                # Convert to list
-                if hasattr(embedding, "tolist"):
-                    embedding = embedding.tolist()
-                else:
-                    embedding = list(embedding)
+                loop = asyncio.get_running_loop()
+                embeddings = await loop.run_in_executor(self._executor, self._encode_batch, texts)
                 
-                return embedding
+                self._metrics["batches_encoded"] += 1
+                self._metrics["texts_encoded"] += len(texts)
+                self._metrics["average_batch_size"] = (
+                    self._metrics["texts_encoded"] / self._metrics["batches_encoded"]
+                )
+                return embeddings
                 
             except Exception as e:
                 last_error = e
@@ -360,6 +541,22 @@ class EmbeddingService:
         
         raise EmbeddingError(f"All {self.config.max_retries} attempts failed. Last error: {last_error}")
     
+    def _encode_batch(self, texts: List[str]) -> List[List[float]]:
+        """Run the model on a batch of texts (called in the worker thread)."""
+        if len(texts) == 1:
+            embeddings = [self._model.encode(texts[0], convert_to_tensor=False)]
+        else:
+            embeddings = self._model.encode(texts, convert_to_tensor=False, batch_size=self.config.batch_size)
+        
+        # Convert to lists
+        embeddings = [
+            embedding.tolist() if hasattr(embedding, "tolist") else list(embedding)
+            for embedding in embeddings
+        ]
+        if len(embeddings) != len(texts):
+            raise EmbeddingError(f"Model returned {len(embeddings)} embeddings for {len(texts)} texts")
+        return embeddings
+    
     def _extract_text(self, content: Union[str, Dict[str, Any]]) -> str:
         """Extract text from content for embedding."""
         if isinstance(content, str):
@@ -561,7 +758,8 @@ class EmbeddingService:
             "timeout_seconds": self.config.timeout_seconds,
             "cache_enabled": self.config.cache_enabled,
             "cache_ttl_seconds": self.config.cache_ttl_seconds,
-            "batch_size": self.config.batch_size
+            "batch_size": self.config.batch_size,
+            "batch_window_ms": self.config.batch_window_ms
         }
 
 # Global service instance
@@ -648,6 +846,7 @@ def _load_config_from_file() -> Optional[EmbeddingConfig]:
                 max_retries=int(embedding_cfg.get('max_retries', 3)),
                 timeout_seconds=float(embedding_cfg.get('timeout', 30.0)),
                 batch_size=int(embedding_cfg.get('batch_size', 100)),
+                batch_window_ms=float(embedding_cfg.get('batch_window_ms', 2.0)),
             )
 
             logger.info(
@@ -715,4 +914,21 @@ async def generate_embedding(
         List[float]: Embedding vector
     """
     service = await get_embedding_service()
-    return await service.generate_embedding(content, adjust_dimensions)
\ No newline at end of file
+    return await service.generate_embedding(content, adjust_dimensions)
+
+async def generate_embeddings(
+    contents: List[Union[str, Dict[str, Any]]],
+    adjust_dimensions: bool = True
+) -> List[List[float]]:
+    """
+    Convenience function to generate embeddings for many contents at once.
+    
+    Args:
+        contents: Contents to embed
+        adjust_dimensions: Whether to adjust dimensions
+        
+    Returns:
+        List[List[float]]: One embedding vector per content
+    """
+    service = await get_embedding_service()
+    return await service.generate_embeddings(contents, adjust_dimensions)
@@ -8,7 +8,7 @@ to enable consistent querying across vector, graph, and key-value stores.
 
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 class SearchOptions(BaseModel):
@@ -19,6 +19,17 @@ class SearchOptions(BaseModel):
     score_threshold: float = Field(default=0.0, ge=0.0, le=1.0, description="Minimum score threshold")
     include_metadata: bool = Field(default=True, description="Include metadata in results")
     namespace: Optional[str] = Field(default=None, description="Optional namespace for query scoping")
+    timeout_ms: Optional[float] = Field(default=None, gt=0, description="Deadline applied to each backend in milliseconds")
+    backend_timeouts: Dict[str, float] = Field(default_factory=dict, description="Per-backend deadline overrides in milliseconds")
+    
+    @field_validator('backend_timeouts')
+    @classmethod
+    def backend_timeouts_positive(cls, v):
+        """Ensure every per-backend deadline is positive, like timeout_ms."""
+        for name, timeout_ms in v.items():
+            if timeout_ms <= 0:
+                raise ValueError(f"backend_timeouts['{name}'] must be positive")
+        return v
     
     class Config:
         schema_extra = {
@@ -27,7 +38,9 @@ class SearchOptions(BaseModel):
                 "filters": {"type": "code", "tags": ["python"]},
                 "score_threshold": 0.5,
                 "include_metadata": True,
-                "namespace": "agent_123"
+                "namespace": "agent_123",
+                "timeout_ms": 500,
+                "backend_timeouts": {"graph": 250}
             }
         }
 
@@ -141,4 +154,12 @@ class BackendSearchError(Exception):
         self.backend_name = backend_name
         self.message = message
         self.original_error = original_error
-        super().__init__(f"Backend '{backend_name}' search failed: {message}")
\ No newline at end of file
+        super().__init__(f"Backend '{backend_name}' search failed: {message}")
+
+
+class BackendTimeoutError(BackendSearchError):
+    """Exception raised when a backend misses its search deadline."""
+    
+    def __init__(self, backend_name: str, timeout_ms: float):
+        self.timeout_ms = timeout_ms
+        super().__init__(backend_name, f"deadline of {timeout_ms:.0f}ms exceeded")
@@ -126,6 +126,8 @@ class SearchResultResponse(BaseModel):
     # Backend performance breakdown
     backend_timings: Dict[str, float] = Field(default_factory=dict, description="Per-backend timing breakdown")
     backends_used: List[str] = Field(default_factory=list, description="List of backends that were queried")
+    timed_out_backends: List[str] = Field(default_factory=list, description="Backends that missed their deadline; their backend_timings entry is the time waited")
+    stage_timings: Dict[str, float] = Field(default_factory=dict, description="Per-stage retrieval pipeline timings in milliseconds (debug requests only)")
 
     # Result source breakdown (Issue #311: visibility into hybrid search composition)
     source_breakdown: Dict[str, int] = Field(default_factory=lambda: {}, description="Count of results from each source (vector, graph, text, kv)")
@@ -164,7 +166,8 @@ class SearchResultResponse(BaseModel):
                     "vector": 25.1,
                     "graph": 20.1
                 },
-                "backends_used": ["vector", "graph"]
+                "backends_used": ["vector", "graph"],
+                "timed_out_backends": []
             }
         }
 
@@ -22,6 +22,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 from .models import SortBy
+from .tool_dispatch import register_tool
 
 # Import secure error handling and MCP validation
 try:
@@ -83,6 +84,9 @@ if (
 
 from ..core.config import Config
 from ..core.semantic_cache import get_semantic_cache_generator
+from ..core.pipeline_tracing import get_stage_histograms
+from ..core.storage_executor import get_storage_executor, run_storage_call
+from ..storage.near_duplicate import MinHasher, MinHashLSHIndex, word_shingles
 from ..utils.text_generation import generate_searchable_text
 
 # Import embedding service for semantic cache keys
@@ -104,6 +108,21 @@ HEALTH_CHECK_RETRY_DELAY_DEFAULT = 5.0
 # Configurable via environment variable for expensive queries
 CACHE_TTL_SECONDS = int(os.getenv("VERIS_CACHE_TTL_SECONDS", "300"))  # Default: 5 minutes
 
+# Semantic result cache in front of RetrievalCore (in-process LRU + Redis)
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+
+# BM25 text backend, seeded from Neo4j/Qdrant by the streaming indexer
+TEXT_BACKEND_ENABLED = os.getenv("TEXT_BACKEND_ENABLED", "false").lower() == "true"
+
+# Maximum number of contexts accepted by one store_contexts_batch request
+STORE_BATCH_MAX_ITEMS = int(os.getenv("STORE_BATCH_MAX_ITEMS", "1000"))
+
+# Duplicate detection in store_context (opt-in). MinHash LSH over contexts stored by
+# this process finds candidates; only a candidate with identical content is reused.
+STORE_DEDUP_ENABLED = os.getenv("STORE_DEDUP_ENABLED", "false").lower() == "true"
+STORE_DEDUP_THRESHOLD = float(os.getenv("STORE_DEDUP_THRESHOLD", "0.9"))  # Estimated Jaccard
+STORE_DEDUP_MAX_ENTRIES = int(os.getenv("STORE_DEDUP_MAX_ENTRIES", "50000"))
+
 # Sentinel monitoring configuration (Phase 2)
 METRICS_CACHE_TTL_SECONDS = int(os.getenv("METRICS_CACHE_TTL_SECONDS", "10"))  # Default: 10 seconds
 SERVICE_VERSION = os.getenv("SERVICE_VERSION", "0.9.0")  # Configurable version
@@ -307,6 +326,22 @@ TextSearchBackend = _try_import_backend_component(
     "src.backends.text_backend", "TextSearchBackend", unified_backend_components, unified_backend_errors
 )
 
+initialize_text_backend = _try_import_backend_component(
+    "src.backends.text_backend", "initialize_text_backend", unified_backend_components, unified_backend_errors
+)
+
+StreamingTextIndexer = _try_import_backend_component(
+    "src.backends.text_indexer", "StreamingTextIndexer", unified_backend_components, unified_backend_errors
+)
+
+Neo4jContextSource = _try_import_backend_component(
+    "src.backends.text_indexer", "Neo4jContextSource", unified_backend_components, unified_backend_errors
+)
+
+QdrantContextSource = _try_import_backend_component(
+    "src.backends.text_indexer", "QdrantContextSource", unified_backend_components, unified_backend_errors
+)
+
 create_embedding_generator = _try_import_backend_component(
     "src.core.embedding_config",
     "create_embedding_generator",
@@ -314,6 +349,14 @@ create_embedding_generator = _try_import_backend_component(
     unified_backend_errors,
 )
 
+SearchResultCache = _try_import_backend_component(
+    "src.core.result_cache", "SearchResultCache", unified_backend_components, unified_backend_errors
+)
+
+KVContentIndex = _try_import_backend_component(
+    "src.backends.kv_index", "KVContentIndex", unified_backend_components, unified_backend_errors
+)
+
 # Determine if unified backend is available (requires core components)
 UNIFIED_BACKEND_AVAILABLE = (
     "QueryDispatcher" in unified_backend_components
@@ -598,11 +641,21 @@ _qdrant_init_status = {
 # PHASE 1: Global unified search infrastructure
 query_dispatcher = None
 retrieval_core = None
+text_backend = None
+text_indexer = None
 
 # Global dashboard components
 dashboard = None
 websocket_connections = set()  # Track WebSocket connections
 
+# Signatures of fully stored contexts, for store_context near-duplicate detection
+store_dedup_hasher = MinHasher()
+store_dedup_index = MinHashLSHIndex(
+    num_perm=store_dedup_hasher.num_perm,
+    threshold=STORE_DEDUP_THRESHOLD,
+    max_entries=STORE_DEDUP_MAX_ENTRIES,
+)
+
 
 class StoreContextRequest(BaseModel):
     """Request model for store_context tool.
@@ -632,6 +685,21 @@ class StoreContextRequest(BaseModel):
     )
 
 
+class StoreContextsBatchRequest(BaseModel):
+    """Request model for store_contexts_batch tool.
+
+    Attributes:
+        items: Contexts to store, each shaped like a store_context request
+    """
+
+    items: List[StoreContextRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=STORE_BATCH_MAX_ITEMS,
+        description=f"Contexts to store (1-{STORE_BATCH_MAX_ITEMS})",
+    )
+
+
 class RetrieveContextRequest(BaseModel):
     """Request model for retrieve_context tool.
 
@@ -645,6 +713,7 @@ class RetrieveContextRequest(BaseModel):
         sort_by: Sort order for results (timestamp or relevance)
         exclude_sources: List of source/author values to exclude from results
         use_cache: Whether to use cached results (default: true). Set to false for fresh results.
+        debug: Include the trace_id and per-stage pipeline timings in the response
     """
 
     query: str
@@ -667,6 +736,10 @@ class RetrieveContextRequest(BaseModel):
         default=True,
         description="Whether to use cached results. Set to false to bypass cache and get fresh results.",
     )
+    debug: bool = Field(
+        default=False,
+        description="Include the trace_id and per-stage retrieval timings (stage_timings) in the response.",
+    )
 
 
 class QueryGraphRequest(BaseModel):
@@ -892,6 +965,7 @@ def validate_startup_credentials() -> Dict[str, Optional[str]]:
 async def startup_event() -> None:
     """Initialize storage clients and MCP validation on startup."""
     global neo4j_client, qdrant_client, kv_store, dashboard, query_dispatcher, retrieval_core
+    global text_backend, text_indexer
 
     # Initialize MCP contract validator
     try:
@@ -1095,23 +1169,41 @@ async def startup_event() -> None:
                         logger.warning(f"⚠️ KV backend initialization failed: {e}")
 
                 # Initialize Text Backend (BM25 full-text search)
-                # DISABLED: Text backend is not production-ready
-                # Issue: Text backend initializes with empty in-memory index and is not auto-seeded
-                # from Neo4j/Qdrant, causing it to return 0 results. In hybrid search mode, this
-                # empty backend (priority 2) may interfere with graph backend (priority 3) results.
-                # TODO: Implement auto-indexing from existing storage before re-enabling
-                # if TextSearchBackend:
-                #     try:
-                #         text_backend = TextSearchBackend()
-                #         query_dispatcher.register_backend("text", text_backend)
-                #         logger.info("✅ Text backend registered with MCP dispatcher")
-                #         logger.info("   Note: Text backend uses in-memory BM25 indexing")
-                #     except Exception as e:
-                #         logger.warning(f"⚠️ Text backend initialization failed: {e}")
-                logger.info("ℹ️ Text backend disabled - awaiting auto-indexing implementation")
-
-                # Initialize unified RetrievalCore
-                retrieval_core = initialize_retrieval_core(query_dispatcher)
+                # Existing segments (TEXT_INDEX_DIR) are mapped immediately; the streaming
+                # indexer then pages Neo4j/Qdrant in the background from its last checkpoint,
+                # so the backend serves a partial index while the catch-up runs. New contexts
+                # are added on the store path; the indexer backfills whatever that missed.
+                if TEXT_BACKEND_ENABLED and initialize_text_backend and StreamingTextIndexer:
+                    try:
+                        text_backend = initialize_text_backend()
+                        await text_backend.initialize()
+                        sources = []
+                        if neo4j_client:
+                            # First, so the richer graph searchable_text wins for shared ids
+                            sources.append(Neo4jContextSource(neo4j_client))
+                        if qdrant_client:
+                            # Only adds contexts without a graph node
+                            sources.append(QdrantContextSource(qdrant_client))
+                        text_indexer = StreamingTextIndexer(text_backend, sources)
+                        text_indexer.start()
+                        query_dispatcher.register_backend("text", text_backend)
+                        logger.info(
+                            f"✅ Text backend registered with MCP dispatcher "
+                            f"({text_backend.document_count} documents, catch-up running)"
+                        )
+                    except Exception as e:
+                        logger.warning(f"⚠️ Text backend initialization failed: {e}")
+                        text_backend = None
+                        text_indexer = None
+                else:
+                    logger.info("ℹ️ Text backend disabled (set TEXT_BACKEND_ENABLED=true)")
+
+                # Initialize unified RetrievalCore with the shared semantic result cache
+                result_cache = None
+                if SearchResultCache and RESULT_CACHE_ENABLED:
+                    result_cache = SearchResultCache(redis_client=simple_redis)
+                    logger.info("✅ Semantic result cache enabled for RetrievalCore")
+                retrieval_core = initialize_retrieval_core(query_dispatcher, result_cache=result_cache)
                 logger.info(
                     "✅ Unified RetrievalCore initialized - MCP now uses same search path as API"
                 )
@@ -1169,6 +1261,10 @@ async def shutdown_event() -> None:
     if dashboard:
         await dashboard.stop_collection_loop()
         await dashboard.shutdown()
+    if text_indexer:
+        await text_indexer.stop()
+    if text_backend:
+        await text_backend.cleanup()
 
     # Stop metrics queue processor
     if REQUEST_METRICS_AVAILABLE:
@@ -1295,7 +1391,7 @@ async def _check_service_with_retries(
 
     for attempt in range(max_retries):
         try:
-            await asyncio.get_event_loop().run_in_executor(None, check_func)
+            await run_storage_call(check_func, operation=f"health_check.{service_name.lower()}")
             logger.info(f"{service_name} health check successful on attempt {attempt + 1}")
             return "healthy", ""
         except (ConnectionRefusedError, OSError) as e:
@@ -1537,6 +1633,8 @@ async def debug_features() -> Dict[str, Any]:
         features["cross_encoder"]["model_loaded"] = reranker.enabled and reranker.model is not None
         features["cross_encoder"]["model_name"] = reranker.model_name
         features["cross_encoder"]["request_count"] = reranker.request_count
+        features["cross_encoder"]["score_cache"] = reranker.score_cache.get_stats()
+        features["cross_encoder"]["batching"] = reranker.batcher.get_stats()
     except Exception as e:
         features["cross_encoder"]["model_loaded"] = False
         features["cross_encoder"]["model_error"] = str(e)
@@ -1818,6 +1916,76 @@ async def prometheus_metrics() -> PlainTextResponse:
         f"veris_memory_info{{version=\"{SERVICE_VERSION}\",protocol=\"{SERVICE_PROTOCOL}\"}} 1",
     ]
 
+    # Qdrant write durability and sampled verification of async writes
+    if qdrant_client is not None and hasattr(qdrant_client, "get_write_stats"):
+        write_stats = qdrant_client.get_write_stats()
+        metrics_lines.extend([
+            "",
+            "# HELP veris_memory_qdrant_writes_total Vectors written to Qdrant by durability mode",
+            "# TYPE veris_memory_qdrant_writes_total counter",
+        ])
+        for mode, count in write_stats["writes"].items():
+            metrics_lines.append(f"veris_memory_qdrant_writes_total{{durability=\"{mode}\"}} {count}")
+        metrics_lines.extend([
+            "",
+            "# HELP veris_memory_qdrant_write_verifications_total Sampled async write verifications by result",
+            "# TYPE veris_memory_qdrant_write_verifications_total counter",
+        ])
+        for result in ("verified", "missing", "corrupted", "errors", "dropped"):
+            count = write_stats["verification"][result]
+            metrics_lines.append(
+                f"veris_memory_qdrant_write_verifications_total{{result=\"{result}\"}} {count}"
+            )
+
+    # Storage executor saturation: queue depth > 0 with all workers busy
+    executor_stats = get_storage_executor().get_stats()
+    metrics_lines.extend([
+        "",
+        "# HELP veris_memory_storage_executor_queue_depth Storage calls waiting for a worker thread",
+        "# TYPE veris_memory_storage_executor_queue_depth gauge",
+        f"veris_memory_storage_executor_queue_depth {executor_stats['queue_depth']}",
+        "# HELP veris_memory_storage_executor_active Storage calls currently running",
+        "# TYPE veris_memory_storage_executor_active gauge",
+        f"veris_memory_storage_executor_active {executor_stats['active']}",
+        "# HELP veris_memory_storage_executor_workers Storage executor worker threads",
+        "# TYPE veris_memory_storage_executor_workers gauge",
+        f"veris_memory_storage_executor_workers {executor_stats['max_workers']}",
+        "# HELP veris_memory_storage_executor_rejected_total Storage calls rejected while saturated",
+        "# TYPE veris_memory_storage_executor_rejected_total counter",
+        f"veris_memory_storage_executor_rejected_total {executor_stats['rejected']}",
+        "# HELP veris_memory_storage_executor_wait_ms_max Longest time a storage call waited for a worker",
+        "# TYPE veris_memory_storage_executor_wait_ms_max gauge",
+        f"veris_memory_storage_executor_wait_ms_max {executor_stats['max_wait_ms']:.3f}",
+        "# HELP veris_memory_storage_calls_total Storage calls by operation",
+        "# TYPE veris_memory_storage_calls_total counter",
+    ])
+    for operation, stats in executor_stats["operations"].items():
+        metrics_lines.append(
+            f"veris_memory_storage_calls_total{{operation=\"{operation}\"}} {stats['calls']}"
+        )
+
+    # RetrievalCore semantic result cache
+    result_cache = getattr(retrieval_core, "result_cache", None) if retrieval_core else None
+    if result_cache is not None:
+        cache_stats = result_cache.get_stats()
+        metrics_lines.extend([
+            "",
+            "# HELP veris_memory_result_cache_lookups_total Result cache lookups by outcome",
+            "# TYPE veris_memory_result_cache_lookups_total counter",
+            f"veris_memory_result_cache_lookups_total{{outcome=\"memory_hit\"}} {cache_stats['memory_hits']}",
+            f"veris_memory_result_cache_lookups_total{{outcome=\"redis_hit\"}} {cache_stats['redis_hits']}",
+            f"veris_memory_result_cache_lookups_total{{outcome=\"miss\"}} {cache_stats['misses']}",
+            "# HELP veris_memory_result_cache_entries Entries in the in-process result cache",
+            "# TYPE veris_memory_result_cache_entries gauge",
+            f"veris_memory_result_cache_entries {cache_stats['memory_entries']}",
+        ])
+
+    # RetrievalCore per-stage latency histograms
+    stage_histogram_lines = get_stage_histograms().prometheus_lines()
+    if stage_histogram_lines:
+        metrics_lines.append("")
+        metrics_lines.extend(stage_histogram_lines)
+
     return PlainTextResponse("\n".join(metrics_lines))
 
 
@@ -2001,6 +2169,37 @@ async def list_tools() -> Dict[str, Any]:
                 "metadata": {"priority": "high"},
             },
         },
+        "store_contexts_batch": {
+            "name": "store_contexts_batch",
+            "description": "Store many contexts with batched embeddings, vector upsert and graph writes",
+            "endpoint": "/tools/store_contexts_batch",
+            "method": "POST",
+            "available": qdrant_client is not None or neo4j_client is not None,
+            "requires_auth": API_KEY_AUTH_AVAILABLE,
+            "capabilities": ["write", "store", "batch"],
+            "input_schema": {
+                "type": "object",
+                "required": ["items"],
+                "properties": {
+                    "items": {
+                        "type": "array",
+                        "minItems": 1,
+                        "maxItems": STORE_BATCH_MAX_ITEMS,
+                        "description": "store_context requests",
+                    },
+                },
+            },
+            "example": {
+                "items": [
+                    {"content": {"title": "API design"}, "type": "design"},
+                    {
+                        "content": {"title": "Use REST"},
+                        "type": "decision",
+                        "relationships": [{"type": "IMPLEMENTS", "target": "ctx-123"}],
+                    },
+                ]
+            },
+        },
         "retrieve_context": {
             "name": "retrieve_context",
             "description": "Retrieve contexts using hybrid search (vector + graph)",
@@ -2193,7 +2392,9 @@ async def verify_readiness() -> Dict[str, Any]:
         index_info = {}
         if qdrant_client:
             try:
-                collections = qdrant_client.get_collections()
+                collections = await run_storage_call(
+                    qdrant_client.get_collections, operation="qdrant.get_collections"
+                )
                 if hasattr(collections, "collections"):
                     for collection in collections.collections:
                         if collection.name == "context_store":
@@ -2208,7 +2409,11 @@ async def verify_readiness() -> Dict[str, Any]:
         if neo4j_client:
             try:
                 # Try to get node count
-                result = neo4j_client.execute_query("MATCH (n) RETURN count(n) as node_count")
+                result = await run_storage_call(
+                    neo4j_client.execute_query,
+                    "MATCH (n) RETURN count(n) as node_count",
+                    operation="neo4j.query",
+                )
                 if result and len(result) > 0:
                     index_info["graph_nodes"] = result[0].get("node_count", "unknown")
             except Exception:
@@ -2313,6 +2518,225 @@ async def verify_readiness() -> Dict[str, Any]:
         }
 
 
+def _apply_author_attribution(
+    request: StoreContextRequest, api_key_info: Optional[APIKeyInfo]
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Resolve the author of a store request and record it in the request metadata.
+
+    Sprint 13 Phase 2.2: the author is auto-populated from the API key when the
+    request does not name one.
+
+    Returns:
+        (author, author_type) tuple
+    """
+    author = request.author
+    author_type = request.author_type
+
+    if api_key_info and not author:
+        author = api_key_info.user_id
+        author_type = "agent" if api_key_info.is_agent else "human"
+        logger.info(f"Auto-populated author: {author} (type: {author_type})")
+
+    # Add author to metadata if not already present
+    if request.metadata is None:
+        request.metadata = {}
+
+    if author:
+        request.metadata["author"] = author
+        request.metadata["author_type"] = author_type
+        request.metadata["stored_at"] = datetime.now().isoformat()
+
+    return author, author_type
+
+
+def _build_context_node_properties(
+    context_id: str,
+    request: StoreContextRequest,
+    author: Optional[str],
+    author_type: Optional[str],
+) -> Dict[str, Any]:
+    """Flatten a store request into Neo4j-compatible Context node properties."""
+    # Flatten nested objects for Neo4j compatibility
+    flattened_properties = {
+        "id": context_id,
+        "type": request.type,
+        # Sprint 13 Phase 2.2: Add author attribution to graph
+        "author": author or "unknown",
+        "author_type": author_type or "unknown",
+        "created_at": datetime.now().isoformat(),
+    }
+
+    # Handle request.content safely - convert nested objects to JSON strings
+    for key, value in request.content.items():
+        # Ensure value is JSON-serializable before attempting to serialize
+        safe_value = make_json_serializable(value)
+        if isinstance(safe_value, (dict, list)):
+            flattened_properties[f"{key}_json"] = json.dumps(safe_value)
+        else:
+            flattened_properties[key] = safe_value
+
+    # Also store metadata fields at the top level for easy retrieval
+    if request.metadata:
+        for key, value in request.metadata.items():
+            if key not in [
+                "author",
+                "author_type",
+                "stored_at",
+            ]:  # These are already added
+                # Ensure value is JSON-serializable
+                safe_value = make_json_serializable(value)
+                if isinstance(safe_value, (dict, list)):
+                    flattened_properties[key] = json.dumps(safe_value)
+                else:
+                    flattened_properties[key] = safe_value
+
+    # PR #339: Generate searchable_text field for dynamic property indexing
+    # This enables search across both standard fields AND custom properties
+    searchable_text = generate_searchable_text(flattened_properties)
+    flattened_properties['searchable_text'] = searchable_text
+    logger.debug(f"Generated searchable_text with {len(searchable_text)} characters")
+
+    return flattened_properties
+
+
+def _delete_retrieve_cache_keys() -> int:
+    """Delete cached retrieve_context results, returning how many were dropped."""
+    cache_keys = simple_redis.keys("retrieve:*")
+    for key in cache_keys or []:
+        simple_redis.delete(key)
+    return len(cache_keys or [])
+
+
+async def _invalidate_retrieve_cache(context_types: Optional[List[str]] = None) -> None:
+    """
+    Drop cached retrieve_context results so newly stored contexts appear immediately.
+
+    Args:
+        context_types: Types of the contexts that changed; None invalidates every
+            namespace of the RetrievalCore result cache (e.g. deletes of unknown type)
+    """
+    result_cache = getattr(retrieval_core, "result_cache", None) if retrieval_core else None
+    if result_cache is not None:
+        try:
+            await result_cache.invalidate(context_types)
+        except Exception as cache_err:
+            logger.warning(f"Failed to invalidate result cache: {cache_err}")
+
+    if simple_redis:
+        try:
+            invalidated = await run_storage_call(
+                _delete_retrieve_cache_keys, operation="redis.invalidate_cache"
+            )
+            if invalidated:
+                logger.info(f"Invalidated {invalidated} retrieve cache entries after store")
+        except Exception as cache_err:
+            logger.warning(f"Failed to invalidate cache after store: {cache_err}")
+
+
+def _near_duplicate_key(
+    request: StoreContextRequest, author: Optional[str], author_type: Optional[str]
+) -> Tuple[Any, bytes, str]:
+    """
+    MinHash signature of the request content, the scope it may match in and
+    a hash of the exact content.
+
+    Only contexts with the same type, author and metadata (apart from the
+    store timestamp) count as duplicates of each other.
+    """
+    metadata = {
+        key: value
+        for key, value in (request.metadata or {}).items()
+        if key not in ("author", "author_type", "stored_at")
+    }
+    scope = json.dumps([request.type, author, author_type, metadata], sort_keys=True, default=str)
+    text = json.dumps(request.content, sort_keys=True, default=str)
+    signature = store_dedup_hasher.signature(word_shingles(text))
+    content_hash = hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+    return signature, hashlib.blake2b(scope.encode(), digest_size=16).digest(), content_hash
+
+
+def _forget_stored_context(context_id: str) -> None:
+    """Stop answering store_context duplicates with a deleted context."""
+    store_dedup_index.remove(context_id)
+
+
+async def _stored_context_exists(context_id: str, vector_id: str) -> bool:
+    """
+    Check a duplicate candidate is still live in the backends.
+
+    The dedup index only sees deletes made through this process, so
+    contexts deleted elsewhere are caught here.
+    """
+    try:
+        if neo4j_client:
+            query = """
+            MATCH (n:Context {id: $context_id})
+            WHERE coalesce(n.deleted, false) = false AND coalesce(n.forgotten, false) = false
+            RETURN count(n) as live_count
+            """
+            result = await run_storage_call(
+                neo4j_client.query, query, {"context_id": context_id}, operation="neo4j.query"
+            )
+            if not result or result[0].get("live_count", 0) == 0:
+                return False
+        if qdrant_client:
+            points = await run_storage_call(
+                qdrant_client.client.retrieve,
+                collection_name=qdrant_client.collection_name,
+                ids=[vector_id],
+                with_payload=False,
+                with_vectors=False,
+                operation="qdrant.retrieve",
+            )
+            if not points:
+                return False
+    except Exception as e:
+        logger.warning(f"Could not confirm duplicate context {context_id} exists: {e}")
+        return False
+    return True
+
+
+async def _add_to_text_index(
+    context_id: str,
+    request: StoreContextRequest,
+    author: Optional[str],
+    author_type: Optional[str],
+) -> None:
+    """
+    Make a stored context lexically searchable right away.
+
+    Best effort: the streaming indexer picks up anything missed here on its
+    next catch-up.
+    """
+    if text_backend is None:
+        return
+    try:
+        properties = _build_context_node_properties(context_id, request, author, author_type)
+        await text_backend.index_document(
+            context_id,
+            properties["searchable_text"],
+            content_type=request.type,
+            metadata={
+                "content_type": request.type,
+                "created_at": properties["created_at"],
+                "source_store": "store_context",
+            },
+        )
+    except Exception as e:
+        logger.warning(f"Failed to add context {context_id} to text index: {e}")
+
+
+async def _remove_from_text_index(context_id: str) -> None:
+    """Stop lexical search from matching a deleted context."""
+    if text_backend is None:
+        return
+    try:
+        await text_backend.remove_document(context_id)
+    except Exception as e:
+        logger.warning(f"Failed to remove context {context_id} from text index: {e}")
+
+
 @app.post("/tools/store_context")
 async def store_context(
     request: StoreContextRequest,
@@ -2335,22 +2759,35 @@ async def store_context(
         context_id = str(uuid.uuid4())
 
         # Sprint 13 Phase 2.2: Auto-populate author information from API key
-        author = request.author
-        author_type = request.author_type
-
-        if api_key_info and not author:
-            author = api_key_info.user_id
-            author_type = "agent" if api_key_info.is_agent else "human"
-            logger.info(f"Auto-populated author: {author} (type: {author_type})")
-
-        # Add author to metadata if not already present
-        if request.metadata is None:
-            request.metadata = {}
-
-        if author:
-            request.metadata["author"] = author
-            request.metadata["author_type"] = author_type
-            request.metadata["stored_at"] = datetime.now().isoformat()
+        author, author_type = _apply_author_attribution(request, api_key_info)
+
+        # A context already stored with identical content is answered with
+        # that context instead of being embedded and stored again. Near-duplicate
+        # candidates with any content change are stored, since a one-word edit
+        # can change the meaning. Requests creating relationships are always
+        # stored, since the duplicate lacks them.
+        dedup_signature = dedup_scope = content_hash = None
+        if STORE_DEDUP_ENABLED and not request.relationships:
+            dedup_signature, dedup_scope, content_hash = _near_duplicate_key(
+                request, author, author_type
+            )
+            for match in store_dedup_index.query(dedup_signature, dedup_scope):
+                if match.payload["content_hash"] != content_hash:
+                    continue
+                if not await _stored_context_exists(match.key, match.payload["vector_id"]):
+                    _forget_stored_context(match.key)
+                    continue
+                logger.info(f"Context is a duplicate of {match.key}, skipping storage")
+                return {
+                    "success": True,
+                    "id": match.key,
+                    "vector_id": match.payload["vector_id"],
+                    "graph_id": match.payload["graph_id"],
+                    "message": "Duplicate of an existing context, not stored again",
+                    "embedding_status": "completed",
+                    "relationships_created": 0,
+                    "duplicate_of": match.key,
+                }
 
         # Store in vector database
         vector_id = None
@@ -2382,7 +2819,8 @@ async def store_context(
                 # Only store vector if embedding generation succeeded
                 if embedding is not None:
                     logger.info("Storing vector in Qdrant...")
-                    vector_id = qdrant_client.store_vector(
+                    vector_id = await run_storage_call(
+                        qdrant_client.store_vector,
                         vector_id=context_id,
                         embedding=embedding,
                         metadata={
@@ -2390,6 +2828,7 @@ async def store_context(
                             "type": request.type,
                             "metadata": request.metadata,
                         },
+                        operation="qdrant.store_vector",
                     )
                     logger.info(f"Successfully stored vector with ID: {vector_id}")
                 else:
@@ -2405,52 +2844,15 @@ async def store_context(
         if neo4j_client:
             try:
                 logger.info("Storing context in Neo4j graph database...")
-                # Flatten nested objects for Neo4j compatibility
-                flattened_properties = {
-                    "id": context_id,
-                    "type": request.type,
-                    # Sprint 13 Phase 2.2: Add author attribution to graph
-                    "author": author or "unknown",
-                    "author_type": author_type or "unknown",
-                    "created_at": datetime.now().isoformat(),
-                }
+                flattened_properties = _build_context_node_properties(
+                    context_id, request, author, author_type
+                )
 
-                # Handle request.content safely - convert nested objects to JSON strings
-                for key, value in request.content.items():
-                    # Ensure value is JSON-serializable before attempting to serialize
-                    safe_value = make_json_serializable(value)
-                    if isinstance(safe_value, (dict, list)):
-                        flattened_properties[f"{key}_json"] = json.dumps(safe_value)
-                    else:
-                        flattened_properties[key] = safe_value
-
-                # Also store metadata fields at the top level for easy retrieval
-                if request.metadata:
-                    for key, value in request.metadata.items():
-                        if key not in [
-                            "author",
-                            "author_type",
-                            "stored_at",
-                        ]:  # These are already added
-                            # Ensure value is JSON-serializable
-                            safe_value = make_json_serializable(value)
-                            if isinstance(safe_value, (dict, list)):
-                                flattened_properties[key] = json.dumps(safe_value)
-                            else:
-                                flattened_properties[key] = safe_value
-
-                # PR #339: Generate searchable_text field for dynamic property indexing
-                # This enables search across both standard fields AND custom properties
-                # NOTE: Phase 1 - Field generation only. PR #340 will update graph_backend.py
-                # to include searchable_text in search queries. New contexts get the field
-                # immediately; existing 531+ facts will be migrated in PR #341.
-                searchable_text = generate_searchable_text(flattened_properties)
-                flattened_properties['searchable_text'] = searchable_text
-                logger.debug(f"Generated searchable_text with {len(searchable_text)} characters")
-
-                graph_id = neo4j_client.create_node(
+                graph_id = await run_storage_call(
+                    neo4j_client.create_node,
                     labels=["Context"],
                     properties=flattened_properties,
+                    operation="neo4j.create_node",
                 )
                 logger.info(f"Successfully created graph node with ID: {graph_id}")
 
@@ -2467,7 +2869,12 @@ async def store_context(
                                 RETURN ID(n) as node_id
                                 LIMIT 1
                             """
-                            target_result = neo4j_client.query(target_query, {"id": rel["target"]})
+                            target_result = await run_storage_call(
+                                neo4j_client.query,
+                                target_query,
+                                {"id": rel["target"]},
+                                operation="neo4j.query",
+                            )
 
                             if not target_result or len(target_result) == 0:
                                 logger.warning(
@@ -2479,10 +2886,12 @@ async def store_context(
                             target_node_id = str(target_result[0].get("node_id"))
 
                             # Create relationship using internal node IDs
-                            result = neo4j_client.create_relationship(
+                            result = await run_storage_call(
+                                neo4j_client.create_relationship,
                                 start_node=graph_id,
                                 end_node=target_node_id,
                                 relationship_type=rel.get("type", "RELATED_TO"),
+                                operation="neo4j.create_relationship",
                             )
 
                             # Verify relationship was created
@@ -2546,17 +2955,21 @@ async def store_context(
         if embedding_message:
             response["embedding_message"] = embedding_message
 
+        # Only contexts stored in every available backend can stand in for duplicates
+        if dedup_signature is not None and vector_id and (graph_id or not neo4j_client):
+            store_dedup_index.add(
+                context_id,
+                dedup_signature,
+                dedup_scope,
+                payload={"vector_id": vector_id, "graph_id": graph_id, "content_hash": content_hash},
+            )
+
+        if vector_id or graph_id:
+            await _add_to_text_index(context_id, request, author, author_type)
+
         # Invalidate retrieve_context cache so new entries appear immediately
         # This prevents stale cached results from hiding newly stored content
-        if simple_redis:
-            try:
-                cache_keys = simple_redis.keys("retrieve:*")
-                if cache_keys:
-                    for key in cache_keys:
-                        simple_redis.delete(key)
-                    logger.info(f"Invalidated {len(cache_keys)} retrieve cache entries after store")
-            except Exception as cache_err:
-                logger.warning(f"Failed to invalidate cache after store: {cache_err}")
+        await _invalidate_retrieve_cache([request.type])
 
         return response
 
@@ -2570,6 +2983,187 @@ async def store_context(
         return handle_generic_error(e, "store context")
 
 
+# Creates every Context node first, then resolves relationship targets, so
+# items in the same batch can reference each other. Relationships follow
+# Neo4jInitializer.create_relationship: a TYPE relationship with the
+# requested type stored in r.type.
+STORE_CONTEXTS_BATCH_CYPHER = """
+UNWIND $items AS item
+CREATE (n:Context)
+SET n = item.properties
+WITH collect({node: n, relationships: item.relationships}) AS created
+UNWIND created AS entry
+WITH entry.node AS n, entry.relationships AS relationships
+CALL {
+    WITH n, relationships
+    UNWIND relationships AS rel
+    CALL {
+        WITH rel
+        MATCH (t:Context)
+        WHERE t.id = rel.target
+        RETURN t
+        LIMIT 1
+    }
+    CREATE (n)-[r:TYPE]->(t)
+    SET r.type = rel.type
+    RETURN count(r) AS relationships_created
+}
+RETURN n.id AS id, ID(n) AS node_id, relationships_created
+"""
+
+
+@app.post("/tools/store_contexts_batch")
+async def store_contexts_batch(
+    request: StoreContextsBatchRequest,
+    api_key_info: Optional[APIKeyInfo] = (
+        Depends(verify_api_key) if API_KEY_AUTH_AVAILABLE else None
+    ),
+) -> Dict[str, Any]:
+    """
+    Store many contexts with batched embedding, vector and graph writes.
+
+    Equivalent to calling store_context once per item, but all embeddings are
+    generated in one batch, all vectors are written with one Qdrant upsert and
+    all nodes and relationships are created by one UNWIND Cypher statement.
+    Returns a per-item status in request order.
+    """
+    try:
+        import uuid
+
+        items = request.items
+        context_ids = [str(uuid.uuid4()) for _ in items]
+        attributions = [_apply_author_attribution(item, api_key_info) for item in items]
+        results: List[Dict[str, Any]] = [
+            {
+                "index": index,
+                "success": False,
+                "id": context_id,
+                "vector_id": None,
+                "graph_id": None,
+                "embedding_status": "unavailable",
+                "relationships_created": 0,
+            }
+            for index, context_id in enumerate(context_ids)
+        ]
+
+        # Vector storage: one embedding batch, one upsert
+        if qdrant_client:
+            embeddings: List[Optional[List[float]]]
+            try:
+                from ..embedding import generate_embeddings
+
+                embeddings = await generate_embeddings(
+                    [item.content for item in items], adjust_dimensions=True
+                )
+            except Exception as embedding_error:
+                # Like store_context, fall back to the legacy path, one item at a
+                # time, so one bad item or a transient error does not fail the batch
+                logger.error(f"Batch embedding failed, embedding items one by one: {embedding_error}")
+                embeddings = []
+                for item in items:
+                    try:
+                        embeddings.append(await _generate_embedding(item.content))
+                    except ValueError as item_error:
+                        logger.error(f"Embedding generation failed for batch item: {item_error}")
+                        embeddings.append(None)
+
+            embedded = []
+            for result, item, embedding in zip(results, items, embeddings):
+                if embedding is None:
+                    result["embedding_status"] = "failed"
+                    result["embedding_message"] = "Embedding generation failed - check logs"
+                else:
+                    embedded.append((result, item, embedding))
+
+            if embedded:
+                try:
+                    points = [
+                        (
+                            result["id"],
+                            embedding,
+                            {"content": item.content, "type": item.type, "metadata": item.metadata},
+                        )
+                        for result, item, embedding in embedded
+                    ]
+                    vector_ids = await run_storage_call(
+                        qdrant_client.store_vectors, points, operation="qdrant.store_vectors"
+                    )
+                    for (result, _, _), vector_id in zip(embedded, vector_ids):
+                        result["vector_id"] = vector_id
+                        result["embedding_status"] = "completed"
+                    logger.info(f"Stored {len(vector_ids)} vectors in one batch")
+                except Exception as vector_error:
+                    logger.error(f"Batch vector storage failed: {vector_error}")
+                    for result, _, _ in embedded:
+                        result["embedding_status"] = "failed"
+                        result["embedding_message"] = "Vector storage failed - check logs"
+
+        # Graph storage: nodes and relationships in one statement
+        if neo4j_client:
+            try:
+                batch = [
+                    {
+                        "properties": _build_context_node_properties(
+                            context_id, item, author, author_type
+                        ),
+                        "relationships": [
+                            {"target": rel["target"], "type": rel.get("type", "RELATED_TO")}
+                            for rel in item.relationships or []
+                            if rel.get("target")
+                        ],
+                    }
+                    for context_id, item, (author, author_type) in zip(context_ids, items, attributions)
+                ]
+                records = await run_storage_call(
+                    neo4j_client.query,
+                    STORE_CONTEXTS_BATCH_CYPHER,
+                    {"items": batch},
+                    operation="neo4j.query",
+                )
+                created = {record["id"]: record for record in records}
+                for result in results:
+                    record = created.get(result["id"])
+                    if record:
+                        result["graph_id"] = str(record["node_id"])
+                        result["relationships_created"] = record["relationships_created"]
+                logger.info(f"Created {len(created)} graph nodes in one batch")
+            except Exception as graph_error:
+                logger.error(f"Batch graph storage failed: {graph_error}")
+
+        for result, item in zip(results, items):
+            result["success"] = bool(result["vector_id"] or result["graph_id"])
+            requested = len(item.relationships or [])
+            if requested and result["relationships_created"] < requested:
+                result["relationships_message"] = (
+                    f"Created {result['relationships_created']}/{requested} relationships; "
+                    "missing targets were skipped"
+                )
+
+        for result, item, (author, author_type) in zip(results, items, attributions):
+            if result["success"]:
+                await _add_to_text_index(result["id"], item, author, author_type)
+
+        stored = sum(1 for result in results if result["success"])
+        if stored:
+            await _invalidate_retrieve_cache(
+                [item.type for item, result in zip(items, results) if result["success"]]
+            )
+
+        return {
+            "success": stored == len(items),
+            "stored": stored,
+            "failed": len(items) - stored,
+            "results": results,
+            "message": f"Stored {stored}/{len(items)} contexts",
+        }
+
+    except Exception as e:
+        import traceback
+
+        logger.error(f"Error storing context batch: {traceback.format_exc()}")
+        return handle_generic_error(e, "store context batch")
+
+
 @app.post("/tools/retrieve_context")
 async def retrieve_context(request: RetrieveContextRequest) -> Dict[str, Any]:
     """
@@ -2645,7 +3239,9 @@ async def retrieve_context(request: RetrieveContextRequest) -> Dict[str, Any]:
                 cache_key = f"retrieve:{cache_hash}"
 
             try:
-                cached_result = simple_redis.get(cache_key)
+                cached_result = await run_storage_call(
+                    simple_redis.get, cache_key, operation="redis.get"
+                )
                 if cached_result:
                     # METRICS: Log cache hit with structured data for monitoring
                     logger.info(
@@ -2708,6 +3304,7 @@ async def retrieve_context(request: RetrieveContextRequest) -> Dict[str, Any]:
                     context_type=getattr(request, "context_type", None),
                     metadata_filters=getattr(request, "metadata_filters", None),
                     score_threshold=0.0,  # Use default threshold
+                    debug=request.debug,
                 )
 
                 # Convert SearchResultResponse to MCP format
@@ -2775,7 +3372,13 @@ async def retrieve_context(request: RetrieveContextRequest) -> Dict[str, Any]:
                 # SEMANTIC SEARCH IMPROVEMENT: Reuse the cache_key computed earlier
                 if simple_redis and getattr(request, "use_cache", True) != False and results and cache_key:
                     try:
-                        simple_redis.setex(cache_key, CACHE_TTL_SECONDS, json.dumps(response))
+                        await run_storage_call(
+                            simple_redis.setex,
+                            cache_key,
+                            CACHE_TTL_SECONDS,
+                            json.dumps(response),
+                            operation="redis.setex",
+                        )
                         cache_type = "semantic" if semantic_cache_used else "text"
                         logger.info(
                             f"✅ Cached results ({cache_type}) for query: {request.query[:50]}..."
@@ -2783,6 +3386,11 @@ async def retrieve_context(request: RetrieveContextRequest) -> Dict[str, Any]:
                     except Exception as cache_error:
                         logger.warning(f"Failed to cache results: {cache_error}")
 
+                # Debug timings describe this request only, so they are never cached
+                if request.debug:
+                    response["trace_id"] = search_response.trace_id
+                    response["stage_timings"] = search_response.stage_timings
+
                 return response
 
             except Exception as unified_error:
@@ -2805,9 +3413,11 @@ async def retrieve_context(request: RetrieveContextRequest) -> Dict[str, Any]:
                     f"Generated query embedding with {len(query_vector)} dimensions using robust service"
                 )
 
-                vector_results = qdrant_client.search(
+                vector_results = await run_storage_call(
+                    qdrant_client.search,
                     query_vector=query_vector,
                     limit=request.limit,
+                    operation="qdrant.search",
                 )
 
                 # Convert results to proper format
@@ -2845,8 +3455,11 @@ async def retrieve_context(request: RetrieveContextRequest) -> Dict[str, Any]:
                 RETURN n
                 LIMIT $limit
                 """
-                raw_graph_results = neo4j_client.query(
-                    cypher_query, parameters={"type": request.type, "limit": request.limit}
+                raw_graph_results = await run_storage_call(
+                    neo4j_client.query,
+                    cypher_query,
+                    parameters={"type": request.type, "limit": request.limit},
+                    operation="neo4j.query",
                 )
 
                 # Normalize graph results to consistent format (eliminate nested 'n' structure)
@@ -2924,7 +3537,13 @@ async def retrieve_context(request: RetrieveContextRequest) -> Dict[str, Any]:
         # SEMANTIC SEARCH IMPROVEMENT: Reuse the cache_key computed earlier (legacy path)
         if simple_redis and getattr(request, "use_cache", True) != False and results and cache_key:
             try:
-                simple_redis.setex(cache_key, CACHE_TTL_SECONDS, json.dumps(response))
+                await run_storage_call(
+                    simple_redis.setex,
+                    cache_key,
+                    CACHE_TTL_SECONDS,
+                    json.dumps(response),
+                    operation="redis.setex",
+                )
                 cache_type = "semantic" if semantic_cache_used else "text"
                 logger.info(
                     f"✅ Cached legacy results ({cache_type}) for query: {request.query[:50]}..."
@@ -2962,7 +3581,12 @@ async def query_graph(request: QueryGraphRequest) -> Dict[str, Any]:
         if not neo4j_client:
             raise HTTPException(status_code=503, detail="Graph database not available")
 
-        results = neo4j_client.query(request.query, parameters=request.parameters)
+        results = await run_storage_call(
+            neo4j_client.query,
+            request.query,
+            parameters=request.parameters,
+            operation="neo4j.query",
+        )
 
         return {
             "success": True,
@@ -3023,9 +3647,13 @@ async def update_scratchpad_endpoint(request: UpdateScratchpadRequest) -> Dict[s
         redis_key = f"scratchpad:{request.agent_id}:{request.key}"
 
         # Store value with TTL based on mode
-        if request.mode == "append" and simple_redis.exists(redis_key):
+        if request.mode == "append" and await run_storage_call(
+            simple_redis.exists, redis_key, operation="redis.exists"
+        ):
             # Append mode: get existing content and append
-            existing_content = simple_redis.get(redis_key) or ""
+            existing_content = (
+                await run_storage_call(simple_redis.get, redis_key, operation="redis.get") or ""
+            )
             content_str = f"{existing_content}\n{request.content}"
         else:
             # Overwrite mode or no existing content
@@ -3034,8 +3662,22 @@ async def update_scratchpad_endpoint(request: UpdateScratchpadRequest) -> Dict[s
         try:
             # Use simple_redis for direct Redis access
             logger.info(f"Using SimpleRedisClient to store key: {redis_key}")
-            success = simple_redis.set(redis_key, content_str, ex=request.ttl)
+            success = await run_storage_call(
+                simple_redis.set, redis_key, content_str, ex=request.ttl, operation="redis.set"
+            )
             logger.info(f"SimpleRedisClient.set() returned: {success}")
+            if success and KVContentIndex and getattr(simple_redis, "client", None) is not None:
+                # Keep KV content search able to find scratchpad entries
+                try:
+                    await run_storage_call(
+                        KVContentIndex(simple_redis.client).index,
+                        redis_key,
+                        content_str,
+                        request.ttl,
+                        operation="redis.index",
+                    )
+                except Exception as index_error:
+                    logger.warning(f"Failed to index scratchpad key {redis_key}: {index_error}")
 
         except Exception as e:
             logger.error(f"SimpleRedisClient error: {type(e).__name__}: {e}")
@@ -3093,7 +3735,7 @@ async def get_agent_state_endpoint(request: GetAgentStateRequest) -> Dict[str, A
             redis_key = f"{request.prefix}:{request.agent_id}:{request.key}"
             try:
                 logger.info(f"Using SimpleRedisClient to get key: {redis_key}")
-                value = simple_redis.get(redis_key)
+                value = await run_storage_call(simple_redis.get, redis_key, operation="redis.get")
                 logger.info(f"SimpleRedisClient.get() returned value: {value is not None}")
             except Exception as e:
                 logger.error(f"SimpleRedisClient error: {type(e).__name__}: {e}")
@@ -3125,7 +3767,7 @@ async def get_agent_state_endpoint(request: GetAgentStateRequest) -> Dict[str, A
             pattern = f"{request.prefix}:{request.agent_id}:*"
             try:
                 logger.info(f"Using SimpleRedisClient to get keys matching: {pattern}")
-                keys = simple_redis.keys(pattern)
+                keys = await run_storage_call(simple_redis.keys, pattern, operation="redis.keys")
                 logger.info(f"SimpleRedisClient.keys() found {len(keys)} keys")
             except Exception as e:
                 logger.error(f"SimpleRedisClient error: {type(e).__name__}: {e}")
@@ -3142,12 +3784,14 @@ async def get_agent_state_endpoint(request: GetAgentStateRequest) -> Dict[str, A
                     "message": "No state found for agent",
                 }
 
-            # Retrieve all values
+            # Retrieve all values in one executor call
+            values = await run_storage_call(
+                lambda: [simple_redis.get(key) for key in keys], operation="redis.get_many"
+            )
             data = {}
-            for key in keys:
+            for key, value in zip(keys, values):
                 key_str = key.decode("utf-8") if isinstance(key, bytes) else key
                 key_name = key_str.split(":", 2)[-1]  # Extract key name
-                value = simple_redis.get(key)
 
                 try:
                     data[key_name] = json.loads(value) if isinstance(value, bytes) else value
@@ -3640,6 +4284,10 @@ async def delete_context_rest_endpoint(
             qdrant_client=qdrant_client,
             redis_client=simple_redis if simple_redis else None,
         )
+        if result.get("success"):
+            _forget_stored_context(context_id)
+            await _remove_from_text_index(context_id)
+            await _invalidate_retrieve_cache()
 
         return result
 
@@ -3686,6 +4334,10 @@ async def delete_context_endpoint(
             qdrant_client=qdrant_client,
             redis_client=simple_redis if simple_redis else None,
         )
+        if result.get("success"):
+            _forget_stored_context(request.context_id)
+            await _remove_from_text_index(request.context_id)
+            await _invalidate_retrieve_cache()
 
         return result
 
@@ -3731,6 +4383,10 @@ async def forget_context_endpoint(
             neo4j_client=neo4j_client,
             redis_client=simple_redis if simple_redis else None,
         )
+        if result.get("success"):
+            _forget_stored_context(request.context_id)
+            await _remove_from_text_index(request.context_id)
+            await _invalidate_retrieve_cache()
 
         return result
 
@@ -3800,7 +4456,9 @@ async def sentinel_cleanup_endpoint(
             DETACH DELETE n
             RETURN count(n) as deleted_count
             """
-            result = neo4j_client.query(query, {"context_id": request.context_id})
+            result = await run_storage_call(
+                neo4j_client.query, query, {"context_id": request.context_id}, operation="neo4j.query"
+            )
             if result and result[0].get("deleted_count", 0) > 0:
                 deleted_from.append("neo4j")
         except Exception as e:
@@ -3810,7 +4468,9 @@ async def sentinel_cleanup_endpoint(
     # Delete from Qdrant
     if qdrant_client:
         try:
-            qdrant_client.delete_vector(request.context_id)
+            await run_storage_call(
+                qdrant_client.delete_vector, request.context_id, operation="qdrant.delete_vector"
+            )
             deleted_from.append("qdrant")
         except Exception as e:
             # Qdrant may return error if vector doesn't exist, which is ok
@@ -3819,6 +4479,10 @@ async def sentinel_cleanup_endpoint(
                 errors.append(f"qdrant: {str(e)}")
 
     success = len(deleted_from) > 0 or len(errors) == 0
+    if deleted_from:
+        _forget_stored_context(request.context_id)
+        await _remove_from_text_index(request.context_id)
+        await _invalidate_retrieve_cache()
 
     return {
         "success": success,
@@ -3877,9 +4541,11 @@ async def upsert_fact_endpoint(
                 query_vector = await generate_embedding(fact_key, adjust_dimensions=True)
 
                 # Search for facts containing this key
-                vector_results = qdrant_client.search(
+                vector_results = await run_storage_call(
+                    qdrant_client.search,
                     query_vector=query_vector,
                     limit=20,
+                    operation="qdrant.search",
                 )
 
                 # Find facts that match our criteria
@@ -3968,7 +4634,8 @@ async def upsert_fact_endpoint(
 
                 if embedding and len(embedding) > 0:
                     # Store in Qdrant using wrapper method (matches store_context pattern)
-                    vector_id = qdrant_client.store_vector(
+                    vector_id = await run_storage_call(
+                        qdrant_client.store_vector,
                         vector_id=new_fact_id,
                         embedding=embedding,
                         metadata={
@@ -3976,6 +4643,7 @@ async def upsert_fact_endpoint(
                             "metadata": new_fact_metadata,
                             "searchable_text": searchable_text,
                         },
+                        operation="qdrant.store_vector",
                     )
                     logger.info(f"Stored fact in vector DB: {vector_id}")
                 else:
@@ -4015,8 +4683,10 @@ async def upsert_fact_endpoint(
                     CREATE (f)-[:HAS_VALUE]->(v)
                     RETURN id(f) as graph_id
                     """
-                    result = neo4j_client.query(
+                    result = await run_storage_call(
+                        neo4j_client.query,
                         query,
+                        operation="neo4j.query",
                         parameters={
                             "id": new_fact_id,
                             "user_id": user_id,
@@ -4049,8 +4719,10 @@ async def upsert_fact_endpoint(
                     })
                     RETURN id(c) as graph_id
                     """
-                    result = neo4j_client.query(
+                    result = await run_storage_call(
+                        neo4j_client.query,
                         query,
+                        operation="neo4j.query",
                         parameters={
                             "id": new_fact_id,
                             "fact_key": fact_key,
@@ -4070,15 +4742,7 @@ async def upsert_fact_endpoint(
                 logger.error(f"Failed to store fact in graph DB: {graph_err}")
 
         # Step 4: Invalidate retrieve cache
-        if simple_redis:
-            try:
-                cache_keys = simple_redis.keys("retrieve:*")
-                if cache_keys:
-                    for key in cache_keys:
-                        simple_redis.delete(key)
-                    logger.info(f"Invalidated {len(cache_keys)} cache entries after upsert")
-            except Exception as cache_err:
-                logger.warning(f"Failed to invalidate cache: {cache_err}")
+        await _invalidate_retrieve_cache(["fact"])
 
         return {
             "success": True,
@@ -4161,9 +4825,11 @@ async def get_user_facts_endpoint(
                     LIMIT $limit
                     """
 
-                results = neo4j_client.query(
+                results = await run_storage_call(
+                    neo4j_client.query,
                     query,
-                    parameters={"user_id": user_id, "limit": request.limit}
+                    parameters={"user_id": user_id, "limit": request.limit},
+                    operation="neo4j.query",
                 )
 
                 for record in results:
@@ -4189,9 +4855,11 @@ async def get_user_facts_endpoint(
                 # Generate embedding for generic fact query
                 query_vector = await generate_embedding(f"facts about user {user_id}", adjust_dimensions=True)
 
-                vector_results = qdrant_client.search(
+                vector_results = await run_storage_call(
+                    qdrant_client.search,
                     query_vector=query_vector,
                     limit=request.limit * 2,  # Get more to filter
+                    operation="qdrant.search",
                 )
 
                 for result in vector_results:
@@ -4251,5 +4919,16 @@ async def get_user_facts_endpoint(
         }
 
 
+# REST compatibility routes call these handlers in-process, not over loopback HTTP
+register_tool(
+    "store_context",
+    store_context,
+    StoreContextRequest,
+    auth_dependency=verify_api_key if API_KEY_AUTH_AVAILABLE else None,
+)
+register_tool("retrieve_context", retrieve_context, RetrieveContextRequest)
+register_tool("query_graph", query_graph, QueryGraphRequest)
+
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("MCP_SERVER_PORT", 8000)))
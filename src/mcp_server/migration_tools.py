@@ -272,7 +272,7 @@ class MigrationTools:
                 try:
                     text_backend = initialize_text_backend()
                     
-                    if text_backend.documents:
+                    if text_backend.document_count:
                         from ..interfaces.backend_interface import SearchOptions
                         
                         options = SearchOptions(limit=limit)
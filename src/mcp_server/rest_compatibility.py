@@ -6,6 +6,9 @@ This module provides REST API endpoints that map to the existing MCP tools inter
 This allows sentinel monitoring checks to validate the system using expected REST patterns
 while the actual implementation uses MCP tools.
 
+Tool-backed routes call the registered /tools/* handlers in-process (see
+tool_dispatch.py) rather than over loopback HTTP.
+
 Endpoint Mapping:
 - POST /api/v1/contexts → /tools/store_context
 - POST /api/v1/contexts/search → /tools/retrieve_context
@@ -26,6 +29,8 @@ from fastapi.responses import RedirectResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, Field
 
+from .tool_dispatch import call_tool, get_tool
+
 logger = logging.getLogger(__name__)
 
 # Configuration
@@ -176,9 +181,11 @@ async def forward_to_mcp_tool(
     payload: Dict[str, Any]
 ) -> Dict[str, Any]:
     """
-    Forward request to MCP tool endpoint using internal HTTP call.
+    Run an MCP tool for a REST route.
 
-    This allows us to reuse the existing MCP tool logic without duplicating code.
+    Tools registered in tool_dispatch (main.py registers its /tools/* routes)
+    are called in-process with the same validation and authentication. Other
+    tools fall back to an internal HTTP call.
 
     Args:
         request: FastAPI request object
@@ -191,6 +198,18 @@ async def forward_to_mcp_tool(
     Raises:
         HTTPException: If the MCP tool call fails
     """
+    tool = get_tool(tool_path.rsplit("/", 1)[-1])
+    if tool is not None:
+        try:
+            return await call_tool(tool, request, payload)
+        except HTTPException as e:
+            logger.debug(f"MCP tool call failed: {e.status_code} - {e.detail}")
+            logger.error(f"MCP tool call to {tool_path} failed with status {e.status_code}")
+            raise HTTPException(status_code=e.status_code, detail="Internal service error")
+        except Exception as e:
+            logger.error(f"Error in MCP tool {tool_path}: {e}")
+            raise HTTPException(status_code=500, detail="Internal service error")
+
     import httpx
 
     try:
@@ -14,6 +14,7 @@ Date: 2025-08-19
 
 import math
 import os
+import re
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Union
 import logging
@@ -66,6 +67,15 @@ TECHNICAL_TERMS = {
     'dockerfile', 'sh', 'bash', 'sql', 'css', 'html'
 }
 
+# Substring checks for is_technical_query, folded into one compiled scan
+_TECHNICAL_QUERY_RE = re.compile("|".join(re.escape(s) for s in (
+    '.py', '.js', '.ts', '.md', '.json',
+    '()', '[]', '{}', '->', '=>', 'function', 'class', 'def',
+)))
+_BOOST_EXTENSION_RE = re.compile("|".join(
+    re.escape(f'.{ext}') for ext in ['py', 'js', 'ts', 'md', 'json', 'yaml']
+))
+
 
 def calculate_exact_match_boost(
     query: str, 
@@ -237,7 +247,24 @@ def calculate_recency_decay(
         return base_score
 
 
-def calculate_technical_boost(query: str, content: Union[str, Dict]) -> float:
+def query_has_technical_terms(query: str) -> bool:
+    """
+    Whether calculate_technical_boost treats the query as technical.
+    
+    Args:
+        query: The search query string
+    
+    Returns:
+        True if the query has a technical term or a file extension
+    """
+    query_lower = query.lower()
+    # Check if query contains technical terms, or a file extension (e.g., "server.py")
+    return bool(set(query_lower.split()) & TECHNICAL_TERMS) or bool(_BOOST_EXTENSION_RE.search(query_lower))
+
+
+def calculate_technical_boost(
+    query: str, content: Union[str, Dict], technical_query: Optional[bool] = None
+) -> float:
     """
     Boost results containing technical terms when query is technical.
     
@@ -247,13 +274,14 @@ def calculate_technical_boost(query: str, content: Union[str, Dict]) -> float:
     Args:
         query: The search query string
         content: The content to analyze
+        technical_query: Precomputed query_has_technical_terms(query), if known
     
     Returns:
         Float boost factor for technical content
     """
     boost = 1.0
-    query_lower = query.lower()
-    query_terms = set(query_lower.split())
+    if technical_query is None:
+        technical_query = query_has_technical_terms(query)
     
     # Handle dict content
     if isinstance(content, dict):
@@ -263,13 +291,6 @@ def calculate_technical_boost(query: str, content: Union[str, Dict]) -> float:
     
     content_lower = content_str.lower()
     
-    # Check if query contains technical terms
-    technical_query = bool(query_terms & TECHNICAL_TERMS)
-    
-    # Also check for file extensions in query (e.g., "server.py")
-    has_extension = any(f'.{ext}' in query_lower for ext in ['py', 'js', 'ts', 'md', 'json', 'yaml'])
-    technical_query = technical_query or has_extension
-    
     if technical_query:
         # Count technical terms in content
         tech_count = sum(1 for term in TECHNICAL_TERMS if term in content_lower)
@@ -308,6 +329,8 @@ def apply_search_enhancements(
         Enhanced and re-sorted list of results
     """
     enhanced_results = []
+    # Query-level analysis runs once, not once per result
+    technical_query = query_has_technical_terms(query) if enable_technical_boost else False
     
     for result in results:
         # Start with original score
@@ -352,7 +375,7 @@ def apply_search_enhancements(
         
         # Apply technical boost
         if enable_technical_boost:
-            tech_boost = calculate_technical_boost(query, content)
+            tech_boost = calculate_technical_boost(query, content, technical_query)
             enhanced_score *= tech_boost
             boosts['technical'] = tech_boost
         
@@ -387,15 +410,10 @@ def is_technical_query(query: str) -> bool:
         True if query appears to be technical
     """
     query_lower = query.lower()
-    query_terms = set(query_lower.split())
     
     # Check for technical terms
-    has_technical_terms = bool(query_terms & TECHNICAL_TERMS)
-    
-    # Check for file extensions
-    has_extension = any(f'.{ext}' in query_lower for ext in ['py', 'js', 'ts', 'md', 'json'])
-    
-    # Check for code-like patterns
-    has_code_patterns = any(pattern in query_lower for pattern in ['()', '[]', '{}', '->', '=>', 'function', 'class', 'def'])
+    if set(query_lower.split()) & TECHNICAL_TERMS:
+        return True
     
-    return has_technical_terms or has_extension or has_code_patterns
\ No newline at end of file
+    # Check for file extensions and code-like patterns
+    return bool(_TECHNICAL_QUERY_RE.search(query_lower))
\ No newline at end of file
@@ -27,7 +27,8 @@ try:
     from src.core.agent_namespace import AgentNamespace
     from src.core.config import Config
     from src.core.embedding_config import create_embedding_generator
-    from src.core.rate_limiter import rate_limit_check
+    from src.core.rate_limiter import get_rate_limiter, rate_limit_check
+    from src.core.rate_limit_backends import RedisTokenBucketBackend
     from src.core.ssl_config import SSLConfigManager
     from src.security.cypher_validator import CypherValidator
     from src.storage.kv_store import ContextKV
@@ -38,7 +39,9 @@ try:
     from src.security.input_validator import InputValidator, ContentTypeValidator
     # Fact system imports
     from src.storage.fact_store import FactStore
+    from src.storage.async_fact_store import AsyncFactStore, close_async_redis_pools
     from src.core.intent_classifier import IntentClassifier, IntentType
+    from src.core.query_analysis import QueryAnalyzer
     from src.core.fact_extractor import FactExtractor
     from src.core.qa_generator import QAPairGenerator
     from src.storage.fact_ranker import FactAwareRanker
@@ -70,7 +73,8 @@ except ImportError:
     from core.agent_namespace import AgentNamespace
     from core.config import Config
     from core.embedding_config import create_embedding_generator
-    from core.rate_limiter import rate_limit_check
+    from core.rate_limiter import get_rate_limiter, rate_limit_check
+    from core.rate_limit_backends import RedisTokenBucketBackend
     from core.ssl_config import SSLConfigManager
     from security.cypher_validator import CypherValidator
     # Metrics collection import for fallback path
@@ -83,7 +87,9 @@ except ImportError:
     from security.input_validator import InputValidator, ContentTypeValidator
     # Fact system imports
     from storage.fact_store import FactStore
+    from storage.async_fact_store import AsyncFactStore, close_async_redis_pools
     from core.intent_classifier import IntentClassifier, IntentType
+    from core.query_analysis import QueryAnalyzer
     from core.fact_extractor import FactExtractor
     from core.qa_generator import QAPairGenerator
     from storage.fact_ranker import FactAwareRanker
@@ -119,6 +125,7 @@ metrics_collector = None
 
 # Global fact system instances
 fact_store = None
+async_fact_store = None
 intent_classifier = IntentClassifier()
 fact_extractor = FactExtractor()
 qa_generator = QAPairGenerator()
@@ -151,6 +158,7 @@ except ImportError as e:
 async def initialize_storage_clients() -> Dict[str, Any]:
     """Initialize storage clients with SSL/TLS support."""
     global neo4j_client, qdrant_client, kv_store, embedding_generator, fact_store, scope_middleware, metrics_collector
+    global async_fact_store
 
     try:
         # Initialize metrics collector
@@ -283,6 +291,14 @@ async def initialize_storage_clients() -> Dict[str, Any]:
             kv_store = None
             logger.warning("⚠️ KV store disabled: REDIS_URL not set")
 
+        # Share rate limit buckets across workers through Redis
+        if kv_store and kv_store.redis_client and os.getenv("RATE_LIMIT_BACKEND", "redis") == "redis":
+            try:
+                get_rate_limiter().set_backend(RedisTokenBucketBackend(kv_store.redis_client))
+                logger.info("✅ Rate limiter using shared Redis buckets")
+            except Exception as e:
+                logger.warning(f"⚠️ Shared rate limiting unavailable, using in-process limits: {e}")
+
         # Initialize embedding generator
         try:
             embedding_generator = await create_embedding_generator(base_config)
@@ -296,6 +312,14 @@ async def initialize_storage_clients() -> Dict[str, Any]:
             if kv_store and kv_store.redis_client:
                 fact_store = FactStore(kv_store.redis_client)
                 scope_middleware = ScopeMiddleware(scope_validator)
+
+                # Request-path fact reads/writes go through the shared async pool
+                try:
+                    async_fact_store = AsyncFactStore.from_url(redis_url, password=redis_password)
+                    logger.info("✅ Async fact store initialized")
+                except Exception as async_error:
+                    logger.warning(f"⚠️ Async fact store unavailable, using sync FactStore: {async_error}")
+                    async_fact_store = None
                 
                 # Phase 3: Initialize graph integration
                 try:
@@ -325,6 +349,7 @@ async def initialize_storage_clients() -> Dict[str, Any]:
                 logger.info("✅ Fact system initialized")
             else:
                 fact_store = None
+                async_fact_store = None
                 scope_middleware = None
                 graph_fact_store = None
                 graph_enhancer = None
@@ -334,6 +359,7 @@ async def initialize_storage_clients() -> Dict[str, Any]:
         except Exception as e:
             logger.error(f"❌ Failed to initialize fact system: {e}")
             fact_store = None
+            async_fact_store = None
             scope_middleware = None
             graph_fact_store = None
             graph_enhancer = None
@@ -373,16 +399,22 @@ async def initialize_storage_clients() -> Dict[str, Any]:
 
 async def cleanup_storage_clients() -> None:
     """Clean up storage clients."""
-    global neo4j_client, qdrant_client, kv_store
+    global neo4j_client, qdrant_client, kv_store, async_fact_store
 
     if neo4j_client:
         neo4j_client.close()
         logger.info("Neo4j client closed")
 
     if kv_store:
+        get_rate_limiter().set_backend(None)
         kv_store.close()
         logger.info("KV store closed")
 
+    if async_fact_store:
+        async_fact_store = None
+        await close_async_redis_pools()
+        logger.info("Async fact store pool closed")
+
     # Qdrant VectorDBInitializer doesn't have a close method in the current implementation
     # but we set it to None for cleanup
     if qdrant_client:
@@ -1585,10 +1617,13 @@ async def retrieve_context_tool(arguments: Dict[str, Any]) -> Dict[str, Any]:
         enhanced_queries = [query]  # Start with original query
         intent_result = None
         query_expansion_metadata = {}
+        # Intent and lexical checks run once here and are reused by later stages
+        query_analysis = None
         
         try:
             # Classify query intent
-            intent_result = intent_classifier.classify(query)
+            query_analysis = QueryAnalyzer(intent_classifier).analyze(query, normalize=False)
+            intent_result = query_analysis.intent
             logger.debug(f"Query intent: {intent_result.intent.value}, attribute: {intent_result.attribute}")
             
             # Generate query rewrites for better recall
@@ -1601,7 +1636,9 @@ async def retrieve_context_tool(arguments: Dict[str, Any]) -> Dict[str, Any]:
             # Phase 3: Graph-enhanced query expansion
             if graph_query_expander:
                 try:
-                    expansion_result = graph_query_expander.expand_query(query)
+                    expansion_result = graph_query_expander.expand_query(
+                        query, intent_result=intent_result
+                    )
                     graph_expanded_queries = [eq.query for eq in expansion_result.expanded_queries]
                     enhanced_queries.extend(graph_expanded_queries)
                     
@@ -1724,8 +1761,11 @@ async def retrieve_context_tool(arguments: Dict[str, Any]) -> Dict[str, Any]:
                     
                     # Apply hybrid scoring if available, otherwise fall back to fact-aware ranking
                     if hybrid_scorer:
-                        # Classify intent for scoring mode selection
-                        intent_result = intent_classifier.classify(original_query)
+                        # Intent for scoring mode selection
+                        if query_analysis is not None:
+                            intent_result = query_analysis.intent
+                        else:
+                            intent_result = intent_classifier.classify(original_query)
                         
                         # Apply hybrid scoring with graph integration
                         hybrid_scores = hybrid_scorer.compute_hybrid_score(
@@ -1916,7 +1956,10 @@ async def retrieve_context_tool(arguments: Dict[str, Any]) -> Dict[str, Any]:
         # 4. Technical term recognition for better code discovery
         
         # Determine if this is a technical query
-        technical_query = is_technical_query(query)
+        if query_analysis is not None:
+            technical_query = query_analysis.is_technical
+        else:
+            technical_query = is_technical_query(query)
         
         # Apply enhancements with all features enabled
         # These can be made configurable via arguments in the future
@@ -2909,16 +2952,25 @@ async def store_fact_tool(arguments: Dict[str, Any]) -> Dict[str, Any]:
             
             # Run potentially long-running storage operation asynchronously
             try:
-                await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: active_fact_store.store_fact(
+                if async_fact_store and not graph_fact_store:
+                    await async_fact_store.store_fact(
                         namespace=scope.namespace,
                         user_id=scope.user_id,
                         attribute=arguments["attribute"],
                         value=arguments["value"],
                         source_turn_id=source_turn_id
                     )
-                )
+                else:
+                    await asyncio.get_event_loop().run_in_executor(
+                        None,
+                        lambda: active_fact_store.store_fact(
+                            namespace=scope.namespace,
+                            user_id=scope.user_id,
+                            attribute=arguments["attribute"],
+                            value=arguments["value"],
+                            source_turn_id=source_turn_id
+                        )
+                    )
                 stored_facts = [{"attribute": arguments["attribute"], "value": arguments["value"]}]
             except Exception as e:
                 logger.error(f"Error storing fact: {e}")
@@ -2941,6 +2993,27 @@ async def store_fact_tool(arguments: Dict[str, Any]) -> Dict[str, Any]:
                 active_fact_store = graph_fact_store if graph_fact_store else fact_store
                 store_tasks = []
                 
+                if async_fact_store and not graph_fact_store:
+                    # All extracted facts go out in one pipelined transaction
+                    store_tasks.append(async_fact_store.store_facts(
+                        scope.namespace,
+                        scope.user_id,
+                        [
+                            {
+                                "attribute": f.attribute,
+                                "value": f.value,
+                                "confidence": f.confidence,
+                                "source_turn_id": source_turn_id,
+                            }
+                            for f in extracted_facts
+                        ],
+                    ))
+                    stored_facts = [
+                        {"attribute": f.attribute, "value": f.value, "confidence": f.confidence}
+                        for f in extracted_facts
+                    ]
+                    extracted_facts = []
+                
                 for fact in extracted_facts:
                     # Create async task for each fact storage operation
                     task = asyncio.get_event_loop().run_in_executor(
@@ -2992,6 +3065,13 @@ async def store_fact_tool(arguments: Dict[str, Any]) -> Dict[str, Any]:
         }
 
 
+async def _get_fact(namespace: str, user_id: str, attribute: str):
+    """Look up one fact through the async store when it is available."""
+    if async_fact_store:
+        return await async_fact_store.get_fact(namespace, user_id, attribute)
+    return fact_store.get_fact(namespace, user_id, attribute)
+
+
 async def retrieve_fact_tool(arguments: Dict[str, Any]) -> Dict[str, Any]:
     """Retrieve facts using intent classification and deterministic lookup."""
     if not fact_store or not scope_middleware:
@@ -3024,7 +3104,7 @@ async def retrieve_fact_tool(arguments: Dict[str, Any]) -> Dict[str, Any]:
         
         if attribute:
             # Direct attribute lookup
-            fact = fact_store.get_fact(scope.namespace, scope.user_id, attribute)
+            fact = await _get_fact(scope.namespace, scope.user_id, attribute)
             if fact:
                 return {
                     "success": True,
@@ -3040,7 +3120,7 @@ async def retrieve_fact_tool(arguments: Dict[str, Any]) -> Dict[str, Any]:
                 }
         elif intent_result.attribute:
             # Intent-based lookup
-            fact = fact_store.get_fact(scope.namespace, scope.user_id, intent_result.attribute)
+            fact = await _get_fact(scope.namespace, scope.user_id, intent_result.attribute)
             if fact:
                 return {
                     "success": True,
@@ -3117,7 +3197,15 @@ async def list_user_facts_tool(arguments: Dict[str, Any]) -> Dict[str, Any]:
         include_history = arguments.get("include_history", False)
 
         # Get all facts for user
-        user_facts = fact_store.get_user_facts(scope.namespace, scope.user_id)
+        if async_fact_store:
+            user_facts = await async_fact_store.get_user_facts(scope.namespace, scope.user_id)
+            histories = (
+                await async_fact_store.get_fact_histories(scope.namespace, scope.user_id, user_facts)
+                if include_history else {}
+            )
+        else:
+            user_facts = fact_store.get_user_facts(scope.namespace, scope.user_id)
+            histories = None
         
         facts_data = []
         for attribute, fact in user_facts.items():
@@ -3131,7 +3219,10 @@ async def list_user_facts_tool(arguments: Dict[str, Any]) -> Dict[str, Any]:
             }
             
             if include_history:
-                history = fact_store.get_fact_history(scope.namespace, scope.user_id, attribute)
+                if histories is not None:
+                    history = histories.get(attribute, [])
+                else:
+                    history = fact_store.get_fact_history(scope.namespace, scope.user_id, attribute)
                 fact_data["history"] = history
             
             facts_data.append(fact_data)
@@ -3189,10 +3280,13 @@ async def delete_user_facts_tool(arguments: Dict[str, Any]) -> Dict[str, Any]:
             }
 
         # Delete all facts for user - run async for potentially large deletions
-        deleted_count = await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: fact_store.delete_user_facts(scope.namespace, scope.user_id)
-        )
+        if async_fact_store:
+            deleted_count = await async_fact_store.delete_user_facts(scope.namespace, scope.user_id)
+        else:
+            deleted_count = await asyncio.get_event_loop().run_in_executor(
+                None,
+                lambda: fact_store.delete_user_facts(scope.namespace, scope.user_id)
+            )
         
         logger.info(f"Deleted {deleted_count} fact entries for {scope.namespace}:{scope.user_id}")
         
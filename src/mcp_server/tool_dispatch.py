@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+In-process dispatch to MCP tool handlers.
+
+The REST compatibility layer used to reach /tools/* by POSTing back to its own
+server over loopback HTTP: a new connection, a second JSON encode/decode and a
+second pass through the middleware stack on every call. main.py registers its
+tool handlers here instead, and callers invoke them directly with the same
+request model validation and API key check the HTTP route would apply.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Type
+
+from fastapi import HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ToolHandler:
+    """A registered /tools/{name} handler."""
+    handler: Callable[..., Awaitable[Dict[str, Any]]]
+    request_model: Type[BaseModel]
+    # FastAPI dependency resolving api_key_info, e.g. verify_api_key
+    auth_dependency: Optional[Callable[..., Awaitable[Any]]] = None
+
+
+_handlers: Dict[str, ToolHandler] = {}
+
+
+def register_tool(
+    name: str,
+    handler: Callable[..., Awaitable[Dict[str, Any]]],
+    request_model: Type[BaseModel],
+    auth_dependency: Optional[Callable[..., Awaitable[Any]]] = None,
+) -> None:
+    """
+    Register a tool handler for in-process calls.
+
+    Args:
+        name: Tool name (the last segment of its /tools/ path)
+        handler: The route function; called as handler(model[, api_key_info=...])
+        request_model: Pydantic model the route validates its body with
+        auth_dependency: Dependency supplying api_key_info, if the route takes one
+    """
+    _handlers[name] = ToolHandler(handler, request_model, auth_dependency)
+
+
+def get_tool(name: str) -> Optional[ToolHandler]:
+    """Return the registered handler for a tool name, if any."""
+    return _handlers.get(name)
+
+
+def clear_tools() -> None:
+    """Drop all registrations (useful for testing)."""
+    _handlers.clear()
+
+
+async def call_tool(tool: ToolHandler, request: Request, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run a tool handler as its HTTP route would, without the HTTP round trip.
+
+    Args:
+        tool: Registered handler
+        request: Incoming request, used for authentication headers
+        payload: Tool request body
+
+    Returns:
+        The handler's result, JSON-encoded the way the route would return it
+
+    Raises:
+        HTTPException: 422 for an invalid payload, or whatever the
+            authentication dependency or handler raises
+    """
+    try:
+        body = tool.request_model(**payload)
+    except ValidationError as e:
+        logger.debug(f"Tool payload validation failed: {e}")
+        raise HTTPException(status_code=422, detail="Invalid tool request")
+
+    kwargs: Dict[str, Any] = {}
+    if tool.auth_dependency is not None:
+        kwargs["api_key_info"] = await tool.auth_dependency(
+            request,
+            x_api_key=request.headers.get("x-api-key"),
+            authorization=request.headers.get("authorization"),
+        )
+
+    return jsonable_encoder(await tool.handler(body, **kwargs))
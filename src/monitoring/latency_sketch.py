@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Mergeable latency sketches for request metrics.
+
+LatencySketch is a DDSketch-style histogram: values are counted in
+logarithmically sized bins so that any quantile is reported within a fixed
+relative error (1% by default), memory is bounded by the number of bins, and
+two sketches merge by adding bin counts.
+
+WindowedLatencySketch keeps one sketch per fixed-size time bucket in a ring
+buffer. Recording touches only the current bucket; a percentile over any
+window merges the buckets inside it, so queries cost O(buckets) and never
+sort raw samples.
+"""
+
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_MAX_BINS = 2048
+DEFAULT_BUCKET_SECONDS = 10.0
+
+
+class LatencySketch:
+    """Relative-error quantile sketch with bounded memory."""
+
+    __slots__ = ("relative_accuracy", "gamma", "_log_gamma", "min_value", "max_bins",
+                 "bins", "zero_count", "count", "sum", "min", "max")
+
+    def __init__(
+        self,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        max_bins: int = DEFAULT_MAX_BINS,
+        min_value: float = 1e-3,
+    ):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        self.max_bins = max(1, max_bins)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        """Record one value."""
+        if value <= self.min_value:
+            self.zero_count += 1
+        else:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[key] = self.bins.get(key, 0) + 1
+            if len(self.bins) > self.max_bins:
+                self._collapse_lowest()
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "LatencySketch") -> None:
+        """Add another sketch's counts into this one."""
+        if other.count == 0:
+            return
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for key, bin_count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + bin_count
+        while len(self.bins) > self.max_bins:
+            self._collapse_lowest()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate the q-th quantile (0 <= q <= 1).
+
+        Uses the same rank convention as sorting the samples and taking index
+        ``int(q * count)``. Estimates are clamped to the observed min and max.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = min(int(q * self.count), self.count - 1)
+        if rank < self.zero_count:
+            return max(self.min, 0.0)
+        cumulative = self.zero_count
+        for key in sorted(self.bins):
+            cumulative += self.bins[key]
+            if cumulative > rank:
+                estimate = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def _collapse_lowest(self) -> None:
+        """Fold the lowest bin into the next one to bound memory."""
+        keys = sorted(self.bins)
+        lowest, next_lowest = keys[0], keys[1]
+        self.bins[next_lowest] += self.bins.pop(lowest)
+
+
+class _Bucket:
+    __slots__ = ("index", "sketch", "errors")
+
+    def __init__(self, index: int, sketch: LatencySketch):
+        self.index = index
+        self.sketch = sketch
+        self.errors = 0
+
+
+class WindowedLatencySketch:
+    """Ring buffer of per-time-bucket sketches covering a sliding window."""
+
+    def __init__(
+        self,
+        window_seconds: float,
+        bucket_seconds: float = DEFAULT_BUCKET_SECONDS,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+    ):
+        """
+        Args:
+            window_seconds: Longest window that can be queried
+            bucket_seconds: Width of each time bucket
+            relative_accuracy: Relative error of reported quantiles
+        """
+        if window_seconds <= 0 or bucket_seconds <= 0:
+            raise ValueError("window_seconds and bucket_seconds must be positive")
+        self.bucket_seconds = bucket_seconds
+        self.num_buckets = max(1, math.ceil(window_seconds / bucket_seconds))
+        self.window_seconds = self.num_buckets * bucket_seconds
+        self.relative_accuracy = relative_accuracy
+        self._slots: List[Optional[_Bucket]] = [None] * self.num_buckets
+
+    def record(self, value: float, is_error: bool = False, now: Optional[float] = None) -> None:
+        """Record a value in the bucket for ``now`` (defaults to the current time)."""
+        index = self._bucket_index(now)
+        slot = index % self.num_buckets
+        bucket = self._slots[slot]
+        if bucket is None or bucket.index != index:
+            bucket = _Bucket(index, LatencySketch(self.relative_accuracy))
+            self._slots[slot] = bucket
+        bucket.sketch.add(value)
+        if is_error:
+            bucket.errors += 1
+
+    def snapshot(
+        self, window_seconds: Optional[float] = None, now: Optional[float] = None
+    ) -> Tuple[LatencySketch, int]:
+        """
+        Merge the buckets inside the window.
+
+        Args:
+            window_seconds: Window to cover (rounded up to whole buckets, capped
+                at the ring size); defaults to the whole ring
+            now: Reference time in seconds since the epoch
+
+        Returns:
+            (merged sketch, error count) for the window
+        """
+        current = self._bucket_index(now)
+        span = self.num_buckets
+        if window_seconds is not None:
+            span = min(span, max(1, math.ceil(window_seconds / self.bucket_seconds)))
+        merged = LatencySketch(self.relative_accuracy)
+        errors = 0
+        for bucket in self._slots:
+            if bucket is not None and current - span < bucket.index <= current:
+                merged.merge(bucket.sketch)
+                errors += bucket.errors
+        return merged, errors
+
+    def recent_count(self, seconds: float, now: Optional[float] = None) -> float:
+        """
+        Approximate number of values recorded in the last ``seconds``.
+
+        Buckets that straddle the window start are prorated, assuming values
+        were spread evenly over the part of the bucket that has elapsed.
+        """
+        now = time.time() if now is None else now
+        start = now - seconds
+        total = 0.0
+        for bucket in self._slots:
+            if bucket is None:
+                continue
+            bucket_start = bucket.index * self.bucket_seconds
+            bucket_end = min(bucket_start + self.bucket_seconds, now)
+            if bucket_end <= start or bucket_start > now:
+                continue
+            elapsed = bucket_end - bucket_start
+            covered = bucket_end - max(bucket_start, start)
+            total += bucket.sketch.count * (covered / elapsed if elapsed > 0 else 1.0)
+        return total
+
+    def _bucket_index(self, now: Optional[float]) -> int:
+        return int((time.time() if now is None else now) // self.bucket_seconds)
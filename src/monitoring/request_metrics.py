@@ -7,22 +7,35 @@ Provides FastAPI middleware for tracking:
 - Error rates by endpoint
 - Request counts and throughput
 - Time-series data for trending
+
+Latency percentiles come from mergeable quantile sketches kept in a ring of
+one-minute buckets per endpoint (see latency_sketch.py), so recording is O(1)
+without a lock, memory per endpoint is bounded, and a percentile over any
+window merges O(buckets) sketches instead of sorting raw durations.
 """
 
 import time
-import asyncio
 import logging
-from typing import Dict, List, Optional, Callable
+from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
 from dataclasses import dataclass, field
 # FastAPI imports - these are required dependencies
-from fastapi import Request, Response, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import Response, HTTPException
 FASTAPI_AVAILABLE = True
 
+from .latency_sketch import WindowedLatencySketch
+
+try:
+    from ..utils.asgi_pipeline import PipelineStage, RequestContext, ResponseLike
+except ImportError:
+    # Imported as the top-level "monitoring" package with src/ on sys.path
+    from utils.asgi_pipeline import PipelineStage, RequestContext, ResponseLike
+
 logger = logging.getLogger(__name__)
 
+METRICS_BUCKET_SECONDS = 60
+
 
 @dataclass
 class RequestMetric:
@@ -41,9 +54,21 @@ class EndpointStats:
     request_count: int = 0
     error_count: int = 0
     total_duration_ms: float = 0.0
-    durations: deque = field(default_factory=lambda: deque(maxlen=1000))
+    latency: WindowedLatencySketch = field(
+        default_factory=lambda: WindowedLatencySketch(60 * 60, METRICS_BUCKET_SECONDS)
+    )
     last_request: Optional[datetime] = None
     
+    def record(self, duration_ms: float, is_error: bool = False,
+               timestamp: Optional[datetime] = None) -> None:
+        """Record one request against this endpoint."""
+        self.request_count += 1
+        self.total_duration_ms += duration_ms
+        self.latency.record(duration_ms, is_error)
+        if is_error:
+            self.error_count += 1
+        self.last_request = timestamp or datetime.utcnow()
+    
     @property
     def error_rate_percent(self) -> float:
         """Calculate error rate percentage."""
@@ -60,21 +85,13 @@ class EndpointStats:
     
     @property
     def p95_duration_ms(self) -> float:
-        """Calculate 95th percentile duration."""
-        if not self.durations:
-            return 0.0
-        sorted_durations = sorted(self.durations)
-        idx = int(len(sorted_durations) * 0.95)
-        return sorted_durations[min(idx, len(sorted_durations) - 1)]
+        """95th percentile duration over the history window."""
+        return self.latency.snapshot()[0].quantile(0.95)
     
     @property
     def p99_duration_ms(self) -> float:
-        """Calculate 99th percentile duration."""
-        if not self.durations:
-            return 0.0
-        sorted_durations = sorted(self.durations)
-        idx = int(len(sorted_durations) * 0.99)
-        return sorted_durations[min(idx, len(sorted_durations) - 1)]
+        """99th percentile duration over the history window."""
+        return self.latency.snapshot()[0].quantile(0.99)
 
 
 class RequestMetricsCollector:
@@ -89,42 +106,33 @@ class RequestMetricsCollector:
             
         self.max_history_minutes = max_history_minutes
         self.max_requests_stored = max_requests_stored
-        self.endpoint_stats: Dict[str, EndpointStats] = defaultdict(EndpointStats)
+        self.endpoint_stats: Dict[str, EndpointStats] = defaultdict(self._new_endpoint_stats)
         self.recent_requests: deque = deque(maxlen=max_requests_stored)
+        self.latency = WindowedLatencySketch(max_history_minutes * 60, METRICS_BUCKET_SECONDS)
         self.total_requests = 0
         self.total_errors = 0
-        self._lock = asyncio.Lock()
         
-        # Bounded task queue for metrics recording
-        self._metrics_queue: asyncio.Queue = asyncio.Queue(maxsize=1000)
-        self._queue_processor_task: Optional[asyncio.Task] = None
-        self._processing_enabled = True
-        
-        # Rate limiting for cleanup operations
-        self._last_cleanup = datetime.utcnow()
-        self._cleanup_interval_seconds = 30  # Cleanup every 30 seconds max
+    def _new_endpoint_stats(self) -> EndpointStats:
+        return EndpointStats(
+            latency=WindowedLatencySketch(self.max_history_minutes * 60, METRICS_BUCKET_SECONDS)
+        )
         
     async def start_queue_processor(self) -> None:
-        """Start the bounded queue processor for metrics recording."""
-        if self._queue_processor_task is None or self._queue_processor_task.done():
-            self._processing_enabled = True
-            self._queue_processor_task = asyncio.create_task(self._process_metrics_queue())
-            logger.info("Started metrics queue processor")
+        """
+        Lifecycle hook kept for server startup.
+        
+        Recording updates fixed-size sketches inline, so there is no
+        background queue to drain.
+        """
+        logger.debug("Request metrics are recorded inline; no queue processor to start")
     
     async def stop_queue_processor(self) -> None:
-        """Stop the metrics queue processor gracefully."""
-        self._processing_enabled = False
-        if self._queue_processor_task:
-            self._queue_processor_task.cancel()
-            try:
-                await self._queue_processor_task
-            except asyncio.CancelledError:
-                pass
-        logger.info("Stopped metrics queue processor")
+        """Lifecycle hook kept for server shutdown."""
+        logger.debug("Request metrics are recorded inline; no queue processor to stop")
     
     async def record_request(self, method: str, path: str, status_code: int, 
                            duration_ms: float, error: Optional[str] = None) -> None:
-        """Record a request metric using bounded queue for backpressure handling."""
+        """Record a request metric (O(1), no lock, no awaits)."""
         # Input validation
         if not method or len(method) > 10:
             logger.warning(f"Invalid method: {method}")
@@ -136,94 +144,32 @@ class RequestMetricsCollector:
             logger.warning(f"Invalid duration: {duration_ms}ms")
             return
         
-        metric_data = {
-            'method': method,
-            'path': path,
-            'status_code': status_code,
-            'duration_ms': duration_ms,
-            'error': error,
-            'timestamp': datetime.utcnow()
-        }
+        metric = RequestMetric(
+            timestamp=datetime.utcnow(),
+            method=method,
+            path=path,
+            status_code=status_code,
+            duration_ms=duration_ms,
+            error=error
+        )
+        is_error = status_code >= 400
         
-        try:
-            # Non-blocking put with immediate failure if queue is full
-            self._metrics_queue.put_nowait(metric_data)
-        except asyncio.QueueFull:
-            logger.warning("Metrics queue full, dropping request metric")
-            # Could implement sampling here - only record every Nth request when overloaded
-    
-    async def _process_metrics_queue(self) -> None:
-        """Process metrics from the bounded queue."""
-        while self._processing_enabled:
-            try:
-                # Wait for metrics with timeout to allow graceful shutdown
-                metric_data = await asyncio.wait_for(
-                    self._metrics_queue.get(), 
-                    timeout=1.0
-                )
-                
-                await self._record_metric_direct(metric_data)
-                self._metrics_queue.task_done()
-                
-            except asyncio.TimeoutError:
-                # Normal timeout, continue processing
-                continue
-            except asyncio.CancelledError:
-                logger.info("Metrics queue processor cancelled")
-                break
-            except Exception as e:
-                logger.error(f"Error processing metric: {e}")
-                continue
-    
-    async def _record_metric_direct(self, metric_data: Dict) -> None:
-        """Directly record a metric (internal method with full validation already done)."""
-        async with self._lock:
-            endpoint_key = f"{metric_data['method']} {metric_data['path']}"
-            metric = RequestMetric(
-                timestamp=metric_data['timestamp'],
-                method=metric_data['method'],
-                path=metric_data['path'],
-                status_code=metric_data['status_code'],
-                duration_ms=metric_data['duration_ms'],
-                error=metric_data['error']
-            )
-            
-            # Update endpoint stats
-            stats = self.endpoint_stats[endpoint_key]
-            stats.request_count += 1
-            stats.total_duration_ms += metric_data['duration_ms']
-            stats.durations.append(metric_data['duration_ms'])
-            stats.last_request = metric.timestamp
-            
-            if metric_data['status_code'] >= 400:
-                stats.error_count += 1
-                self.total_errors += 1
-            
-            # Add to recent requests
-            self.recent_requests.append(metric)
-            self.total_requests += 1
-            
-            # Rate-limited cleanup
-            await self._cleanup_old_data_rate_limited()
-    
-    async def _cleanup_old_data_rate_limited(self) -> None:
-        """Remove data older than max_history_minutes with rate limiting."""
-        now = datetime.utcnow()
-        if (now - self._last_cleanup).total_seconds() >= self._cleanup_interval_seconds:
-            await self._cleanup_old_data()
-            self._last_cleanup = now
+        # Everything below runs without yielding to the event loop, so
+        # concurrent requests cannot interleave and no lock is needed.
+        self.endpoint_stats[f"{method} {path}"].record(duration_ms, is_error, metric.timestamp)
+        self.latency.record(duration_ms, is_error)
+        self.total_requests += 1
+        if is_error:
+            self.total_errors += 1
+        
+        self.recent_requests.append(metric)
+        self._cleanup_old_data()
     
-    async def _cleanup_old_data(self) -> None:
-        """Remove data older than max_history_minutes."""
+    def _cleanup_old_data(self) -> None:
+        """Drop recent requests older than max_history_minutes (amortized O(1))."""
         cutoff_time = datetime.utcnow() - timedelta(minutes=self.max_history_minutes)
-        
-        # Clean recent requests with batch processing to avoid blocking
         cleanup_count = 0
-        max_cleanup_per_cycle = 1000  # Limit cleanup operations per cycle
-        
-        while (self.recent_requests and 
-               self.recent_requests[0].timestamp < cutoff_time and
-               cleanup_count < max_cleanup_per_cycle):
+        while self.recent_requests and self.recent_requests[0].timestamp < cutoff_time:
             self.recent_requests.popleft()
             cleanup_count += 1
             
@@ -231,59 +177,44 @@ class RequestMetricsCollector:
             logger.debug(f"Cleaned up {cleanup_count} old request metrics")
     
     async def get_global_stats(self) -> Dict[str, float]:
-        """Get global statistics across all endpoints."""
-        async with self._lock:
-            if not self.recent_requests:
-                return {
-                    'total_requests': 0,
-                    'total_errors': 0,
-                    'error_rate_percent': 0.0,
-                    'avg_duration_ms': 0.0,
-                    'p95_duration_ms': 0.0,
-                    'p99_duration_ms': 0.0,
-                    'requests_per_minute': 0.0
-                }
-            
-            # Calculate from recent requests
-            durations = [r.duration_ms for r in self.recent_requests]
-            errors = [r for r in self.recent_requests if r.status_code >= 400]
-            
-            # Calculate requests per minute
-            now = datetime.utcnow()
-            one_minute_ago = now - timedelta(minutes=1)
-            recent_minute_requests = [
-                r for r in self.recent_requests 
-                if r.timestamp >= one_minute_ago
-            ]
-            
-            # Sort durations for percentiles
-            sorted_durations = sorted(durations)
-            
+        """Get global statistics across all endpoints over the history window."""
+        sketch, errors = self.latency.snapshot()
+        if sketch.count == 0:
             return {
-                'total_requests': len(self.recent_requests),
-                'total_errors': len(errors),
-                'error_rate_percent': (len(errors) / len(self.recent_requests)) * 100,
-                'avg_duration_ms': sum(durations) / len(durations) if durations else 0.0,
-                'p95_duration_ms': sorted_durations[int(len(sorted_durations) * 0.95)] if sorted_durations else 0.0,
-                'p99_duration_ms': sorted_durations[int(len(sorted_durations) * 0.99)] if sorted_durations else 0.0,
-                'requests_per_minute': len(recent_minute_requests)
+                'total_requests': 0,
+                'total_errors': 0,
+                'error_rate_percent': 0.0,
+                'avg_duration_ms': 0.0,
+                'p95_duration_ms': 0.0,
+                'p99_duration_ms': 0.0,
+                'requests_per_minute': 0.0
             }
+        
+        return {
+            'total_requests': sketch.count,
+            'total_errors': errors,
+            'error_rate_percent': (errors / sketch.count) * 100,
+            'avg_duration_ms': sketch.mean,
+            'p95_duration_ms': sketch.quantile(0.95),
+            'p99_duration_ms': sketch.quantile(0.99),
+            'requests_per_minute': self.latency.recent_count(60)
+        }
     
     async def get_endpoint_stats(self) -> Dict[str, Dict[str, float]]:
         """Get statistics by endpoint."""
-        async with self._lock:
-            return {
-                endpoint: {
-                    'request_count': stats.request_count,
-                    'error_count': stats.error_count,
-                    'error_rate_percent': stats.error_rate_percent,
-                    'avg_duration_ms': stats.avg_duration_ms,
-                    'p95_duration_ms': stats.p95_duration_ms,
-                    'p99_duration_ms': stats.p99_duration_ms,
-                    'last_request': stats.last_request.isoformat() if stats.last_request else None
-                }
-                for endpoint, stats in self.endpoint_stats.items()
+        endpoints = {}
+        for endpoint, stats in list(self.endpoint_stats.items()):
+            sketch, _ = stats.latency.snapshot()
+            endpoints[endpoint] = {
+                'request_count': stats.request_count,
+                'error_count': stats.error_count,
+                'error_rate_percent': stats.error_rate_percent,
+                'avg_duration_ms': stats.avg_duration_ms,
+                'p95_duration_ms': sketch.quantile(0.95),
+                'p99_duration_ms': sketch.quantile(0.99),
+                'last_request': stats.last_request.isoformat() if stats.last_request else None
             }
+        return endpoints
     
     async def get_trending_data(self, minutes: int = 5) -> List[Dict[str, float]]:
         """Get trending data for the last N minutes with input validation."""
@@ -293,102 +224,91 @@ class RequestMetricsCollector:
         if minutes > 1440:  # Max 24 hours
             raise ValueError("minutes cannot exceed 1440 (24 hours)")
         
-        async with self._lock:
-            cutoff_time = datetime.utcnow() - timedelta(minutes=minutes)
-            recent = [r for r in self.recent_requests if r.timestamp >= cutoff_time]
-            
-            # Limit processing for very large datasets
-            max_requests_to_process = 50000
-            if len(recent) > max_requests_to_process:
-                logger.warning(f"Limiting trending analysis to {max_requests_to_process} most recent requests")
-                recent = recent[-max_requests_to_process:]
-            
-            # Group by minute
-            minute_buckets = defaultdict(list)
-            for request in recent:
-                minute_key = request.timestamp.replace(second=0, microsecond=0)
-                minute_buckets[minute_key].append(request)
-            
-            # Limit number of minute buckets to prevent memory exhaustion
-            max_buckets = min(minutes, 1440)  # Never more than requested minutes or 24 hours
-            if len(minute_buckets) > max_buckets:
-                # Keep only the most recent buckets
-                sorted_minutes = sorted(minute_buckets.keys())
-                recent_minutes = sorted_minutes[-max_buckets:]
-                minute_buckets = {k: minute_buckets[k] for k in recent_minutes}
-            
-            # Calculate stats per minute
-            trending = []
-            for minute, requests in sorted(minute_buckets.items()):
-                durations = [r.duration_ms for r in requests]
-                errors = [r for r in requests if r.status_code >= 400]
-                
-                trending.append({
-                    'timestamp': minute.isoformat(),
-                    'request_count': len(requests),
-                    'error_count': len(errors),
-                    'avg_duration_ms': sum(durations) / len(durations) if durations else 0.0,
-                    'error_rate_percent': (len(errors) / len(requests)) * 100 if requests else 0.0
-                })
+        cutoff_time = datetime.utcnow() - timedelta(minutes=minutes)
+        recent = [r for r in self.recent_requests if r.timestamp >= cutoff_time]
+        
+        # Limit processing for very large datasets
+        max_requests_to_process = 50000
+        if len(recent) > max_requests_to_process:
+            logger.warning(f"Limiting trending analysis to {max_requests_to_process} most recent requests")
+            recent = recent[-max_requests_to_process:]
+        
+        # Group by minute
+        minute_buckets = defaultdict(list)
+        for request in recent:
+            minute_key = request.timestamp.replace(second=0, microsecond=0)
+            minute_buckets[minute_key].append(request)
+        
+        # Limit number of minute buckets to prevent memory exhaustion
+        max_buckets = min(minutes, 1440)  # Never more than requested minutes or 24 hours
+        if len(minute_buckets) > max_buckets:
+            # Keep only the most recent buckets
+            sorted_minutes = sorted(minute_buckets.keys())
+            recent_minutes = sorted_minutes[-max_buckets:]
+            minute_buckets = {k: minute_buckets[k] for k in recent_minutes}
+        
+        # Calculate stats per minute
+        trending = []
+        for minute, requests in sorted(minute_buckets.items()):
+            durations = [r.duration_ms for r in requests]
+            errors = [r for r in requests if r.status_code >= 400]
             
-            return trending
+            trending.append({
+                'timestamp': minute.isoformat(),
+                'request_count': len(requests),
+                'error_count': len(errors),
+                'avg_duration_ms': sum(durations) / len(durations) if durations else 0.0,
+                'error_rate_percent': (len(errors) / len(requests)) * 100 if requests else 0.0
+            })
+        
+        return trending
 
 
-class RequestMetricsMiddleware(BaseHTTPMiddleware):
+class RequestMetricsMiddleware(PipelineStage):
     """FastAPI middleware for request metrics collection with improved error handling."""
     
     def __init__(self, app, metrics_collector: RequestMetricsCollector):
         super().__init__(app)
         self.metrics_collector = metrics_collector
-        # Ensure queue processor is started
-        asyncio.create_task(self.metrics_collector.start_queue_processor())
-        
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Process request and collect metrics with improved error handling."""
-        start_time = time.time()
-        error_message = None
-        response = None
-        
-        try:
-            response = await call_next(request)
-            status_code = response.status_code
-        except HTTPException as e:
+    
+    async def on_response(self, ctx: RequestContext, response: ResponseLike) -> None:
+        """Record metrics for a completed request."""
+        await self._record(ctx, response.status_code)
+    
+    async def on_error(self, ctx: RequestContext, error: Exception) -> Optional[Response]:
+        """Answer an unhandled error and record it."""
+        if isinstance(error, HTTPException):
             # Handle FastAPI HTTP exceptions properly
-            error_message = f"HTTP {e.status_code}: {e.detail}"
-            status_code = e.status_code
-            # Re-raise HTTPException to let FastAPI handle it properly
+            error_message = f"HTTP {error.status_code}: {error.detail}"
             response = Response(
-                content=str(e.detail),
-                status_code=e.status_code,
-                headers=getattr(e, 'headers', None)
+                content=str(error.detail),
+                status_code=error.status_code,
+                headers=getattr(error, 'headers', None)
             )
-        except asyncio.CancelledError:
-            # Handle cancellation gracefully
-            error_message = "Request cancelled"
-            status_code = 499  # Client closed connection
-            response = Response(
-                content="Request cancelled",
-                status_code=499
-            )
-        except Exception as e:
+        else:
             # Handle unexpected exceptions
-            error_message = f"Unexpected error: {type(e).__name__}: {str(e)}"
-            status_code = 500
-            logger.error(f"Unexpected error in request middleware: {e}", exc_info=True)
+            error_message = f"Unexpected error: {type(error).__name__}: {str(error)}"
+            logger.error(f"Unexpected error in request middleware: {error}", exc_info=error)
             response = Response(
                 content="Internal Server Error",
                 status_code=500
             )
         
-        # Calculate duration
-        duration_ms = (time.time() - start_time) * 1000
-        
-        # Record metrics using bounded queue (non-blocking)
-        # The bounded queue handles backpressure automatically
+        await self._record(ctx, response.status_code, error_message)
+        return response
+    
+    async def on_cancel(self, ctx: RequestContext) -> None:
+        """Record a request cancelled by a client disconnect."""
+        await self._record(ctx, 499, "Request cancelled")  # Client closed connection
+    
+    async def _record(self, ctx: RequestContext, status_code: int,
+                      error_message: Optional[str] = None) -> None:
+        """Record one request (constant-time sketch updates, non-blocking)."""
+        duration_ms = (time.time() - ctx.start_time) * 1000
         try:
             await self.metrics_collector.record_request(
-                method=request.method,
-                path=request.url.path,
+                method=ctx.request.method,
+                path=ctx.request.url.path,
                 status_code=status_code,
                 duration_ms=duration_ms,
                 error=error_message
@@ -396,8 +316,6 @@ class RequestMetricsMiddleware(BaseHTTPMiddleware):
         except Exception as e:
             # Don't let metrics recording interfere with request processing
             logger.debug(f"Failed to record request metrics: {e}")
-        
-        return response
 
 
 # Global metrics collector instance
@@ -13,6 +13,7 @@ from typing import List, Dict, Any, Optional, Callable
 from dataclasses import dataclass
 from enum import Enum
 
+from ..core.query_analysis import contains_code_patterns
 from ..interfaces.memory_result import MemoryResult, ContentType, ResultSource
 from ..utils.logging_middleware import ranking_logger
 
@@ -273,13 +274,7 @@ class CodeBoostRankingPolicy(RankingPolicy):
     
     def _contains_code_patterns(self, text: str) -> bool:
         """Heuristically detect if text contains code."""
-        code_indicators = [
-            'def ', 'function ', 'class ', 'import ', 'from ',
-            '{', '}', '()', '[]', 'return', 'if __name__',
-            'SELECT', 'INSERT', 'UPDATE', 'DELETE', 'CREATE'
-        ]
-        text_lower = text.lower()
-        return any(indicator.lower() in text_lower for indicator in code_indicators)
+        return contains_code_patterns(text)
     
     def _calculate_recency_factor(self, result_time, current_time) -> float:
         """Simplified recency calculation."""
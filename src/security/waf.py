@@ -13,6 +13,8 @@ from datetime import datetime, timedelta
 from collections import defaultdict
 import hashlib
 
+from .waf_engine import LiteralScan, WAFMatcher, fold_text, guard_pattern
+
 logger = logging.getLogger(__name__)
 
 
@@ -257,6 +259,8 @@ class WAFFilter:
         self.config = config or WAFConfig()
         self.blocked_ips: Set[str] = set()
         self.alert_callbacks = []
+        self._matcher: Optional[WAFMatcher] = None
+        self._matcher_key: Tuple = ()
     
     def check_request(self, request_data: Dict[str, Any]) -> WAFResult:
         """
@@ -271,48 +275,64 @@ class WAFFilter:
         if not self.config.is_enabled():
             return WAFResult(blocked=False)
         
-        # Convert all keys and values to strings for pattern matching
-        text_to_check = []
+        # Check against all enabled rules in one scan of the request fields
+        for rule in self._get_matcher().iter_matches(self._iter_request_text(request_data)):
+            # Pattern matched - take action based on rule
+            if rule.action == "block":
+                logger.warning(
+                    f"WAF blocked request - Rule: {rule.name}, "
+                    f"Severity: {rule.severity}"
+                )
+                
+                return WAFResult(
+                    blocked=True,
+                    rule=rule.name,
+                    severity=rule.severity,
+                    message=rule.description,
+                    matched_pattern=rule.pattern
+                )
+            
+            elif rule.action == "log":
+                logger.info(f"WAF logged request - Rule: {rule.name}")
+            
+            elif rule.action == "alert":
+                self._send_alert(rule, request_data)
+        
+        return WAFResult(blocked=False)
+    
+    def match_rules(self, request_data: Dict[str, Any]) -> List[str]:
+        """
+        Report every enabled rule matching a request, regardless of action.
+        
+        Args:
+            request_data: Dictionary containing request fields to check
+            
+        Returns:
+            Names of the matching rules in evaluation order
+        """
+        return self._get_matcher().scan(self._iter_request_text(request_data))
+    
+    def _get_matcher(self) -> WAFMatcher:
+        """Matcher for the current rule set, rebuilt when rules change"""
+        rules = self.config.get_rules()
+        key = tuple((id(rule), rule.enabled, rule.compiled_pattern) for rule in rules)
+        if self._matcher is None or key != self._matcher_key:
+            self._matcher = WAFMatcher(rules)
+            self._matcher_key = key
+        return self._matcher
+    
+    @staticmethod
+    def _iter_request_text(request_data: Dict[str, Any]):
+        """Yield request keys and values as strings for pattern matching"""
         for key, value in request_data.items():
             # Include the key in the text to check
-            text_to_check.append(str(key))
+            yield str(key)
             
             if value is not None:
                 if isinstance(value, (list, dict)):
-                    text_to_check.append(json.dumps(value))
+                    yield json.dumps(value)
                 else:
-                    text_to_check.append(str(value))
-        
-        combined_text = " ".join(text_to_check)
-        
-        # Check against all enabled rules
-        for rule in self.config.get_rules():
-            if not rule.enabled:
-                continue
-            
-            if rule.compiled_pattern and rule.compiled_pattern.search(combined_text):
-                # Pattern matched - take action based on rule
-                if rule.action == "block":
-                    logger.warning(
-                        f"WAF blocked request - Rule: {rule.name}, "
-                        f"Severity: {rule.severity}"
-                    )
-                    
-                    return WAFResult(
-                        blocked=True,
-                        rule=rule.name,
-                        severity=rule.severity,
-                        message=rule.description,
-                        matched_pattern=rule.pattern
-                    )
-                
-                elif rule.action == "log":
-                    logger.info(f"WAF logged request - Rule: {rule.name}")
-                
-                elif rule.action == "alert":
-                    self._send_alert(rule, request_data)
-        
-        return WAFResult(blocked=False)
+                    yield str(value)
     
     def check_ip(self, ip_address: str) -> bool:
         """Check if IP is blocked"""
@@ -577,6 +597,7 @@ class WAFResponseFilter:
             re.compile(pattern, re.IGNORECASE)
             for pattern in self.sensitive_patterns
         ]
+        self._guards = [guard_pattern(pattern) for pattern in self.compiled_patterns]
     
     def filter_response(self, response_data: str) -> Tuple[str, bool]:
         """
@@ -590,12 +611,20 @@ class WAFResponseFilter:
         """
         has_sensitive = False
         filtered = response_data
-        
-        for pattern in self.compiled_patterns:
-            if pattern.search(filtered):
+        scan = None
+        
+        # Patterns whose literals are absent are skipped without a regex scan
+        for pattern, guard in zip(self.compiled_patterns, self._guards):
+            if guard.prefiltered:
+                if scan is None:
+                    scan = LiteralScan([fold_text(filtered)])
+                if not guard.candidates(scan):
+                    continue
+            # Redact sensitive data
+            filtered, count = pattern.subn("[REDACTED]", filtered)
+            if count:
                 has_sensitive = True
-                # Redact sensitive data
-                filtered = pattern.sub("[REDACTED]", filtered)
+                scan = None
         
         if has_sensitive:
             logger.warning("Sensitive data detected and redacted in response")
@@ -0,0 +1,399 @@
+"""
+Multi-pattern matching engine for the WAF.
+
+WAFFilter used to run every enabled rule regex over one string built from the
+whole request, and several default rules start with an unanchored ``.*?``
+that makes a miss quadratic in the request size. Python's ``re`` has no
+multi-pattern automaton, so instead each rule is split once into its
+top-level alternatives, and each alternative is guarded by literal sets:
+case-folded substrings every match of it must contain (``ldap_injection``
+needs one of ``cn=``, ``ou=``, ``dc=``, ``objectclass=``). Request fields are
+folded one at a time, guard literals are looked up across them with memoized
+substring scans, and only alternatives whose guards hold are confirmed with a
+regex. Alternatives without a usable literal are always confirmed, so the
+rules that match are exactly those of the rule-by-rule scan.
+"""
+
+import logging
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+try:
+    from re import _constants as sre_constants
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants
+    import sre_parse
+
+if TYPE_CHECKING:
+    from .waf import WAFRule
+
+logger = logging.getLogger(__name__)
+
+# Cap on the alternatives in one literal set (e.g. a run following [abc]);
+# larger products are split instead of enumerated
+MAX_LITERAL_ALTERNATIVES = 64
+
+_REPEAT_OPS = {
+    sre_constants.MAX_REPEAT,
+    sre_constants.MIN_REPEAT,
+    getattr(sre_constants, "POSSESSIVE_REPEAT", sre_constants.MAX_REPEAT),
+}
+_GROUP_OPS = {sre_constants.SUBPATTERN, getattr(sre_constants, "ATOMIC_GROUP", sre_constants.SUBPATTERN)}
+
+
+@lru_cache(maxsize=1)
+def _bmp_text() -> str:
+    return "".join(map(chr, range(0x80, 0x10000)))
+
+
+@lru_cache(maxsize=1)
+def _ascii_fixes() -> Dict[int, str]:
+    """Non-ASCII characters re.IGNORECASE equates with an ASCII letter (e.g. 'ſ', 'ı', 'İ')."""
+    fixes = {}
+    for letter in "abcdefghijklmnopqrstuvwxyz":
+        for char in re.findall(letter, _bmp_text(), re.IGNORECASE):
+            fixes[ord(char)] = letter
+    return fixes
+
+
+def fold_text(text: str) -> str:
+    """
+    Case-fold text for literal prefiltering.
+
+    str.lower() alone disagrees with re.IGNORECASE on a few characters
+    ('İ'.lower() is two characters, 'ſ' matches 's'), so those are mapped to
+    the ASCII letter the regex engine treats them as first.
+    """
+    if text.isascii():
+        return text.lower()
+    return text.translate(_ascii_fixes()).lower()
+
+
+@lru_cache(maxsize=None)
+def _literal_char(char: str, ignorecase: bool) -> Optional[str]:
+    """Folded form of a pattern literal, or None if it cannot be used in a prefilter."""
+    if char.isspace():
+        # Literals never span the separator between request fields
+        return None
+    if char.isascii():
+        return char.lower()
+    if ord(char) > 0xFFFF:
+        return None
+    # Non-ASCII literals are only usable if every character the regex engine
+    # may equate with them folds the same way (rules out e.g. 'Σ'/'σ'/'ς')
+    folded = fold_text(char)
+    candidates = [char] + re.findall(re.escape(folded), _bmp_text(), re.IGNORECASE)
+    if ignorecase:
+        candidates += re.findall(re.escape(char), _bmp_text(), re.IGNORECASE)
+    if all(fold_text(other) == folded for other in candidates):
+        return folded
+    return None
+
+
+def _best(sets: Sequence[FrozenSet[str]]) -> Optional[FrozenSet[str]]:
+    """Most selective literal set: longest shortest literal, then fewest alternatives."""
+    if not sets:
+        return None
+    return max(sets, key=lambda s: (min(map(len, s)), -len(s)))
+
+
+class _Sequence:
+    """Literal requirements of a parsed regex sequence."""
+
+    __slots__ = ("required", "head", "literal")
+
+    def __init__(self, required: List[FrozenSet[str]], head: Set[str], literal: bool):
+        # Each set in required has a member in every match
+        self.required = required
+        # Strings every match starts with (one of), or {""} if unknown
+        self.head = head
+        # True when every match is exactly one of head
+        self.literal = literal
+
+
+def _product(left: Set[str], right: Set[str]) -> Optional[Set[str]]:
+    if len(left) * len(right) > MAX_LITERAL_ALTERNATIVES:
+        return None
+    return {a + b for a in left for b in right}
+
+
+def _analyze(items, ignorecase: bool) -> _Sequence:
+    """Collect the literal sets every match of a parsed sequence must contain."""
+    required: List[FrozenSet[str]] = []
+    head: Optional[Set[str]] = None
+    literal = True
+    current = {""}
+
+    def flush():
+        nonlocal current, head
+        if head is None:
+            head = current
+        if "" not in current:
+            required.append(frozenset(current))
+        current = {""}
+
+    def extend(strings: Set[str]):
+        nonlocal current
+        combined = _product(current, strings)
+        if combined is None:
+            flush()
+            combined = set(strings) if len(strings) <= MAX_LITERAL_ALTERNATIVES else {""}
+        current = combined
+
+    def combine(sub: _Sequence):
+        nonlocal literal
+        extend(sub.head)
+        if not sub.literal:
+            literal = False
+            flush()
+            required.extend(sub.required)
+
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            char = _literal_char(chr(av), ignorecase)
+            if char is None:
+                literal = False
+                flush()
+            else:
+                extend({char})
+        elif op is sre_constants.IN:
+            chars = [_literal_char(chr(v), ignorecase) if o is sre_constants.LITERAL else None for o, v in av]
+            if chars and None not in chars:
+                extend(set(chars))
+            else:
+                literal = False
+                flush()
+        elif op is sre_constants.AT:
+            # Zero-width: does not break a literal run
+            continue
+        elif op in _GROUP_OPS:
+            sub_items = av[-1] if op is sre_constants.SUBPATTERN else av
+            if op is sre_constants.SUBPATTERN and (av[1] or av[2]):
+                # Inline flag changes inside the group
+                literal = False
+                flush()
+                continue
+            combine(_analyze(sub_items, ignorecase))
+        elif op is sre_constants.BRANCH:
+            branches = [_analyze(b, ignorecase) for b in av[1]]
+            heads: Set[str] = set().union(*(b.head for b in branches))
+            bests = [_best(b.required) for b in branches]
+            inner = [frozenset().union(*bests)] if None not in bests else []
+            combine(_Sequence(inner, heads, all(b.literal for b in branches)))
+        elif op in _REPEAT_OPS:
+            min_count, max_count, sub_items = av
+            sub = _analyze(sub_items, ignorecase)
+            if min_count == max_count == 1:
+                combine(sub)
+                continue
+            literal = False
+            if min_count >= 1:
+                extend(sub.head)
+                flush()
+                required.extend(sub.required)
+            else:
+                flush()
+        else:
+            literal = False
+            flush()
+
+    flush()
+    return _Sequence(required, head if head is not None else {""}, literal)
+
+
+class LiteralScan:
+    """
+    Memoized literal lookups over folded text pieces.
+
+    Each distinct character of a literal is looked up first (a memchr-speed
+    scan), so one absent character rules out every literal containing it
+    without scanning for them.
+    """
+
+    __slots__ = ("_pieces", "_known")
+
+    def __init__(self, folded_pieces: List[str]):
+        self._pieces = folded_pieces
+        self._known: Dict[str, bool] = {}
+
+    def __contains__(self, literal: str) -> bool:
+        known = self._known.get(literal)
+        if known is None:
+            if len(literal) > 1 and not all(char in self for char in literal):
+                known = False
+            else:
+                known = any(literal in piece for piece in self._pieces)
+            self._known[literal] = known
+        return known
+
+
+def _selectivity(options: FrozenSet[str]) -> Tuple[int, int]:
+    return min(map(len, options)), -len(options)
+
+
+def _split_alternatives(pattern: str) -> List[str]:
+    """Split a pattern at its top-level '|', after unwrapping enclosing capture groups."""
+    while True:
+        bars: List[int] = []
+        first_close = None
+        depth = 0
+        in_class = False
+        i = 0
+        while i < len(pattern):
+            char = pattern[i]
+            if char == "\\":
+                i += 1
+            elif in_class:
+                in_class = char != "]"
+            elif char == "[":
+                in_class = True
+                # ']' first in a set (after an optional '^') is a literal
+                if pattern.startswith("^", i + 1):
+                    i += 1
+                if pattern.startswith("]", i + 1):
+                    i += 1
+            elif char == "(":
+                depth += 1
+            elif char == ")":
+                depth -= 1
+                if depth == 0 and first_close is None:
+                    first_close = i
+            elif char == "|" and depth == 0:
+                bars.append(i)
+            i += 1
+
+        if pattern.startswith("(") and not pattern.startswith("(?") and first_close == len(pattern) - 1:
+            pattern = pattern[1:-1]
+            continue
+        bounds = [-1] + bars + [len(pattern)]
+        return [pattern[a + 1:b] for a, b in zip(bounds, bounds[1:])]
+
+
+# Group references would change meaning once alternatives are compiled apart
+_GROUP_REFERENCE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+
+
+@lru_cache(maxsize=1024)
+def _build_alternatives(pattern: str, flags: int) -> Tuple[Tuple[List[FrozenSet[str]], Optional["re.Pattern"]], ...]:
+    """(required literal sets, regex) per top-level alternative; regex None means the whole pattern."""
+    if flags & (re.LOCALE | re.VERBOSE):
+        return (([], None),)
+    ignorecase = bool(flags & re.IGNORECASE)
+
+    parts = _split_alternatives(pattern)
+    if len(parts) > 1 and _GROUP_REFERENCE.search(pattern) is None:
+        try:
+            return tuple(
+                (_analyze(sre_parse.parse(part, flags), ignorecase).required, re.compile(part, flags))
+                for part in parts
+            )
+        except (re.error, TypeError, ValueError) as e:
+            logger.debug(f"Cannot split {pattern!r} into alternatives: {e}")
+
+    try:
+        return ((_analyze(sre_parse.parse(pattern, flags), ignorecase).required, None),)
+    except (re.error, TypeError, ValueError) as e:
+        logger.debug(f"Cannot derive literal prefilter for {pattern!r}: {e}")
+        return (([], None),)
+
+
+class GuardedPattern:
+    """
+    A compiled regex split into its top-level alternatives, each guarded by
+    the literal sets every match of that alternative must contain.
+
+    A search for ``a|b`` succeeds exactly when a search for ``a`` or for ``b``
+    does, so only the alternatives whose literals are all present in the
+    (folded) text need to be run. Within a guard, sets are ordered most
+    selective first, so evaluation usually stops at the first absent literal.
+    """
+
+    __slots__ = ("compiled", "alternatives", "literals")
+
+    def __init__(self, compiled: "re.Pattern"):
+        self.compiled = compiled
+        if isinstance(compiled.pattern, str):
+            alternatives = _build_alternatives(compiled.pattern, compiled.flags)
+        else:
+            alternatives = (([], None),)
+        self.alternatives: Tuple[Tuple[Tuple[FrozenSet[str], ...], "re.Pattern"], ...] = tuple(
+            (tuple(sorted(dict.fromkeys(required), key=_selectivity, reverse=True)), regex or compiled)
+            for required, regex in alternatives
+        )
+        self.literals: FrozenSet[str] = frozenset(
+            lit for required, _ in self.alternatives for options in required for lit in options
+        )
+
+    @property
+    def prefiltered(self) -> bool:
+        """Whether every alternative is guarded by at least one literal set."""
+        return all(required for required, _ in self.alternatives)
+
+    def candidates(self, scan: LiteralScan) -> List["re.Pattern"]:
+        """Alternatives that may match the scanned text; empty means no match."""
+        return [
+            regex for required, regex in self.alternatives
+            if all(any(lit in scan for lit in options) for options in required)
+        ]
+
+
+def guard_pattern(compiled: "re.Pattern") -> GuardedPattern:
+    """Split a compiled regex into literal-guarded alternatives (cached per pattern)."""
+    return GuardedPattern(compiled)
+
+
+class WAFMatcher:
+    """All enabled WAF rules compiled for one scan over the request fields."""
+
+    def __init__(self, rules: Iterable["WAFRule"]):
+        """
+        Args:
+            rules: WAF rules in evaluation order; disabled rules are skipped
+        """
+        self.rules = [r for r in rules if r.enabled and r.compiled_pattern is not None]
+        self.patterns = [guard_pattern(r.compiled_pattern) for r in self.rules]
+        self.literals: FrozenSet[str] = frozenset().union(*(p.literals for p in self.patterns))
+
+    def iter_matches(self, pieces: Iterable[str]) -> Iterator["WAFRule"]:
+        """
+        Yield the rules matching the text pieces joined by single spaces, in rule order.
+
+        Pieces are case-folded one at a time and guard literals are looked up
+        per piece, only as far as needed to decide each rule. The joined text
+        is only built if some alternative remains to be confirmed; confirmation
+        is lazy, so a caller stopping at the first blocking rule skips the rest.
+        """
+        seen: List[str] = []
+        folded: List[str] = []
+        for piece in pieces:
+            seen.append(piece)
+            folded.append(fold_text(piece))
+        scan = LiteralScan(folded)
+
+        text = None
+        for rule, pattern in zip(self.rules, self.patterns):
+            candidates = pattern.candidates(scan)
+            if not candidates:
+                continue
+            if text is None:
+                text = " ".join(seen)
+            if any(regex.search(text) for regex in candidates):
+                yield rule
+
+    def scan(self, pieces: Iterable[str]) -> List[str]:
+        """Names of every rule matching the joined pieces."""
+        return [rule.name for rule in self.iter_matches(pieces)]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Guard coverage of the compiled rules."""
+        return {
+            "rules": len(self.rules),
+            "prefiltered_rules": sum(p.prefiltered for p in self.patterns),
+            "alternatives": sum(len(p.alternatives) for p in self.patterns),
+            "literals": len(self.literals),
+        }
+
+
+__all__ = ["GuardedPattern", "LiteralScan", "WAFMatcher", "fold_text", "guard_pattern"]
@@ -0,0 +1,336 @@
+"""
+Async fact storage on a shared redis.asyncio connection pool.
+
+Uses the same keyspace as FactStore, so both stores can serve the same data:
+
+    facts:{namespace}:{user_id}:{attribute}         fact JSON (SETEX)
+    fact_history:{namespace}:{user_id}:{attribute}  LIST of replaced versions
+    fact_index:{namespace}:{user_id}                SET of the user's attributes
+    fact_index:ready                                marker written once legacy
+                                                    facts have been indexed
+
+Listing a user's facts is one SMEMBERS plus one MGET, and writes go out as a
+single MULTI pipeline, so request latency does not grow with the number of
+attributes a user has.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .fact_store import Fact, FactStore
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - redis is a hard dependency in deployments
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+FACT_STORE_POOL_SIZE = int(os.getenv("FACT_STORE_POOL_SIZE", "32"))
+
+_pools: Dict[str, Any] = {}
+
+
+def get_async_redis_pool(
+    redis_url: str,
+    password: Optional[str] = None,
+    max_connections: int = FACT_STORE_POOL_SIZE,
+) -> Any:
+    """Return the process-wide redis.asyncio connection pool for a URL."""
+    if aioredis is None:
+        raise ImportError("redis.asyncio is not available")
+    pool = _pools.get(redis_url)
+    if pool is None:
+        pool = aioredis.ConnectionPool.from_url(
+            redis_url, password=password, max_connections=max_connections
+        )
+        _pools[redis_url] = pool
+    return pool
+
+
+async def close_async_redis_pools() -> None:
+    """Disconnect every shared pool (call on shutdown)."""
+    while _pools:
+        _, pool = _pools.popitem()
+        await pool.disconnect()
+
+
+def _decode(value: Any) -> Any:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class AsyncFactStore:
+    """
+    Non-blocking counterpart of FactStore.
+
+    Every public method costs a fixed number of Redis round trips: reads of
+    all user facts are SMEMBERS + MGET, writes are one MULTI pipeline plus a
+    second one only when an existing fact has to be moved to history.
+    """
+
+    def __init__(self, redis_client: Any, ttl_seconds: int = 86400 * 30) -> None:
+        """
+        Args:
+            redis_client: redis.asyncio.Redis (decode_responses=False)
+            ttl_seconds: Expiry for facts, history and the per-user index
+        """
+        self.redis = redis_client
+        self.ttl = ttl_seconds
+        # Reuse FactStore's key helpers so both stores agree on the keyspace
+        self._keys = FactStore(redis_client, ttl_seconds)
+        self._index_ready = False
+
+    @classmethod
+    def from_url(
+        cls, redis_url: str, password: Optional[str] = None, ttl_seconds: int = 86400 * 30
+    ) -> "AsyncFactStore":
+        """Create a store on the shared connection pool for redis_url."""
+        pool = get_async_redis_pool(redis_url, password=password)
+        return cls(aioredis.Redis(connection_pool=pool), ttl_seconds)
+
+    @property
+    def ready_key(self) -> str:
+        return f"{self._keys._index_key_prefix}:ready"
+
+    async def store_fact(
+        self,
+        namespace: str,
+        user_id: str,
+        attribute: str,
+        value: Any,
+        confidence: float = 1.0,
+        source_turn_id: str = "",
+        provenance: str = "user_input"
+    ) -> None:
+        """Store a fact with lineage tracking (see FactStore.store_fact)."""
+        await self.store_facts(
+            namespace,
+            user_id,
+            [{
+                "attribute": attribute,
+                "value": value,
+                "confidence": confidence,
+                "source_turn_id": source_turn_id,
+                "provenance": provenance,
+            }],
+        )
+
+    async def store_facts(
+        self, namespace: str, user_id: str, facts: Iterable[Dict[str, Any]]
+    ) -> int:
+        """
+        Store several facts for one user in a single transaction.
+
+        Each item needs "attribute" and "value"; "confidence", "source_turn_id"
+        and "provenance" default as in store_fact. Returns facts stored.
+        """
+        if not namespace or not user_id:
+            raise ValueError("namespace, user_id, and attribute are required")
+
+        now = datetime.utcnow().isoformat()
+        records: List[Fact] = []
+        for item in facts:
+            if not item.get("attribute"):
+                raise ValueError("namespace, user_id, and attribute are required")
+            records.append(Fact(
+                value=item["value"],
+                confidence=item.get("confidence", 1.0),
+                source_turn_id=item.get("source_turn_id", ""),
+                updated_at=now,
+                provenance=item.get("provenance", "user_input"),
+                attribute=item["attribute"],
+                user_id=user_id,
+                namespace=namespace,
+            ))
+        if not records:
+            return 0
+
+        index_key = self._keys._make_user_index_key(namespace, user_id)
+        pipe = self.redis.pipeline(transaction=True)
+        for fact in records:
+            fact_key = self._keys._make_fact_key(namespace, user_id, fact.attribute)
+            pipe.get(fact_key)
+            pipe.setex(fact_key, self.ttl, json.dumps(fact.to_dict()))
+        pipe.sadd(index_key, *[fact.attribute for fact in records])
+        pipe.expire(index_key, self.ttl)
+        results = await pipe.execute()
+
+        # GET replies sit at even positions, ahead of each SETEX reply
+        history_pipe = None
+        for position, fact in enumerate(records):
+            previous = results[position * 2]
+            if not previous:
+                continue
+            if history_pipe is None:
+                history_pipe = self.redis.pipeline(transaction=False)
+            history_key = self._keys._make_history_key(namespace, user_id, fact.attribute)
+            history_pipe.lpush(history_key, json.dumps({
+                "fact": _decode(previous),
+                "replaced_at": now,
+                "replaced_by": fact.source_turn_id,
+            }))
+            history_pipe.expire(history_key, self.ttl)
+        if history_pipe is not None:
+            await history_pipe.execute()
+
+        logger.info(f"Stored {len(records)} facts for {namespace}:{user_id}")
+        return len(records)
+
+    async def get_fact(self, namespace: str, user_id: str, attribute: str) -> Optional[Fact]:
+        """Retrieve a fact; returns None if it doesn't exist."""
+        if not namespace or not user_id or not attribute:
+            return None
+        fact_key = self._keys._make_fact_key(namespace, user_id, attribute)
+        return self._parse(fact_key, await self.redis.get(fact_key))
+
+    async def get_user_facts(self, namespace: str, user_id: str) -> Dict[str, Fact]:
+        """Retrieve all facts for a user as attribute -> Fact."""
+        if not namespace or not user_id:
+            return {}
+        await self._ensure_index()
+
+        index_key = self._keys._make_user_index_key(namespace, user_id)
+        attributes = sorted(_decode(a) for a in await self.redis.smembers(index_key))
+        if not attributes:
+            return {}
+
+        keys = [self._keys._make_fact_key(namespace, user_id, a) for a in attributes]
+        values = await self.redis.mget(keys)
+
+        facts: Dict[str, Fact] = {}
+        expired: List[str] = []
+        for attribute, key, value in zip(attributes, keys, values):
+            if value is None:
+                expired.append(attribute)
+                continue
+            fact = self._parse(key, value)
+            if fact is not None:
+                facts[fact.attribute] = fact
+        if expired:
+            await self.redis.srem(index_key, *expired)
+        return facts
+
+    async def get_fact_history(self, namespace: str, user_id: str, attribute: str) -> List[Dict[str, Any]]:
+        """Get the update history for a fact, newest first."""
+        histories = await self.get_fact_histories(namespace, user_id, [attribute])
+        return histories.get(attribute, [])
+
+    async def get_fact_histories(
+        self, namespace: str, user_id: str, attributes: Iterable[str]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Histories for several attributes in one pipelined round trip."""
+        attributes = [a for a in attributes if a]
+        if not namespace or not user_id or not attributes:
+            return {}
+
+        pipe = self.redis.pipeline(transaction=False)
+        for attribute in attributes:
+            pipe.lrange(self._keys._make_history_key(namespace, user_id, attribute), 0, -1)
+        replies = await pipe.execute()
+
+        histories: Dict[str, List[Dict[str, Any]]] = {}
+        for attribute, entries in zip(attributes, replies):
+            history = []
+            for entry_data in entries or ():
+                try:
+                    history.append(json.loads(_decode(entry_data)))
+                except json.JSONDecodeError as e:
+                    logger.error(f"Failed to parse history entry: {e}")
+            histories[attribute] = history
+        return histories
+
+    async def delete_fact(self, namespace: str, user_id: str, attribute: str) -> bool:
+        """Delete a specific fact; returns False if it didn't exist."""
+        if not namespace or not user_id or not attribute:
+            return False
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.delete(
+            self._keys._make_fact_key(namespace, user_id, attribute),
+            self._keys._make_history_key(namespace, user_id, attribute),
+        )
+        pipe.srem(self._keys._make_user_index_key(namespace, user_id), attribute)
+        deleted_count, _ = await pipe.execute()
+        return deleted_count > 0
+
+    async def delete_user_facts(self, namespace: str, user_id: str) -> int:
+        """
+        Delete all facts for a user (forget-me functionality).
+
+        Also sweeps keys matching the user's patterns so facts written before
+        the index existed are not left behind. Returns fact entries deleted.
+        """
+        if not namespace or not user_id:
+            return 0
+
+        index_key = self._keys._make_user_index_key(namespace, user_id)
+        keys = set()
+        for attribute in await self.redis.smembers(index_key):
+            attribute = _decode(attribute)
+            keys.add(self._keys._make_fact_key(namespace, user_id, attribute))
+            keys.add(self._keys._make_history_key(namespace, user_id, attribute))
+        for pattern in (
+            self._keys._make_user_facts_pattern(namespace, user_id),
+            f"{self._keys._history_key_prefix}:{namespace}:{user_id}:*",
+        ):
+            async for key in self.redis.scan_iter(match=pattern, count=500):
+                keys.add(_decode(key))
+
+        pipe = self.redis.pipeline(transaction=True)
+        if keys:
+            pipe.delete(*keys)
+        pipe.unlink(index_key)
+        replies = await pipe.execute()
+        deleted_count = replies[0] if keys else 0
+
+        logger.info(f"Deleted {deleted_count} fact entries for {namespace}:{user_id}")
+        return deleted_count
+
+    async def search_facts_by_value(self, namespace: str, user_id: str, search_value: str) -> List[Tuple[str, Fact]]:
+        """Search facts by value content (for debugging/admin)."""
+        facts = await self.get_user_facts(namespace, user_id)
+        search_lower = search_value.lower()
+        return [
+            (attribute, fact)
+            for attribute, fact in facts.items()
+            if isinstance(fact.value, str) and search_lower in fact.value.lower()
+        ]
+
+    async def rebuild_index(self, scan_count: int = 500) -> int:
+        """Index facts written before the per-user index existed; returns facts indexed."""
+        prefix = self._keys._fact_key_prefix
+        indexed = 0
+        pipe = self.redis.pipeline(transaction=False)
+        async for key in self.redis.scan_iter(match=f"{prefix}:*", count=scan_count):
+            parts = _decode(key).split(":", 3)
+            if len(parts) != 4:
+                continue
+            _, namespace, user_id, attribute = parts
+            index_key = self._keys._make_user_index_key(namespace, user_id)
+            pipe.sadd(index_key, attribute)
+            pipe.expire(index_key, self.ttl)
+            indexed += 1
+        pipe.set(self.ready_key, "1")
+        await pipe.execute()
+        logger.info(f"Indexed {indexed} existing facts")
+        return indexed
+
+    async def _ensure_index(self) -> None:
+        """Backfill the index once per keyspace before the first indexed read."""
+        if self._index_ready:
+            return
+        if not await self.redis.exists(self.ready_key):
+            await self.rebuild_index()
+        self._index_ready = True
+
+    @staticmethod
+    def _parse(key: str, data: Any) -> Optional[Fact]:
+        if not data:
+            return None
+        try:
+            return Fact.from_dict(json.loads(_decode(data)))
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            logger.error(f"Failed to parse fact {key}: {e}")
+            return None
@@ -680,14 +680,14 @@ class EnhancedStorageOrchestrator:
         """Retrieve context from text backend."""
         try:
             # Check if document exists in text backend
-            if context_id in self.text_backend.documents:
-                doc = self.text_backend.documents[context_id]
+            doc = self.text_backend.get_document(context_id)
+            if doc is not None:
                 return {
                     "found": True,
                     "data": {
                         "text": doc.text,
                         "metadata": doc.metadata,
-                        "token_count": len(doc.tokens),
+                        "token_count": doc.doc_length,
                     },
                 }
             else:
@@ -7,14 +7,28 @@ and improve fact recall accuracy.
 """
 
 import re
-from typing import List, Dict, Optional, Tuple, Any
+from typing import List, Dict, Optional, Tuple, Any, Sequence
 from dataclasses import dataclass
 from enum import Enum
+import functools
 import math
 import logging
+import os
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+FACT_RANKER_MATCH_CACHE_SIZE = int(os.getenv("FACT_RANKER_MATCH_CACHE_SIZE", "4096"))
+
+# Query-answer alignment checks (query side, content side, boost)
+_QUERY_ALIGNMENT_RULES = [
+    (re.compile(r"\bwhat'?s my name\b"), re.compile(r'\bmy name is\b'), 0.08),
+    (re.compile(r"\bwhat'?s my email\b"), re.compile(r'\bmy email.*is\b'), 0.08),
+    (re.compile(r'\bwhere do i live\b'), re.compile(r'\bi live in\b'), 0.08),
+    (re.compile(r'\bwhat.*my\b'), re.compile(r'\bmy.*is\b'), 0.04),
+]
+
 
 class ContentType(Enum):
     """Types of content for ranking purposes."""
@@ -112,6 +126,33 @@ class FactAwareRanker:
                                for pattern, score, label in self.boost_patterns]
         self._compiled_demote = [(re.compile(pattern, re.IGNORECASE), score, label) 
                                 for pattern, score, label in self.demote_patterns]
+        self._compiled_all = self._compiled_boost + self._compiled_demote
+        self._pattern_deltas = [d for _, d, _ in self._compiled_all]
+        self._pattern_labels = (
+            [f"+{label}" for _, _, label in self._compiled_boost] +
+            [f"-{label}" for _, _, label in self._compiled_demote]
+        )
+        self._boost_count = len(self._compiled_boost)
+        # Pattern hits depend only on the text, and the same stored contexts
+        # come back for many queries, so matches are memoized per text
+        self._cached_matches = functools.lru_cache(maxsize=FACT_RANKER_MATCH_CACHE_SIZE)(
+            self._match_patterns_uncached
+        )
+
+    def match_patterns(self, text: str) -> Tuple[int, ...]:
+        """
+        Indices of all boost/demote patterns found in text, in pattern order.
+
+        Boost patterns come first (indices below the boost count), then
+        demote patterns, matching the order of self._pattern_labels.
+        """
+        return self._cached_matches(text)
+
+    def _match_patterns_uncached(self, text: str) -> Tuple[int, ...]:
+        return tuple(
+            i for i, (pattern, _, _) in enumerate(self._compiled_all)
+            if pattern.search(text)
+        )
 
     def apply_fact_ranking(self, results: List[Dict[str, Any]], query: str = "") -> List[RankingResult]:
         """
@@ -124,44 +165,77 @@ class FactAwareRanker:
         Returns:
             List of RankingResult objects with enhanced scoring
         """
+        if not results:
+            return []
+
+        contents = [result.get('content', '') for result in results]
+        original_scores = [result.get('score', 0.0) for result in results]
+        boosts, final_scores, matched = self.score_batch(contents, original_scores, query)
+
         ranked_results = []
-        
-        for result in results:
-            content = result.get('content', '')
-            original_score = result.get('score', 0.0)
-            
-            # Apply fact-specific scoring
-            ranking_result = self._score_content(content, original_score, query)
-            ranking_result.metadata.update(result.get('metadata', {}))
-            
+        # Stable descending order, same as list.sort(reverse=True)
+        for i in np.argsort(-final_scores, kind='stable'):
+            ranking_result = RankingResult(
+                content=contents[i],
+                original_score=original_scores[i],
+                fact_boost=float(boosts[i]),
+                final_score=float(final_scores[i]),
+                content_type=self._classify_content_type(contents[i], matched[i]),
+                matched_patterns=matched[i],
+                metadata={}
+            )
+            ranking_result.metadata.update(results[i].get('metadata', {}))
             ranked_results.append(ranking_result)
         
-        # Sort by final score (descending)
-        ranked_results.sort(key=lambda x: x.final_score, reverse=True)
-        
         logger.debug(f"Applied fact ranking to {len(results)} results")
         return ranked_results
 
-    def _score_content(self, content: str, original_score: float, query: str = "") -> RankingResult:
-        """Score individual content with fact-aware patterns."""
+    def score_batch(self, contents: Sequence[str], original_scores: Sequence[float],
+                    query: str = "") -> Tuple[np.ndarray, np.ndarray, List[List[str]]]:
+        """
+        Score many texts at once.
+
+        Boosts are summed per text in pattern order, so they are
+        bit-identical to _score_content; adding the original scores and
+        clipping to [0, 1] is one vectorized step over the whole column.
+
+        Returns:
+            (fact boosts, final scores, matched pattern labels per text)
+        """
+        query_rules = self._active_query_rules(query)
+        boosts = np.empty(len(contents), dtype=np.float64)
+        matched: List[List[str]] = []
+        for i, content in enumerate(contents):
+            boost, labels = self._pattern_boost(content, query_rules)
+            boosts[i] = boost
+            matched.append(labels)
+
+        final_scores = np.clip(np.asarray(original_scores, dtype=np.float64) + boosts, 0.0, 1.0)
+        return boosts, final_scores, matched
+
+    def _pattern_boost(self, content: str,
+                       query_rules: List[Tuple[Any, float]]) -> Tuple[float, List[str]]:
+        """Summed pattern and query boost for one text plus matched labels."""
         boost_score = 0.0
         matched_patterns = []
-        
-        # Apply boost patterns (declarative statements)
-        for pattern, score_delta, label in self._compiled_boost:
-            if pattern.search(content):
-                boost_score += score_delta
-                matched_patterns.append(f"+{label}")
-        
-        # Apply demote patterns (interrogative questions)
-        for pattern, score_delta, label in self._compiled_demote:
-            if pattern.search(content):
-                boost_score += score_delta  # score_delta is negative
-                matched_patterns.append(f"-{label}")
-        
-        # Apply query-specific boosts
-        query_boost = self._calculate_query_boost(content, query)
-        boost_score += query_boost
+        # Boost patterns (declarative statements) precede demote patterns
+        # (interrogative questions, negative deltas) in index order
+        for i in self.match_patterns(content):
+            boost_score += self._pattern_deltas[i]
+            matched_patterns.append(self._pattern_labels[i])
+
+        if query_rules:
+            content_lower = content.lower()
+            query_boost = 0.0
+            for content_pattern, delta in query_rules:
+                if content_pattern.search(content_lower):
+                    query_boost += delta
+            boost_score += query_boost
+        return boost_score, matched_patterns
+
+    def _score_content(self, content: str, original_score: float, query: str = "") -> RankingResult:
+        """Score individual content with fact-aware patterns."""
+        boost_score, matched_patterns = self._pattern_boost(content, self._active_query_rules(query))
         
         # Determine content type
         content_type = self._classify_content_type(content, matched_patterns)
@@ -182,33 +256,27 @@ class FactAwareRanker:
             metadata={}
         )
 
+    @staticmethod
+    def _active_query_rules(query: str) -> List[Tuple[Any, float]]:
+        """Content-side checks whose query-side pattern matches the query."""
+        if not query:
+            return []
+        query_lower = query.lower()
+        return [
+            (content_pattern, delta)
+            for query_pattern, content_pattern, delta in _QUERY_ALIGNMENT_RULES
+            if query_pattern.search(query_lower)
+        ]
+
     def _calculate_query_boost(self, content: str, query: str) -> float:
         """Calculate query-specific boost for content."""
-        if not query:
-            return 0.0
-        
         boost = 0.0
-        query_lower = query.lower()
+        if not query:
+            return boost
         content_lower = content.lower()
-        
-        # Boost for query-answer alignment
-        if re.search(r"\bwhat'?s my name\b", query_lower):
-            if re.search(r'\bmy name is\b', content_lower):
-                boost += 0.08
-        
-        if re.search(r"\bwhat'?s my email\b", query_lower):
-            if re.search(r'\bmy email.*is\b', content_lower):
-                boost += 0.08
-        
-        if re.search(r'\bwhere do i live\b', query_lower):
-            if re.search(r'\bi live in\b', content_lower):
-                boost += 0.08
-        
-        # General fact-query alignment
-        if re.search(r'\bwhat.*my\b', query_lower):
-            if re.search(r'\bmy.*is\b', content_lower):
-                boost += 0.04
-        
+        for content_pattern, delta in self._active_query_rules(query):
+            if content_pattern.search(content_lower):
+                boost += delta
         return boost
 
     def _classify_content_type(self, content: str, matched_patterns: List[str]) -> ContentType:
@@ -228,17 +296,17 @@ class FactAwareRanker:
     def boost_declarative_patterns(self, text: str) -> float:
         """Get boost score for declarative patterns in text."""
         boost = 0.0
-        for pattern, score_delta, _ in self._compiled_boost:
-            if pattern.search(text):
-                boost += score_delta
+        for i in self.match_patterns(text):
+            if i < self._boost_count:
+                boost += self._pattern_deltas[i]
         return boost
 
     def demote_interrogative_patterns(self, text: str) -> float:
         """Get demote score for interrogative patterns in text."""
         demote = 0.0
-        for pattern, score_delta, _ in self._compiled_demote:
-            if pattern.search(text):
-                demote += score_delta  # score_delta is negative
+        for i in self.match_patterns(text):
+            if i >= self._boost_count:
+                demote += self._pattern_deltas[i]  # score_delta is negative
         return demote
 
     def explain_ranking(self, content: str, query: str = "") -> Dict[str, Any]:
@@ -41,7 +41,9 @@ class FactStore:
     Redis-backed deterministic fact storage with lineage tracking.
     
     Key pattern: facts:{namespace}:{user_id}:{attribute}
+    Index pattern: fact_index:{namespace}:{user_id} (SET of attributes)
     Supports fact updates with last-write-wins and historical tracking.
+    The per-user index lets AsyncFactStore list a user's facts without KEYS.
     """
 
     def __init__(self, redis_client: Redis, ttl_seconds: int = 86400 * 30) -> None:  # 30 days default
@@ -49,6 +51,7 @@ class FactStore:
         self.ttl = ttl_seconds
         self._fact_key_prefix = "facts"
         self._history_key_prefix = "fact_history"
+        self._index_key_prefix = "fact_index"
 
     def _make_fact_key(self, namespace: str, user_id: str, attribute: str) -> str:
         """Generate Redis key for a fact."""
@@ -58,6 +61,10 @@ class FactStore:
         """Generate Redis key for fact history."""
         return f"{self._history_key_prefix}:{namespace}:{user_id}:{attribute}"
 
+    def _make_user_index_key(self, namespace: str, user_id: str) -> str:
+        """Generate Redis key for the set of a user's fact attributes."""
+        return f"{self._index_key_prefix}:{namespace}:{user_id}"
+
     def _make_user_facts_pattern(self, namespace: str, user_id: str) -> str:
         """Generate Redis pattern for all user facts."""
         return f"{self._fact_key_prefix}:{namespace}:{user_id}:*"
@@ -116,6 +123,10 @@ class FactStore:
         fact_json = json.dumps(fact.to_dict())
         self.redis.setex(fact_key, self.ttl, fact_json)
 
+        index_key = self._make_user_index_key(namespace, user_id)
+        self.redis.sadd(index_key, attribute)
+        self.redis.expire(index_key, self.ttl)
+
         logger.info(f"Stored fact: {namespace}:{user_id}:{attribute} = {value}")
 
     def get_fact(self, namespace: str, user_id: str, attribute: str) -> Optional[Fact]:
@@ -178,6 +189,7 @@ class FactStore:
         history_key = self._make_history_key(namespace, user_id, attribute)
 
         deleted_count = self.redis.delete(fact_key, history_key)
+        self.redis.srem(self._make_user_index_key(namespace, user_id), attribute)
         return deleted_count > 0
 
     def delete_user_facts(self, namespace: str, user_id: str) -> int:
@@ -202,6 +214,7 @@ class FactStore:
             return 0
 
         deleted_count = self.redis.delete(*all_keys)
+        self.redis.unlink(self._make_user_index_key(namespace, user_id))
         logger.info(f"Deleted {deleted_count} fact entries for {namespace}:{user_id}")
         return deleted_count
 
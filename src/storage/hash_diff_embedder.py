@@ -12,11 +12,14 @@ import asyncio
 import hashlib
 import json
 import os
+import queue
+import threading
 import time
-from dataclasses import dataclass
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, replace
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, cast
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
 
 import click
 import yaml
@@ -24,6 +27,16 @@ from openai import OpenAI
 from qdrant_client import QdrantClient
 from qdrant_client.models import PointStruct
 
+try:
+    from .near_duplicate import MinHasher, MinHashPermutation, simhash
+except ImportError:
+    from near_duplicate import MinHasher, MinHashPermutation, simhash
+
+# Directories whose YAML files are never embedded
+_SKIP_DIRS = ("schemas", ".embeddings_cache", "archive")
+# Marks the end of a stage's output on the queue to the next stage
+_DONE = object()
+
 
 @dataclass
 class DocumentHash:
@@ -47,6 +60,51 @@ class EmbeddingTask:
     data: Dict[str, Any]
 
 
+@dataclass
+class EmbeddingProgress:
+    """Running counts of a directory embedding run"""
+
+    scanned: int = 0
+    changed: int = 0
+    embedded: int = 0
+    failed: int = 0
+
+
+def _parse_document(content: str) -> Tuple[Any, Optional[str]]:
+    """Parse a YAML document in a parse worker, returning (data, error)"""
+    try:
+        return yaml.safe_load(content), None
+    except Exception as e:
+        return None, str(e)
+
+
+def _parsed_now(content: str) -> Future:
+    """Parse a YAML document in the calling thread"""
+    future: Future = Future()
+    future.set_result(_parse_document(content))
+    return future
+
+
+def _put(stage_queue: queue.Queue, item: Any, stop: threading.Event) -> None:
+    """Hand an item to the next stage unless the pipeline is stopping"""
+    while not stop.is_set():
+        try:
+            stage_queue.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            continue
+
+
+def _get(stage_queue: queue.Queue, stop: threading.Event) -> Any:
+    """Take the next item from the previous stage, or _DONE once stopping"""
+    while not stop.is_set():
+        try:
+            return stage_queue.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return _DONE
+
+
 class HashDiffEmbedder:
     """Hash-based diff embedder for efficient document processing"""
 
@@ -79,6 +137,12 @@ class HashDiffEmbedder:
         self.retry_backoff_factor = embed_config.get("retry_backoff_factor", 2.0)
         self.request_timeout = embed_config.get("request_timeout", 30)
 
+        # Directory pipeline: YAML parse processes, concurrent embedding
+        # requests and batches queued between stages
+        self.parse_workers = embed_config.get("parse_workers", min(4, os.cpu_count() or 1))
+        self.embed_concurrency = embed_config.get("embed_concurrency", 2)
+        self.queue_batches = embed_config.get("queue_batches", 2)
+
         # Rate limiting
         # Rate limiting handled differently in sync version
 
@@ -124,36 +188,27 @@ class HashDiffEmbedder:
                 pass
         return {}
 
-    def _generate_hash_functions(self, num_hashes: int) -> List:
+    def _generate_hash_functions(self, num_hashes: int) -> List[MinHashPermutation]:
         """Generate hash functions for MinHash/SimHash algorithms.
 
+        The permutations come from a fixed seed, so signatures computed by
+        different embedder instances and processes are comparable.
+
         Args:
             num_hashes: Number of hash functions to generate
 
         Returns:
             List of hash functions
         """
-        import random
-
-        hash_funcs = []
-        # Use different seeds for each hash function
-        for i in range(num_hashes):
-            seed_a = random.randint(1, 2**32 - 1)
-            seed_b = random.randint(0, 2**32 - 1)
-
-            def make_hash_func(a, b):
-                def hash_func(x):
-                    if isinstance(x, str):
-                        x = int(hashlib.md5(x.encode()).hexdigest()[:8], 16)
-                    elif isinstance(x, bytes):
-                        x = int(hashlib.md5(x).hexdigest()[:8], 16)
-                    return (a * x + b) % (2**32)
-
-                return hash_func
-
-            hash_funcs.append(make_hash_func(seed_a, seed_b))
+        return MinHasher(num_hashes).permutations()
 
-        return hash_funcs
+    def _minhasher(self) -> MinHasher:
+        """Vectorized MinHasher for the current hash functions."""
+        hasher = getattr(self, "_cached_minhasher", None)
+        if hasher is None or hasher[0] is not self.hash_funcs:
+            hasher = (self.hash_funcs, MinHasher.from_permutations(self.hash_funcs))
+            self._cached_minhasher = hasher
+        return hasher[1]
 
     def compute_minhash(self, tokens: List[str]) -> List[int]:
         """Compute MinHash signature for a set of tokens.
@@ -167,16 +222,7 @@ class HashDiffEmbedder:
         if not tokens:
             return [0] * self.num_hashes
 
-        signature = []
-        for hash_func in self.hash_funcs:
-            min_hash = float("inf")
-            for token in tokens:
-                hash_val = hash_func(token)
-                if hash_val < min_hash:
-                    min_hash = hash_val
-            signature.append(min_hash)
-
-        return signature
+        return cast(List[int], self._minhasher().signature(tokens).tolist())
 
     def compute_simhash(self, tokens: List[str]) -> int:
         """Compute SimHash for a set of tokens.
@@ -187,28 +233,7 @@ class HashDiffEmbedder:
         Returns:
             SimHash value
         """
-        if not tokens:
-            return 0
-
-        # Initialize vector
-        v = [0] * 64  # 64-bit SimHash
-
-        for token in tokens:
-            token_hash = int(hashlib.md5(token.encode()).hexdigest(), 16)
-
-            for i in range(64):
-                if token_hash & (1 << i):
-                    v[i] += 1
-                else:
-                    v[i] -= 1
-
-        # Create fingerprint
-        fingerprint = 0
-        for i in range(64):
-            if v[i] > 0:
-                fingerprint |= 1 << i
-
-        return fingerprint
+        return simhash(tokens)
 
     def hamming_distance(self, hash1: int, hash2: int) -> int:
         """Calculate Hamming distance between two hashes.
@@ -220,12 +245,7 @@ class HashDiffEmbedder:
         Returns:
             Hamming distance
         """
-        xor = hash1 ^ hash2
-        distance = 0
-        while xor:
-            distance += xor & 1
-            xor >>= 1
-        return distance
+        return bin(hash1 ^ hash2).count("1")
 
     def jaccard_similarity(self, sig1: List[int], sig2: List[int]) -> float:
         """Calculate Jaccard similarity from MinHash signatures.
@@ -279,19 +299,17 @@ class HashDiffEmbedder:
             click.echo(f"Failed to connect: {e}", err=True)
             return False
 
-    def _embed_with_retry(self, text: str) -> List[float]:
-        """Embed text with retry logic"""
+    def _create_embeddings(self, texts: Union[str, List[str]]) -> Any:
+        """Request embeddings with retry logic"""
         retry_delay = self.initial_retry_delay
 
         for attempt in range(self.max_retries):
             try:
-                # Rate limiting removed - sync version doesn't use semaphore
                 if self.openai_client is None:
                     raise Exception("OpenAI client not initialized")
-                response = self.openai_client.embeddings.create(
-                    model=self.embedding_model, input=text, timeout=self.request_timeout
+                return self.openai_client.embeddings.create(
+                    model=self.embedding_model, input=texts, timeout=self.request_timeout
                 )
-                return list(response.data[0].embedding)
 
             except Exception as e:
                 if "rate_limit" in str(e).lower() and attempt < self.max_retries - 1:
@@ -304,138 +322,318 @@ class HashDiffEmbedder:
 
         raise Exception("Max retries exceeded")
 
+    def _embed_with_retry(self, text: str) -> List[float]:
+        """Embed text with retry logic"""
+        response = self._create_embeddings(text)
+        return list(response.data[0].embedding)
+
+    def _embed_batch_with_retry(self, texts: List[str]) -> List[List[float]]:
+        """Embed several texts in one request with retry logic"""
+        response = self._create_embeddings(texts)
+        if len(response.data) != len(texts):
+            raise Exception(f"Expected {len(texts)} embeddings, got {len(response.data)}")
+        return [list(item.embedding) for item in response.data]
+
+    def _embedding_text(self, data: Dict[str, Any]) -> str:
+        """Text embedded for a document"""
+        content_parts = []
+        if "title" in data:
+            content_parts.append(f"Title: {data['title']}")
+        if "description" in data:
+            content_parts.append(f"Description: {data['description']}")
+        if "content" in data:
+            content_parts.append(f"Content: {data['content']}")
+
+        return "\n\n".join(content_parts)
+
+    def _collection_name(self) -> str:
+        """Qdrant collection receiving the embeddings"""
+        return cast(
+            str, self.config.get("qdrant", {}).get("collection_name", "context_embeddings")
+        )
+
+    def _prepare_point(self, task: EmbeddingTask, embedding: List[float]) -> PointStruct:
+        """Build the Qdrant point of an embedded document"""
+        # Generate vector ID
+        embedding_hash = hashlib.sha256(json.dumps(embedding).encode()).hexdigest()
+        vector_id = f"{task.document_id}-{embedding_hash[:8]}"
+
+        # Prepare payload
+        payload = {
+            "document_id": task.document_id,
+            "document_type": task.data.get("document_type", "unknown"),
+            "file_path": str(task.file_path),
+            "title": task.data.get("title", ""),
+            "created_date": task.data.get("created_date", ""),
+            "last_modified": task.data.get("last_modified", ""),
+            "content_hash": hashlib.sha256(task.content.encode()).hexdigest(),
+            "embedding_hash": embedding_hash,
+            "embedded_at": datetime.now().isoformat(),
+        }
+
+        return PointStruct(id=vector_id, vector=embedding, payload=payload)
+
+    def _record_embedded(self, task: EmbeddingTask, point: PointStruct) -> None:
+        """Update the hash cache for a stored document"""
+        payload = cast(Dict[str, Any], point.payload)
+        self.hash_cache[str(task.file_path)] = {
+            "document_id": task.document_id,
+            "content_hash": payload["content_hash"],
+            "embedding_hash": payload["embedding_hash"],
+            "vector_id": point.id,
+            "last_embedded": payload["embedded_at"],
+        }
+
+        if self.verbose:
+            click.echo(f"  ✓ Embedded {task.file_path}")
+
+    def _save_hash_cache(self) -> None:
+        """Save the hash cache, replacing the file atomically"""
+        try:
+            self.hash_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.hash_cache_path.with_name(self.hash_cache_path.name + ".tmp")
+            with open(temp_path, "w") as f:
+                f.write(json.dumps(self.hash_cache, indent=2))
+            os.replace(temp_path, self.hash_cache_path)
+        except OSError as e:
+            click.echo(f"Failed to save hash cache: {e}", err=True)
+
     def _process_embedding_task(self, task: EmbeddingTask) -> Optional[str]:
         """Process a single embedding task"""
         try:
-            # Prepare content
-            content_parts = []
-            if "title" in task.data:
-                content_parts.append(f"Title: {task.data['title']}")
-            if "description" in task.data:
-                content_parts.append(f"Description: {task.data['description']}")
-            if "content" in task.data:
-                content_parts.append(f"Content: {task.data['content']}")
-
-            embedding_text = "\n\n".join(content_parts)
-
-            # Get embedding
-            embedding = self._embed_with_retry(embedding_text)
-
-            # Generate vector ID
-            embedding_hash = hashlib.sha256(json.dumps(embedding).encode()).hexdigest()
-            vector_id = f"{task.document_id}-{embedding_hash[:8]}"
-
-            # Prepare payload
-            payload = {
-                "document_id": task.document_id,
-                "document_type": task.data.get("document_type", "unknown"),
-                "file_path": str(task.file_path),
-                "title": task.data.get("title", ""),
-                "created_date": task.data.get("created_date", ""),
-                "last_modified": task.data.get("last_modified", ""),
-                "content_hash": hashlib.sha256(task.content.encode()).hexdigest(),
-                "embedding_hash": embedding_hash,
-                "embedded_at": datetime.now().isoformat(),
-            }
+            embedding = self._embed_with_retry(self._embedding_text(task.data))
+            point = self._prepare_point(task, embedding)
 
             # Store in Qdrant
-            collection_name = self.config.get("qdrant", {}).get(
-                "collection_name", "context_embeddings"
-            )
             if self.client is not None:
                 self.client.upsert(
-                    collection_name=collection_name,
-                    points=[PointStruct(id=vector_id, vector=embedding, payload=payload)],
+                    collection_name=self._collection_name(),
+                    points=[point],
                     wait=True,  # Ensure immediate availability for retrieval
                 )
 
-            # Update cache
-            self.hash_cache[str(task.file_path)] = {
-                "document_id": task.document_id,
-                "content_hash": payload["content_hash"],
-                "embedding_hash": embedding_hash,
-                "vector_id": vector_id,
-                "last_embedded": payload["embedded_at"],
-            }
-
-            if self.verbose:
-                click.echo(f"  ✓ Embedded {task.file_path}")
-
-            return vector_id
+            self._record_embedded(task, point)
+            return str(point.id)
 
         except Exception as e:
             click.echo(f"  ✗ Failed to embed {task.file_path}: {e}", err=True)
             return None
 
-    def embed_directory(self, directory: Path) -> Tuple[int, int]:
-        """Embed all documents in directory asynchronously"""
-        tasks: List[EmbeddingTask] = []
+    def _embed_batch(self, tasks: List[EmbeddingTask]) -> List[Optional[List[float]]]:
+        """Embed a batch in one request, per document if the request fails
 
-        # Collect tasks
-        for yaml_file in directory.rglob("*.yaml"):
-            if any(skip in yaml_file.parts for skip in ["schemas", ".embeddings_cache", "archive"]):
-                continue
+        Falling back keeps one unembeddable document (e.g. over the model's
+        token limit) from failing the rest of its batch.
+        """
+        texts = [self._embedding_text(task.data) for task in tasks]
+        try:
+            return cast(List[Optional[List[float]]], self._embed_batch_with_retry(texts))
+        except Exception as batch_error:
+            if self.verbose:
+                click.echo(f"Batch embedding failed ({batch_error}), embedding documents singly")
 
+        embeddings: List[Optional[List[float]]] = []
+        for task, text in zip(tasks, texts):
             try:
-                with open(yaml_file, "r") as f:
-                    content = f.read()
-                    data = yaml.safe_load(content)
+                embeddings.append(self._embed_with_retry(text))
+            except Exception as e:
+                click.echo(f"  ✗ Failed to embed {task.file_path}: {e}", err=True)
+                embeddings.append(None)
+        return embeddings
+
+    def _upsert_batch(
+        self, tasks: List[EmbeddingTask], embeddings: List[Optional[List[float]]]
+    ) -> int:
+        """Store the embedded documents of a batch in one upsert, returning how many"""
+        points = []
+        for task, embedding in zip(tasks, embeddings):
+            if embedding is None:
+                continue
+            try:
+                points.append((task, self._prepare_point(task, embedding)))
+            except Exception as e:
+                click.echo(f"  ✗ Failed to embed {task.file_path}: {e}", err=True)
+        if not points:
+            return 0
 
-                if not data:
-                    continue
+        try:
+            if self.client is not None:
+                self.client.upsert(
+                    collection_name=self._collection_name(),
+                    points=[point for _, point in points],
+                    wait=True,  # Ensure immediate availability for retrieval
+                )
+        except Exception as e:
+            for task, _ in points:
+                click.echo(f"  ✗ Failed to embed {task.file_path}: {e}", err=True)
+            return 0
 
-                # Check if needs embedding
-                content_hash = hashlib.sha256(content.encode()).hexdigest()
-                cache_key = str(yaml_file)
+        for task, point in points:
+            self._record_embedded(task, point)
+        return len(points)
 
-                if cache_key in self.hash_cache:
-                    cached = self.hash_cache[cache_key]
-                    if cached.get("content_hash") == content_hash:
-                        continue
+    def embed_directory(
+        self,
+        directory: Path,
+        progress: Optional[Callable[[EmbeddingProgress], None]] = None,
+    ) -> Tuple[int, int]:
+        """Embed changed documents in directory through a pipeline of stages
 
-                task = EmbeddingTask(
-                    file_path=yaml_file,
-                    document_id=data.get("id", yaml_file.stem),
-                    content=content,
-                    data=data,
-                )
-                tasks.append(task)
+        1. A walker reads each YAML file once and skips it if its content hash
+           is cached
+        2. Changed files are parsed in a process pool and grouped into batches
+        3. Each batch is embedded with one request, several batches at a time
+        4. Each batch is stored with one upsert and the hash cache is saved
 
-            except Exception as e:
-                click.echo(f"Error reading {yaml_file}: {e}", err=True)
+        Bounded queues between the stages keep a few batches in flight, so
+        walking, parsing, embedding and upserting overlap without reading the
+        whole tree ahead.
 
-        total_count = len(list(directory.rglob("*.yaml")))
+        Args:
+            directory: Directory to scan for YAML documents
+            progress: Called with the running counts after each stored batch
 
-        if not tasks:
-            return 0, total_count
+        Returns:
+            (embedded, total) document counts
+        """
+        counts = EmbeddingProgress()
+        stop = threading.Event()
+        errors: List[BaseException] = []
+        embed_workers = max(1, self.embed_concurrency)
+        parse_queue: queue.Queue = queue.Queue(maxsize=self.batch_size * self.queue_batches)
+        embed_queue: queue.Queue = queue.Queue(maxsize=self.queue_batches)
+        upsert_queue: queue.Queue = queue.Queue(maxsize=self.queue_batches)
+        pool = ProcessPoolExecutor(self.parse_workers) if self.parse_workers > 0 else None
+
+        def walk() -> None:
+            for yaml_file in directory.rglob("*.yaml"):
+                if stop.is_set():
+                    return
+                counts.scanned += 1
+                if any(skip in yaml_file.parts for skip in _SKIP_DIRS):
+                    continue
 
-        # Process in batches
-        embedded_count = 0
-        for i in range(0, len(tasks), self.batch_size):
-            batch = tasks[i : i + self.batch_size]
-            if self.verbose:
-                click.echo(
-                    f"\nProcessing batch {i // self.batch_size + 1}/"
-                    f"{(len(tasks) + self.batch_size - 1) // self.batch_size}"
-                )
+                try:
+                    with open(yaml_file, "r") as f:
+                        content = f.read()
+                except Exception as e:
+                    click.echo(f"Error reading {yaml_file}: {e}", err=True)
+                    continue
 
-            # Process batch concurrently
-            results = []
-            for task in batch:
+                # Check if needs embedding
+                content_hash = hashlib.sha256(content.encode()).hexdigest()
+                cached = self.hash_cache.get(str(yaml_file))
+                if cached and cached.get("content_hash") == content_hash:
+                    continue
+
+                parsed = pool.submit(_parse_document, content) if pool else _parsed_now(content)
+                _put(parse_queue, (yaml_file, content, parsed), stop)
+
+        def batch() -> None:
+            tasks: List[EmbeddingTask] = []
+            while True:
+                item = _get(parse_queue, stop)
+                if item is _DONE:
+                    break
+                yaml_file, content, parsed = item
                 try:
-                    result = self._process_embedding_task(task)
-                    results.append(result)
+                    data, error = parsed.result()
+                    if error is not None:
+                        raise Exception(error)
+                    if not data:
+                        continue
+                    tasks.append(
+                        EmbeddingTask(
+                            file_path=yaml_file,
+                            document_id=data.get("id", yaml_file.stem),
+                            content=content,
+                            data=data,
+                        )
+                    )
                 except Exception as e:
-                    results.append(e)
+                    click.echo(f"Error reading {yaml_file}: {e}", err=True)
+                    continue
 
-            embedded_count += sum(1 for r in results if r and not isinstance(r, Exception))
+                counts.changed += 1
+                if len(tasks) == self.batch_size:
+                    _put(embed_queue, tasks, stop)
+                    tasks = []
+            if tasks:
+                _put(embed_queue, tasks, stop)
+
+        def embed() -> None:
+            while True:
+                tasks = _get(embed_queue, stop)
+                if tasks is _DONE:
+                    break
+                _put(upsert_queue, (tasks, self._embed_batch(tasks)), stop)
+
+        def stage(
+            target: Callable[[], None], output: queue.Queue, consumers: int = 1
+        ) -> threading.Thread:
+            def run() -> None:
+                try:
+                    target()
+                except BaseException as e:
+                    errors.append(e)
+                    stop.set()
+                finally:
+                    for _ in range(consumers):
+                        _put(output, _DONE, stop)
+
+            return threading.Thread(target=run, name=f"embed-{target.__name__}", daemon=True)
+
+        threads = [
+            stage(walk, parse_queue),
+            stage(batch, embed_queue, consumers=embed_workers),
+            *(stage(embed, upsert_queue) for _ in range(embed_workers)),
+        ]
 
-        # Save cache
-        self.hash_cache_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.hash_cache_path, "w") as f:
-            f.write(json.dumps(self.hash_cache, indent=2))
+        try:
+            if pool is not None:
+                # Fork the parse workers before the stage threads exist
+                pool.submit(_parse_document, "").result()
+            for thread in threads:
+                thread.start()
+
+            batch_number = 0
+            finished = 0
+            while finished < embed_workers:
+                item = _get(upsert_queue, stop)
+                if item is _DONE:
+                    if stop.is_set():
+                        break
+                    finished += 1
+                    continue
 
-        return embedded_count, total_count
+                tasks, embeddings = item
+                batch_number += 1
+                if self.verbose:
+                    click.echo(
+                        f"\nProcessing batch {batch_number} ({len(tasks)} documents, "
+                        f"{counts.scanned} files scanned)"
+                    )
+                stored = self._upsert_batch(tasks, embeddings)
+                counts.embedded += stored
+                counts.failed += len(tasks) - stored
+
+                # Save after every batch so an interrupted run resumes where it stopped
+                if stored:
+                    self._save_hash_cache()
+                if progress is not None:
+                    progress(replace(counts))
+        finally:
+            stop.set()
+            for thread in threads:
+                if thread.ident is not None:
+                    thread.join()
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+        if errors:
+            raise errors[0]
+
+        return counts.embedded, counts.scanned
 
 
 async def main():
@@ -11,6 +11,8 @@ from enum import Enum
 import logging
 import math
 
+import numpy as np
+
 # Try absolute imports first, fall back to relative
 try:
     from .fact_ranker import FactAwareRanker, RankingResult
@@ -138,12 +140,14 @@ class HybridScorer:
             scoring_mode = self._select_scoring_mode(query, intent)
         
         weights = self.scoring_modes[scoring_mode]
+        if not results:
+            return []
         
-        # Extract vector scores from results
+        # Extract vector scores from results (a repeated id keeps its last value)
+        result_ids = [result.get('id', str(i)) for i, result in enumerate(results)]
         vector_scores = {}
         lexical_scores = {}
-        for i, result in enumerate(results):
-            result_id = result.get('id', str(i))
+        for result_id, result in zip(result_ids, results):
             vector_scores[result_id] = result.get('score', 0.0)
             lexical_scores[result_id] = result.get('lexical_score', 0.0)
         
@@ -151,8 +155,11 @@ class HybridScorer:
         fact_scores = {}
         if self.enable_fact_patterns and weights.fact_boost > 0:
             fact_ranking_results = self.fact_ranker.apply_fact_ranking(results, query)
+            first_id_by_content = {}
+            for result_id, result in zip(result_ids, results):
+                first_id_by_content.setdefault(result.get('content'), result_id)
             for ranking_result in fact_ranking_results:
-                result_id = self._get_result_id(ranking_result, results)
+                result_id = first_id_by_content.get(ranking_result.content)
                 if result_id:
                     fact_scores[result_id] = ranking_result.fact_boost
         
@@ -165,29 +172,36 @@ class HybridScorer:
             for result_id, signal in graph_signals.items():
                 graph_scores[result_id] = signal.total_score
         
-        # Compute hybrid scores
+        # Feature columns, one row per result
+        vector_col = np.array([vector_scores.get(r, 0.0) for r in result_ids], dtype=np.float64)
+        lexical_col = np.array([lexical_scores.get(r, 0.0) for r in result_ids], dtype=np.float64)
+        graph_col = np.array([graph_scores.get(r, 0.0) for r in result_ids], dtype=np.float64)
+        fact_col = np.array([fact_scores.get(r, 0.0) for r in result_ids], dtype=np.float64)
+        
+        # Weighted combination, fact boost and [0, 1] bounds for all rows at once.
+        # Operation order matches the scalar formula so scores are bit-identical.
+        combined_col = (
+            weights.alpha_dense * vector_col +
+            weights.beta_lexical * lexical_col +
+            weights.gamma_graph * graph_col
+        )
+        final_col = np.clip(combined_col + weights.fact_boost * fact_col,
+                            self.score_floor, self.score_ceiling)
+        order = np.argsort(-final_col, kind='stable')
+        
+        weights_metadata = {
+            'alpha_dense': weights.alpha_dense,
+            'beta_lexical': weights.beta_lexical,
+            'gamma_graph': weights.gamma_graph,
+            'fact_boost': weights.fact_boost
+        }
+        
         hybrid_scores = []
-        for i, result in enumerate(results):
-            result_id = result.get('id', str(i))
-            
-            # Get component scores
-            vector_score = vector_scores.get(result_id, 0.0)
-            lexical_score = lexical_scores.get(result_id, 0.0)
-            graph_score = graph_scores.get(result_id, 0.0)
-            fact_pattern_score = fact_scores.get(result_id, 0.0)
-            
-            # Compute weighted combination
-            combined_score = (
-                weights.alpha_dense * vector_score +
-                weights.beta_lexical * lexical_score +
-                weights.gamma_graph * graph_score
-            )
-            
-            # Apply fact pattern boost
-            final_score = combined_score + (weights.fact_boost * fact_pattern_score)
-            
-            # Normalize to [0, 1] range
-            final_score = max(self.score_floor, min(self.score_ceiling, final_score))
+        for i in order:
+            vector_score = float(vector_col[i])
+            lexical_score = float(lexical_col[i])
+            graph_score = float(graph_col[i])
+            fact_pattern_score = float(fact_col[i])
             
             # Generate explanation
             explanation = self._generate_score_explanation(
@@ -195,30 +209,20 @@ class HybridScorer:
                 weights, scoring_mode
             ) if self.enable_score_explanation else ""
             
-            hybrid_score = HybridScore(
-                final_score=final_score,
+            hybrid_scores.append(HybridScore(
+                final_score=float(final_col[i]),
                 vector_score=vector_score,
                 lexical_score=lexical_score,
                 graph_score=graph_score,
                 fact_pattern_score=fact_pattern_score,
-                combined_score=combined_score,
+                combined_score=float(combined_col[i]),
                 explanation=explanation,
                 metadata={
                     'scoring_mode': scoring_mode.value,
-                    'weights': {
-                        'alpha_dense': weights.alpha_dense,
-                        'beta_lexical': weights.beta_lexical,
-                        'gamma_graph': weights.gamma_graph,
-                        'fact_boost': weights.fact_boost
-                    },
-                    'result_id': result_id
+                    'weights': dict(weights_metadata),
+                    'result_id': result_ids[i]
                 }
-            )
-            
-            hybrid_scores.append(hybrid_score)
-        
-        # Sort by final score (descending)
-        hybrid_scores.sort(key=lambda x: x.final_score, reverse=True)
+            ))
         
         logger.debug(f"Computed hybrid scores for {len(results)} results using {scoring_mode.value} mode")
         return hybrid_scores
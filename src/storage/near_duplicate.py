@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Vectorized MinHash/SimHash signatures and a banded LSH index.
+
+Every token is hashed once to 64 bits; the MinHash permutations are then
+applied to all token hashes as one NumPy operation using multiply-shift
+hashing, h(x) = ((a * x + b) mod 2**64) >> 32 with odd a, so a signature
+costs one digest per token plus a (tokens x permutations) array op.
+
+MinHashLSHIndex splits signatures into bands and buckets them by the band
+bytes; a query only compares the signatures sharing a band bucket, which is
+how store_context finds near-duplicate contexts in well under a millisecond.
+"""
+
+import hashlib
+import re
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+
+Token = Union[str, bytes, int]
+
+_MASK64 = (1 << 64) - 1
+_MAX_HASH = np.uint64(_MASK64)
+# Token rows per multiply block, bounding the temporary array at ~4 MB
+_CHUNK_TOKENS = 4096
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def _token_digest(token: Token) -> bytes:
+    """Little-endian 64-bit digest of a token; integers are used as they are."""
+    if isinstance(token, int):
+        return (token & _MASK64).to_bytes(8, "little")
+    if isinstance(token, str):
+        token = token.encode("utf-8", "surrogatepass")
+    return hashlib.blake2b(token, digest_size=8).digest()
+
+
+def token_hash(token: Token) -> int:
+    """64-bit hash of a token."""
+    return int.from_bytes(_token_digest(token), "little")
+
+
+def token_hashes(tokens: Iterable[Token]) -> np.ndarray:
+    """uint64 array with the hash of each token."""
+    digests = b"".join(map(_token_digest, tokens))
+    return np.frombuffer(digests, dtype="<u8").astype(np.uint64)
+
+
+def word_shingles(text: str, size: int = 3) -> List[str]:
+    """Lowercased word n-grams of text; the words themselves if there are fewer."""
+    words = _WORD_PATTERN.findall(text.lower())
+    if len(words) <= size:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[i : i + size]) for i in range(len(words) - size + 1)]
+
+
+class MinHashPermutation:
+    """One MinHash permutation, callable on a single token."""
+
+    __slots__ = ("a", "b")
+
+    def __init__(self, a: int, b: int):
+        self.a = a
+        self.b = b
+
+    def __call__(self, token: Token) -> int:
+        return ((self.a * token_hash(token) + self.b) & _MASK64) >> 32
+
+    def __repr__(self) -> str:
+        return f"MinHashPermutation(a={self.a:#x}, b={self.b:#x})"
+
+
+class MinHasher:
+    """MinHash signatures over a fixed set of permutations."""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        a = rng.integers(0, _MASK64, size=num_perm, dtype=np.uint64, endpoint=True)
+        b = rng.integers(0, _MASK64, size=num_perm, dtype=np.uint64, endpoint=True)
+        self._set_parameters(a | np.uint64(1), b)
+
+    @classmethod
+    def from_permutations(cls, permutations: Sequence[MinHashPermutation]) -> "MinHasher":
+        """MinHasher applying the given permutations in order."""
+        hasher = cls.__new__(cls)
+        hasher._set_parameters(
+            np.fromiter((p.a for p in permutations), dtype=np.uint64, count=len(permutations)),
+            np.fromiter((p.b for p in permutations), dtype=np.uint64, count=len(permutations)),
+        )
+        return hasher
+
+    def _set_parameters(self, a: np.ndarray, b: np.ndarray) -> None:
+        self.a = a
+        self.b = b
+        self.num_perm = len(a)
+
+    def permutations(self) -> List[MinHashPermutation]:
+        """The permutations as scalar callables."""
+        return [MinHashPermutation(int(a), int(b)) for a, b in zip(self.a, self.b)]
+
+    def signature(self, tokens: Iterable[Token]) -> np.ndarray:
+        """uint32 MinHash signature of the token set; all zeros when empty."""
+        hashes = token_hashes(set(tokens))
+        if not len(hashes):
+            return np.zeros(self.num_perm, dtype=np.uint32)
+
+        minimum = np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        for start in range(0, len(hashes), _CHUNK_TOKENS):
+            block = hashes[start : start + _CHUNK_TOKENS, None] * self.a
+            block += self.b
+            np.minimum(minimum, block.min(axis=0), out=minimum)
+        # The top 32 bits are monotone in the full value, so shift after the min
+        return (minimum >> np.uint64(32)).astype(np.uint32)
+
+
+def simhash(tokens: Iterable[Token]) -> int:
+    """64-bit SimHash of the tokens, each weighted by its count."""
+    counts = Counter(tokens)
+    if not counts:
+        return 0
+
+    hashes = token_hashes(counts).astype("<u8", copy=False)
+    weights = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+    # Column i holds bit i of every token hash
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    votes = weights @ (bits.astype(np.int64) * 2 - 1)
+    return int.from_bytes(np.packbits(votes > 0, bitorder="little").tobytes(), "little")
+
+
+def jaccard(signature1: np.ndarray, signature2: np.ndarray) -> float:
+    """Jaccard similarity estimated from two MinHash signatures."""
+    if len(signature1) != len(signature2) or not len(signature1):
+        return 0.0
+    return float(np.count_nonzero(signature1 == signature2)) / len(signature1)
+
+
+def choose_bands(num_perm: int, threshold: float, recall: float = 0.95) -> Tuple[int, int]:
+    """Bands and rows per band for an LSH index.
+
+    Picks the most rows per band (fewest candidates to verify) for which a
+    pair exactly at the threshold still shares a bucket with the given
+    probability, 1 - (1 - threshold**rows)**bands.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if 1 - (1 - threshold**rows) ** bands >= recall:
+            best = (bands, rows)
+    return best
+
+
+@dataclass
+class NearDuplicate:
+    """An indexed entry similar to a query signature."""
+
+    key: Hashable
+    similarity: float
+    payload: Any = None
+
+
+class MinHashLSHIndex:
+    """Banded LSH index of MinHash signatures with exact-estimate verification.
+
+    Entries live in an optional scope (any hashable); queries only match
+    entries of the same scope. With max_entries set, the oldest entries are
+    evicted first.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 128,
+        threshold: float = 0.9,
+        max_entries: Optional[int] = None,
+        recall: float = 0.95,
+    ):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+        self.num_perm = num_perm
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.bands, self.rows = choose_bands(num_perm, threshold, recall)
+        self._buckets: List[Dict[Tuple[Hashable, bytes], Set[Hashable]]] = [
+            {} for _ in range(self.bands)
+        ]
+        self._entries: "OrderedDict[Hashable, Tuple[np.ndarray, Hashable, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def _bucket_keys(self, signature: np.ndarray, scope: Hashable) -> List[Tuple[Hashable, bytes]]:
+        if len(signature) != self.num_perm:
+            raise ValueError(f"Expected a signature of {self.num_perm} values, got {len(signature)}")
+        data = np.ascontiguousarray(signature, dtype=np.uint32).tobytes()
+        width = self.rows * 4
+        return [(scope, data[i * width : (i + 1) * width]) for i in range(self.bands)]
+
+    def add(self, key: Hashable, signature: np.ndarray, scope: Hashable = None,
+            payload: Any = None) -> None:
+        """Index a signature under key, replacing any previous entry for it."""
+        bucket_keys = self._bucket_keys(signature, scope)
+        self.remove(key)
+        for buckets, bucket_key in zip(self._buckets, bucket_keys):
+            buckets.setdefault(bucket_key, set()).add(key)
+        self._entries[key] = (np.asarray(signature, dtype=np.uint32), scope, payload)
+
+        if self.max_entries is not None:
+            while len(self._entries) > self.max_entries:
+                self.remove(next(iter(self._entries)))
+
+    def remove(self, key: Hashable) -> bool:
+        """Drop an entry; returns whether it was indexed."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        signature, scope, _ = entry
+        for buckets, bucket_key in zip(self._buckets, self._bucket_keys(signature, scope)):
+            members = buckets.get(bucket_key)
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del buckets[bucket_key]
+        return True
+
+    def query(self, signature: np.ndarray, scope: Hashable = None) -> List[NearDuplicate]:
+        """Entries at or above the threshold, most similar first."""
+        candidates: Set[Hashable] = set()
+        for buckets, bucket_key in zip(self._buckets, self._bucket_keys(signature, scope)):
+            members = buckets.get(bucket_key)
+            if members:
+                candidates.update(members)
+        if not candidates:
+            return []
+
+        keys = list(candidates)
+        stored = np.stack([self._entries[key][0] for key in keys])
+        similarities = np.count_nonzero(stored == signature, axis=1) / self.num_perm
+        matches = [
+            NearDuplicate(key, float(similarity), self._entries[key][2])
+            for key, similarity in zip(keys, similarities)
+            if similarity >= self.threshold
+        ]
+        matches.sort(key=lambda match: match.similarity, reverse=True)
+        return matches
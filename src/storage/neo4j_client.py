@@ -225,6 +225,8 @@ class Neo4jInitializer:
             # Relationship traversal
             ("Sprint", ["sprint_number", "status"]),
             ("Task", ["status", "assigned_to"]),
+            # Keyset pagination for the streaming text indexer
+            ("Context", ["created_at"]),
             # Full-text search
             ("Document", ["title"], "fulltext"),
             ("Document", ["description"], "fulltext"),
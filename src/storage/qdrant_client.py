@@ -10,9 +10,13 @@ This module:
 """
 
 import logging
+import os
+import queue
+import random
 import sys
+import threading
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import click
 import yaml
@@ -34,6 +38,7 @@ from qdrant_client.models import (
     HnswConfigDiff,
     OptimizersConfigDiff,
     PointStruct,
+    QueryRequest,
     VectorParams,
 )
 
@@ -53,6 +58,128 @@ except ImportError:
     sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
     from core.config import Config
 
+# Write durability for store_vector/store_vectors:
+#   verify - upsert(wait=True) followed by a read-back of the stored point
+#   ack    - upsert(wait=True) only
+#   async  - upsert(wait=False); a sample of writes is verified in the background
+WRITE_DURABILITY_MODES = ("verify", "ack", "async")
+QDRANT_WRITE_DURABILITY = os.getenv("QDRANT_WRITE_DURABILITY", "verify").lower()
+QDRANT_VERIFY_SAMPLE_RATE = float(os.getenv("QDRANT_VERIFY_SAMPLE_RATE", "0.01"))
+QDRANT_VERIFY_DELAY_SECONDS = float(os.getenv("QDRANT_VERIFY_DELAY_SECONDS", "0.5"))
+QDRANT_VERIFY_MAX_PENDING = int(os.getenv("QDRANT_VERIFY_MAX_PENDING", "1000"))
+
+
+class SampledWriteVerifier:
+    """Verify a sample of async (wait=False) writes on a background thread.
+
+    Sampled writes are read back after a short delay, since Qdrant only
+    acknowledged them. Mismatches are counted and logged, never raised.
+    """
+
+    def __init__(
+        self,
+        retrieve,
+        sample_rate: float = QDRANT_VERIFY_SAMPLE_RATE,
+        delay_seconds: float = QDRANT_VERIFY_DELAY_SECONDS,
+        max_pending: int = QDRANT_VERIFY_MAX_PENDING,
+        attempts: int = 3,
+    ):
+        """
+        Args:
+            retrieve: Callable (collection_name, ids) -> points with vectors
+            sample_rate: Fraction of writes to verify (0.0 - 1.0)
+            delay_seconds: Delay before each read-back attempt
+            max_pending: Sampled writes queued beyond this are dropped
+            attempts: Read-back attempts before a write counts as missing
+        """
+        self._retrieve = retrieve
+        self.sample_rate = max(0.0, min(1.0, sample_rate))
+        self.delay_seconds = delay_seconds
+        self.attempts = max(1, attempts)
+        self._queue: "queue.Queue[Tuple[str, str, int]]" = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.stats = {
+            "sampled": 0,
+            "verified": 0,
+            "missing": 0,
+            "corrupted": 0,
+            "errors": 0,
+            "dropped": 0,
+        }
+
+    def submit(self, collection_name: str, vector_id: str, dimensions: int) -> bool:
+        """Queue a write for verification if it falls in the sample."""
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return False
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((collection_name, vector_id, dimensions))
+        except queue.Full:
+            self._increment("dropped")
+            return False
+        self._increment("sampled")
+        return True
+
+    def wait_idle(self, timeout: float = 5.0) -> bool:
+        """Wait until all queued verifications have finished."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return verification counters."""
+        with self._lock:
+            stats = dict(self.stats)
+        stats["pending"] = self._queue.qsize()
+        stats["sample_rate"] = self.sample_rate
+        return stats
+
+    def _increment(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="qdrant-write-verifier", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            collection_name, vector_id, dimensions = self._queue.get()
+            try:
+                self._increment(self._verify(collection_name, vector_id, dimensions))
+            except Exception as e:
+                logger.warning(f"Sampled write verification errored for {vector_id}: {e}")
+                self._increment("errors")
+            finally:
+                self._queue.task_done()
+
+    def _verify(self, collection_name: str, vector_id: str, dimensions: int) -> str:
+        for attempt in range(self.attempts):
+            if self.delay_seconds > 0:
+                time.sleep(self.delay_seconds)
+            points = self._retrieve(collection_name, [vector_id])
+            if not points:
+                continue
+            vector = points[0].vector
+            if not vector or len(vector) != dimensions:
+                logger.warning(
+                    f"Sampled write verification: vector {vector_id} corrupted or incomplete"
+                )
+                return "corrupted"
+            return "verified"
+        logger.warning(f"Sampled write verification: vector {vector_id} not found after upsert")
+        return "missing"
+
 
 class VectorDBInitializer:
     """Initialize and configure Qdrant vector database"""
@@ -79,6 +206,49 @@ class VectorDBInitializer:
 
         self.client: Optional[QdrantClient] = None
 
+        qdrant_config = self.config.get("qdrant", {}) if isinstance(self.config, dict) else {}
+        self.write_durability = self._resolve_durability(
+            qdrant_config.get("write_durability", QDRANT_WRITE_DURABILITY)
+        )
+        self.write_counts = {mode: 0 for mode in WRITE_DURABILITY_MODES}
+        # Writes run on storage-executor threads, so the counters need a lock
+        self._write_counts_lock = threading.Lock()
+        self.write_verifier = SampledWriteVerifier(
+            self._retrieve_for_verification,
+            sample_rate=float(qdrant_config.get("verify_sample_rate", QDRANT_VERIFY_SAMPLE_RATE)),
+        )
+
+    @staticmethod
+    def _resolve_durability(mode: Optional[str]) -> str:
+        """Validate a durability mode name."""
+        mode = (mode or "verify").lower()
+        if mode not in WRITE_DURABILITY_MODES:
+            raise ValueError(
+                f"Invalid write durability '{mode}', expected one of {', '.join(WRITE_DURABILITY_MODES)}"
+            )
+        return mode
+
+    def _retrieve_for_verification(self, collection_name: str, ids: List[str]) -> list:
+        if not self.client:
+            raise RuntimeError("Not connected to Qdrant")
+        return self.client.retrieve(collection_name=collection_name, ids=ids, with_vectors=True)
+
+    def _count_writes(self, mode: str, count: int = 1) -> None:
+        with self._write_counts_lock:
+            self.write_counts[mode] += count
+
+    def _snapshot_write_counts(self) -> Dict[str, int]:
+        with self._write_counts_lock:
+            return dict(self.write_counts)
+
+    def get_write_stats(self) -> Dict[str, Any]:
+        """Return write counts per durability mode and sampled verification results."""
+        return {
+            "durability": self.write_durability,
+            "writes": self._snapshot_write_counts(),
+            "verification": self.write_verifier.get_stats(),
+        }
+
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """Load configuration from .ctxrc.yaml"""
         try:
@@ -315,7 +485,11 @@ class VectorDBInitializer:
             return False
 
     def store_vector(
-        self, vector_id: str, embedding: list, metadata: Optional[Dict[str, Any]] = None
+        self,
+        vector_id: str,
+        embedding: list,
+        metadata: Optional[Dict[str, Any]] = None,
+        durability: Optional[str] = None,
     ) -> str:
         """Store a vector in the Qdrant collection.
 
@@ -323,6 +497,8 @@ class VectorDBInitializer:
             vector_id: Unique identifier for the vector
             embedding: The vector embedding
             metadata: Optional metadata to store with the vector
+            durability: Override the configured write durability
+                ("verify", "ack" or "async")
 
         Returns:
             str: The vector ID that was stored
@@ -342,6 +518,7 @@ class VectorDBInitializer:
             raise ValueError("embedding must be a non-empty list")
         if not all(isinstance(x, (int, float)) for x in embedding):
             raise ValueError("embedding must contain only numeric values")
+        mode = self._resolve_durability(durability or self.write_durability)
 
         try:
             from qdrant_client.models import PointStruct
@@ -361,11 +538,18 @@ class VectorDBInitializer:
                         payload=metadata or {},
                     )
                 ],
-                wait=True,  # Ensure immediate availability for retrieval
+                wait=mode != "async",  # Ensure immediate availability for retrieval
             )
+            self._count_writes(mode)
             
             # PHASE 0: Log upsert response details  
             logger.info(f"✅ Qdrant upsert response: operation_id={getattr(upsert_result, 'operation_id', 'N/A')}, status={getattr(upsert_result, 'status', 'unknown')}")
+
+            if mode == "async":
+                self.write_verifier.submit(collection_name, vector_id, len(embedding))
+                return vector_id
+            if mode == "ack":
+                return vector_id
             
             # PHASE 0 FIX: Write-after-read verification
             # Verify the vector was actually stored by attempting to retrieve it
@@ -402,6 +586,89 @@ class VectorDBInitializer:
         except Exception as e:
             raise RuntimeError(f"Failed to store vector: {e}")
 
+    def store_vectors(
+        self,
+        points: List[Tuple[str, list, Optional[Dict[str, Any]]]],
+        durability: Optional[str] = None,
+    ) -> List[str]:
+        """Store many vectors with a single upsert.
+
+        Args:
+            points: (vector_id, embedding, metadata) tuples
+            durability: Override the configured write durability
+
+        Returns:
+            List[str]: The vector IDs that were stored
+
+        Raises:
+            RuntimeError: If not connected or storage fails
+            ValueError: If any point is invalid
+        """
+        if not self.client:
+            raise RuntimeError("Not connected to Qdrant")
+        if not points:
+            return []
+
+        collection_name = self.config.get("qdrant", {}).get("collection_name", "context_embeddings")
+
+        # Validate every point before writing any of them
+        for vector_id, embedding, _ in points:
+            if not vector_id or not isinstance(vector_id, str):
+                raise ValueError("vector_id must be a non-empty string")
+            if not embedding or not isinstance(embedding, list):
+                raise ValueError(f"embedding for {vector_id} must be a non-empty list")
+            if not all(isinstance(x, (int, float)) for x in embedding):
+                raise ValueError(f"embedding for {vector_id} must contain only numeric values")
+
+        mode = self._resolve_durability(durability or self.write_durability)
+        vector_ids = [vector_id for vector_id, _, _ in points]
+        try:
+            logger.info(f"📦 Storing {len(points)} vectors in one upsert")
+            upsert_result = self.client.upsert(
+                collection_name=collection_name,
+                points=[
+                    PointStruct(id=vector_id, vector=embedding, payload=metadata or {})
+                    for vector_id, embedding, metadata in points
+                ],
+                wait=mode != "async",  # Ensure immediate availability for retrieval
+            )
+            self._count_writes(mode, len(points))
+            logger.info(
+                f"✅ Qdrant batch upsert response: operation_id={getattr(upsert_result, 'operation_id', 'N/A')}, "
+                f"status={getattr(upsert_result, 'status', 'unknown')}"
+            )
+
+            if mode == "async":
+                for vector_id, embedding, _ in points:
+                    self.write_verifier.submit(collection_name, vector_id, len(embedding))
+                return vector_ids
+            if mode == "ack":
+                return vector_ids
+
+            # Verify the whole batch with one retrieve (ids only, no vectors)
+            retrieved_points = self.client.retrieve(
+                collection_name=collection_name,
+                ids=vector_ids,
+                with_payload=False,
+                with_vectors=False,
+            )
+            found = {str(point.id) for point in retrieved_points or []}
+            missing = [vector_id for vector_id in vector_ids if vector_id not in found]
+            if missing:
+                raise RuntimeError(
+                    f"Storage verification failed: {len(missing)} of {len(vector_ids)} vectors not found after upsert"
+                )
+
+            return vector_ids
+        except ConnectionError as e:
+            raise RuntimeError(f"Qdrant connection error: {e}")
+        except TimeoutError as e:
+            raise RuntimeError(f"Qdrant timeout error: {e}")
+        except RuntimeError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Failed to store vectors: {e}")
+
     def search(
         self, query_vector: list, limit: int = 10, filter_dict: Optional[Dict[str, Any]] = None
     ) -> list:
@@ -467,6 +734,113 @@ class VectorDBInitializer:
         except Exception as e:
             raise RuntimeError(f"Failed to search vectors: {e}")
 
+    def search_batch(
+        self,
+        query_vectors: List[list],
+        limit: int = 10,
+        filter_dict: Optional[Dict[str, Any]] = None,
+    ) -> List[list]:
+        """Search for several query vectors in one Qdrant request.
+
+        Args:
+            query_vectors: Query vectors to search for
+            limit: Maximum number of results per query vector
+            filter_dict: Optional filter conditions applied to every query
+
+        Returns:
+            list: One list of search results per query vector, in input order
+
+        Raises:
+            RuntimeError: If not connected or search fails
+        """
+        if not self.client:
+            raise RuntimeError("Not connected to Qdrant")
+
+        collection_name = self.config.get("qdrant", {}).get("collection_name", "context_embeddings")
+
+        # Validate inputs
+        if not query_vectors:
+            return []
+        for query_vector in query_vectors:
+            if not query_vector or not isinstance(query_vector, list):
+                raise ValueError("each query vector must be a non-empty list")
+            if not all(isinstance(x, (int, float)) for x in query_vector):
+                raise ValueError("query vectors must contain only numeric values")
+        if not isinstance(limit, int) or limit <= 0:
+            raise ValueError("limit must be a positive integer")
+        if limit > 1000:  # Reasonable upper bound
+            raise ValueError("limit cannot exceed 1000")
+        if filter_dict is not None and not isinstance(filter_dict, dict):
+            raise ValueError("filter_dict must be a dictionary or None")
+
+        try:
+            responses = self.client.query_batch_points(
+                collection_name=collection_name,
+                requests=[
+                    QueryRequest(
+                        query=query_vector, limit=limit, filter=filter_dict, with_payload=True
+                    )
+                    for query_vector in query_vectors
+                ],
+            )
+
+            return [
+                [
+                    {
+                        "id": result.id,
+                        "score": result.score,
+                        "payload": result.payload or {},
+                    }
+                    for result in response.points
+                ]
+                for response in responses
+            ]
+        except ConnectionError as e:
+            raise RuntimeError(f"Qdrant connection error during batch search: {e}")
+        except TimeoutError as e:
+            raise RuntimeError(f"Qdrant timeout error during batch search: {e}")
+        except ValueError as e:
+            # Re-raise validation errors
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Failed to batch search vectors: {e}")
+
+    def scroll(
+        self, limit: int = 256, offset: Optional[Any] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[Any]]:
+        """Page through the collection in point ID order, without vectors.
+
+        Args:
+            limit: Maximum number of points per page
+            offset: Point ID to start from (the previous page's next offset)
+
+        Returns:
+            tuple: (points as {"id", "payload"} dicts, next page offset or None
+            when the collection is exhausted)
+
+        Raises:
+            RuntimeError: If not connected or the scroll fails
+        """
+        if not self.client:
+            raise RuntimeError("Not connected to Qdrant")
+
+        collection_name = self.config.get("qdrant", {}).get("collection_name", "context_embeddings")
+
+        if not isinstance(limit, int) or limit <= 0:
+            raise ValueError("limit must be a positive integer")
+
+        try:
+            points, next_offset = self.client.scroll(
+                collection_name=collection_name,
+                limit=limit,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False,
+            )
+            return [{"id": point.id, "payload": point.payload or {}} for point in points], next_offset
+        except Exception as e:
+            raise RuntimeError(f"Failed to scroll vectors: {e}")
+
     def get_collections(self):
         """Get information about available collections.
 
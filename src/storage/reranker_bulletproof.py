@@ -2,17 +2,36 @@
 """
 Bulletproof reranker with hardened text extraction and fail-safes
 Fixes the classic "all rerank_score = 0.000" bug from empty text inputs
+
+Cross-encoder inference runs on dedicated worker threads, never on the caller's
+thread or event loop. Pairs from concurrent queries are coalesced into shared
+forward passes, and scores are cached per (query, doc id, content) so repeated
+candidates are not re-scored.
 """
 
+import asyncio
+import hashlib
 import logging
+import os
+import queue
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Future
 import numpy as np
 import torch
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from sentence_transformers import CrossEncoder
 
 logger = logging.getLogger(__name__)
 
+RERANKER_WORKERS = int(os.getenv("RERANKER_WORKERS", "1"))
+RERANKER_MAX_BATCH_PAIRS = int(os.getenv("RERANKER_MAX_BATCH_PAIRS", "128"))
+RERANKER_BATCH_WAIT_MS = float(os.getenv("RERANKER_BATCH_WAIT_MS", "2"))
+RERANKER_SCORE_CACHE_SIZE = int(os.getenv("RERANKER_SCORE_CACHE_SIZE", "10000"))
+
+ScoreKey = Tuple[str, str, str]
+
 class RerankerMetrics:
     """Simple metrics tracker"""
     def __init__(self) -> None:
@@ -140,6 +159,168 @@ def clamp_for_rerank(txt: str, max_chars: int = 4000) -> str:
     
     return text
 
+class RerankScoreCache:
+    """Thread-safe LRU of (query hash, doc id, content hash) -> cross-encoder score"""
+
+    def __init__(self, max_entries: int = RERANKER_SCORE_CACHE_SIZE) -> None:
+        self.max_entries = max(0, max_entries)
+        self._scores: "OrderedDict[ScoreKey, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(query: str, doc_id: str, text: str) -> ScoreKey:
+        return (_digest(query), str(doc_id), _digest(text))
+
+    def get_many(self, keys: List[ScoreKey]) -> List[Optional[float]]:
+        with self._lock:
+            scores = []
+            for key in keys:
+                score = self._scores.get(key)
+                if score is None:
+                    self.misses += 1
+                else:
+                    self._scores.move_to_end(key)
+                    self.hits += 1
+                scores.append(score)
+            return scores
+
+    def put_many(self, items: List[Tuple[ScoreKey, float]]) -> None:
+        if not self.max_entries:
+            return
+        with self._lock:
+            for key, score in items:
+                self._scores[key] = score
+                self._scores.move_to_end(key)
+            while len(self._scores) > self.max_entries:
+                self._scores.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._scores.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._scores),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8", errors="replace"), digest_size=16).hexdigest()
+
+
+class CrossEncoderBatcher:
+    """
+    Dedicated inference workers that coalesce concurrent scoring requests
+
+    Each worker takes the oldest pending request, then keeps collecting requests
+    for up to ``max_wait_ms`` or until ``max_batch_pairs`` pairs are queued, and
+    runs them through the model as one forward pass.
+    """
+
+    def __init__(
+        self,
+        predict: Callable[[List[List[str]]], List[float]],
+        max_batch_pairs: int = RERANKER_MAX_BATCH_PAIRS,
+        max_wait_ms: float = RERANKER_BATCH_WAIT_MS,
+        workers: int = RERANKER_WORKERS,
+    ) -> None:
+        self.predict = predict
+        self.max_batch_pairs = max(1, max_batch_pairs)
+        self.max_wait_ms = max(0.0, max_wait_ms)
+        self.worker_count = max(1, workers)
+        self._queue: "queue.Queue[Tuple[List[List[str]], Future]]" = queue.Queue()
+        self._workers: List[threading.Thread] = []
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.requests = 0
+        self.batches = 0
+        self.pairs = 0
+        self.max_requests_per_batch = 0
+
+    def submit(self, pairs: List[List[str]]) -> Future:
+        """Queue pairs for scoring; the future resolves to one score per pair"""
+        self._ensure_workers()
+        future: Future = Future()
+        self._queue.put((pairs, future))
+        return future
+
+    def _ensure_workers(self) -> None:
+        if self._workers:
+            return
+        with self._start_lock:
+            if self._workers:
+                return
+            for i in range(self.worker_count):
+                worker = threading.Thread(
+                    target=self._run, name=f"reranker-{i}", daemon=True
+                )
+                worker.start()
+                self._workers.append(worker)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            pair_count = len(batch[0][0])
+            deadline = time.monotonic() + self.max_wait_ms / 1000
+            while pair_count < self.max_batch_pairs:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(item)
+                pair_count += len(item[0])
+            self._score_batch(batch)
+
+    def _score_batch(self, batch: List[Tuple[List[List[str]], Future]]) -> None:
+        live = [(pairs, future) for pairs, future in batch if future.set_running_or_notify_cancel()]
+        if not live:
+            return
+        all_pairs = [pair for pairs, _ in live for pair in pairs]
+        try:
+            with torch.inference_mode():
+                scores = self.predict(all_pairs)
+            if hasattr(scores, 'tolist'):
+                scores = scores.tolist()
+            scores = [float(score) for score in scores]
+        except Exception as e:
+            for _, future in live:
+                future.set_exception(e)
+            return
+
+        with self._stats_lock:
+            self.requests += len(live)
+            self.batches += 1
+            self.pairs += len(all_pairs)
+            self.max_requests_per_batch = max(self.max_requests_per_batch, len(live))
+
+        offset = 0
+        for pairs, future in live:
+            future.set_result(scores[offset:offset + len(pairs)])
+            offset += len(pairs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "workers": self.worker_count,
+                "max_batch_pairs": self.max_batch_pairs,
+                "max_wait_ms": self.max_wait_ms,
+                "pending": self._queue.qsize(),
+                "requests": self.requests,
+                "batches": self.batches,
+                "pairs": self.pairs,
+                "avg_pairs_per_batch": self.pairs / self.batches if self.batches else 0.0,
+                "max_requests_per_batch": self.max_requests_per_batch,
+            }
+
+
 class BulletproofReranker:
     """Bulletproof reranker with fail-safes and debugging"""
     
@@ -153,7 +334,13 @@ class BulletproofReranker:
         self.model: Optional[CrossEncoder] = None
         self.enabled = True
         self.request_count = 0
+        self.score_cache = RerankScoreCache()
+        self.batcher = CrossEncoderBatcher(self._predict)
         self._load_model()
+
+    def _predict(self, pairs: List[List[str]]) -> List[float]:
+        """Model forward pass (runs on a batcher worker thread)"""
+        return self.model.predict(pairs)
     
     def _load_model(self) -> None:
         """Load cross-encoder model with error handling"""
@@ -194,6 +381,9 @@ class BulletproofReranker:
         """
         Bulletproof reranking with fail-safes
         
+        Blocks the calling thread until the batcher has scored the candidates;
+        async callers should use ``arerank`` instead.
+        
         Args:
             query: Search query
             candidates: List of candidates with payload/content
@@ -208,93 +398,155 @@ class BulletproofReranker:
             return candidates
         
         try:
-            # Extract texts with robust extraction
-            texts = []
-            for candidate in candidates:
-                # Try multiple payload locations
-                payload = candidate.get("payload", candidate)
-                text = extract_chunk_text(payload, debug=self.debug_mode)
-                clamped_text = clamp_for_rerank(text)
-                texts.append(clamped_text)
-            
-            # Hard fail-safe: if all empty, abort rerank
-            empties = sum(1 for t in texts if not t.strip())
-            if empties == len(texts):
-                metrics.counter("reranker_all_empty").inc()
-                logger.error(f"❌ RERANKER: All {len(texts)} candidates have empty text - aborting rerank")
-                self._debug_log_candidates(query, candidates, texts)
+            request = self._prepare(query, candidates)
+            if request is None:
                 return candidates
+            texts, keys, scores, pending = request
+            if pending is not None:
+                self._fill_scores(scores, pending, pending[1].result())
+            return self._finish(query, candidates, texts, keys, scores, start_time)
+        except Exception as e:
+            logger.error(f"❌ RERANKER: Exception during reranking: {e}")
+            metrics.counter("reranker_exceptions").inc()
+            return candidates
+    
+    async def arerank(self, query: str, candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Async variant of ``rerank`` that awaits inference without blocking the event loop
+        
+        Args:
+            query: Search query
+            candidates: List of candidates with payload/content
             
-            if empties > len(texts) * 0.5:
-                logger.warning(f"⚠️  RERANKER: {empties}/{len(texts)} candidates have empty text")
-            
-            # Build pairs and score
-            pairs = []
-            for text in texts:
-                # Use space for completely empty texts (model needs something)
-                pair_text = text if text.strip() else " "
-                pairs.append([query, pair_text])
-            
-            # Get cross-encoder scores with deterministic inference
-            with torch.inference_mode():
-                scores = self.model.predict(pairs)
-            
-            # Convert to list if numpy array
-            if hasattr(scores, 'tolist'):
-                scores = scores.tolist()
-            
-            # Sanity check: no all-zeros after model call
-            if all(abs(s) < 1e-9 for s in scores):
-                metrics.counter("reranker_all_zero_scores").inc()
-                logger.error("❌ RERANKER: All scores are zero - model prediction failed")
-                self._debug_log_candidates(query, candidates, texts, scores)
-                
-                # Auto-disable if too many zero-score failures
-                if metrics.counters.get("reranker_all_zero_scores", 0) >= self.auto_disable_threshold:
-                    logger.error(f"❌ RERANKER: Auto-disabling after {self.auto_disable_threshold} zero-score failures")
-                    self.enabled = False
-                
+        Returns:
+            Reranked candidates (fail-safe to original order if issues)
+        """
+        start_time = time.time()
+        self.request_count += 1
+        
+        if not self.enabled or not self.model or not candidates:
+            return candidates
+        
+        try:
+            request = self._prepare(query, candidates)
+            if request is None:
                 return candidates
-            
-            # Debug logging
-            self._debug_log_candidates(query, candidates, texts, scores)
-            
-            # Create scored candidates
-            scored_candidates = []
-            for i, candidate in enumerate(candidates):
-                scored = candidate.copy()
-                scored["rerank_score"] = float(scores[i])
-                scored["original_score"] = candidate.get("score", 0.0)
-                scored["text_length"] = len(texts[i]) if i < len(texts) else 0
-                scored_candidates.append(scored)
-            
-            # Sort by rerank score (higher = better, descending)
-            order = np.argsort(-np.asarray(scores))
-            reranked = [scored_candidates[i] for i in order]
-            
-            # Assert scores are descending
-            rerank_scores = [reranked[i]["rerank_score"] for i in range(len(reranked))]
-            if len(rerank_scores) > 1:
-                for i in range(len(rerank_scores) - 1):
-                    if rerank_scores[i] < rerank_scores[i + 1]:
-                        logger.warning(f"⚠️  Score ordering issue at positions {i}, {i+1}: {rerank_scores[i]} < {rerank_scores[i+1]}")
-                        break
-            
-            # Track metrics
-            latency_ms = (time.time() - start_time) * 1000
-            metrics.timers.append(latency_ms)
-            metrics.counter("reranker_invocations").inc()
-            
-            logger.info(f"✅ RERANKER: Scored {len(candidates)} candidates in {latency_ms:.1f}ms")
-            logger.info(f"   Top score: {rerank_scores[0]:.4f}, Bottom: {rerank_scores[-1]:.4f}")
-            
-            return reranked
-            
+            texts, keys, scores, pending = request
+            if pending is not None:
+                self._fill_scores(scores, pending, await asyncio.wrap_future(pending[1]))
+            return self._finish(query, candidates, texts, keys, scores, start_time)
         except Exception as e:
             logger.error(f"❌ RERANKER: Exception during reranking: {e}")
             metrics.counter("reranker_exceptions").inc()
             return candidates
     
+    def _prepare(self, query: str, candidates: List[Dict[str, Any]]):
+        """
+        Extract texts, look up cached scores and submit the rest to the batcher
+        
+        Returns:
+            None if reranking should be skipped, else (texts, cache keys, scores with
+            None for uncached candidates, (missing indices, future) or None)
+        """
+        # Extract texts with robust extraction
+        texts = []
+        for candidate in candidates:
+            # Try multiple payload locations
+            payload = candidate.get("payload", candidate)
+            text = extract_chunk_text(payload, debug=self.debug_mode)
+            clamped_text = clamp_for_rerank(text)
+            texts.append(clamped_text)
+        
+        # Hard fail-safe: if all empty, abort rerank
+        empties = sum(1 for t in texts if not t.strip())
+        if empties == len(texts):
+            metrics.counter("reranker_all_empty").inc()
+            logger.error(f"❌ RERANKER: All {len(texts)} candidates have empty text - aborting rerank")
+            self._debug_log_candidates(query, candidates, texts)
+            return None
+        
+        if empties > len(texts) * 0.5:
+            logger.warning(f"⚠️  RERANKER: {empties}/{len(texts)} candidates have empty text")
+        
+        keys = [
+            self.score_cache.make_key(
+                query, candidate.get("id", candidate.get("context_id", f"candidate_{i}")), texts[i]
+            )
+            for i, candidate in enumerate(candidates)
+        ]
+        scores = self.score_cache.get_many(keys)
+        missing = [i for i, score in enumerate(scores) if score is None]
+        if not missing:
+            return texts, keys, scores, None
+        
+        # Use space for completely empty texts (model needs something)
+        pairs = [[query, texts[i] if texts[i].strip() else " "] for i in missing]
+        return texts, keys, scores, (missing, self.batcher.submit(pairs))
+    
+    @staticmethod
+    def _fill_scores(scores: List[Optional[float]], pending, batch_scores: List[float]) -> None:
+        for i, score in zip(pending[0], batch_scores):
+            scores[i] = score
+    
+    def _finish(
+        self,
+        query: str,
+        candidates: List[Dict[str, Any]],
+        texts: List[str],
+        keys: List[ScoreKey],
+        scores: List[float],
+        start_time: float,
+    ) -> List[Dict[str, Any]]:
+        """Validate scores, cache them and order candidates"""
+        # Sanity check: no all-zeros after model call
+        if all(abs(s) < 1e-9 for s in scores):
+            metrics.counter("reranker_all_zero_scores").inc()
+            logger.error("❌ RERANKER: All scores are zero - model prediction failed")
+            self._debug_log_candidates(query, candidates, texts, scores)
+            
+            # Auto-disable if too many zero-score failures
+            if metrics.counters.get("reranker_all_zero_scores", 0) >= self.auto_disable_threshold:
+                logger.error(f"❌ RERANKER: Auto-disabling after {self.auto_disable_threshold} zero-score failures")
+                self.enabled = False
+            
+            return candidates
+        
+        self.score_cache.put_many(list(zip(keys, scores)))
+        
+        # Debug logging
+        self._debug_log_candidates(query, candidates, texts, scores)
+        
+        # Create scored candidates
+        scored_candidates = []
+        for i, candidate in enumerate(candidates):
+            scored = candidate.copy()
+            scored["rerank_score"] = float(scores[i])
+            scored["original_score"] = candidate.get("score", 0.0)
+            scored["text_length"] = len(texts[i]) if i < len(texts) else 0
+            scored_candidates.append(scored)
+        
+        # Sort by rerank score (higher = better, descending)
+        order = np.argsort(-np.asarray(scores))
+        reranked = [scored_candidates[i] for i in order]
+        
+        # Assert scores are descending
+        rerank_scores = [reranked[i]["rerank_score"] for i in range(len(reranked))]
+        if len(rerank_scores) > 1:
+            for i in range(len(rerank_scores) - 1):
+                if rerank_scores[i] < rerank_scores[i + 1]:
+                    logger.warning(f"⚠️  Score ordering issue at positions {i}, {i+1}: {rerank_scores[i]} < {rerank_scores[i+1]}")
+                    break
+        
+        # Track metrics
+        latency_ms = (time.time() - start_time) * 1000
+        metrics.timers.append(latency_ms)
+        metrics.counter("reranker_invocations").inc()
+        
+        logger.info(f"✅ RERANKER: Scored {len(candidates)} candidates in {latency_ms:.1f}ms")
+        logger.info(f"   Top score: {rerank_scores[0]:.4f}, Bottom: {rerank_scores[-1]:.4f}")
+        
+        return reranked
+    
     def debug_rerank(self, query: str, candidate_payloads: List[Dict]) -> List[Dict[str, Any]]:
         """
         Debug endpoint to inspect exactly what reranker sees
@@ -340,7 +592,9 @@ class BulletproofReranker:
             "request_count": self.request_count,
             "debug_mode": self.debug_mode,
             "auto_disable_threshold": self.auto_disable_threshold,
-            "metrics": metrics.get_stats()
+            "metrics": metrics.get_stats(),
+            "score_cache": self.score_cache.get_stats(),
+            "batching": self.batcher.get_stats()
         }
 
 # Global instance
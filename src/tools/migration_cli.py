@@ -269,7 +269,7 @@ def search_test(query, backend, limit, config_path):
             if backend in ["text", "hybrid"]:
                 text_backend = initialize_text_backend()
 
-                if text_backend.documents:
+                if text_backend.document_count:
                     from ..interfaces.backend_interface import SearchOptions
 
                     options = SearchOptions(limit=limit)
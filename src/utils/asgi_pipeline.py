@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Pure-ASGI middleware pipeline for Veris Memory.
+
+Starlette's BaseHTTPMiddleware runs each layer's call_next in a separate task
+and passes the response through memory streams, so every layer of a stack
+adds a task, a stream hop per body chunk and a response wrapper per request.
+Here a middleware is a PipelineStage with hooks around the request, and a
+MiddlewarePipeline runs any number of stages in one ASGI call with a single
+send wrapper.
+
+Stages behave like a BaseHTTPMiddleware stack with the first stage outermost:
+
+- on_request runs outermost first; returning a response short-circuits the
+  stages inside it and the application.
+- on_response runs innermost first when the response starts, with the status
+  code and mutable headers, before anything is sent.
+- on_error runs innermost first when the application or an inner stage raises
+  before the response started; the first stage returning a response handles
+  the error, and only the stages outside it see that response.
+- on_cancel runs innermost first when the request is cancelled; cancellation
+  is always re-raised.
+
+A stage also works on its own through app.add_middleware, and keeps a
+dispatch(request, call_next) method with the same hook semantics.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Tuple, Union
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class RequestContext:
+    """State of one request shared by the stages of a pipeline."""
+
+    __slots__ = ("request", "start_time", "state")
+
+    def __init__(self, request: Request):
+        self.request = request
+        self.start_time = time.time()
+        # Per-stage values carried from on_request to the later hooks
+        self.state: Dict[Any, Any] = {}
+
+
+class ResponseStart:
+    """Status code and mutable headers of an http.response.start message."""
+
+    __slots__ = ("status_code", "headers")
+
+    def __init__(self, message: Message):
+        self.status_code: int = message["status"]
+        message.setdefault("headers", [])
+        self.headers = MutableHeaders(scope=message)
+
+
+# Anything on_response receives: a ResponseStart inside a pipeline, the
+# Response returned by call_next through dispatch
+ResponseLike = Union[ResponseStart, Response]
+
+
+class PipelineStage:
+    """Base class for middleware hooks run by a MiddlewarePipeline."""
+
+    def __init__(self, app: Optional[ASGIApp] = None):
+        self.app = app
+        self._pipeline = MiddlewarePipeline(app, (self,)) if app is not None else None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self._pipeline(scope, receive, send)
+
+    async def on_request(self, ctx: RequestContext) -> Optional[Response]:
+        """Inspect the request; return a response to answer it here."""
+        return None
+
+    async def on_response(self, ctx: RequestContext, response: ResponseLike) -> None:
+        """Observe the response status or add headers before it is sent."""
+
+    async def on_error(self, ctx: RequestContext, error: Exception) -> Optional[Response]:
+        """Observe an error; return a response to handle it here."""
+        return None
+
+    async def on_cancel(self, ctx: RequestContext) -> None:
+        """Observe a cancelled request."""
+
+    async def dispatch(self, request: Request,
+                       call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+        """Run the hooks around call_next as a BaseHTTPMiddleware would."""
+        ctx = RequestContext(request)
+        response = await self.on_request(ctx)
+        if response is not None:
+            return response
+
+        try:
+            response = await call_next(request)
+        except asyncio.CancelledError:
+            await self.on_cancel(ctx)
+            raise
+        except Exception as e:
+            handled = await self.on_error(ctx, e)
+            if handled is None:
+                raise
+            return handled
+
+        await self.on_response(ctx, response)
+        return response
+
+
+def _hooks(stages: Sequence[PipelineStage], name: str) -> Tuple[Optional[Callable], ...]:
+    """Bound hook per stage, or None where the stage keeps the no-op default."""
+    default = getattr(PipelineStage, name)
+    return tuple(
+        getattr(stage, name) if getattr(type(stage), name) is not default else None
+        for stage in stages
+    )
+
+
+class MiddlewarePipeline:
+    """Pure-ASGI middleware running several stages in one call."""
+
+    def __init__(self, app: ASGIApp, stages: Sequence[PipelineStage]):
+        self.app = app
+        self.stages = tuple(stages)
+        self._on_request = _hooks(self.stages, "on_request")
+        self._on_response = _hooks(self.stages, "on_response")
+        self._on_error = _hooks(self.stages, "on_error")
+        self._on_cancel = _hooks(self.stages, "on_cancel")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        ctx = RequestContext(Request(scope, receive))
+        on_response = self._on_response
+        # Number of stages whose on_request passed; only they see the outcome
+        depth = 0
+        started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal started
+            if message["type"] == "http.response.start":
+                response = ResponseStart(message)
+                for index in range(depth - 1, -1, -1):
+                    hook = on_response[index]
+                    if hook is not None:
+                        await hook(ctx, response)
+                started = True
+            await send(message)
+
+        response = None
+        try:
+            for hook in self._on_request:
+                if hook is not None:
+                    response = await hook(ctx)
+                    if response is not None:
+                        break
+                depth += 1
+            else:
+                await self.app(scope, receive, send_wrapper)
+                return
+        except asyncio.CancelledError:
+            for index in range(depth - 1, -1, -1):
+                hook = self._on_cancel[index]
+                if hook is not None:
+                    await hook(ctx)
+            raise
+        except Exception as e:
+            if started:
+                raise
+            response, depth = await self._handle_error(ctx, e, depth)
+
+        await response(scope, receive, send_wrapper)
+
+    async def _handle_error(self, ctx: RequestContext, error: Exception,
+                            depth: int) -> Tuple[Response, int]:
+        """Offer the error to the entered stages, innermost first."""
+        for index in range(depth - 1, -1, -1):
+            hook = self._on_error[index]
+            if hook is not None:
+                response = await hook(ctx, error)
+                if response is not None:
+                    return response, index
+        raise error
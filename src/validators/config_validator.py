@@ -131,6 +131,16 @@ class ConfigValidator:
                     self.errors.append(
                         "vector_db.embedding.request_timeout must be a positive number"
                     )
+                if (
+                    not isinstance(embed.get("parse_workers", 0), int)
+                    or embed.get("parse_workers", 0) < 0
+                ):
+                    self.errors.append(
+                        "vector_db.embedding.parse_workers must be a non-negative integer"
+                    )
+                for key in ("embed_concurrency", "queue_batches"):
+                    if not isinstance(embed.get(key, 1), int) or embed.get(key, 1) < 1:
+                        self.errors.append(f"vector_db.embedding.{key} must be a positive integer")
 
             # Search settings
             if "search" in vdb:
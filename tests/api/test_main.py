@@ -41,6 +41,9 @@ class TestAPIApplication:
         for middleware in app.user_middleware:
             if hasattr(middleware, 'cls'):
                 middleware_types.append(middleware.cls.__name__)
+                # Stages composed into one pure-ASGI pipeline
+                for stage in middleware.kwargs.get('stages', []):
+                    middleware_types.append(type(stage).__name__)
             elif hasattr(middleware, 'dispatch'):
                 middleware_types.append(type(middleware).__name__)
         
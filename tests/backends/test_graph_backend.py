@@ -11,7 +11,7 @@ Tests the _build_search_query method including:
 - Index creation for actual fields
 """
 
-from unittest.mock import Mock, MagicMock, call
+from unittest.mock import Mock, MagicMock
 import pytest
 
 from src.backends.graph_backend import GraphBackend
@@ -419,3 +419,107 @@ class TestGraphBackendEdgeCases:
         # Should extract from user_input (first non-null field)
         assert len(results) == 1
         assert results[0].text == 'Valid input'
+
+
+class TestGraphBackendFulltextSearch:
+    """Test suite for the full-text index search path."""
+
+    @pytest.fixture
+    def graph_backend(self):
+        """Create a graph backend in fulltext mode for testing."""
+        mock_client = Mock()
+        mock_client.query = Mock(return_value=[])
+        return GraphBackend(mock_client, search_mode="fulltext")
+
+    def test_build_fulltext_query(self, graph_backend):
+        """Test that the full-text query uses queryNodes and orders by score."""
+        options = SearchOptions(limit=7, namespace="team")
+
+        cypher_query, parameters = graph_backend._build_fulltext_query("neo4j tuning", options)
+
+        assert "db.index.fulltext.queryNodes($index_name, $fulltext_query)" in cypher_query
+        assert "ORDER BY score DESC" in cypher_query
+        assert "CONTAINS" not in cypher_query
+        assert "n.namespace = $namespace" in cypher_query
+        assert parameters["index_name"] == graph_backend.fulltext_index_name
+        assert parameters["fulltext_query"] == "neo4j AND tuning"
+        assert parameters["limit"] == 7
+
+    def test_lucene_syntax_is_escaped(self, graph_backend):
+        """Test that Lucene operators in user input are matched literally."""
+        options = SearchOptions(limit=5)
+
+        _, parameters = graph_backend._build_fulltext_query('c++ (draft) AND title:x', options)
+
+        assert parameters["fulltext_query"] == 'c\\+\\+ AND \\(draft\\) AND "AND" AND title\\:x'
+
+    def test_create_indexes_provisions_fulltext_index(self, graph_backend):
+        """Test that _create_indexes creates the full-text index over all text fields."""
+        graph_backend._create_indexes()
+
+        index_queries = [call[0][0] for call in graph_backend.client.query.call_args_list]
+        fulltext_queries = [query for query in index_queries if "CREATE FULLTEXT INDEX" in query]
+
+        assert len(fulltext_queries) == 1
+        for field in ["title", "description", "keyword", "user_input", "bot_response", "searchable_text"]:
+            assert f"n.{field}" in fulltext_queries[0]
+        assert graph_backend._fulltext_available is True
+
+    @pytest.mark.asyncio
+    async def test_search_uses_fulltext_scores(self, graph_backend):
+        """Test that search returns nodes ranked by Lucene relevance."""
+        graph_backend.client.query.side_effect = [
+            [],  # CREATE FULLTEXT INDEX
+            [
+                {"n": {"id": "a", "title": "weak match"}, "score": 0.5},
+                {"n": {"id": "b", "title": "strong match"}, "score": 3.0},
+            ],
+        ]
+
+        results = await graph_backend.search("match", SearchOptions(limit=5))
+
+        assert [r.id for r in results] == ["b", "a"]
+        assert results[0].score == pytest.approx(0.75)
+        assert results[0].metadata["fulltext_score"] == 3.0
+        assert "queryNodes" in graph_backend.client.query.call_args_list[1][0][0]
+
+    @pytest.mark.asyncio
+    async def test_search_falls_back_when_index_missing(self, graph_backend):
+        """Test that a missing full-text index falls back to CONTAINS search."""
+        graph_backend.client.query.side_effect = [
+            [],  # CREATE FULLTEXT INDEX
+            Exception("There is no such fulltext schema index: context_fulltext"),
+            [{"n": {"id": "a", "title": "banana bread"}}],
+        ]
+
+        results = await graph_backend.search("banana", SearchOptions(limit=5))
+
+        assert [r.id for r in results] == ["a"]
+        assert "CONTAINS" in graph_backend.client.query.call_args_list[2][0][0]
+        assert graph_backend._fulltext_available is False
+
+    @pytest.mark.asyncio
+    async def test_search_falls_back_when_index_cannot_be_created(self, graph_backend):
+        """Test that failing to provision the index keeps CONTAINS search working."""
+        graph_backend.client.query.side_effect = [
+            Exception("Unsupported administration command"),
+            [],
+        ]
+
+        await graph_backend.search("banana", SearchOptions(limit=5))
+
+        assert "CONTAINS" in graph_backend.client.query.call_args_list[1][0][0]
+        assert graph_backend._fulltext_available is False
+
+    @pytest.mark.asyncio
+    async def test_contains_mode_skips_fulltext(self):
+        """Test that contains mode never touches the full-text index."""
+        mock_client = Mock()
+        mock_client.query = Mock(return_value=[])
+        backend = GraphBackend(mock_client, search_mode="contains")
+
+        await backend.search("banana", SearchOptions(limit=5))
+
+        index_queries = [call[0][0] for call in mock_client.query.call_args_list]
+        assert len(index_queries) == 1
+        assert "CONTAINS" in index_queries[0]
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Tests for KV content search through the Redis token index.
+
+Tests cover:
+- Index maintenance on writes and overwrites
+- Complete results beyond the old 200-key scan sample
+- Bounded round trips for hydration
+- Backfill of keys written before the index existed
+- Index entries expiring with their keys
+- Lazy pruning of expired keys and the scan fallback
+"""
+
+import fnmatch
+from unittest.mock import Mock
+
+import pytest
+
+from src.backends.kv_backend import KVBackend
+from src.backends.kv_index import KVContentIndex, tokenize
+from src.interfaces.backend_interface import SearchOptions
+
+
+class FakePipeline:
+    """Queues commands and runs them against FakeRedis in one round trip."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        self.redis.round_trips += 1
+        return [getattr(self.redis, name)(*args, _counted=False, **kwargs) for name, args, kwargs in self.commands]
+
+
+class FakeRedis:
+    """Dict-backed subset of redis.Redis that counts round trips."""
+
+    def __init__(self):
+        self.strings = {}
+        self.sets = {}
+        self.expirations = {}
+        self.round_trips = 0
+
+    def _count(self, counted):
+        if counted:
+            self.round_trips += 1
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def set(self, key, value, ex=None, _counted=True):
+        self._count(_counted)
+        self.strings[key] = value
+        self.expirations.pop(key, None)
+        if ex:
+            self.expirations[key] = ex
+        return True
+
+    def get(self, key, _counted=True):
+        self._count(_counted)
+        return self.strings.get(key)
+
+    def mget(self, keys, _counted=True):
+        self._count(_counted)
+        return [self.strings.get(key) for key in keys]
+
+    def exists(self, key, _counted=True):
+        self._count(_counted)
+        return int(key in self.strings or key in self.sets)
+
+    def delete(self, *keys, _counted=True):
+        self._count(_counted)
+        deleted = 0
+        for key in keys:
+            self.expirations.pop(key, None)
+            deleted += int(self.strings.pop(key, None) is not None or self.sets.pop(key, None) is not None)
+        return deleted
+
+    def expire(self, key, seconds, nx=False, gt=False, _counted=True):
+        self._count(_counted)
+        if key not in self.strings and key not in self.sets:
+            return False
+        current = self.expirations.get(key)
+        if (nx and current is not None) or (gt and (current is None or seconds <= current)):
+            return False
+        self.expirations[key] = seconds
+        return True
+
+    def ttl(self, key, _counted=True):
+        self._count(_counted)
+        if key not in self.strings and key not in self.sets:
+            return -2
+        return self.expirations.get(key, -1)
+
+    def expire_key(self, key):
+        """Simulate a key reaching its TTL."""
+        self.expirations.pop(key, None)
+        self.strings.pop(key, None)
+        self.sets.pop(key, None)
+
+    def sadd(self, key, *members, _counted=True):
+        self._count(_counted)
+        self.sets.setdefault(key, set()).update(members)
+
+    def srem(self, key, *members, _counted=True):
+        self._count(_counted)
+        self.sets.get(key, set()).difference_update(members)
+
+    def smembers(self, key, _counted=True):
+        self._count(_counted)
+        return set(self.sets.get(key, set()))
+
+    def sinter(self, keys, _counted=True):
+        self._count(_counted)
+        groups = [self.sets.get(key, set()) for key in keys]
+        return set.intersection(*groups) if groups else set()
+
+    def sunionstore(self, dest, keys, _counted=True):
+        self._count(_counted)
+        union = set().union(*(self.sets.get(key, set()) for key in keys))
+        self.delete(dest, _counted=False)
+        if union:
+            self.sets[dest] = union
+        return len(union)
+
+    def scan_iter(self, match=None, count=None):
+        self.round_trips += 1
+        return iter([key for key in list(self.strings) if fnmatch.fnmatch(key, match)])
+
+    def scan(self, cursor=0, match=None, count=None):
+        self.round_trips += 1
+        return 0, [key for key in self.strings if fnmatch.fnmatch(key, match)]
+
+    def ping(self):
+        return True
+
+
+@pytest.fixture
+def redis():
+    return FakeRedis()
+
+
+@pytest.fixture
+def backend(redis):
+    return KVBackend(simple_redis=Mock(redis_client=redis, set=redis.set, get=redis.get))
+
+
+class TestKVContentIndex:
+    """Test the token -> key set index."""
+
+    def test_tokenize(self):
+        """Test tokens are lowercased, unique and skip single characters."""
+        assert tokenize("Neo4j setup: a Neo4j config") == ["neo4j", "setup", "config"]
+
+    def test_overwrite_removes_stale_tokens(self, redis):
+        """Test re-indexing a key drops tokens from its previous value."""
+        index = KVContentIndex(redis)
+        redis.set("state:a", "alpha beta")
+        index.index("state:a", "alpha beta")
+        redis.set("state:a", "gamma")
+        index.index("state:a", "gamma")
+
+        assert index.search("alpha") == []
+        assert index.search("gamma") == [("state:a", "gamma")]
+
+    def test_expired_keys_are_pruned(self, redis):
+        """Test keys missing on hydration are removed from the index."""
+        index = KVContentIndex(redis)
+        redis.set("session:x", "deploy notes")
+        index.index("session:x", "deploy notes")
+        del redis.strings["session:x"]  # expired
+
+        assert index.search("deploy") == []
+        assert redis.sets.get(index.token_key("deploy")) == set()
+        assert index.doc_key("session:x") not in redis.sets
+        assert not any(key.startswith("kvidx:q:") for key in redis.sets)
+
+    def test_entries_expire_with_key(self, redis):
+        """Test entries of a key with a TTL expire no earlier and no later than needed."""
+        index = KVContentIndex(redis)
+        redis.set("scratchpad:a", "deploy notes", ex=600)
+        index.index("scratchpad:a", "deploy notes", ttl=600)
+        redis.set("scratchpad:b", "deploy plan", ex=60)
+        index.index("scratchpad:b", "deploy plan", ttl=60)
+        redis.set("scratchpad:c", "deploy forever")
+        index.index("scratchpad:c", "deploy forever")
+
+        assert redis.ttl(index.doc_key("scratchpad:a")) == 600
+        assert redis.ttl(index.doc_key("scratchpad:b")) == 60
+        assert redis.ttl(index.doc_key("scratchpad:c")) == -1
+        # Shared token sets live as long as their longest-lived member
+        assert redis.ttl(index.expiring_token_key("deploy")) == 600
+        assert redis.ttl(index.expiring_token_key("plan")) == 60
+        assert redis.ttl(index.token_key("deploy")) == -1
+        assert {key for key, _ in index.search("deploy")} == {
+            "scratchpad:a", "scratchpad:b", "scratchpad:c"
+        }
+
+        for key in (index.expiring_token_key("plan"), index.doc_key("scratchpad:b"), "scratchpad:b"):
+            redis.expire_key(key)
+        assert index.search("deploy plan") == []
+
+    def test_overwrite_without_ttl_becomes_persistent(self, redis):
+        """Test re-indexing an expiring key as persistent moves it out of the expiring sets."""
+        index = KVContentIndex(redis)
+        redis.set("scratchpad:a", "deploy notes", ex=60)
+        index.index("scratchpad:a", "deploy notes", ttl=60)
+        redis.set("scratchpad:a", "deploy notes")
+        index.index("scratchpad:a", "deploy notes")
+
+        assert redis.sets[index.expiring_token_key("deploy")] == set()
+        assert redis.sets[index.token_key("deploy")] == {"scratchpad:a"}
+        assert redis.ttl(index.doc_key("scratchpad:a")) == -1
+
+    def test_query_without_tokens_returns_none(self, redis):
+        """Test queries with nothing indexable defer to the caller."""
+        assert KVContentIndex(redis).search("?!") is None
+
+
+class TestKVBackendContentSearch:
+    """Test KVBackend content search through the index."""
+
+    @pytest.mark.asyncio
+    async def test_set_key_indexes_content(self, backend, redis):
+        """Test keys written through set_key are found by content."""
+        await backend.set_key("agent1:notes", "Rotate the Redis password weekly", namespace="scratchpad")
+
+        results = await backend._content_search("redis password", SearchOptions(limit=5))
+
+        assert [r.id for r in results] == ["scratchpad:agent1:notes"]
+
+    @pytest.mark.asyncio
+    async def test_complete_results_with_bounded_round_trips(self, backend, redis):
+        """Test a match beyond the old scan sample is found in a constant number of calls."""
+        for i in range(500):
+            await backend.set_key(f"scratchpad:filler{i}", f"unrelated value {i}")
+        await backend.set_key("scratchpad:needle", "the quarterly migration plan")
+        await backend._ensure_index_ready()
+        redis.round_trips = 0
+
+        # A full page from the index leaves nothing for the scan of other prefixes
+        results = await backend._content_search("migration plan", SearchOptions(limit=1))
+
+        assert [r.id for r in results] == ["scratchpad:needle"]
+        assert redis.round_trips == 2  # SUNIONSTORE/SINTER pipeline + one pipelined MGET
+
+    @pytest.mark.asyncio
+    async def test_existing_keys_are_backfilled(self, backend, redis):
+        """Test keys written before the index existed are indexed on first search."""
+        redis.set("scratchpad:agent1:bio", "Ada Lovelace", ex=300)
+        redis.set("other:ignored", "Ada Lovelace")
+
+        results = await backend._content_search("lovelace", SearchOptions(limit=5))
+
+        assert [r.id for r in results] == ["scratchpad:agent1:bio"]
+        assert backend.content_index.is_ready()
+        assert redis.ttl(backend.content_index.doc_key("scratchpad:agent1:bio")) == 300
+
+    @pytest.mark.asyncio
+    async def test_unindexed_prefixes_are_scanned(self, backend, redis):
+        """Test keys written outside the index stay searchable after the backfill."""
+        await backend._ensure_index_ready()
+        redis.set("state:agent1:plan", "the quarterly migration plan")
+        redis.set("fact:user:name", "Ada Lovelace")
+        await backend.set_key("state:agent2:plan", "another migration plan")
+
+        results = await backend._content_search("migration plan", SearchOptions(limit=5))
+
+        assert {r.id for r in results} == {"state:agent1:plan", "state:agent2:plan"}
+        assert backend.content_index.doc_key("state:agent2:plan") not in redis.sets
+        assert [r.id for r in await backend._content_search("Lovelace", SearchOptions(limit=5))] == [
+            "fact:user:name"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_scan_without_index(self, redis):
+        """Test the scan path is used when no raw client is exposed."""
+        backend = KVBackend(simple_redis=Mock(spec=["get", "set"], get=redis.get, set=redis.set))
+        redis.set("state:a", "hello world")
+
+        assert backend.content_index is None
+        assert await backend._content_search("hello", SearchOptions(limit=5)) == []
@@ -3,6 +3,9 @@
 Tests for QueryDispatcher implementation.
 """
 
+import asyncio
+import time
+
 import pytest
 from unittest.mock import AsyncMock, Mock
 from typing import List, Dict, Any
@@ -36,6 +39,23 @@ class MockBackend(BackendSearchInterface):
         return BackendHealthStatus(status="healthy", response_time_ms=5.0)
 
 
+class SlowMockBackend(MockBackend):
+    """Mock backend that sleeps before returning results."""
+    
+    def __init__(self, name: str, delay_s: float, results: List[MemoryResult] = None):
+        super().__init__(name, results)
+        self.delay_s = delay_s
+        self.cancelled = False
+    
+    async def search(self, query: str, options: SearchOptions) -> List[MemoryResult]:
+        try:
+            await asyncio.sleep(self.delay_s)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return await super().search(query, options)
+
+
 @pytest.fixture
 def mock_vector_results():
     """Create mock vector search results."""
@@ -670,4 +690,204 @@ class TestQueryDispatcherSearchByEmbedding:
         call_args = vector_backend.search_by_embedding.call_args
         assert call_args[0][1].limit == 1
         assert call_args[0][1].score_threshold == 0.9
-        assert call_args[0][1].namespace == "test_ns"
\ No newline at end of file
+        assert call_args[0][1].namespace == "test_ns"
+
+
+class TestParallelDeadlines:
+    """Test concurrent fan-out and per-backend deadlines."""
+    
+    @pytest.mark.asyncio
+    async def test_parallel_policy_runs_backends_concurrently(self, mock_vector_results, mock_graph_results):
+        """Parallel latency should track the slowest backend, not the sum."""
+        dispatcher = QueryDispatcher()
+        dispatcher.register_backend("vector", SlowMockBackend("vector", 0.2, mock_vector_results))
+        dispatcher.register_backend("graph", SlowMockBackend("graph", 0.2, mock_graph_results))
+        
+        start = time.perf_counter()
+        response = await dispatcher.dispatch_query("test query", search_mode=SearchMode.HYBRID)
+        elapsed = time.perf_counter() - start
+        
+        assert response.success is True
+        assert set(response.backends_used) == {"vector", "graph"}
+        assert elapsed < 0.35
+    
+    @pytest.mark.asyncio
+    async def test_slow_backend_times_out_with_partial_results(self, mock_vector_results):
+        """A backend missing its deadline is cancelled and reported."""
+        dispatcher = QueryDispatcher()
+        slow_graph = SlowMockBackend("graph", 5.0)
+        dispatcher.register_backend("vector", MockBackend("vector", mock_vector_results))
+        dispatcher.register_backend("graph", slow_graph)
+        
+        start = time.perf_counter()
+        response = await dispatcher.dispatch_query(
+            "test query",
+            search_mode=SearchMode.HYBRID,
+            options=SearchOptions(backend_timeouts={"graph": 50})
+        )
+        elapsed = time.perf_counter() - start
+        
+        assert elapsed < 1.0
+        assert response.success is True
+        assert len(response.results) == len(mock_vector_results)
+        assert response.backends_used == ["vector"]
+        assert response.timed_out_backends == ["graph"]
+        assert response.backend_timings["graph"] == 50
+        assert slow_graph.cancelled is True
+    
+    @pytest.mark.asyncio
+    async def test_dispatcher_backend_timeout_configuration(self, mock_vector_results):
+        """Dispatcher-level per-backend deadlines apply when the request sets none."""
+        dispatcher = QueryDispatcher()
+        dispatcher.register_backend("vector", SlowMockBackend("vector", 5.0, mock_vector_results))
+        dispatcher.set_backend_timeout("vector", 20)
+        
+        response = await dispatcher.dispatch_query("test query", search_mode=SearchMode.VECTOR)
+        
+        assert response.timed_out_backends == ["vector"]
+        assert response.results == []
+        
+        dispatcher.set_backend_timeout("vector", None)
+        assert "vector" not in dispatcher.backend_timeouts
+        
+        with pytest.raises(ValueError):
+            dispatcher.set_backend_timeout("vector", 0)
+    
+    def test_timeout_resolution_order(self):
+        """Request overrides win over dispatcher configuration."""
+        dispatcher = QueryDispatcher()
+        dispatcher.default_timeout_ms = 1000
+        dispatcher.set_backend_timeout("graph", 300)
+        
+        assert dispatcher._get_backend_timeout("vector", SearchOptions()) == 1000
+        assert dispatcher._get_backend_timeout("graph", SearchOptions()) == 300
+        assert dispatcher._get_backend_timeout("graph", SearchOptions(timeout_ms=200)) == 200
+        assert dispatcher._get_backend_timeout(
+            "graph", SearchOptions(timeout_ms=200, backend_timeouts={"graph": 100})
+        ) == 100
+    
+    def test_non_positive_backend_timeouts_rejected(self):
+        """Per-backend request deadlines are validated like timeout_ms."""
+        for bad in (0, -50):
+            with pytest.raises(ValueError, match="backend_timeouts"):
+                SearchOptions(backend_timeouts={"graph": bad})
+            with pytest.raises(ValueError):
+                SearchOptions(timeout_ms=bad)
+    
+    @pytest.mark.asyncio
+    async def test_fallback_policy_moves_on_after_timeout(self, mock_graph_results):
+        """Fallback policy treats a timeout like a failure and tries the next backend."""
+        dispatcher = QueryDispatcher()
+        dispatcher.register_backend("vector", SlowMockBackend("vector", 5.0))
+        dispatcher.register_backend("graph", MockBackend("graph", mock_graph_results))
+        
+        response = await dispatcher.dispatch_query(
+            "test query",
+            search_mode=SearchMode.HYBRID,
+            dispatch_policy=DispatchPolicy.FALLBACK,
+            options=SearchOptions(timeout_ms=20)
+        )
+        
+        assert response.timed_out_backends == ["vector"]
+        assert len(response.results) == 1
+        assert response.results[0].source == ResultSource.GRAPH
+
+
+class MultiQueryMockBackend(MockBackend):
+    """Mock vector backend that supports batched multi-query search."""
+    
+    def __init__(self, name: str, results_per_query: List[List[MemoryResult]]):
+        super().__init__(name)
+        self.results_per_query = results_per_query
+        self.search_many_calls = []
+    
+    async def search_many(self, queries: List[str], options: SearchOptions) -> List[List[MemoryResult]]:
+        self.search_many_calls.append(list(queries))
+        return [list(results) for results in self.results_per_query[:len(queries)]]
+
+
+class TestSearchExpanded:
+    """Test multi-query expansion dispatch."""
+    
+    @pytest.mark.asyncio
+    async def test_vector_batched_and_other_backends_run_once(self, mock_vector_results, mock_graph_results):
+        """Paraphrases go to the vector backend in one call; graph only sees the original."""
+        dispatcher = QueryDispatcher()
+        vector = MultiQueryMockBackend("vector", [mock_vector_results[:1], mock_vector_results[1:], []])
+        graph = MockBackend("graph", mock_graph_results)
+        dispatcher.register_backend("vector", vector)
+        dispatcher.register_backend("graph", graph)
+        
+        per_query, timed_out = await dispatcher.search_expanded(
+            ["original", "paraphrase one", "paraphrase two"], SearchOptions(), SearchMode.HYBRID
+        )
+        
+        assert vector.search_many_calls == [["original", "paraphrase one", "paraphrase two"]]
+        assert vector.search_called_count == 0
+        assert graph.search_called_count == 1
+        assert graph.last_query == "original"
+        assert [r.id for r in per_query[0]] == ["vec_1", "graph_1"]
+        assert [r.id for r in per_query[1]] == ["vec_2"]
+        assert per_query[2] == []
+        assert timed_out == []
+    
+    @pytest.mark.asyncio
+    async def test_vector_without_batch_support_searches_original(self, mock_vector_results):
+        """A vector backend without search_many is searched for the original query only."""
+        dispatcher = QueryDispatcher()
+        vector = MockBackend("vector", mock_vector_results)
+        dispatcher.register_backend("vector", vector)
+        
+        per_query, _ = await dispatcher.search_expanded(["original", "paraphrase"], SearchOptions(), SearchMode.VECTOR)
+        
+        assert vector.search_called_count == 1
+        assert len(per_query[0]) == 2
+        assert per_query[1] == []
+    
+    @pytest.mark.asyncio
+    async def test_vector_batch_failure_keeps_other_results(self, mock_graph_results):
+        """A failed batch vector search leaves the original query's other results intact."""
+        dispatcher = QueryDispatcher()
+        vector = MultiQueryMockBackend("vector", [])
+        vector.search_many = AsyncMock(side_effect=RuntimeError("qdrant down"))
+        dispatcher.register_backend("vector", vector)
+        dispatcher.register_backend("graph", MockBackend("graph", mock_graph_results))
+        
+        per_query, timed_out = await dispatcher.search_expanded(
+            ["original", "paraphrase"], SearchOptions(), SearchMode.HYBRID
+        )
+        
+        assert [r.id for r in per_query[0]] == ["graph_1"]
+        assert per_query[1] == []
+        assert timed_out == []
+    
+    @pytest.mark.asyncio
+    async def test_original_results_merged_by_id(self, mock_vector_results):
+        """A context found by the vector and another backend appears once in the original's results."""
+        dispatcher = QueryDispatcher()
+        dispatcher.register_backend("vector", MultiQueryMockBackend("vector", [mock_vector_results, []]))
+        dispatcher.register_backend("text", MockBackend("text", mock_vector_results[1:]))
+        
+        per_query, _ = await dispatcher.search_expanded(["original", "paraphrase"], SearchOptions(), SearchMode.HYBRID)
+        
+        assert [r.id for r in per_query[0]] == ["vec_1", "vec_2"]
+    
+    @pytest.mark.asyncio
+    async def test_vector_batch_timeout_reported(self, mock_graph_results):
+        """A batch vector search past its deadline is reported as timed out."""
+        dispatcher = QueryDispatcher()
+        vector = MultiQueryMockBackend("vector", [])
+        
+        async def slow_search_many(queries, options):
+            await asyncio.sleep(5.0)
+        
+        vector.search_many = slow_search_many
+        dispatcher.register_backend("vector", vector)
+        dispatcher.register_backend("graph", MockBackend("graph", mock_graph_results))
+        
+        per_query, timed_out = await dispatcher.search_expanded(
+            ["original", "paraphrase"], SearchOptions(timeout_ms=20), SearchMode.HYBRID
+        )
+        
+        assert timed_out == ["vector"]
+        assert [r.id for r in per_query[0]] == ["graph_1"]
@@ -8,6 +8,7 @@ and integration with the broader search architecture.
 
 import pytest
 import asyncio
+from collections import Counter
 from datetime import datetime
 from typing import List, Dict, Any
 
@@ -403,6 +404,109 @@ class TestTextSearchBackend:
         assert not backend.index_dirty
 
 
+class TestInvertedIndex:
+    """Test postings-list maintenance and term-at-a-time scoring."""
+    
+    @staticmethod
+    async def _populated_backend():
+        """Backend with a small corpus indexed."""
+        backend = TextSearchBackend()
+        await backend.index_document("doc1", "python web framework for python developers")
+        await backend.index_document("doc2", "java enterprise framework")
+        await backend.index_document("doc3", "rust systems programming")
+        await backend.index_document("doc4", "python data science with numpy")
+        return backend
+    
+    @pytest.mark.asyncio
+    async def test_postings_track_term_frequencies(self):
+        """Postings map each term to the documents containing it."""
+        backend = await self._populated_backend()
+        
+        assert backend.postings["python"] == {"doc1": 2, "doc4": 1}
+        assert backend.postings["framework"] == {"doc1": 1, "doc2": 1}
+        assert backend.term_doc_frequencies["python"] == len(backend.postings["python"])
+    
+    @pytest.mark.asyncio
+    async def test_postings_updated_on_reindex_and_remove(self):
+        """Reindexing and removal keep postings consistent."""
+        backend = await self._populated_backend()
+        
+        await backend.index_document("doc3", "go systems programming")
+        assert "rust" not in backend.postings
+        assert "rust" not in backend.term_doc_frequencies
+        assert backend.postings["go"] == {"doc3": 1}
+        
+        await backend.remove_document("doc1")
+        assert backend.postings["python"] == {"doc4": 1}
+        assert "web" not in backend.postings
+        assert backend.total_doc_length == sum(d.doc_length for d in backend.documents.values())
+    
+    @pytest.mark.asyncio
+    async def test_scores_match_document_scorer(self):
+        """Term-at-a-time scores equal per-document BM25 scores."""
+        backend = await self._populated_backend()
+        query_terms = backend.tokenize("python framework python")
+        avg_doc_length = backend.total_doc_length / len(backend.documents)
+        
+        results = await backend.search("python framework python", SearchOptions(limit=10))
+        
+        assert {r.id for r in results} == {"doc1", "doc2", "doc4"}
+        for result in results:
+            expected = backend.scorer.score_document(
+                query_terms=query_terms,
+                document=backend.documents[result.id],
+                avg_doc_length=avg_doc_length,
+                total_docs=len(backend.documents),
+                term_doc_frequencies=backend.term_doc_frequencies
+            )
+            assert result.metadata["bm25_raw_score"] == pytest.approx(expected)
+    
+    @pytest.mark.asyncio
+    async def test_idf_cache_invalidated_on_index_change(self):
+        """Cached IDF values are dropped when corpus statistics change."""
+        backend = await self._populated_backend()
+        await backend.search("rust", SearchOptions(limit=1))
+        assert "rust" in backend.scorer.idf_cache
+        
+        await backend.index_document("doc5", "rust async runtime")
+        assert backend.scorer.idf_cache == {}
+    
+    @pytest.mark.asyncio
+    async def test_search_returns_top_k(self):
+        """Only the requested number of best-scoring documents is returned."""
+        backend = TextSearchBackend()
+        for i in range(50):
+            await backend.index_document(f"doc{i}", "needle " * (i % 5 + 1) + "filler text " * 5)
+        
+        results = await backend.search("needle", SearchOptions(limit=5))
+        
+        assert len(results) == 5
+        scores = [r.score for r in results]
+        assert scores == sorted(scores, reverse=True)
+
+
+    @pytest.mark.asyncio
+    async def test_top_k_pruning_matches_exhaustive_scoring(self):
+        """Pruned top-k scoring returns the same documents and scores as a full pass."""
+        import random
+        rng = random.Random(7)
+        vocabulary = ["common"] * 20 + ["frequent"] * 10 + [f"rare{i}" for i in range(30)]
+        backend = TextSearchBackend()
+        for i in range(300):
+            await backend.index_document(f"doc{i}", " ".join(rng.choices(vocabulary, k=12)))
+        
+        avg_doc_length = backend.total_doc_length / len(backend.documents)
+        for query in ["rare3 common", "rare1 rare2 frequent common", "common frequent", "rare9"]:
+            query_counts = Counter(backend.tokenize(query))
+            exhaustive = backend._score_postings(query_counts, avg_doc_length)[0]
+            pruned = backend._score_postings(query_counts, avg_doc_length, limit=5)[0]
+            
+            top = lambda scores: sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:5]
+            assert [score for _, score in top(pruned)] == pytest.approx([score for _, score in top(exhaustive)])
+            for doc_id, score in top(pruned):
+                assert exhaustive[doc_id] == pytest.approx(score)
+
+
 class TestTextBackendIntegration:
     """Test integration scenarios with the text search backend."""
     
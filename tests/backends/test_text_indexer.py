@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming incremental text indexer.
+
+Covers keyset pagination over Neo4j, the overlap window before its
+high-water mark, the Qdrant scroll cursor, process-pool tokenization, ids
+shared between sources, and high-water marks surviving a restart.
+"""
+
+import asyncio
+
+import pytest
+
+from src.backends.text_backend import TextSearchBackend
+from src.backends.text_indexer import (
+    Neo4jContextSource,
+    QdrantContextSource,
+    StreamingTextIndexer,
+    tokenize_batch,
+)
+from src.interfaces.backend_interface import SearchOptions
+
+
+class FakeNeo4j:
+    """Answers the indexer's keyset page query from a list of Context nodes."""
+
+    def __init__(self, nodes=None):
+        self.nodes = list(nodes or [])
+        self.queries = 0
+        self.fail_after = None
+
+    def query(self, cypher, parameters):
+        self.queries += 1
+        if self.fail_after is not None and self.queries > self.fail_after:
+            raise RuntimeError("neo4j unavailable")
+        after = (parameters["after_created_at"], parameters["after_id"])
+        rows = sorted(
+            (
+                node for node in self.nodes
+                if node.get("id") and (node.get("created_at") or "", node["id"]) > after
+            ),
+            key=lambda node: (node.get("created_at") or "", node["id"]),
+        )
+        return [{"n": node, "created_at": node.get("created_at") or ""} for node in rows[:parameters["limit"]]]
+
+
+class FakeQdrant:
+    """Scrolls points in id order like VectorDBInitializer.scroll."""
+
+    def __init__(self, points):
+        self.points = sorted(points, key=lambda point: point["id"])
+
+    def scroll(self, limit=256, offset=None):
+        start = 0 if offset is None else next(
+            i for i, point in enumerate(self.points) if point["id"] == offset
+        )
+        page = self.points[start:start + limit]
+        following = self.points[start + limit:start + limit + 1]
+        return page, following[0]["id"] if following else None
+
+
+def _node(index, text, created_at=None):
+    return {
+        "id": f"ctx-{index:03d}",
+        "type": "design",
+        "created_at": created_at or f"2025-01-01T00:00:{index:02d}",
+        "searchable_text": text,
+    }
+
+
+GRAPH_NODES = [
+    _node(1, "redis cache eviction policy"),
+    _node(2, "qdrant vector collection sharding"),
+    _node(3, "neo4j relationship traversal depth"),
+    _node(4, "bm25 lexical ranking parameters"),
+    _node(5, "redis pipeline batching"),
+]
+
+
+async def _search(backend, query):
+    return [result.id for result in await backend.search(query, SearchOptions(limit=10))]
+
+
+class TestTokenizeBatch:
+    """Test worker-side tokenization."""
+
+    def test_matches_backend_tokenizer(self):
+        """Test counts match TextSearchBackend.tokenize."""
+        backend = TextSearchBackend()
+        text = "Redis, redis and REDIS-cluster 42"
+
+        [(frequencies, length)] = tokenize_batch([text])
+
+        tokens = backend.tokenize(text)
+        assert length == len(tokens)
+        assert frequencies == {"redis": 3, "and": 1, "cluster": 1, "42": 1}
+
+
+class TestStreamingTextIndexer:
+    """Test streaming sources into the backend."""
+
+    @pytest.mark.asyncio
+    async def test_streams_all_pages_from_both_sources(self):
+        """Test every page is indexed and the graph text wins for shared ids."""
+        qdrant = FakeQdrant([
+            {"id": "ctx-001", "payload": {"content": {"title": "vector copy"}, "type": "design"}},
+            {"id": "vec-only", "payload": {"content": {"title": "orphan embedding document"}}},
+        ])
+        backend = TextSearchBackend()
+        indexer = StreamingTextIndexer(
+            backend,
+            [Neo4jContextSource(FakeNeo4j(GRAPH_NODES), page_size=2), QdrantContextSource(qdrant, page_size=1)],
+            workers=0,
+        )
+
+        stats = await indexer.run_once()
+
+        assert stats["neo4j"] == {"documents": 5, "pages": 3}
+        assert stats["qdrant"] == {"documents": 1, "pages": 2}
+        assert backend.document_count == 6
+        assert await _search(backend, "orphan") == ["vec-only"]
+        assert await _search(backend, "eviction") == ["ctx-001"]
+        assert await _search(backend, "copy") == []
+        assert indexer.checkpoints["qdrant"]["complete"] is True
+        assert indexer.checkpoints["neo4j"] == {"created_at": "2025-01-01T00:00:05", "id": "ctx-005"}
+
+    @pytest.mark.asyncio
+    async def test_shared_ids_indexed_once_across_flushes(self, tmp_path):
+        """Test ids already flushed by one source are not re-added by the next."""
+        qdrant = FakeQdrant([
+            {"id": node["id"], "payload": {"content": {"title": node["searchable_text"]}}}
+            for node in GRAPH_NODES
+        ])
+        backend = TextSearchBackend(index_dir=str(tmp_path), flush_threshold=2)
+        await backend.initialize()
+        indexer = StreamingTextIndexer(
+            backend,
+            [Neo4jContextSource(FakeNeo4j(GRAPH_NODES), page_size=2), QdrantContextSource(qdrant, page_size=2)],
+            workers=0,
+        )
+
+        stats = await indexer.run_once()
+
+        try:
+            assert stats["qdrant"]["documents"] == 0
+            assert backend.document_count == 5
+            assert not any(segment.deleted for segment in backend.segments)
+            assert set(await _search(backend, "redis")) == {"ctx-001", "ctx-005"}
+        finally:
+            await backend.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_reset_replaces_indexed_documents(self):
+        """Test a reset run re-indexes documents, once per id."""
+        backend = TextSearchBackend()
+        await backend.index_document("ctx-001", "stale text")
+        qdrant = FakeQdrant([{"id": "ctx-001", "payload": {"content": {"title": "vector copy"}}}])
+        indexer = StreamingTextIndexer(
+            backend, [Neo4jContextSource(FakeNeo4j(GRAPH_NODES)), QdrantContextSource(qdrant)], workers=0
+        )
+
+        await indexer.run_once()
+        assert await _search(backend, "stale") == ["ctx-001"]
+
+        stats = await indexer.run_once(reset=True)
+
+        assert stats["qdrant"]["documents"] == 0
+        assert await _search(backend, "stale") == []
+        assert await _search(backend, "eviction") == ["ctx-001"]
+
+    @pytest.mark.asyncio
+    async def test_tokenizer_pool_reused_until_stop(self):
+        """Test one process pool serves every run and stop() shuts it down."""
+        graph = FakeNeo4j(GRAPH_NODES[:2])
+        indexer = StreamingTextIndexer(TextSearchBackend(), [Neo4jContextSource(graph)], workers=1)
+
+        await indexer.run_once()
+        pool = indexer._pool
+        graph.nodes.append(_node(6, "segment merge compaction"))
+        stats = await indexer.run_once()
+
+        assert pool is not None and indexer._pool is pool
+        assert stats["neo4j"]["documents"] == 1
+        await indexer.stop()
+        assert indexer._pool is None
+
+    @pytest.mark.asyncio
+    async def test_process_pool_tokenization(self):
+        """Test documents tokenized in worker processes score like inline ones."""
+        pooled = TextSearchBackend()
+        inline = TextSearchBackend()
+        indexer = StreamingTextIndexer(pooled, [Neo4jContextSource(FakeNeo4j(GRAPH_NODES))], workers=1)
+        await indexer.run_once()
+        await indexer.stop()
+        await StreamingTextIndexer(inline, [Neo4jContextSource(FakeNeo4j(GRAPH_NODES))], workers=0).run_once()
+
+        pooled_results = await pooled.search("redis", SearchOptions(limit=10))
+        inline_results = await inline.search("redis", SearchOptions(limit=10))
+
+        assert [(r.id, r.score) for r in pooled_results] == [(r.id, r.score) for r in inline_results]
+
+    @pytest.mark.asyncio
+    async def test_restart_only_indexes_new_contexts(self, tmp_path):
+        """Test the persisted high-water mark skips contexts indexed before a restart."""
+        graph = FakeNeo4j(GRAPH_NODES)
+        backend = TextSearchBackend(index_dir=str(tmp_path))
+        await backend.initialize()
+        await StreamingTextIndexer(backend, [Neo4jContextSource(graph, page_size=2)], workers=0).run_once()
+        await backend.cleanup()
+
+        graph.nodes.append(_node(6, "segment merge compaction"))
+        restarted = TextSearchBackend(index_dir=str(tmp_path))
+        await restarted.initialize()
+        assert await _search(restarted, "redis")
+
+        indexer = StreamingTextIndexer(restarted, [Neo4jContextSource(graph, page_size=2)], workers=0)
+        stats = await indexer.run_once()
+
+        assert stats["neo4j"]["documents"] == 1
+        assert restarted.document_count == 6
+        assert await _search(restarted, "compaction") == ["ctx-006"]
+        await restarted.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_fetch_error_keeps_indexed_pages(self):
+        """Test pages fetched before a failure are indexed and the next run resumes after them."""
+        graph = FakeNeo4j(GRAPH_NODES)
+        graph.fail_after = 1
+        backend = TextSearchBackend()
+        indexer = StreamingTextIndexer(backend, [Neo4jContextSource(graph, page_size=2)], workers=0)
+
+        stats = await indexer.run_once()
+
+        assert "neo4j unavailable" in stats["neo4j"]["error"]
+        assert backend.document_count == 2
+        assert indexer.checkpoints["neo4j"]["id"] == "ctx-002"
+
+        graph.fail_after = None
+        stats = await indexer.run_once()
+
+        assert stats["neo4j"]["documents"] == 3
+        assert backend.document_count == 5
+
+    @pytest.mark.asyncio
+    async def test_nodes_without_id_do_not_stall_paging(self):
+        """Test a page of id-less Context nodes does not stop the source from advancing."""
+        nodes = [{"created_at": f"2025-01-01T00:00:0{i}", "searchable_text": "orphan"} for i in range(3)]
+        graph = FakeNeo4j(nodes + GRAPH_NODES)
+        indexer = StreamingTextIndexer(TextSearchBackend(), [Neo4jContextSource(graph, page_size=2)], workers=0)
+
+        stats = await asyncio.wait_for(indexer.run_once(), timeout=5)
+
+        assert stats["neo4j"]["documents"] == 5
+        assert indexer.checkpoints["neo4j"] == {"created_at": "2025-01-01T00:00:05", "id": "ctx-005"}
+
+    @pytest.mark.asyncio
+    async def test_late_commit_inside_overlap_is_indexed(self):
+        """Test a context stamped before the high-water mark but committed later is picked up."""
+        graph = FakeNeo4j(GRAPH_NODES)
+        backend = TextSearchBackend()
+        indexer = StreamingTextIndexer(backend, [Neo4jContextSource(graph, page_size=2)], workers=0)
+        await indexer.run_once()
+
+        graph.nodes.append(_node(9, "late committed write", created_at="2025-01-01T00:00:03.5"))
+        stats = await indexer.run_once()
+
+        assert stats["neo4j"]["documents"] == 1
+        assert await _search(backend, "committed") == ["ctx-009"]
+        assert indexer.checkpoints["neo4j"] == {"created_at": "2025-01-01T00:00:05", "id": "ctx-005"}
+
+    @pytest.mark.asyncio
+    async def test_late_commit_before_overlap_is_missed(self):
+        """Test overlap_seconds bounds how far back each run re-reads."""
+        graph = FakeNeo4j(GRAPH_NODES)
+        backend = TextSearchBackend()
+        indexer = StreamingTextIndexer(
+            backend, [Neo4jContextSource(graph, page_size=2, overlap_seconds=1)], workers=0
+        )
+        await indexer.run_once()
+
+        graph.nodes.append(_node(9, "late committed write", created_at="2025-01-01T00:00:02.5"))
+        stats = await indexer.run_once()
+
+        assert stats["neo4j"]["documents"] == 0
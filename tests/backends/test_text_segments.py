@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Tests for the memory-mapped on-disk segments of the BM25 text index.
+
+Covers the segment file format, manifest persistence, the segmented
+TextSearchBackend lifecycle (flush, reopen, delete, merge) and several
+backends sharing one index directory.
+"""
+
+import os
+
+import pytest
+
+from src.backends.text_backend import TextSearchBackend
+from src.backends.text_segments import (
+    Segment, SegmentFormatError, lock_index, read_manifest, unlock_index, write_manifest, write_segment
+)
+from src.interfaces.backend_interface import SearchOptions
+
+
+SAMPLE_DOCUMENTS = [
+    ("python", "Python is a programming language for machine learning"),
+    ("java", "Java is a programming language for enterprise applications"),
+    ("ml", "Machine learning algorithms learn patterns from data"),
+    ("web", "Web development with JavaScript and Python frameworks"),
+]
+
+
+class TestSegmentFormat:
+    """Test writing and reading segment files."""
+
+    @staticmethod
+    def _write(path):
+        docs = [
+            ("b", {"apple": 2, "pear": 1}, 3, "apple apple pear", {"tag": "b"}),
+            ("a", {"apple": 1}, 1, "apple", {"tag": "a"}),
+            ("c", {"pear": 1, "plum": 1}, 2, "pear plum", {}),
+        ]
+        write_segment(str(path), docs)
+        return Segment(str(path))
+
+    def test_round_trip(self, tmp_path):
+        """Header, doc ids, lengths and stored fields survive a write/open."""
+        segment = self._write(tmp_path / "seg.bm25")
+        try:
+            assert segment.doc_count == 3
+            assert segment.term_count == 3
+            assert segment.total_doc_length == 6
+            # Documents are stored sorted by id
+            assert [segment.doc_id(i) for i in range(3)] == ["a", "b", "c"]
+            assert list(segment.doc_lengths) == [1, 3, 2]
+            assert segment.stored_fields(1) == ("apple apple pear", {"tag": "b"})
+            assert not os.path.exists(str(tmp_path / "seg.bm25.tmp"))
+        finally:
+            segment.close()
+
+    def test_postings_and_lookup(self, tmp_path):
+        """Postings are sorted by ordinal and doc ids are found by binary search."""
+        segment = self._write(tmp_path / "seg.bm25")
+        try:
+            ordinals, tfs = segment.postings("apple")
+            assert list(ordinals) == [0, 1]
+            assert list(tfs) == [1, 2]
+            ordinals.release()
+            tfs.release()
+
+            assert segment.doc_frequency("pear") == 2
+            assert segment.doc_frequency("missing") == 0
+            assert segment.postings("missing") is None
+            assert segment.find_doc("c") == 2
+            assert segment.find_doc("zzz") is None
+        finally:
+            segment.close()
+
+    def test_deletes_are_skipped(self, tmp_path):
+        """Deleted ordinals are excluded from accumulation and live totals."""
+        segment = self._write(tmp_path / "seg.bm25")
+        try:
+            assert segment.delete(1)
+            assert not segment.delete(1)
+            assert segment.live_doc_count == 2
+            assert segment.live_doc_length == 3
+            assert segment.doc_frequency("apple") == 1
+            assert segment.doc_frequency("pear") == 1
+            assert segment.doc_frequency("plum") == 1
+
+            accumulator = {}
+            segment.accumulate("apple", 1.0, accumulator, False, 0.5, 0.5)
+            assert set(accumulator) == {0}
+            assert list(segment.live_ordinals()) == [0, 2]
+        finally:
+            segment.close()
+
+    def test_invalid_file_rejected(self, tmp_path):
+        """Files that are not segments raise SegmentFormatError."""
+        path = tmp_path / "bogus.bm25"
+        path.write_bytes(b"not a segment" * 10)
+        with pytest.raises(SegmentFormatError):
+            Segment(str(path))
+        with pytest.raises(SegmentFormatError):
+            Segment(str(tmp_path / "missing.bm25"))
+
+    def test_manifest_round_trip(self, tmp_path):
+        """The manifest records segment names and deleted ordinals."""
+        assert read_manifest(str(tmp_path))["segments"] == []
+
+        segment = self._write(tmp_path / "seg.bm25")
+        try:
+            segment.delete(2)
+            write_manifest(str(tmp_path), 5, [segment])
+        finally:
+            segment.close()
+
+        manifest = read_manifest(str(tmp_path))
+        assert manifest["generation"] == 5
+        assert manifest["segments"] == [{"name": "seg.bm25", "deleted": [2]}]
+
+
+class TestSegmentedBackend:
+    """Test TextSearchBackend with a persistent index directory."""
+
+    @staticmethod
+    async def _indexed_backend(index_dir):
+        backend = TextSearchBackend(index_dir=str(index_dir))
+        await backend.initialize()
+        for doc_id, text in SAMPLE_DOCUMENTS:
+            await backend.index_document(doc_id, text, metadata={"source": doc_id})
+        return backend
+
+    @pytest.mark.asyncio
+    async def test_flush_and_reopen(self, tmp_path):
+        """Flushed documents are searchable after reopening the index."""
+        backend = await self._indexed_backend(tmp_path)
+        assert await backend.flush() is not None
+        assert len(backend.documents) == 0
+        assert backend.document_count == len(SAMPLE_DOCUMENTS)
+        await backend.cleanup()
+
+        reopened = TextSearchBackend(index_dir=str(tmp_path))
+        await reopened.initialize()
+        try:
+            assert reopened.document_count == len(SAMPLE_DOCUMENTS)
+            results = await reopened.search("machine learning", SearchOptions(limit=5))
+            assert {r.id for r in results} == {"python", "ml"}
+            assert results[0].metadata["source"] in {"python", "ml"}
+
+            document = reopened.get_document("java")
+            assert document.text == SAMPLE_DOCUMENTS[1][1]
+        finally:
+            await reopened.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_segmented_scores_match_memory(self, tmp_path):
+        """Scores are identical whether documents live in memory or in segments."""
+        memory = TextSearchBackend()
+        for doc_id, text in SAMPLE_DOCUMENTS:
+            await memory.index_document(doc_id, text)
+
+        # Split the corpus across two segments and the in-memory segment
+        segmented = TextSearchBackend(index_dir=str(tmp_path))
+        await segmented.initialize()
+        for doc_id, text in SAMPLE_DOCUMENTS[:2]:
+            await segmented.index_document(doc_id, text)
+        await segmented.flush()
+        await segmented.index_document(*SAMPLE_DOCUMENTS[2])
+        await segmented.flush()
+        await segmented.index_document(*SAMPLE_DOCUMENTS[3])
+        assert len(segmented.segments) == 2 and len(segmented.documents) == 1
+        try:
+            for query in ["python programming", "learning data", "web frameworks java"]:
+                expected = await memory.search(query, SearchOptions(limit=10))
+                actual = await segmented.search(query, SearchOptions(limit=10))
+                # Compare by id: documents with equal scores may be returned in any order
+                assert {r.id: r.score for r in actual} == pytest.approx({r.id: r.score for r in expected})
+        finally:
+            await segmented.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_deletes_survive_restart(self, tmp_path):
+        """Removing a flushed document is persisted in the manifest."""
+        backend = await self._indexed_backend(tmp_path)
+        await backend.flush()
+        assert await backend.remove_document("java")
+        assert not await backend.remove_document("java")
+        await backend.cleanup()
+
+        reopened = TextSearchBackend(index_dir=str(tmp_path))
+        await reopened.initialize()
+        try:
+            assert reopened.document_count == len(SAMPLE_DOCUMENTS) - 1
+            assert reopened.get_document("java") is None
+            results = await reopened.search("enterprise", SearchOptions(limit=5))
+            assert results == []
+        finally:
+            await reopened.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_reindex_replaces_flushed_copy(self, tmp_path):
+        """Re-indexing a flushed document shadows the on-disk copy."""
+        backend = await self._indexed_backend(tmp_path)
+        await backend.flush()
+        await backend.index_document("java", "Kotlin runs on the JVM")
+        try:
+            assert backend.document_count == len(SAMPLE_DOCUMENTS)
+            assert await backend.search("enterprise", SearchOptions(limit=5)) == []
+            results = await backend.search("kotlin", SearchOptions(limit=5))
+            assert [r.id for r in results] == ["java"]
+        finally:
+            await backend.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_reindex_only_flushed_document(self, tmp_path):
+        """Re-indexing the only flushed document keeps df within the live count."""
+        backend = TextSearchBackend(index_dir=str(tmp_path))
+        await backend.initialize()
+        try:
+            await backend.index_document("d1", "Python programming guide")
+            await backend.flush()
+            await backend.index_document("d1", "Python programming guide")
+
+            assert backend.document_count == 1
+            assert backend._document_frequency("python") == 1
+            results = await backend.search("python", SearchOptions(limit=5))
+            assert [r.id for r in results] == ["d1"]
+        finally:
+            await backend.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_merge_drops_deleted_documents(self, tmp_path):
+        """Merging rewrites live documents into one segment and removes old files."""
+        backend = await self._indexed_backend(tmp_path)
+        await backend.flush()
+        await backend.index_document("rust", "Rust is a systems programming language")
+        await backend.flush()
+        await backend.remove_document("ml")
+        old_paths = [segment.path for segment in backend.segments]
+
+        merged = await backend.merge_segments()
+        try:
+            assert merged is not None
+            assert len(backend.segments) == 1
+            assert backend.segments[0].doc_count == len(SAMPLE_DOCUMENTS)
+            assert not backend.segments[0].deleted
+            assert not any(os.path.exists(path) for path in old_paths)
+
+            results = await backend.search("programming language", SearchOptions(limit=5))
+            assert {r.id for r in results} == {"python", "java", "rust"}
+        finally:
+            await backend.cleanup()
+
+        manifest = read_manifest(str(tmp_path))
+        assert [entry["name"] for entry in manifest["segments"]] == [merged]
+
+
+class TestSharedIndexDirectory:
+    """Test backends in several processes writing one index directory."""
+
+    @staticmethod
+    async def _open(index_dir):
+        backend = TextSearchBackend(index_dir=str(index_dir))
+        await backend.initialize()
+        return backend
+
+    def test_lock_is_exclusive(self, tmp_path):
+        """An exclusive holder keeps out other writers and readers."""
+        handle = lock_index(str(tmp_path))
+        try:
+            assert lock_index(str(tmp_path), blocking=False) is None
+            assert lock_index(str(tmp_path), shared=True, blocking=False) is None
+        finally:
+            unlock_index(handle)
+
+        reader = lock_index(str(tmp_path), shared=True, blocking=False)
+        assert reader is not None
+        unlock_index(reader)
+
+    @pytest.mark.asyncio
+    async def test_flushes_from_two_writers_are_kept(self, tmp_path):
+        """Each writer's flush keeps the other's segments, and searches see both."""
+        first, second = await self._open(tmp_path), await self._open(tmp_path)
+        try:
+            await first.index_document(*SAMPLE_DOCUMENTS[0])
+            await first.flush()
+            await second.index_document(*SAMPLE_DOCUMENTS[1])
+            await second.flush()
+
+            assert len(read_manifest(str(tmp_path))["segments"]) == 2
+            results = await first.search("programming language", SearchOptions(limit=5))
+            assert {r.id for r in results} == {"python", "java"}
+        finally:
+            await first.cleanup()
+            await second.cleanup()
+
+        reopened = await self._open(tmp_path)
+        try:
+            assert reopened.document_count == 2
+        finally:
+            await reopened.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_delete_seen_by_other_writer(self, tmp_path):
+        """A delete made by one writer stops matching in another."""
+        first, second = await self._open(tmp_path), await self._open(tmp_path)
+        try:
+            for doc_id, text in SAMPLE_DOCUMENTS:
+                await first.index_document(doc_id, text)
+            await first.flush()
+            assert await second.search("enterprise", SearchOptions(limit=5))
+
+            assert await first.remove_document("java")
+            assert await second.search("enterprise", SearchOptions(limit=5)) == []
+            assert second.document_count == len(SAMPLE_DOCUMENTS) - 1
+        finally:
+            await first.cleanup()
+            await second.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_same_document_flushed_twice_counts_once(self, tmp_path):
+        """The later flush of a document supersedes the copy another writer flushed."""
+        first, second = await self._open(tmp_path), await self._open(tmp_path)
+        try:
+            await first.index_document("doc", "old text about queues")
+            await first.flush()
+            await second.index_document("doc", "new text about streams")
+            await second.flush()
+
+            assert first.document_count == 1
+            assert await first.search("queues", SearchOptions(limit=5)) == []
+            assert [r.id for r in await first.search("streams", SearchOptions(limit=5))] == ["doc"]
+        finally:
+            await first.cleanup()
+            await second.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_second_merge_of_same_segments_is_dropped(self, tmp_path):
+        """A merge whose sources another writer already merged is discarded."""
+        first = await self._open(tmp_path)
+        for doc_id, text in SAMPLE_DOCUMENTS[:2]:
+            await first.index_document(doc_id, text)
+            await first.flush()
+        second = await self._open(tmp_path)
+        try:
+            merged = await first.merge_segments()
+            assert await second.merge_segments() is None
+
+            assert [entry["name"] for entry in read_manifest(str(tmp_path))["segments"]] == [merged]
+            assert sorted(os.listdir(tmp_path)) == sorted([merged, "segments.json", "segments.lock"])
+            assert second.document_count == 2
+            assert [segment.name for segment in second.segments] == [merged]
+        finally:
+            await first.cleanup()
+            await second.cleanup()
+
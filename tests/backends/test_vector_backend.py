@@ -377,5 +377,50 @@ class TestVectorBackendSearchByEmbedding:
             assert result.metadata.get("vector_search") is True
 
 
+class TestVectorBackendSearchMany:
+    """Test suite for batched multi-query search (MQE support)."""
+
+    @pytest.mark.asyncio
+    async def test_search_many_uses_one_embedding_batch_and_one_qdrant_call(self):
+        """Test that all queries are embedded together and searched in one request."""
+        from src.interfaces.backend_interface import SearchOptions
+
+        client = Mock()
+        client.search_batch = Mock(return_value=[
+            [{"id": "doc_1", "score": 0.9, "payload": {"text": "Neo4j setup"}}],
+            [{"id": "doc_2", "score": 0.4, "payload": {"text": "Neo4j tuning"}}],
+        ])
+        embedding_generator = Mock()
+        embedding_generator.generate_batch_embeddings = AsyncMock(return_value=[[0.1] * 3, [0.2] * 3])
+        backend = VectorBackend(client, embedding_generator)
+
+        results = await backend.search_many(
+            ["configure neo4j", "set up neo4j"], SearchOptions(limit=5, score_threshold=0.5)
+        )
+
+        embedding_generator.generate_batch_embeddings.assert_awaited_once_with(
+            ["configure neo4j", "set up neo4j"]
+        )
+        client.search_batch.assert_called_once_with(
+            query_vectors=[[0.1] * 3, [0.2] * 3], limit=5, filter_dict=None
+        )
+        assert len(results) == 2
+        assert results[1] == []  # Below the score threshold
+
+    @pytest.mark.asyncio
+    async def test_search_many_error_handling(self):
+        """Test that batch failures surface as BackendSearchError."""
+        from src.interfaces.backend_interface import SearchOptions, BackendSearchError
+
+        client = Mock()
+        client.search_batch = Mock(side_effect=RuntimeError("Connection failed"))
+        embedding_generator = Mock()
+        embedding_generator.generate_batch_embeddings = AsyncMock(return_value=[[0.1] * 3])
+        backend = VectorBackend(client, embedding_generator)
+
+        with pytest.raises(BackendSearchError):
+            await backend.search_many(["q"], SearchOptions(limit=5))
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Tests for src/core/pipeline_tracing.py and its use in RetrievalCore.search.
+
+Tests cover:
+- Cumulative histogram buckets and Prometheus rendering
+- Spans sharing the request trace_id, including failed stages
+- RetrievalCore stage timings behind the debug flag
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.core.pipeline_tracing import (
+    PipelineTrace,
+    StageHistograms,
+    get_stage_histograms,
+    reset_stage_histograms,
+)
+from src.core.query_dispatcher import QueryDispatcher
+from src.core.retrieval_core import RetrievalCore
+from src.interfaces.memory_result import (
+    ContentType,
+    MemoryResult,
+    ResultSource,
+    SearchResultResponse,
+)
+from src.utils.logging_middleware import trace_context
+
+
+def _response():
+    return SearchResultResponse(
+        success=True,
+        results=[
+            MemoryResult(
+                id=f"ctx-{i}", text=f"context {i}", type=ContentType.GENERAL,
+                score=0.9 - i * 0.1, source=ResultSource.VECTOR,
+            )
+            for i in range(3)
+        ],
+        total_count=3,
+        search_mode_used="hybrid",
+        backends_used=["vector"],
+    )
+
+
+class TestStageHistograms:
+    """Test the per-stage histograms."""
+
+    def test_buckets_are_cumulative(self):
+        """Test each bucket counts observations at or below its bound."""
+        histograms = StageHistograms(buckets_ms=(1, 10, 100))
+        for duration in (0.5, 1.0, 7.0, 50.0, 5000.0):
+            histograms.observe("dispatch", duration)
+
+        data = histograms.snapshot()["dispatch"]
+
+        assert data["buckets"] == {"1": 2, "10": 3, "100": 4, "+Inf": 5}
+        assert data["count"] == 5
+        assert data["sum_ms"] == pytest.approx(5058.5)
+
+    def test_prometheus_lines(self):
+        """Test rendering is empty until observed, then one series set per stage."""
+        histograms = StageHistograms(buckets_ms=(2.5,))
+        assert histograms.prometheus_lines() == []
+
+        histograms.observe("rerank", 2.0)
+        lines = histograms.prometheus_lines(metric="stage_ms")
+
+        assert "# TYPE stage_ms histogram" in lines
+        assert 'stage_ms_bucket{stage="rerank",le="2.5"} 1' in lines
+        assert 'stage_ms_bucket{stage="rerank",le="+Inf"} 1' in lines
+        assert 'stage_ms_count{stage="rerank"} 1' in lines
+
+
+class TestPipelineTrace:
+    """Test spans recorded by a request trace."""
+
+    def test_spans_share_trace_id_and_feed_histograms(self):
+        """Test spans use the logging trace id and are observed even when a stage fails."""
+        histograms = StageHistograms()
+        with trace_context("trace-abc"):
+            trace = PipelineTrace(histograms=histograms)
+
+        with trace.span("normalization"):
+            pass
+        with pytest.raises(RuntimeError):
+            with trace.span("dispatch", search_mode="vector"):
+                raise RuntimeError("backend down")
+        with trace.span("dispatch") as attributes:
+            attributes["retry"] = True
+        totals = trace.finish()
+
+        assert trace.trace_id == "trace-abc"
+        assert [span["stage"] for span in trace.spans] == ["normalization", "dispatch", "dispatch"]
+        assert trace.spans[1]["attributes"] == {"search_mode": "vector"}
+        assert set(totals) == {"normalization", "dispatch", "total"}
+        assert totals["total"] >= totals["dispatch"]
+        snapshot = histograms.snapshot()
+        assert snapshot["dispatch"]["count"] == 2
+        assert snapshot["total"]["count"] == 1
+
+
+class TestRetrievalCoreTracing:
+    """Test RetrievalCore reporting stage timings."""
+
+    @pytest.fixture(autouse=True)
+    def plain_pipeline(self):
+        """Run dispatch and search enhancements only, with fresh histograms."""
+        reset_stage_histograms()
+        with patch("src.core.retrieval_core.ENABLE_QUERY_NORMALIZATION", False), \
+             patch("src.core.retrieval_core.ENABLE_MQE", False), \
+             patch("src.core.retrieval_core.ENABLE_HYDE", False), \
+             patch("src.core.retrieval_core.ENABLE_CROSS_ENCODER", False):
+            yield
+        reset_stage_histograms()
+
+    @pytest.mark.asyncio
+    async def test_debug_includes_stage_timings(self):
+        """Test debug responses carry per-stage timings and the trace id."""
+        dispatcher = AsyncMock(spec=QueryDispatcher)
+        dispatcher.search.return_value = _response()
+        core = RetrievalCore(dispatcher)
+
+        with trace_context("trace-debug"):
+            response = await core.search("redis cache", search_mode="vector", debug=True)
+
+        assert response.trace_id == "trace-debug"
+        assert "dispatch" in response.stage_timings
+        assert response.stage_timings["total"] >= response.stage_timings["dispatch"]
+        assert get_stage_histograms().snapshot()["dispatch"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stage_timings_omitted_without_debug(self):
+        """Test regular responses still feed the histograms but carry no timings."""
+        dispatcher = AsyncMock(spec=QueryDispatcher)
+        dispatcher.search.return_value = _response()
+        core = RetrievalCore(dispatcher)
+
+        response = await core.search("redis cache", search_mode="vector")
+
+        assert response.stage_timings == {}
+        assert response.trace_id
+        assert get_stage_histograms().snapshot()["total"]["count"] == 1
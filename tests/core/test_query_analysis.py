@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Tests for src/core/query_analysis.py and the precompiled query patterns.
+
+Tests cover:
+- Prefiltered intent classification matching the per-pattern scan
+- Precompiled normalizer intent scores and entities matching per-pattern regexes
+- Single-scan technical and code checks matching the substring loops
+- One analysis feeding intent, normalization and lexical flags
+"""
+
+import re
+from unittest.mock import patch
+
+import pytest
+
+from src.core.intent_classifier import IntentClassifier, IntentType
+from src.core.query_analysis import QueryAnalyzer, contains_code_patterns
+from src.core.query_normalizer import QueryIntent, QueryNormalizer, QueryNormalizerConfig
+from src.mcp_server.search_enhancements import TECHNICAL_TERMS, is_technical_query
+
+QUERIES = [
+    "What's my name?",
+    "whats my email address",
+    "Do you remember my name",
+    "My name is Ada",
+    "I'm 29 years old",
+    "I'm from Lagos",
+    "actually, my name is Grace",
+    "Correction: I live in Osaka",
+    "let me correct that",
+    "that's wrong, I prefer tea",
+    "I like ramen and I live in Lima",
+    "my email is ada@example.com",
+    "how to setup neo4j database connection",
+    "How do I fix the redis cache timeout error?",
+    "What is a vector database? explain embeddings",
+    "find the server.py file",
+    "def retrieve_context() -> list",
+    "SELECT * FROM contexts",
+    "veris memory mcp protocol graph query search",
+    "tell me about the weather",
+    "",
+    "   ",
+]
+
+
+def _reference_classify(classifier, query):
+    """Previous classify(): each group scanned pattern by pattern."""
+    if not query or not query.strip():
+        return IntentType.GENERAL_QUERY, 0.0, None
+    query = query.strip()
+    for compiled, intent in ((classifier._compiled_update, IntentType.UPDATE_FACT),
+                             (classifier._compiled_storage, IntentType.STORE_FACT),
+                             (classifier._compiled_lookup, IntentType.FACT_LOOKUP)):
+        result = classifier._check_patterns(query, compiled, intent)
+        if result.confidence > 0.7:
+            return result.intent, result.confidence, result.attribute
+    return IntentType.GENERAL_QUERY, 0.8, None
+
+
+def _reference_intent_scores(normalizer, query):
+    return {
+        intent: sum(1 for p in patterns if re.search(p, query, re.IGNORECASE)) / len(patterns)
+        for intent, patterns in normalizer.intent_patterns.items()
+    }
+
+
+def _reference_entities(normalizer, query):
+    entities = []
+    for pattern in normalizer.entity_patterns:
+        entities.extend(m.lower().strip() for m in re.findall(pattern, query, re.IGNORECASE))
+    return set(entities)
+
+
+def _reference_is_technical(query):
+    query_lower = query.lower()
+    return (
+        bool(set(query_lower.split()) & TECHNICAL_TERMS)
+        or any(f'.{ext}' in query_lower for ext in ['py', 'js', 'ts', 'md', 'json'])
+        or any(p in query_lower for p in ['()', '[]', '{}', '->', '=>', 'function', 'class', 'def'])
+    )
+
+
+@pytest.fixture
+def classifier():
+    return IntentClassifier()
+
+
+@pytest.fixture
+def normalizer():
+    return QueryNormalizer(QueryNormalizerConfig(enabled=True))
+
+
+class TestPrecompiledPatterns:
+    """Test the single-scan matchers against the previous pattern loops."""
+
+    @pytest.mark.parametrize("query", QUERIES)
+    def test_intent_matches_reference(self, classifier, query):
+        """Test intent, confidence and attribute are unchanged."""
+        result = classifier.classify(query)
+        assert (result.intent, result.confidence, result.attribute) == _reference_classify(classifier, query)
+
+    @pytest.mark.parametrize("query", QUERIES)
+    def test_normalizer_matches_reference(self, normalizer, query):
+        """Test intent scores and entities are unchanged."""
+        query_lower = query.lower().strip()
+        scores = _reference_intent_scores(normalizer, query_lower)
+        intent, confidence = normalizer._detect_intent(query_lower)
+
+        if max(scores.values()) == 0:
+            assert (intent, confidence) == (QueryIntent.UNKNOWN, 0.0)
+        else:
+            assert intent == max(scores, key=lambda k: scores[k])
+            assert confidence == scores[intent]
+        assert set(normalizer._extract_entities(query_lower)) == _reference_entities(normalizer, query_lower)
+
+    @pytest.mark.parametrize("query", QUERIES)
+    def test_technical_and_code_checks_match_reference(self, query):
+        """Test the combined scans agree with the substring loops."""
+        indicators = ['def ', 'function ', 'class ', 'import ', 'from ', '{', '}', '()', '[]',
+                      'return', 'if __name__', 'SELECT', 'INSERT', 'UPDATE', 'DELETE', 'CREATE']
+        assert is_technical_query(query) == _reference_is_technical(query)
+        assert contains_code_patterns(query) == any(i.lower() in query.lower() for i in indicators)
+
+    def test_extract_fact_value(self, classifier):
+        """Test value extraction uses the compiled storage patterns."""
+        assert classifier.extract_fact_value("My name is Ada") == ("name", "Ada")
+
+
+class TestQueryAnalyzer:
+    """Test the combined analysis stage."""
+
+    def test_analysis_combines_stages(self, normalizer):
+        """Test one call yields intent, normalized form and lexical flags."""
+        analyzer = QueryAnalyzer(normalizer=normalizer)
+        analysis = analyzer.analyze("How to setup Neo4j?")
+
+        assert analysis.intent.intent == IntentType.GENERAL_QUERY
+        assert analysis.normalized.intent == QueryIntent.CONFIGURATION
+        assert analysis.normalization_applied
+        assert analysis.effective_query == "How do I configure Neo4j database settings?"
+        assert analysis.is_technical is True
+        assert analysis.is_code_like is False
+
+    def test_analysis_without_normalization(self):
+        """Test normalize=False keeps the raw query and skips the normalizer."""
+        analysis = QueryAnalyzer().analyze("What's my name?", normalize=False)
+
+        assert analysis.normalized is None
+        assert analysis.effective_query == "What's my name?"
+        assert analysis.intent.intent == IntentType.FACT_LOOKUP
+        assert analysis.intent.attribute == "name"
+
+    def test_analysis_without_classification(self, normalizer):
+        """Test classify=False skips the intent classifier."""
+        classifier = IntentClassifier()
+        with patch.object(classifier, "classify") as classify:
+            analysis = QueryAnalyzer(classifier, normalizer).analyze("How to setup Neo4j?", classify=False)
+
+        classify.assert_not_called()
+        assert analysis.intent is None
+        assert analysis.normalization_applied
+        assert analysis.is_technical is True
+
+    def test_low_confidence_keeps_query(self, normalizer):
+        """Test unconfident normalizations are not applied."""
+        analysis = QueryAnalyzer(normalizer=normalizer).analyze("tell me about the weather")
+        assert not analysis.normalization_applied
+        assert analysis.effective_query == "tell me about the weather"
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Tests for src/core/rate_limit_backends.py
+
+Tests cover:
+- Shared token buckets enforced across limiter instances (workers)
+- Local reservations admitting clearly under-limit clients without Redis
+- Unused reservations returned to Redis, including after a failed call
+- Workers never admitting more than capacity between them
+- Fallback to bounded in-process buckets when Redis fails
+- MCPRateLimiter routing endpoint and burst checks through a backend
+"""
+
+import asyncio
+import math
+
+import pytest
+
+from src.core.rate_limit_backends import (
+    LocalTokenBucketBackend,
+    LRUDict,
+    RedisTokenBucketBackend,
+)
+from src.core.rate_limiter import MCPRateLimiter
+
+
+class FakeRedis:
+    """Runs the token bucket script in Python against a dict and a fake clock."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.now = 1000.0
+        self.calls = 0
+        self.fail = False
+
+    def register_script(self, source):
+        assert "redis.call('TIME')" in source
+
+        def script(keys, args):
+            if self.fail:
+                raise ConnectionError("redis down")
+            self.calls += 1
+            return self._token_bucket(keys[0], *[float(a) for a in args])
+        return script
+
+    def _token_bucket(self, key, capacity, rate, requested, refund, reserve, reserve_floor):
+        state = self.hashes.get(key)
+        tokens, ts = state if state else (capacity, self.now)
+        tokens = min(capacity, tokens + max(0.0, self.now - ts) * rate + refund)
+        allowed = reserved = 0
+        if tokens >= requested:
+            tokens -= requested
+            allowed = 1
+            reserved = max(0, min(reserve, math.floor(tokens - reserve_floor)))
+            tokens -= reserved
+        wait = 0 if allowed else (requested - tokens) / rate
+        self.hashes[key] = (tokens, self.now)
+        assert math.ceil((capacity - tokens) / rate) + 1 > 0
+        return [allowed, str(tokens), str(wait), reserved]
+
+
+@pytest.fixture
+def redis():
+    return FakeRedis()
+
+
+class TestRedisTokenBucketBackend:
+    """Test the Redis-backed shared buckets."""
+
+    def test_limit_shared_across_instances(self, redis):
+        """Test two workers draw from the same bucket."""
+        worker_a = RedisTokenBucketBackend(redis, cache_ttl_ms=0)
+        worker_b = RedisTokenBucketBackend(redis, cache_ttl_ms=0)
+
+        results = [w.consume("c1", 4, 1.0).allowed for w in (worker_a, worker_b) * 3]
+
+        assert results == [True, True, True, True, False, False]
+        assert redis.calls == 6
+
+    def test_refill_and_retry_after(self, redis):
+        """Test tokens refill with server time and retry_after is reported."""
+        backend = RedisTokenBucketBackend(redis, cache_ttl_ms=0)
+        assert backend.consume("c1", 1, 0.5).allowed
+        denied = backend.consume("c1", 1, 0.5)
+        assert not denied.allowed
+        assert denied.retry_after == pytest.approx(2.0)
+
+        redis.now += 2.0
+        assert backend.consume("c1", 1, 0.5).allowed
+
+    def test_cache_skips_round_trips_under_limit(self, redis):
+        """Test clients far below the limit are admitted locally."""
+        backend = RedisTokenBucketBackend(redis, cache_ttl_ms=60000, cache_headroom=0.5, cache_reserve=0.5)
+
+        sources = [backend.consume("c1", 10, 0.001).source for _ in range(5)]
+
+        # 9 left after the request; 4 reserved so that 5 remain in Redis
+        assert sources == ["redis", "cache", "cache", "cache", "cache"]
+        assert redis.hashes["ratelimit:c1"][0] == pytest.approx(5.0, abs=0.01)
+        assert redis.calls == 1
+        assert backend.cache_hits == 4
+
+    def test_cached_admits_taken_from_redis_up_front(self, redis):
+        """Test the next Redis call starts from what the reservation left."""
+        backend = RedisTokenBucketBackend(redis, cache_ttl_ms=60000, cache_headroom=0.5, cache_reserve=0.5)
+        for _ in range(5):
+            backend.consume("c1", 10, 0.001)
+
+        decision = backend.consume("c1", 10, 0.001)
+
+        assert decision.source == "redis"
+        assert decision.remaining == pytest.approx(4.0, abs=0.01)
+        assert redis.hashes["ratelimit:c1"][0] == pytest.approx(4.0, abs=0.01)
+
+    def test_unused_reservation_refunded(self, redis):
+        """Test an expired reservation is returned on the next Redis call."""
+        backend = RedisTokenBucketBackend(redis, cache_ttl_ms=60000, cache_headroom=0.5, cache_reserve=0.5)
+        backend.consume("c1", 10, 0.001)
+        backend._decisions["c1"][0] = 0.0
+
+        decision = backend.consume("c1", 10, 0.001)
+
+        # 5 in Redis + 4 refunded - 1 requested, then 3 reserved again
+        assert decision.source == "redis"
+        assert decision.remaining == pytest.approx(8.0, abs=0.01)
+        assert redis.hashes["ratelimit:c1"][0] == pytest.approx(5.0, abs=0.01)
+
+    def test_cache_never_admits_over_limit(self, redis):
+        """Test the total admitted never exceeds capacity."""
+        backend = RedisTokenBucketBackend(redis, cache_ttl_ms=60000, cache_headroom=0.2, cache_reserve=0.5)
+        allowed = sum(backend.consume("c1", 10, 0.0001).allowed for _ in range(30))
+        assert allowed == 10
+
+    def test_workers_never_admit_over_limit_together(self, redis):
+        """Test local admits in several workers stay within one capacity."""
+        workers = [
+            RedisTokenBucketBackend(redis, cache_ttl_ms=60000, cache_headroom=0.2, cache_reserve=0.5)
+            for _ in range(4)
+        ]
+        allowed = sum(workers[i % 4].consume("c1", 10, 0.0001).allowed for i in range(40))
+        assert allowed == 10
+
+    def test_reservation_kept_when_redis_fails(self, redis):
+        """Test a reservation is not dropped when the refunding call fails."""
+        backend = RedisTokenBucketBackend(redis, cache_ttl_ms=60000, cache_headroom=0.5, cache_reserve=0.5)
+        backend.consume("c1", 10, 0.001)
+        backend._decisions["c1"][0] = 0.0
+        redis.fail = True
+
+        assert backend.consume("c1", 10, 0.001).source == "local"
+        assert backend._decisions["c1"][2] == 4
+
+        redis.fail = False
+        backend._redis_retry_at = 0.0
+        decision = backend.consume("c1", 10, 0.001)
+
+        assert decision.remaining == pytest.approx(8.0, abs=0.01)
+
+    def test_fallback_when_redis_fails(self, redis):
+        """Test Redis errors fall back to local buckets and back off."""
+        backend = RedisTokenBucketBackend(
+            redis, cache_ttl_ms=0, fallback=LocalTokenBucketBackend(max_keys=100)
+        )
+        redis.fail = True
+
+        decisions = [backend.consume("c1", 2, 0.001) for _ in range(3)]
+
+        assert [d.allowed for d in decisions] == [True, True, False]
+        assert {d.source for d in decisions} == {"local"}
+        assert backend.fallback_calls == 3
+        assert backend.get_stats()["redis_available"] is False
+
+    def test_decision_cache_bounded(self, redis):
+        """Test cached decisions are evicted least recently used first."""
+        backend = RedisTokenBucketBackend(redis, max_cached_keys=3)
+        for i in range(10):
+            backend.consume(f"c{i}", 10, 1.0)
+        assert list(backend._decisions) == ["c7", "c8", "c9"]
+
+
+class TestLocalBackends:
+    """Test the in-process bounded structures."""
+
+    def test_local_backend_lru_bound(self):
+        """Test the local backend keeps at most max_keys buckets."""
+        backend = LocalTokenBucketBackend(max_keys=2)
+        backend.consume("a", 1, 0.001)
+        backend.consume("b", 1, 0.001)
+        backend.consume("a", 1, 0.001)
+        backend.consume("c", 1, 0.001)
+        assert len(backend) == 2
+        # "b" was least recently used, so "a" keeps its drained bucket
+        assert not backend.consume("a", 1, 0.001).allowed
+        assert backend.consume("b", 1, 0.001).allowed
+
+    def test_lru_dict_default_factory(self):
+        """Test LRUDict creates missing entries and evicts the oldest."""
+        limiters = LRUDict(max_size=2, default_factory=dict)
+        limiters["a"]["x"] = 1
+        limiters["b"]["x"] = 2
+        limiters["a"]
+        limiters["c"]["x"] = 3
+        assert list(limiters) == ["a", "c"]
+        assert isinstance(limiters, dict)
+
+
+class TestMCPRateLimiterBackend:
+    """Test MCPRateLimiter with a shared backend."""
+
+    def test_endpoint_limit_shared_between_workers(self, redis):
+        """Test two limiter instances enforce one per-client budget."""
+        workers = [MCPRateLimiter(), MCPRateLimiter()]
+        for worker in workers:
+            worker.set_backend(RedisTokenBucketBackend(redis, cache_ttl_ms=0))
+
+        async def run():
+            return [
+                (await workers[i % 2].async_check_rate_limit("store_context", "client_1"))[0]
+                for i in range(12)
+            ]
+
+        results = asyncio.run(run())
+
+        # store_context allows a burst of 10 per client
+        assert results.count(True) == 10
+        assert results[-1] is False
+        assert workers[0].client_limiters == {}
+
+    def test_burst_protection_uses_backend(self, redis):
+        """Test burst protection is enforced through the backend."""
+        limiter = MCPRateLimiter()
+        limiter.set_backend(RedisTokenBucketBackend(redis, cache_ttl_ms=0))
+
+        async def run():
+            return [(await limiter.async_check_burst_protection("client_1"))[0] for _ in range(51)]
+
+        results = asyncio.run(run())
+
+        assert results.count(True) == 50
+        assert not hasattr(limiter, "_burst_limiters")
+        assert "ratelimit:burst:client_1" in redis.hashes
+
+    def test_rate_limit_info_reports_backend(self, redis):
+        """Test backend stats are included in rate limit info."""
+        limiter = MCPRateLimiter()
+        limiter.set_backend(LocalTokenBucketBackend())
+        info = limiter.get_rate_limit_info("store_context", "client_1")
+        assert info["backend"]["backend"] == "local"
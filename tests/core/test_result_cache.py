@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Tests for src/core/result_cache.py and its use in RetrievalCore.search.
+
+Tests cover:
+- Semantic keys shared by near-identical embeddings
+- In-process LRU eviction and TTL expiry
+- Redis tier reads, writes and shared generation counters
+- Namespace and global invalidation
+- RetrievalCore skipping dispatch on cache hits
+"""
+
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.core.query_dispatcher import QueryDispatcher
+from src.core.result_cache import SearchResultCache
+from src.core.retrieval_core import RetrievalCore
+from src.core.semantic_cache import SemanticCacheKeyGenerator
+from src.interfaces.memory_result import (
+    ContentType,
+    MemoryResult,
+    ResultSource,
+    SearchResultResponse,
+)
+
+EMBEDDING = [0.12, -0.31, 0.58, 0.07] * 8
+PARAPHRASE_EMBEDDING = [value + 0.01 for value in EMBEDDING]
+
+
+class FakeRedisClient:
+    """Dict-backed stand-in for SimpleRedisClient and its raw client."""
+
+    def __init__(self):
+        self.store = {}
+        self.client = self
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def setex(self, key, ttl, value):
+        self.store[key] = value
+        return True
+
+    def mget(self, keys):
+        return [self.store.get(key) for key in keys]
+
+    def incr(self, key):
+        self.store[key] = str(int(self.store.get(key) or 0) + 1)
+        return int(self.store[key])
+
+
+def _response(text="Cached context"):
+    return SearchResultResponse(
+        success=True,
+        results=[
+            MemoryResult(
+                id="ctx-1", text=text, type=ContentType.GENERAL, score=0.9, source=ResultSource.VECTOR
+            )
+        ],
+        total_count=1,
+        search_mode_used="hybrid",
+        backends_used=["vector"],
+    )
+
+
+def _cache(**kwargs):
+    return SearchResultCache(key_generator=SemanticCacheKeyGenerator(), **kwargs)
+
+
+class TestSearchResultCache:
+    """Test the two-tier result cache."""
+
+    @pytest.mark.asyncio
+    async def test_paraphrase_shares_key_and_parameters_do_not(self):
+        """Test that close embeddings share a key while limit and filters split it."""
+        cache = _cache()
+
+        key = await cache.make_key(EMBEDDING, limit=10, search_mode="hybrid")
+
+        assert key == await cache.make_key(PARAPHRASE_EMBEDDING, limit=10, search_mode="hybrid")
+        assert key != await cache.make_key(EMBEDDING, limit=5, search_mode="hybrid")
+        assert key != await cache.make_key(EMBEDDING, limit=10, search_mode="vector")
+        assert key != await cache.make_key(
+            EMBEDDING, limit=10, search_mode="hybrid", filters={"tags": ["python"]}
+        )
+
+    @pytest.mark.asyncio
+    async def test_memory_tier_round_trip_and_lru_eviction(self):
+        """Test that the in-process tier serves hits and evicts least recently used."""
+        cache = _cache(max_entries=2)
+        await cache.set("a", _response("A"))
+        await cache.set("b", _response("B"))
+        assert (await cache.get("a")).results[0].text == "A"  # a is now most recent
+
+        await cache.set("c", _response("C"))
+
+        assert await cache.get("b") is None
+        assert (await cache.get("a")).results[0].text == "A"
+        stats = cache.get_stats()
+        assert stats["evictions"] == 1
+        assert stats["memory_hits"] == 2
+        assert stats["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_entries_expire_after_ttl(self):
+        """Test that expired entries are not served."""
+        cache = _cache(ttl_seconds=60)
+        await cache.set("a", _response())
+
+        with patch("src.core.result_cache.time.monotonic", return_value=time.monotonic() + 61):
+            assert await cache.get("a") is None
+
+    @pytest.mark.asyncio
+    async def test_redis_tier_shared_between_instances(self):
+        """Test that another worker's cache is served from Redis."""
+        redis = FakeRedisClient()
+        writer = _cache(redis_client=redis)
+        reader = _cache(redis_client=redis)
+        key = await writer.make_key(EMBEDDING, limit=10, search_mode="hybrid")
+        await writer.set(key, _response())
+
+        cached = await reader.get(key)
+
+        assert cached.results[0].id == "ctx-1"
+        assert reader.get_stats()["redis_hits"] == 1
+        assert await reader.get(key) is not None
+        assert reader.get_stats()["memory_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_namespace_invalidation(self):
+        """Test that storing a type invalidates that type and unfiltered searches only."""
+        redis = FakeRedisClient()
+        cache = _cache(redis_client=redis)
+        other_worker = _cache(redis_client=redis)
+        design_key = await cache.make_key(EMBEDDING, 10, "hybrid", context_type="design")
+        decision_key = await cache.make_key(EMBEDDING, 10, "hybrid", context_type="decision")
+        unfiltered_key = await cache.make_key(EMBEDDING, 10, "hybrid")
+
+        await other_worker.invalidate(["design"])
+
+        assert await cache.make_key(EMBEDDING, 10, "hybrid", context_type="design") != design_key
+        assert await cache.make_key(EMBEDDING, 10, "hybrid", context_type="decision") == decision_key
+        assert await cache.make_key(EMBEDDING, 10, "hybrid") != unfiltered_key
+
+    @pytest.mark.asyncio
+    async def test_global_invalidation_without_redis(self):
+        """Test that invalidating every namespace changes all keys and clears memory."""
+        cache = _cache()
+        key = await cache.make_key(EMBEDDING, 10, "hybrid", context_type="design")
+        await cache.set(key, _response())
+
+        await cache.invalidate()
+
+        assert await cache.make_key(EMBEDDING, 10, "hybrid", context_type="design") != key
+        assert cache.get_stats()["memory_entries"] == 0
+
+
+class TestRetrievalCoreResultCache:
+    """Test RetrievalCore serving final results from the cache."""
+
+    @pytest.fixture(autouse=True)
+    def plain_pipeline(self):
+        """Disable optional pipeline phases so only dispatch runs on a miss."""
+        with patch("src.core.retrieval_core.ENABLE_QUERY_NORMALIZATION", False), \
+             patch("src.core.retrieval_core.ENABLE_MQE", False), \
+             patch("src.core.retrieval_core.ENABLE_HYDE", False), \
+             patch("src.core.retrieval_core.ENABLE_CROSS_ENCODER", False), \
+             patch("src.core.retrieval_core.ENABLE_SEARCH_ENHANCEMENTS", False), \
+             patch("src.core.retrieval_core.QUERY_EMBEDDING_AVAILABLE", True):
+            yield
+
+    @pytest.mark.asyncio
+    async def test_paraphrased_query_skips_dispatch(self):
+        """Test that a paraphrase with a near-identical embedding is served from cache."""
+        dispatcher = AsyncMock(spec=QueryDispatcher)
+        dispatcher.search.return_value = _response()
+        core = RetrievalCore(dispatcher, result_cache=_cache())
+        embed = AsyncMock(side_effect=[EMBEDDING, PARAPHRASE_EMBEDDING])
+
+        with patch("src.core.retrieval_core.generate_query_embedding", embed):
+            first = await core.search("configure neo4j", limit=5)
+            second = await core.search("set up neo4j", limit=5)
+
+        dispatcher.search.assert_awaited_once()
+        assert second.results[0].id == first.results[0].id
+        assert core.result_cache.get_stats()["memory_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidation_and_opt_out_dispatch_again(self):
+        """Test that invalidated entries and use_cache=False reach the backends."""
+        dispatcher = AsyncMock(spec=QueryDispatcher)
+        dispatcher.search.return_value = _response()
+        core = RetrievalCore(dispatcher, result_cache=_cache())
+
+        with patch("src.core.retrieval_core.generate_query_embedding", AsyncMock(return_value=EMBEDDING)):
+            await core.search("q", context_type="design")
+            await core.result_cache.invalidate(["design"])
+            await core.search("q", context_type="design")
+            await core.search("q", context_type="design", use_cache=False)
+
+        assert dispatcher.search.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_embedding_failure_searches_uncached(self):
+        """Test that a failed key embedding falls back to a normal search."""
+        dispatcher = AsyncMock(spec=QueryDispatcher)
+        dispatcher.search.return_value = _response()
+        core = RetrievalCore(dispatcher, result_cache=_cache())
+
+        with patch(
+            "src.core.retrieval_core.generate_query_embedding",
+            AsyncMock(side_effect=RuntimeError("model unavailable")),
+        ):
+            response = await core.search("q")
+            await core.search("q")
+
+        assert response.success is True
+        assert dispatcher.search.await_count == 2
+        assert core.result_cache.get_stats()["stores"] == 0
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tests for src/core/storage_executor.py
+
+Tests cover:
+- Blocking calls run off the event loop
+- Bounded submission and rejection when saturated
+- Queue depth, wait time and per-operation metrics
+- Context variable propagation and error accounting
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+
+from src.core.storage_executor import (
+    StorageExecutor,
+    StorageExecutorSaturatedError,
+    get_storage_executor,
+    reset_storage_executor,
+    run_storage_call,
+)
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+class TestStorageExecutor:
+    """Test the bounded storage executor."""
+
+    @pytest.mark.asyncio
+    async def test_blocking_call_does_not_stall_event_loop(self):
+        """Test that other coroutines progress while a storage call blocks."""
+        executor = StorageExecutor(max_workers=2, max_pending=4)
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        result, _ = await asyncio.gather(
+            executor.run(lambda: time.sleep(0.1) or "done", operation="slow"),
+            ticker(),
+        )
+
+        assert result == "done"
+        assert len(ticks) == 5
+        assert ticks[-1] - ticks[0] < 0.1  # ticker finished while the call was blocked
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_saturated(self):
+        """Test that calls beyond max_pending are rejected and counted."""
+        executor = StorageExecutor(max_workers=1, max_pending=2)
+        release = threading.Event()
+
+        first = asyncio.ensure_future(executor.run(release.wait, operation="blocked"))
+        second = asyncio.ensure_future(executor.run(release.wait, operation="blocked"))
+        await asyncio.sleep(0.05)
+
+        stats = executor.get_stats()
+        assert stats["active"] == 1
+        assert stats["queue_depth"] == 1
+        assert stats["saturated"] is True
+        assert executor.saturated is True
+        with pytest.raises(StorageExecutorSaturatedError):
+            await executor.run(lambda: None, operation="rejected")
+
+        release.set()
+        await asyncio.gather(first, second)
+        stats = executor.get_stats()
+        assert stats["rejected"] == 1
+        assert stats["completed"] == 2
+        assert stats["queue_depth"] == 0
+        assert stats["peak_queue_depth"] >= 1
+        assert stats["max_wait_ms"] > 0
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_queued_call_leaves_queue(self):
+        """Test that a caller timing out before the call starts does not leak queue depth."""
+        executor = StorageExecutor(max_workers=1, max_pending=4)
+        release = threading.Event()
+        blocker = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(executor.run(lambda: None), timeout=0.05)
+
+        release.set()
+        await blocker
+        assert executor.get_stats()["queue_depth"] == 0
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_errors_and_operation_metrics(self):
+        """Test that failures propagate and per-operation stats are recorded."""
+        executor = StorageExecutor(max_workers=2)
+
+        def fail():
+            raise ConnectionError("neo4j down")
+
+        await executor.run(lambda: 1, operation="neo4j.query")
+        with pytest.raises(ConnectionError, match="neo4j down"):
+            await executor.run(fail, operation="neo4j.query")
+
+        stats = executor.get_stats()
+        assert stats["failed"] == 1
+        assert stats["completed"] == 1
+        assert stats["operations"]["neo4j.query"]["calls"] == 2
+        assert stats["operations"]["neo4j.query"]["errors"] == 1
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_context_variables_propagate(self):
+        """Test that context variables set by the caller are visible in the worker."""
+        executor = StorageExecutor(max_workers=1)
+        request_id.set("req-123")
+
+        seen = await executor.run(request_id.get)
+
+        assert seen == "req-123"
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_global_executor_helpers(self):
+        """Test run_storage_call uses the shared executor and passes arguments through."""
+        reset_storage_executor()
+        try:
+            result = await run_storage_call(
+                lambda a, b=0: a + b, 2, b=3, operation="redis.get"
+            )
+            assert result == 5
+            assert get_storage_executor().get_stats()["operations"]["redis.get"]["calls"] == 1
+        finally:
+            reset_storage_executor()
@@ -252,6 +252,7 @@ class TestMigrationTools:
         """Test search when text backend has no documents."""
         mock_text_backend = MagicMock()
         mock_text_backend.documents = []
+        mock_text_backend.document_count = 0
 
         with patch('src.mcp_server.migration_tools.initialize_text_backend', 
                    return_value=mock_text_backend):
@@ -0,0 +1,172 @@
+"""
+Unit tests for duplicate detection in store_context.
+
+Verifies that a duplicate of a stored context is answered with the existing
+context without embedding or storing it again, and that edited, scoped,
+relationship-carrying and deleted contexts are stored normally.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+try:
+    from src.mcp_server.main import (
+        StoreContextRequest,
+        _forget_stored_context,
+        store_context,
+    )
+    from src.storage.near_duplicate import MinHashLSHIndex
+except ImportError:
+    pytest.skip("Main MCP server module not available", allow_module_level=True)
+
+CONTENT = {
+    "title": "Deployment runbook",
+    "text": "Roll out the API behind the load balancer one zone at a time. Drain the old "
+            "pods, wait for in-flight requests to finish and check that the new pods pass "
+            "their readiness probes. Run the smoke tests against the public endpoint, "
+            "compare latency with the previous release and watch error rates for fifteen "
+            "minutes before promoting the release to the remaining zones.",
+}
+DECISION = {
+    "title": "Release review",
+    "text": "The release board reviewed the rollout plan for the payments API, including the "
+            "load test results, the rollback procedure, the on-call rota for the launch week "
+            "and the open security findings from the last audit. After discussion of each item "
+            "the board recorded its outcome. decision: APPROVE",
+}
+
+
+@pytest.fixture
+def backends():
+    """Fresh dedup index and mocked storage backends."""
+    qdrant = Mock()
+    qdrant.store_vector = Mock(side_effect=lambda vector_id, **kwargs: vector_id)
+    qdrant.client.retrieve = Mock(side_effect=lambda ids, **kwargs: [Mock(id=i) for i in ids])
+    neo4j = Mock()
+    neo4j.create_node = Mock(side_effect=["101", "102"])
+    neo4j.query = Mock(return_value=[{"live_count": 1}])
+    with patch("src.mcp_server.main.STORE_DEDUP_ENABLED", True), \
+            patch("src.mcp_server.main.store_dedup_index", MinHashLSHIndex(threshold=0.8)), \
+            patch("src.mcp_server.main.simple_redis", None), \
+            patch("src.mcp_server.main.qdrant_client", qdrant), \
+            patch("src.mcp_server.main.neo4j_client", neo4j), \
+            patch("src.embedding.generate_embedding", new_callable=AsyncMock) as embed:
+        embed.return_value = [0.1] * 384
+        yield qdrant, neo4j, embed
+
+
+class TestStoreContextDedup:
+    """Test store_context near-duplicate detection."""
+
+    @pytest.mark.asyncio
+    async def test_duplicate_returns_existing_context(self, backends):
+        """A duplicate is neither embedded nor stored."""
+        qdrant, neo4j, embed = backends
+
+        first = await store_context(StoreContextRequest(type="log", content=CONTENT), api_key_info=None)
+        second = await store_context(StoreContextRequest(type="log", content=CONTENT), api_key_info=None)
+
+        assert second["success"] is True
+        assert second["id"] == second["duplicate_of"] == first["id"]
+        assert second["vector_id"] == first["vector_id"]
+        assert second["graph_id"] == "101"
+        embed.assert_awaited_once()
+        qdrant.store_vector.assert_called_once()
+        neo4j.create_node.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_one_word_edit_is_stored(self, backends):
+        """A near-duplicate whose one-word edit changes its meaning is stored."""
+        qdrant, _, _ = backends
+        rejected = {**DECISION, "text": DECISION["text"].replace("APPROVE", "REJECT")}
+
+        first = await store_context(StoreContextRequest(type="log", content=DECISION), api_key_info=None)
+        second = await store_context(StoreContextRequest(type="log", content=rejected), api_key_info=None)
+
+        assert "duplicate_of" not in second
+        assert second["id"] != first["id"]
+        assert qdrant.store_vector.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_context_deleted_elsewhere_not_reused(self, backends):
+        """A duplicate deleted outside this process is stored again."""
+        qdrant, neo4j, _ = backends
+
+        first = await store_context(StoreContextRequest(type="log", content=CONTENT), api_key_info=None)
+        neo4j.query.return_value = [{"live_count": 0}]
+        second = await store_context(StoreContextRequest(type="log", content=CONTENT), api_key_info=None)
+
+        assert "duplicate_of" not in second
+        assert second["id"] != first["id"]
+        assert qdrant.store_vector.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_other_scope_is_stored(self, backends):
+        """The same content with another type or metadata is a new context."""
+        qdrant, _, _ = backends
+
+        first = await store_context(StoreContextRequest(type="log", content=CONTENT), api_key_info=None)
+        second = await store_context(
+            StoreContextRequest(type="log", content=CONTENT, metadata={"source": "ci"}),
+            api_key_info=None,
+        )
+
+        assert "duplicate_of" not in second
+        assert second["id"] != first["id"]
+        assert qdrant.store_vector.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_relationships_always_stored(self, backends):
+        """Requests with relationships bypass deduplication."""
+        qdrant, neo4j, _ = backends
+        neo4j.query.return_value = []
+
+        await store_context(StoreContextRequest(type="log", content=CONTENT), api_key_info=None)
+        result = await store_context(
+            StoreContextRequest(
+                type="log", content=CONTENT, relationships=[{"type": "FOLLOWS", "target": "ctx-1"}]
+            ),
+            api_key_info=None,
+        )
+
+        assert "duplicate_of" not in result
+        assert qdrant.store_vector.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_deleted_context_not_reused(self, backends):
+        """A deleted context no longer stands in for duplicates."""
+        qdrant, _, _ = backends
+
+        first = await store_context(StoreContextRequest(type="log", content=CONTENT), api_key_info=None)
+        _forget_stored_context(first["id"])
+        second = await store_context(StoreContextRequest(type="log", content=CONTENT), api_key_info=None)
+
+        assert "duplicate_of" not in second
+        assert qdrant.store_vector.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_embedding_not_indexed(self, backends):
+        """Contexts stored without a vector are not used as duplicates."""
+        qdrant, _, embed = backends
+        embed.side_effect = [RuntimeError("down"), [0.1] * 384]
+
+        with patch("src.mcp_server.main._generate_embedding", new_callable=AsyncMock) as legacy:
+            legacy.side_effect = ValueError("unavailable")
+            first = await store_context(StoreContextRequest(type="log", content=CONTENT), api_key_info=None)
+        second = await store_context(StoreContextRequest(type="log", content=CONTENT), api_key_info=None)
+
+        assert first["embedding_status"] == "failed"
+        assert "duplicate_of" not in second
+        qdrant.store_vector.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_disabled(self, backends):
+        """STORE_DEDUP_ENABLED=false (the default) stores every request."""
+        qdrant, _, _ = backends
+
+        with patch("src.mcp_server.main.STORE_DEDUP_ENABLED", False):
+            await store_context(StoreContextRequest(type="log", content=CONTENT), api_key_info=None)
+            result = await store_context(StoreContextRequest(type="log", content=CONTENT), api_key_info=None)
+
+        assert "duplicate_of" not in result
+        assert qdrant.store_vector.call_count == 2
@@ -0,0 +1,163 @@
+"""
+Unit tests for the store_contexts_batch endpoint.
+
+Verifies that a batch is stored with one embedding batch, one Qdrant upsert
+and one UNWIND Cypher statement, that a failed embedding batch falls back to
+embedding items one by one, and that per-item status is reported.
+"""
+
+import uuid
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+try:
+    from src.mcp_server.main import (
+        STORE_CONTEXTS_BATCH_CYPHER,
+        StoreContextRequest,
+        StoreContextsBatchRequest,
+        store_contexts_batch,
+    )
+except ImportError:
+    pytest.skip("Main MCP server module not available", allow_module_level=True)
+
+
+def _batch_request():
+    return StoreContextsBatchRequest(items=[
+        StoreContextRequest(type="design", content={"title": "API design"}),
+        StoreContextRequest(
+            type="decision",
+            content={"title": "Use REST", "details": {"why": "simple"}},
+            metadata={"source": "unit_test"},
+            relationships=[
+                {"type": "IMPLEMENTS", "target": "ctx-existing"},
+                {"type": "RELATES_TO", "target": "ctx-missing"},
+            ],
+        ),
+    ])
+
+
+def _graph_records(batch):
+    """Simulate the UNWIND statement: one record per item, only ctx-existing resolves."""
+    return [
+        {
+            "id": item["properties"]["id"],
+            "node_id": 100 + index,
+            "relationships_created": sum(
+                1 for rel in item["relationships"] if rel["target"] == "ctx-existing"
+            ),
+        }
+        for index, item in enumerate(batch)
+    ]
+
+
+class TestStoreContextsBatch:
+    """Test batched context storage."""
+
+    @patch('src.mcp_server.main.simple_redis', None)
+    @patch('src.mcp_server.main.qdrant_client')
+    @patch('src.mcp_server.main.neo4j_client')
+    @patch('src.embedding.generate_embeddings', new_callable=AsyncMock)
+    @pytest.mark.asyncio
+    async def test_batch_uses_single_round_trip_per_backend(
+        self, mock_embeddings, mock_neo4j, mock_qdrant
+    ):
+        """All items are embedded, upserted and written to the graph in one call each."""
+        mock_embeddings.return_value = [[0.1] * 384, [0.2] * 384]
+        mock_qdrant.store_vectors = Mock(side_effect=lambda points: [p[0] for p in points])
+        mock_neo4j.query = Mock(side_effect=lambda cypher, params: _graph_records(params["items"]))
+
+        result = await store_contexts_batch(_batch_request(), api_key_info=None)
+
+        assert result["success"] is True
+        assert result["stored"] == 2
+        mock_embeddings.assert_awaited_once()
+        assert mock_embeddings.call_args[0][0] == [{"title": "API design"}, {"title": "Use REST", "details": {"why": "simple"}}]
+        mock_qdrant.store_vectors.assert_called_once()
+        mock_neo4j.query.assert_called_once()
+        assert mock_neo4j.query.call_args[0][0] == STORE_CONTEXTS_BATCH_CYPHER
+        mock_neo4j.create_node.assert_not_called()
+        mock_neo4j.create_relationship.assert_not_called()
+
+        # Per-item status in request order, with UUID ids shared by both backends
+        first, second = result["results"]
+        assert [first["index"], second["index"]] == [0, 1]
+        for item in result["results"]:
+            uuid.UUID(item["id"])
+            assert item["vector_id"] == item["id"]
+            assert item["embedding_status"] == "completed"
+        assert second["graph_id"] == "101"
+        assert second["relationships_created"] == 1
+        assert "1/2 relationships" in second["relationships_message"]
+
+        # Node properties are flattened the same way as store_context
+        batch = mock_neo4j.query.call_args[0][1]["items"]
+        assert batch[1]["properties"]["details_json"] == '{"why": "simple"}'
+        assert batch[1]["properties"]["source"] == "unit_test"
+        assert "searchable_text" in batch[1]["properties"]
+        assert batch[1]["relationships"][0] == {"target": "ctx-existing", "type": "IMPLEMENTS"}
+
+    @patch('src.mcp_server.main.simple_redis', None)
+    @patch('src.mcp_server.main.qdrant_client')
+    @patch('src.mcp_server.main.neo4j_client')
+    @patch('src.embedding.generate_embeddings', new_callable=AsyncMock)
+    @pytest.mark.asyncio
+    async def test_vector_failure_keeps_graph_writes(
+        self, mock_embeddings, mock_neo4j, mock_qdrant
+    ):
+        """A failed embedding batch is reported per item while graph storage proceeds."""
+        mock_embeddings.side_effect = Exception("model unavailable")
+        mock_neo4j.query = Mock(side_effect=lambda cypher, params: _graph_records(params["items"]))
+
+        with patch('src.mcp_server.main._generate_embedding', new_callable=AsyncMock) as legacy:
+            legacy.side_effect = ValueError("unavailable")
+            result = await store_contexts_batch(_batch_request(), api_key_info=None)
+
+        assert result["stored"] == 2
+        mock_qdrant.store_vectors.assert_not_called()
+        for item in result["results"]:
+            assert item["success"] is True
+            assert item["vector_id"] is None
+            assert item["embedding_status"] == "failed"
+            assert item["graph_id"] is not None
+
+    @patch('src.mcp_server.main.simple_redis', None)
+    @patch('src.mcp_server.main.qdrant_client')
+    @patch('src.mcp_server.main.neo4j_client', None)
+    @patch('src.embedding.generate_embeddings', new_callable=AsyncMock)
+    @pytest.mark.asyncio
+    async def test_batch_embedding_failure_falls_back_per_item(self, mock_embeddings, mock_qdrant):
+        """A failed embedding batch is retried item by item; only the bad item misses its vector."""
+        mock_embeddings.side_effect = Exception("batch too large")
+        mock_qdrant.store_vectors = Mock(side_effect=lambda points: [p[0] for p in points])
+
+        with patch('src.mcp_server.main._generate_embedding', new_callable=AsyncMock) as legacy:
+            legacy.side_effect = [ValueError("unsupported content"), [0.2] * 384]
+            result = await store_contexts_batch(_batch_request(), api_key_info=None)
+
+        first, second = result["results"]
+        assert first["success"] is False
+        assert first["embedding_status"] == "failed"
+        assert second["success"] is True
+        assert second["vector_id"] == second["id"]
+        assert second["embedding_status"] == "completed"
+        assert [p[0] for p in mock_qdrant.store_vectors.call_args[0][0]] == [second["id"]]
+
+    @patch('src.mcp_server.main.simple_redis', None)
+    @patch('src.mcp_server.main.qdrant_client', None)
+    @patch('src.mcp_server.main.neo4j_client')
+    @pytest.mark.asyncio
+    async def test_graph_failure_marks_items_failed(self, mock_neo4j):
+        """Items stored in no backend are reported as failed."""
+        mock_neo4j.query = Mock(side_effect=RuntimeError("Neo4j unavailable"))
+
+        result = await store_contexts_batch(_batch_request(), api_key_info=None)
+
+        assert result["success"] is False
+        assert result["failed"] == 2
+        assert all(item["success"] is False for item in result["results"])
+        assert all(item["embedding_status"] == "unavailable" for item in result["results"])
+
+    def test_batch_request_requires_items(self):
+        """Empty batches are rejected by validation."""
+        with pytest.raises(ValueError):
+            StoreContextsBatchRequest(items=[])
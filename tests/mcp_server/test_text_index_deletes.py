@@ -0,0 +1,123 @@
+"""
+Unit tests for keeping the BM25 text index in step with context stores and deletes.
+
+Verifies that stored contexts match lexical search without waiting for the
+catch-up indexer, that deleted and forgotten contexts stop matching, and that
+a failed delete leaves the index untouched.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.backends.text_backend import TextSearchBackend
+from src.interfaces.backend_interface import SearchOptions
+from src.mcp_server.main import (
+    APIKeyInfo,
+    DeleteContextRequest,
+    ForgetContextRequest,
+    StoreContextRequest,
+    StoreContextsBatchRequest,
+    delete_context_endpoint,
+    forget_context_endpoint,
+    store_context,
+    store_contexts_batch,
+)
+
+
+@pytest.fixture
+def api_key_info():
+    return APIKeyInfo(
+        key_id="test_key",
+        user_id="test_user",
+        role="admin",
+        capabilities=["delete", "forget"],
+        is_agent=False,
+        metadata={},
+    )
+
+
+@pytest.fixture
+def text_backend():
+    """Text backend used by the endpoints."""
+    backend = TextSearchBackend()
+    with patch("src.mcp_server.main.text_backend", backend), \
+            patch("src.mcp_server.main.neo4j_client"), \
+            patch("src.mcp_server.main.qdrant_client"), \
+            patch("src.mcp_server.main.simple_redis", None):
+        yield backend
+
+
+async def _index(backend):
+    await backend.index_document("ctx-1", "quarterly migration runbook")
+
+
+async def _matches(backend):
+    return [r.id for r in await backend.search("migration", SearchOptions(limit=5))]
+
+
+class TestTextIndexStores:
+    """Test store endpoints add contexts to the text index."""
+
+    @pytest.mark.asyncio
+    async def test_store_adds_to_text_index(self, text_backend):
+        """A stored context matches lexical search immediately."""
+        with patch("src.embedding.generate_embedding", new_callable=AsyncMock, return_value=[0.1] * 384):
+            result = await store_context(
+                StoreContextRequest(type="log", content={"text": "migration checklist"}),
+                api_key_info=None,
+            )
+
+        assert await _matches(text_backend) == [result["id"]]
+
+    @pytest.mark.asyncio
+    async def test_batch_store_adds_to_text_index(self, text_backend):
+        """Every context of a stored batch matches lexical search immediately."""
+        items = [StoreContextRequest(type="log", content={"text": f"migration step {i}"}) for i in range(2)]
+        with patch("src.mcp_server.main.neo4j_client", None), \
+                patch("src.embedding.generate_embeddings", new_callable=AsyncMock) as embed, \
+                patch("src.mcp_server.main.qdrant_client") as qdrant:
+            embed.return_value = [[0.1] * 384] * 2
+            qdrant.store_vectors.side_effect = lambda points: [point[0] for point in points]
+            result = await store_contexts_batch(StoreContextsBatchRequest(items=items), api_key_info=None)
+
+        assert sorted(await _matches(text_backend)) == sorted(r["id"] for r in result["results"])
+
+
+class TestTextIndexDeletes:
+    """Test delete endpoints remove contexts from the text index."""
+
+    @pytest.mark.asyncio
+    async def test_delete_removes_from_text_index(self, text_backend, api_key_info):
+        """A deleted context no longer matches lexical search."""
+        await _index(text_backend)
+        with patch("src.tools.delete_operations.delete_context", return_value={"success": True}):
+            await delete_context_endpoint(
+                request=DeleteContextRequest(context_id="ctx-1", reason="cleanup", hard_delete=True),
+                api_key_info=api_key_info,
+            )
+
+        assert await _matches(text_backend) == []
+
+    @pytest.mark.asyncio
+    async def test_forget_removes_from_text_index(self, text_backend, api_key_info):
+        """A forgotten context no longer matches lexical search."""
+        await _index(text_backend)
+        with patch("src.tools.delete_operations.forget_context", return_value={"success": True}):
+            await forget_context_endpoint(
+                request=ForgetContextRequest(context_id="ctx-1", reason="cleanup", retention_days=7),
+                api_key_info=api_key_info,
+            )
+
+        assert await _matches(text_backend) == []
+
+    @pytest.mark.asyncio
+    async def test_failed_delete_keeps_text_index(self, text_backend, api_key_info):
+        """A delete that did not succeed leaves the context searchable."""
+        await _index(text_backend)
+        with patch("src.tools.delete_operations.delete_context", return_value={"success": False}):
+            await delete_context_endpoint(
+                request=DeleteContextRequest(context_id="ctx-1", reason="cleanup", hard_delete=True),
+                api_key_info=api_key_info,
+            )
+
+        assert await _matches(text_backend) == ["ctx-1"]
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Tests for in-process MCP tool dispatch used by the REST compatibility layer.
+
+Tests cover:
+- Registered tools called directly, without an HTTP client
+- Request model validation and authentication header handling
+- Sanitized errors matching the HTTP forwarding path
+- HTTP fallback for unregistered tools
+"""
+
+from typing import Optional
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from src.mcp_server import rest_compatibility, tool_dispatch
+
+
+class EchoRequest(BaseModel):
+    query: str
+    limit: int = 10
+
+
+class KeyInfo(BaseModel):
+    user_id: str
+
+
+@pytest.fixture(autouse=True)
+def registry():
+    """Run each test against an empty registry, restoring main.py's afterwards."""
+    saved = dict(tool_dispatch._handlers)
+    tool_dispatch.clear_tools()
+    yield
+    tool_dispatch.clear_tools()
+    tool_dispatch._handlers.update(saved)
+
+
+def _request(headers=None):
+    request = Mock()
+    request.headers = headers or {}
+    return request
+
+
+class TestInProcessDispatch:
+    """Test forward_to_mcp_tool with registered handlers."""
+
+    @pytest.mark.asyncio
+    async def test_registered_tool_skips_http(self):
+        """Test a registered tool runs in-process with a validated model."""
+        handler = AsyncMock(return_value={"success": True, "results": []})
+        tool_dispatch.register_tool("retrieve_context", handler, EchoRequest)
+
+        with patch("httpx.AsyncClient") as mock_client_class:
+            result = await rest_compatibility.forward_to_mcp_tool(
+                _request(), "/tools/retrieve_context", {"query": "redis", "limit": "5"}
+            )
+
+        mock_client_class.assert_not_called()
+        assert result == {"success": True, "results": []}
+        body = handler.call_args.args[0]
+        assert isinstance(body, EchoRequest)
+        assert body.limit == 5
+
+    @pytest.mark.asyncio
+    async def test_auth_dependency_receives_headers(self):
+        """Test the API key dependency sees the caller's headers."""
+        auth = AsyncMock(return_value=KeyInfo(user_id="agent-1"))
+        handler = AsyncMock(return_value={"success": True})
+        tool_dispatch.register_tool("store_context", handler, EchoRequest, auth_dependency=auth)
+        request = _request({"x-api-key": "vmk_test", "authorization": "Bearer t"})
+
+        await rest_compatibility.forward_to_mcp_tool(request, "/tools/store_context", {"query": "x"})
+
+        auth.assert_awaited_once_with(request, x_api_key="vmk_test", authorization="Bearer t")
+        assert handler.call_args.kwargs["api_key_info"].user_id == "agent-1"
+
+    @pytest.mark.asyncio
+    async def test_auth_failure_is_sanitized(self):
+        """Test authentication errors keep their status with a generic detail."""
+        auth = AsyncMock(side_effect=HTTPException(status_code=401, detail="Invalid API key"))
+        handler = AsyncMock()
+        tool_dispatch.register_tool("store_context", handler, EchoRequest, auth_dependency=auth)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await rest_compatibility.forward_to_mcp_tool(_request(), "/tools/store_context", {"query": "x"})
+
+        assert exc_info.value.status_code == 401
+        assert exc_info.value.detail == "Internal service error"
+        handler.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_invalid_payload_returns_422(self):
+        """Test payloads failing model validation are rejected like the route."""
+        handler = AsyncMock()
+        tool_dispatch.register_tool("retrieve_context", handler, EchoRequest)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await rest_compatibility.forward_to_mcp_tool(_request(), "/tools/retrieve_context", {"limit": 3})
+
+        assert exc_info.value.status_code == 422
+        handler.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_handler_error_is_sanitized(self):
+        """Test handler exceptions do not leak details."""
+        handler = AsyncMock(side_effect=RuntimeError("neo4j password in traceback"))
+        tool_dispatch.register_tool("query_graph", handler, EchoRequest)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await rest_compatibility.forward_to_mcp_tool(_request(), "/tools/query_graph", {"query": "x"})
+
+        assert exc_info.value.status_code == 500
+        assert "password" not in exc_info.value.detail
+
+    @pytest.mark.asyncio
+    async def test_result_is_json_encoded(self):
+        """Test results are encoded as the HTTP route would return them."""
+        from datetime import datetime
+
+        handler = AsyncMock(return_value={"created_at": datetime(2025, 1, 2, 3, 4, 5)})
+        tool_dispatch.register_tool("retrieve_context", handler, EchoRequest)
+
+        result = await rest_compatibility.forward_to_mcp_tool(
+            _request(), "/tools/retrieve_context", {"query": "x"}
+        )
+
+        assert result == {"created_at": "2025-01-02T03:04:05"}
+
+    @pytest.mark.asyncio
+    async def test_unregistered_tool_uses_http(self):
+        """Test tools without a registration still go over HTTP."""
+        with patch("httpx.AsyncClient") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_response = Mock()
+            mock_response.status_code = 200
+            mock_response.json.return_value = {"success": True}
+            mock_client.post.return_value = mock_response
+            mock_client_class.return_value.__aenter__.return_value = mock_client
+
+            result = await rest_compatibility.forward_to_mcp_tool(_request(), "/tools/other", {})
+
+        assert result == {"success": True}
+        mock_client.post.assert_awaited_once()
+
+
+class TestRegistry:
+    """Test tool registration helpers."""
+
+    def test_register_and_get(self):
+        """Test a registered tool can be looked up by name."""
+        handler = AsyncMock()
+        tool_dispatch.register_tool("store_context", handler, EchoRequest)
+
+        tool: Optional[tool_dispatch.ToolHandler] = tool_dispatch.get_tool("store_context")
+        assert tool.handler is handler
+        assert tool.request_model is EchoRequest
+        assert tool_dispatch.get_tool("missing") is None
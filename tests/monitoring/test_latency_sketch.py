@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tests for src/monitoring/latency_sketch.py.
+
+Tests cover:
+- Quantile accuracy within the configured relative error
+- Merging sketches matches a sketch of the combined values
+- Bounded bin count
+- Time-bucketed windows, ring wrap-around and prorated recent counts
+"""
+
+import random
+
+import pytest
+
+from src.monitoring.latency_sketch import LatencySketch, WindowedLatencySketch
+
+
+def _exact_quantile(values, q):
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class TestLatencySketch:
+    """Test the DDSketch-style quantile sketch."""
+
+    def test_empty_sketch(self):
+        """Test an empty sketch reports zeros."""
+        sketch = LatencySketch()
+        assert sketch.count == 0
+        assert sketch.quantile(0.95) == 0.0
+        assert sketch.mean == 0.0
+
+    @pytest.mark.parametrize("q", [0.5, 0.9, 0.95, 0.99])
+    def test_quantiles_within_relative_error(self, q):
+        """Test quantiles of a skewed distribution stay within 1% of exact."""
+        rng = random.Random(42)
+        values = [rng.lognormvariate(3, 1.2) for _ in range(20000)]
+        sketch = LatencySketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        exact = _exact_quantile(values, q)
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.01)
+
+    def test_merge_matches_combined_sketch(self):
+        """Test merging two sketches equals sketching all values at once."""
+        left, right, combined = LatencySketch(), LatencySketch(), LatencySketch()
+        for i in range(1, 501):
+            (left if i % 2 else right).add(float(i))
+            combined.add(float(i))
+
+        left.merge(right)
+
+        assert left.bins == combined.bins
+        assert left.count == combined.count == 500
+        assert left.quantile(0.99) == combined.quantile(0.99)
+        assert (left.min, left.max) == (1.0, 500.0)
+
+    def test_merge_rejects_different_accuracy(self):
+        """Test sketches with different bin widths cannot be merged."""
+        other = LatencySketch(relative_accuracy=0.05)
+        other.add(1.0)
+        with pytest.raises(ValueError):
+            LatencySketch(relative_accuracy=0.01).merge(other)
+
+    def test_bins_are_bounded(self):
+        """Test memory stays bounded by collapsing the lowest bins."""
+        sketch = LatencySketch(max_bins=32)
+        for exponent in range(-3, 6):
+            for step in range(1, 100):
+                sketch.add(step * 10.0 ** exponent)
+
+        assert len(sketch.bins) <= 32
+        assert sketch.quantile(0.99) == pytest.approx(_exact_quantile(
+            [step * 10.0 ** exponent for exponent in range(-3, 6) for step in range(1, 100)], 0.99
+        ), rel=0.01)
+
+    def test_zero_durations(self):
+        """Test values at or below min_value are counted without a log bin."""
+        sketch = LatencySketch()
+        sketch.add(0.0)
+        sketch.add(10.0)
+
+        assert sketch.zero_count == 1
+        assert sketch.quantile(0.0) == 0.0
+        assert sketch.quantile(0.99) == 10.0
+
+
+class TestWindowedLatencySketch:
+    """Test the ring of time-bucketed sketches."""
+
+    def test_window_selects_buckets(self):
+        """Test snapshots only merge buckets inside the requested window."""
+        window = WindowedLatencySketch(window_seconds=300, bucket_seconds=60)
+        window.record(10.0, now=1000.0)
+        window.record(20.0, is_error=True, now=1070.0)
+        window.record(30.0, now=1130.0)
+
+        sketch, errors = window.snapshot(now=1130.0)
+        assert sketch.count == 3
+        assert errors == 1
+
+        sketch, errors = window.snapshot(window_seconds=60, now=1130.0)
+        assert sketch.count == 1
+        assert sketch.quantile(0.5) == 30.0
+        assert errors == 0
+
+    def test_ring_wraps_and_expires_old_buckets(self):
+        """Test buckets older than the ring are overwritten and not reported."""
+        window = WindowedLatencySketch(window_seconds=120, bucket_seconds=60)
+        assert window.num_buckets == 2
+
+        window.record(500.0, now=0.0)
+        window.record(5.0, now=120.0)  # reuses slot 0
+
+        sketch, _ = window.snapshot(now=120.0)
+        assert sketch.count == 1
+        assert sketch.max == 5.0
+
+        window.record(6.0, now=170.0)
+        assert window.snapshot(now=400.0)[0].count == 0
+
+    def test_recent_count_prorates_partial_bucket(self):
+        """Test the bucket straddling the window start is prorated."""
+        window = WindowedLatencySketch(window_seconds=600, bucket_seconds=60)
+        for _ in range(60):
+            window.record(1.0, now=60.0)  # bucket [60, 120)
+        for _ in range(10):
+            window.record(1.0, now=125.0)  # bucket [120, 180)
+
+        # Last 60s from t=150 covers [90, 150): half of the older bucket.
+        assert window.recent_count(60, now=150.0) == pytest.approx(40.0)
+
+    def test_invalid_window(self):
+        """Test non-positive windows are rejected."""
+        with pytest.raises(ValueError):
+            WindowedLatencySketch(window_seconds=0)
@@ -90,7 +90,7 @@ class TestEndpointStats:
         assert stats.request_count == 0
         assert stats.error_count == 0
         assert stats.total_duration_ms == 0.0
-        assert len(stats.durations) == 0
+        assert stats.latency.snapshot()[0].count == 0
         assert stats.last_request is None
     
     def test_error_rate_calculation(self):
@@ -136,7 +136,7 @@ class TestEndpointStats:
         # Add sorted duration data: 10, 20, 30, ..., 100
         durations = [float(i * 10) for i in range(1, 11)]
         for duration in durations:
-            stats.durations.append(duration)
+            stats.record(duration)
         
         # P95 should be around 95th percentile (95% of 10 items = index 9)
         assert stats.p95_duration_ms == 100.0
@@ -149,12 +149,12 @@ class TestEndpointStats:
         stats = EndpointStats()
         
         # Single value
-        stats.durations.append(50.0)
+        stats.record(50.0)
         assert stats.p95_duration_ms == 50.0
         assert stats.p99_duration_ms == 50.0
         
         # Two values
-        stats.durations.append(100.0)
+        stats.record(100.0)
         assert stats.p95_duration_ms == 100.0
         assert stats.p99_duration_ms == 100.0
 
@@ -190,8 +190,8 @@ class TestRequestMetricsCollector:
         assert stats.request_count == 1
         assert stats.error_count == 0
         assert stats.total_duration_ms == 45.2
-        assert len(stats.durations) == 1
-        assert stats.durations[0] == 45.2
+        assert stats.latency.snapshot()[0].count == 1
+        assert stats.p95_duration_ms == 45.2
     
     @pytest.mark.asyncio
     async def test_record_error_request(self, collector):
@@ -219,7 +219,7 @@ class TestRequestMetricsCollector:
         assert stats.error_count == 1
         assert stats.error_rate_percent == pytest.approx(33.33, rel=1e-2)
         assert stats.avg_duration_ms == pytest.approx(51.67, rel=1e-2)
-        assert len(stats.durations) == 3
+        assert stats.latency.snapshot()[0].count == 3
     
     @pytest.mark.asyncio
     async def test_global_stats_empty(self, collector):
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Smoke tests for tools/benchmarks/retrieval_load_benchmark.py.
+
+Tests cover:
+- Latency model specs
+- Deterministic fakes and operation mixes
+- A tiny end-to-end run producing the JSON report
+"""
+
+import pytest
+
+from tools.benchmarks.fake_backends import (
+    FakeRedis,
+    LatencyModel,
+    SyntheticContextCorpus,
+)
+from tools.benchmarks.retrieval_load_benchmark import (
+    LoadConfig,
+    build_stack,
+    generate_operations,
+    run_benchmark,
+)
+
+
+class TestFakes:
+    """Test the in-memory stand-ins."""
+
+    def test_latency_specs(self):
+        """Test supported specs parse and invalid ones are rejected."""
+        assert LatencyModel("zero").sample_ms() == 0.0
+        assert LatencyModel("constant:2.5").sample_ms() == 2.5
+        assert 1.0 <= LatencyModel("uniform:1:3", seed=1).sample_ms() <= 3.0
+        assert LatencyModel("lognormal:2:0.5", seed=1).sample_ms() > 0
+        with pytest.raises(ValueError):
+            LatencyModel("lognormal:2")
+
+    def test_corpus_is_deterministic(self):
+        """Test the same index and query key always give the same answer."""
+        corpus = SyntheticContextCorpus(1000, seed=7)
+        other = SyntheticContextCorpus(1000, seed=7)
+
+        assert corpus.context(42) == other.context(42)
+        assert corpus.sample_indices("query", 10) == other.sample_indices("query", 10)
+        assert len(set(corpus.sample_indices("query", 10))) == 10
+
+    def test_redis_pipeline_and_sets(self):
+        """Test the Redis fake supports the commands the KV index uses."""
+        redis = FakeRedis(LatencyModel("zero"))
+        pipe = redis.pipeline()
+        pipe.sadd("tok:a", "k1", "k2").sadd("tok:b", "k2").set("k2", "value")
+        pipe.execute()
+
+        assert redis.sinter(["tok:a", "tok:b"]) == {"k2"}
+        assert redis.mget(["k1", "k2"]) == [None, "value"]
+        assert redis.keys("tok:*") == ["tok:a", "tok:b"]
+
+
+class TestLoadBenchmark:
+    """Test operation generation and a tiny run."""
+
+    def test_operation_mix_is_seeded(self):
+        """Test the replayed operations depend only on the seed."""
+        corpus = SyntheticContextCorpus(1000)
+        config = LoadConfig(write_ratio=0.5)
+
+        first = generate_operations(corpus, config, 50, seed=3, include_writes=True)
+        second = generate_operations(corpus, config, 50, seed=3, include_writes=True)
+
+        assert first == second
+        assert {kind for kind, _ in first} >= {"store", "search:hybrid"}
+        assert all(kind != "store" for kind, _ in generate_operations(corpus, config, 50, 3, False))
+
+    @pytest.mark.asyncio
+    async def test_search_through_fake_stack(self):
+        """Test RetrievalCore returns results from every fake backend."""
+        config = LoadConfig(vector_latency="zero", graph_latency="zero", redis_latency="zero", kv_keys=200)
+        stack = build_stack(SyntheticContextCorpus(1000), config)
+
+        response = await stack.core.search("term1 term2", limit=5, search_mode="vector", use_cache=False)
+
+        assert response.success
+        assert response.results
+
+    @pytest.mark.asyncio
+    async def test_tiny_run_reports_json(self):
+        """Test a run reports throughput, percentiles, stages and allocations."""
+        config = LoadConfig(
+            sizes=[1000], operations=20, concurrency=4, write_ratio=0.0,
+            vector_latency="zero", graph_latency="zero", redis_latency="zero",
+            kv_keys=100, alloc_operations=5,
+        )
+
+        report = await run_benchmark(config)
+
+        result = report["results"][0]
+        assert result["corpus_size"] == 1000
+        assert result["operations"] == 20
+        assert result["throughput_ops"] > 0
+        assert set(result["latency"]) >= {"p50_ms", "p95_ms", "p99_ms"}
+        assert "backend.vector" in result["stages"]
+        assert "storage.qdrant.search" in result["stages"]
+        assert result["allocations"]["operations"] == 5
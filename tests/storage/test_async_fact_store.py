@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Tests for src/storage/async_fact_store.py
+
+Tests cover:
+- Fact writes, overwrites and history in bounded round trips
+- Listing all user facts in O(1) round trips via the per-user index
+- Backfill of facts written before the index existed
+- Interop with the synchronous FactStore keyspace
+- Forget-me deletion including unindexed keys
+"""
+
+import fnmatch
+import json
+
+import pytest
+
+from src.storage.async_fact_store import AsyncFactStore
+from src.storage.fact_store import FactStore
+
+
+class FakePipeline:
+    """Queues commands and runs them against FakeAsyncRedis in one round trip."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        self.redis.round_trips += 1
+        return [getattr(self.redis, f"_{name}")(*args, **kwargs) for name, args, kwargs in self.commands]
+
+
+class FakeAsyncRedis:
+    """Dict-backed subset of redis.asyncio.Redis that counts round trips."""
+
+    def __init__(self):
+        self.strings = {}
+        self.lists = {}
+        self.sets = {}
+        self.round_trips = 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def __getattr__(self, name):
+        sync = object.__getattribute__(self, f"_{name}")
+
+        async def command(*args, **kwargs):
+            self.round_trips += 1
+            return sync(*args, **kwargs)
+        return command
+
+    async def scan_iter(self, match="*", count=None):
+        self.round_trips += 1
+        for key in list(self.strings) + list(self.lists) + list(self.sets):
+            if fnmatch.fnmatchcase(key, match):
+                yield key.encode()
+
+    # Synchronous implementations shared by direct calls and pipelines
+    def _get(self, key):
+        value = self.strings.get(key)
+        return value.encode() if value is not None else None
+
+    def _set(self, key, value):
+        self.strings[key] = value
+        return True
+
+    def _setex(self, key, ttl, value):
+        return self._set(key, value)
+
+    def _mget(self, keys):
+        return [self._get(k) for k in keys]
+
+    def _exists(self, key):
+        return int(key in self.strings)
+
+    def _expire(self, key, ttl):
+        return True
+
+    def _lpush(self, key, value):
+        self.lists.setdefault(key, []).insert(0, value)
+        return len(self.lists[key])
+
+    def _lrange(self, key, start, end):
+        return [v.encode() for v in self.lists.get(key, [])]
+
+    def _sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+        return len(members)
+
+    def _srem(self, key, *members):
+        self.sets.get(key, set()).difference_update(members)
+        return len(members)
+
+    def _smembers(self, key):
+        return {m.encode() for m in self.sets.get(key, set())}
+
+    def _delete(self, *keys):
+        deleted = 0
+        for key in keys:
+            for store in (self.strings, self.lists, self.sets):
+                if store.pop(key, None) is not None:
+                    deleted += 1
+        return deleted
+
+    def _unlink(self, *keys):
+        return self._delete(*keys)
+
+
+class SyncAdapter:
+    """Exposes FakeAsyncRedis storage through the sync FactStore API."""
+
+    def __init__(self, fake):
+        self.fake = fake
+
+    def __getattr__(self, name):
+        return getattr(self.fake, f"_{name}")
+
+
+@pytest.fixture
+def redis():
+    return FakeAsyncRedis()
+
+
+@pytest.fixture
+def store(redis):
+    return AsyncFactStore(redis)
+
+
+class TestAsyncFactStore:
+    """Test the pipelined async fact store."""
+
+    @pytest.mark.asyncio
+    async def test_store_and_get_fact(self, store, redis):
+        """Test a write is one round trip and readable."""
+        await store.store_fact("agent", "u1", "name", "Ada", confidence=0.9)
+        assert redis.round_trips == 1
+
+        fact = await store.get_fact("agent", "u1", "name")
+        assert fact.value == "Ada"
+        assert fact.confidence == 0.9
+        assert redis.sets["fact_index:agent:u1"] == {"name"}
+
+    @pytest.mark.asyncio
+    async def test_overwrite_records_history(self, store, redis):
+        """Test the replaced version is pushed to history."""
+        await store.store_fact("agent", "u1", "name", "Ada", source_turn_id="t1")
+        await store.store_fact("agent", "u1", "name", "Grace", source_turn_id="t2")
+
+        history = await store.get_fact_history("agent", "u1", "name")
+        assert len(history) == 1
+        assert json.loads(history[0]["fact"])["value"] == "Ada"
+        assert history[0]["replaced_by"] == "t2"
+        assert (await store.get_fact("agent", "u1", "name")).value == "Grace"
+
+    @pytest.mark.asyncio
+    async def test_get_user_facts_round_trips_constant(self, store, redis):
+        """Test listing facts costs the same round trips for 3 or 300 attributes."""
+        await store.store_facts("agent", "u1", [{"attribute": f"a{i}", "value": i} for i in range(3)])
+        await store.store_facts("agent", "u2", [{"attribute": f"a{i}", "value": i} for i in range(300)])
+        await store.get_user_facts("agent", "u1")  # triggers one-time backfill check
+
+        redis.round_trips = 0
+        small = await store.get_user_facts("agent", "u1")
+        small_trips = redis.round_trips
+
+        redis.round_trips = 0
+        large = await store.get_user_facts("agent", "u2")
+
+        assert len(small) == 3
+        assert len(large) == 300
+        assert large["a299"].value == 299
+        assert small_trips == redis.round_trips == 2
+
+    @pytest.mark.asyncio
+    async def test_store_facts_single_transaction(self, store, redis):
+        """Test a batch of new facts is one round trip."""
+        stored = await store.store_facts(
+            "agent", "u1", [{"attribute": "name", "value": "Ada"}, {"attribute": "email", "value": "a@x"}]
+        )
+        assert stored == 2
+        assert redis.round_trips == 1
+
+    @pytest.mark.asyncio
+    async def test_store_fact_validation(self, store):
+        """Test required fields are enforced."""
+        with pytest.raises(ValueError):
+            await store.store_fact("", "u1", "name", "Ada")
+        with pytest.raises(ValueError):
+            await store.store_fact("agent", "u1", "", "Ada")
+
+    @pytest.mark.asyncio
+    async def test_expired_facts_pruned_from_index(self, store, redis):
+        """Test index entries whose fact expired are dropped on read."""
+        await store.store_facts("agent", "u1", [{"attribute": "name", "value": "Ada"}, {"attribute": "city", "value": "Paris"}])
+        del redis.strings["facts:agent:u1:city"]
+
+        facts = await store.get_user_facts("agent", "u1")
+        assert set(facts) == {"name"}
+        assert redis.sets["fact_index:agent:u1"] == {"name"}
+
+    @pytest.mark.asyncio
+    async def test_backfills_legacy_facts(self, store, redis):
+        """Test facts written before the index existed are found once."""
+        legacy = {
+            "value": "Ada", "confidence": 1.0, "source_turn_id": "", "updated_at": "",
+            "provenance": "user_input", "attribute": "name", "user_id": "u1", "namespace": "agent",
+        }
+        redis.strings["facts:agent:u1:name"] = json.dumps(legacy)
+
+        facts = await store.get_user_facts("agent", "u1")
+        assert facts["name"].value == "Ada"
+        assert redis.strings["fact_index:ready"] == "1"
+
+    @pytest.mark.asyncio
+    async def test_reads_sync_store_writes(self, store, redis):
+        """Test facts written by FactStore are visible without a backfill."""
+        redis.strings["fact_index:ready"] = "1"
+        FactStore(SyncAdapter(redis)).store_fact("agent", "u1", "email", "a@x")
+
+        facts = await store.get_user_facts("agent", "u1")
+        assert facts["email"].value == "a@x"
+
+    @pytest.mark.asyncio
+    async def test_delete_user_facts(self, store, redis):
+        """Test forget-me removes indexed and unindexed keys."""
+        await store.store_fact("agent", "u1", "name", "Ada")
+        await store.store_fact("agent", "u1", "name", "Grace")
+        redis.strings["facts:agent:u1:stray"] = "{}"
+
+        deleted = await store.delete_user_facts("agent", "u1")
+
+        assert deleted == 3
+        assert await store.get_user_facts("agent", "u1") == {}
+        assert "fact_index:agent:u1" not in redis.sets
+
+    @pytest.mark.asyncio
+    async def test_delete_fact(self, store, redis):
+        """Test deleting one fact updates the index."""
+        await store.store_fact("agent", "u1", "name", "Ada")
+        assert await store.delete_fact("agent", "u1", "name") is True
+        assert await store.delete_fact("agent", "u1", "name") is False
+        assert redis.sets["fact_index:agent:u1"] == set()
@@ -577,10 +577,9 @@ class TestHashDiffEmbedder:
             with open(yaml_file2, "w") as f:
                 yaml.dump(yaml_data2, f)
 
-            # Mock successful embedding
+            # Mock successful embedding, one vector per input text
             mock_response = Mock()
-            mock_response.data = [Mock()]
-            mock_response.data[0].embedding = [0.1, 0.2, 0.3]
+            mock_response.data = [Mock(embedding=[0.1, 0.2, 0.3]), Mock(embedding=[0.4, 0.5, 0.6])]
 
             mock_openai_client = Mock()
             mock_openai_client.embeddings.create.return_value = mock_response
@@ -603,7 +602,10 @@ class TestHashDiffEmbedder:
 
                         assert embedded == 2
                         assert total == 2
-                        assert mock_qdrant_client.upsert.call_count == 2
+                        # Both documents go out in one embedding request and one upsert
+                        mock_openai_client.embeddings.create.assert_called_once()
+                        assert mock_qdrant_client.upsert.call_count == 1
+                        assert len(mock_qdrant_client.upsert.call_args.kwargs["points"]) == 2
 
     def test_embed_directory_skips_cached_files(self):
         """Test that directory embedding skips files that are already cached."""
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Tests for the pipelined HashDiffEmbedder.embed_directory.
+
+Tests cover:
+- One embedding request and one upsert per batch
+- Per-document fallback when a batch request fails
+- Hash cache saved after every batch and progress reported
+- Parsing in the calling process and in a process pool
+"""
+
+import json
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+import yaml
+
+from src.storage.hash_diff_embedder import EmbeddingProgress, HashDiffEmbedder
+
+
+def _embeddings_response(**kwargs):
+    """OpenAI response with one embedding per input text."""
+    texts = kwargs["input"]
+    texts = texts if isinstance(texts, list) else [texts]
+    return Mock(data=[Mock(embedding=[float(len(text)), 0.5]) for text in texts])
+
+
+@pytest.fixture
+def documents(tmp_path):
+    """Directory of five YAML documents."""
+    for i in range(5):
+        with open(tmp_path / f"doc{i}.yaml", "w") as f:
+            yaml.dump({"id": f"doc{i}", "title": f"Doc {i}", "content": "x" * (i + 1)}, f)
+    return tmp_path
+
+
+def _embedder(tmp_path, **embedding_config):
+    with patch.object(HashDiffEmbedder, "_load_config", return_value={}), patch.object(
+        HashDiffEmbedder,
+        "_load_perf_config",
+        return_value={"vector_db": {"embedding": {"parse_workers": 0, **embedding_config}}},
+    ), patch.object(HashDiffEmbedder, "_load_hash_cache", return_value={}):
+        embedder = HashDiffEmbedder()
+    embedder.hash_cache_path = tmp_path / "cache" / "hash_cache.json"
+    embedder.openai_client = Mock()
+    embedder.openai_client.embeddings.create.side_effect = _embeddings_response
+    embedder.client = Mock()
+    return embedder
+
+
+class TestEmbedDirectoryPipeline:
+    """Test the walk, parse, embed and upsert stages together."""
+
+    def test_batches_requests_and_upserts(self, documents):
+        """Test each batch is embedded in one request and stored in one upsert."""
+        embedder = _embedder(documents, batch_size=2)
+
+        embedded, total = embedder.embed_directory(documents)
+
+        assert (embedded, total) == (5, 5)
+        batch_sizes = sorted(
+            len(call.kwargs["input"]) for call in embedder.openai_client.embeddings.create.call_args_list
+        )
+        assert batch_sizes == [1, 2, 2]
+        assert sorted(len(call.kwargs["points"]) for call in embedder.client.upsert.call_args_list) == [1, 2, 2]
+        assert {entry["document_id"] for entry in embedder.hash_cache.values()} == {
+            f"doc{i}" for i in range(5)
+        }
+
+    def test_unchanged_files_skipped_on_rerun(self, documents):
+        """Test a second run embeds only the file that changed."""
+        embedder = _embedder(documents, batch_size=2)
+        embedder.embed_directory(documents)
+        embedder.openai_client.embeddings.create.reset_mock()
+
+        with open(documents / "doc3.yaml", "w") as f:
+            yaml.dump({"id": "doc3", "title": "Doc 3", "content": "changed"}, f)
+        embedded, total = embedder.embed_directory(documents)
+
+        assert (embedded, total) == (1, 5)
+        embedder.openai_client.embeddings.create.assert_called_once()
+
+    def test_batch_failure_falls_back_to_single_documents(self, documents):
+        """Test a failed batch request is retried document by document."""
+        embedder = _embedder(documents, batch_size=5)
+
+        def create(**kwargs):
+            if isinstance(kwargs["input"], list):
+                raise Exception("maximum context length exceeded")
+            if "xxx" in kwargs["input"] and "xxxx" not in kwargs["input"]:
+                raise Exception("maximum context length exceeded")
+            return _embeddings_response(**kwargs)
+
+        embedder.openai_client.embeddings.create.side_effect = create
+        progress = []
+
+        with patch("click.echo") as mock_echo:
+            embedded, total = embedder.embed_directory(documents, progress=progress.append)
+
+        assert (embedded, total) == (4, 5)
+        assert progress == [EmbeddingProgress(scanned=5, changed=5, embedded=4, failed=1)]
+        failures = [call.args[0] for call in mock_echo.call_args_list if call.kwargs.get("err")]
+        assert len(failures) == 1 and "doc2.yaml" in failures[0]
+
+    def test_cache_saved_after_each_batch(self, documents):
+        """Test the hash cache on disk grows batch by batch."""
+        embedder = _embedder(documents, batch_size=2, embed_concurrency=1)
+        saved = []
+
+        def progress(counts):
+            with open(embedder.hash_cache_path) as f:
+                saved.append((counts.embedded, len(json.load(f))))
+
+        embedder.embed_directory(documents, progress=progress)
+
+        assert saved == [(2, 2), (4, 4), (5, 5)]
+        assert not embedder.hash_cache_path.with_name("hash_cache.json.tmp").exists()
+
+    def test_upsert_failure_not_cached(self, documents):
+        """Test documents of a failed upsert stay out of the cache."""
+        embedder = _embedder(documents, batch_size=5)
+        embedder.client.upsert.side_effect = Exception("qdrant unavailable")
+
+        with patch("click.echo"):
+            embedded, total = embedder.embed_directory(documents)
+
+        assert (embedded, total) == (0, 5)
+        assert embedder.hash_cache == {}
+
+    def test_skips_excluded_and_invalid_files(self, documents):
+        """Test excluded directories, empty and invalid documents are not embedded."""
+        (documents / "archive").mkdir()
+        (documents / "archive" / "old.yaml").write_text("id: old\n")
+        (documents / "empty.yaml").write_text("")
+        (documents / "broken.yaml").write_text("invalid: yaml: [unclosed")
+        embedder = _embedder(documents)
+
+        with patch("click.echo") as mock_echo:
+            embedded, total = embedder.embed_directory(documents)
+
+        assert (embedded, total) == (5, 8)
+        errors = [call.args[0] for call in mock_echo.call_args_list if call.kwargs.get("err")]
+        assert len(errors) == 1 and "broken.yaml" in errors[0]
+
+    def test_process_pool_parsing(self, documents):
+        """Test parsing in worker processes gives the same result."""
+        embedder = _embedder(documents, parse_workers=2, batch_size=2)
+
+        embedded, total = embedder.embed_directory(documents)
+
+        assert (embedded, total) == (5, 5)
+        assert embedder.client.upsert.call_count == 3
+
+    def test_stage_error_propagates(self, documents):
+        """Test an unexpected error in a stage stops the run and is raised."""
+        embedder = _embedder(documents)
+
+        with patch.object(Path, "rglob", side_effect=RuntimeError("walk failed")):
+            with pytest.raises(RuntimeError, match="walk failed"):
+                embedder.embed_directory(documents)
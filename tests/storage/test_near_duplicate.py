@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Tests for vectorized MinHash/SimHash signatures and the LSH index.
+
+Tests cover:
+- Signatures identical to applying each permutation token by token
+- SimHash identical to the per-bit reference loop
+- Band selection and near-duplicate queries with scopes, removal and eviction
+"""
+
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from src.storage.near_duplicate import (
+    MinHasher,
+    MinHashLSHIndex,
+    choose_bands,
+    jaccard,
+    simhash,
+    token_hash,
+    word_shingles,
+)
+
+TEXT = (
+    "Veris Memory stores contexts in vector and graph databases so agents can "
+    "retrieve decisions designs and traces through hybrid search later on"
+)
+
+
+def _reference_simhash(tokens):
+    votes = [0] * 64
+    for token, count in Counter(tokens).items():
+        value = token_hash(token)
+        for bit in range(64):
+            votes[bit] += count if value >> bit & 1 else -count
+    return sum(1 << bit for bit in range(64) if votes[bit] > 0)
+
+
+class TestSignatures:
+    """Test the vectorized signatures against scalar references."""
+
+    def test_minhash_matches_scalar_permutations(self):
+        """Test each signature value is the minimum of its permutation."""
+        hasher = MinHasher(64)
+        tokens = word_shingles(TEXT) + ["中文", b"raw bytes", 12345]
+
+        signature = hasher.signature(tokens)
+
+        expected = [min(perm(token) for token in tokens) for perm in hasher.permutations()]
+        assert signature.dtype == np.uint32
+        assert signature.tolist() == expected
+
+    def test_minhash_chunked_matches_unchunked(self, monkeypatch):
+        """Test splitting large token sets into blocks gives the same signature."""
+        hasher = MinHasher(32)
+        tokens = [f"token-{i}" for i in range(500)]
+        expected = hasher.signature(tokens)
+
+        monkeypatch.setattr("src.storage.near_duplicate._CHUNK_TOKENS", 7)
+        assert np.array_equal(hasher.signature(tokens), expected)
+
+    def test_minhash_seeded_and_empty(self):
+        """Test fixed seeds reproduce signatures and empty input gives zeros."""
+        assert np.array_equal(MinHasher(16).signature(["a", "b"]), MinHasher(16).signature(["b", "a"]))
+        assert not np.array_equal(
+            MinHasher(16, seed=1).signature(["a"]), MinHasher(16, seed=2).signature(["a"])
+        )
+        assert MinHasher(16).signature([]).tolist() == [0] * 16
+
+    def test_from_permutations_round_trip(self):
+        """Test a MinHasher rebuilt from its permutations is identical."""
+        hasher = MinHasher(16)
+        rebuilt = MinHasher.from_permutations(hasher.permutations())
+        assert np.array_equal(rebuilt.signature(["x", "y"]), hasher.signature(["x", "y"]))
+
+    @pytest.mark.parametrize("tokens", [
+        TEXT.split(),
+        ["same"] * 5 + ["other"] * 2,
+        ["\x00", " ", "😀"],
+    ])
+    def test_simhash_matches_reference(self, tokens):
+        """Test the count-weighted SimHash equals the per-bit loop."""
+        assert simhash(tokens) == _reference_simhash(tokens)
+
+    def test_simhash_empty(self):
+        """Test empty input hashes to zero."""
+        assert simhash([]) == 0
+
+    def test_jaccard_estimate(self):
+        """Test similar token sets estimate close to their true Jaccard."""
+        hasher = MinHasher(256)
+        words = [f"w{i}" for i in range(100)]
+        estimate = jaccard(hasher.signature(words[:90]), hasher.signature(words[10:]))
+        assert abs(estimate - 80 / 100) < 0.1
+        assert jaccard(np.zeros(3), np.zeros(4)) == 0.0
+
+
+class TestWordShingles:
+    """Test content tokenization."""
+
+    def test_shingles(self):
+        """Test word trigrams are lowercased and punctuation is ignored."""
+        assert word_shingles("One, two THREE four") == ["one two three", "two three four"]
+
+    def test_short_text(self):
+        """Test short texts become one shingle and empty texts none."""
+        assert word_shingles("Hello world") == ["hello world"]
+        assert word_shingles("  ") == []
+
+
+class TestMinHashLSHIndex:
+    """Test near-duplicate lookups."""
+
+    @pytest.fixture
+    def hasher(self):
+        return MinHasher()
+
+    def test_choose_bands(self):
+        """Test band layouts keep recall at the threshold."""
+        assert choose_bands(128, 0.9) == (16, 8)
+        bands, rows = choose_bands(128, 0.5)
+        assert bands * rows == 128
+        assert 1 - (1 - 0.5**rows) ** bands >= 0.95
+
+    def test_finds_near_duplicate_only(self, hasher):
+        """Test a one-word edit matches and unrelated content does not."""
+        index = MinHashLSHIndex(threshold=0.8)
+        index.add("ctx-1", hasher.signature(word_shingles(TEXT)), payload={"graph_id": "1"})
+
+        edited = TEXT.replace("later on", "later today")
+        matches = index.query(hasher.signature(word_shingles(edited)))
+        assert [m.key for m in matches] == ["ctx-1"]
+        assert 0.8 <= matches[0].similarity < 1.0
+        assert matches[0].payload == {"graph_id": "1"}
+
+        assert index.query(hasher.signature(word_shingles("completely different text here"))) == []
+
+    def test_scopes_are_separate(self, hasher):
+        """Test entries only match queries in the same scope."""
+        index = MinHashLSHIndex()
+        signature = hasher.signature(word_shingles(TEXT))
+        index.add("ctx-1", signature, scope="design")
+
+        assert index.query(signature, scope="decision") == []
+        assert index.query(signature, scope="design")[0].similarity == 1.0
+
+    def test_remove_and_replace(self, hasher):
+        """Test removed entries stop matching and re-adding replaces buckets."""
+        index = MinHashLSHIndex()
+        signature = hasher.signature(word_shingles(TEXT))
+        index.add("ctx-1", signature)
+        index.add("ctx-1", signature)
+        assert len(index) == 1
+
+        assert index.remove("ctx-1") is True
+        assert index.remove("ctx-1") is False
+        assert index.query(signature) == []
+        assert all(not buckets for buckets in index._buckets)
+
+    def test_evicts_oldest(self, hasher):
+        """Test max_entries drops the oldest entries first."""
+        index = MinHashLSHIndex(max_entries=2)
+        for i in range(3):
+            index.add(f"ctx-{i}", hasher.signature([f"document {i}"]))
+
+        assert "ctx-0" not in index
+        assert len(index) == 2
+        assert index.query(hasher.signature(["document 2"]))[0].key == "ctx-2"
+
+    def test_rejects_wrong_signature_length(self):
+        """Test signatures from another MinHasher size are refused."""
+        index = MinHashLSHIndex(num_perm=128)
+        with pytest.raises(ValueError):
+            index.add("ctx-1", MinHasher(64).signature(["a"]))
@@ -384,6 +384,149 @@ class TestVectorStoragePerformance:
         assert mock_client.upsert.call_count == 3
         assert mock_client.retrieve.call_count == 3
 
+    def test_store_vectors_single_upsert(self, vector_initializer):
+        """Test that store_vectors writes and verifies a batch in one call each."""
+        mock_client = MagicMock()
+        vector_initializer.client = mock_client
+        points = [(f"vec{i}", [0.1 * i, 0.2], {"i": i}) for i in range(1, 4)]
+        mock_client.retrieve.return_value = [MagicMock(id=vector_id) for vector_id, _, _ in points]
+        
+        result = vector_initializer.store_vectors(points)
+        
+        assert result == ["vec1", "vec2", "vec3"]
+        mock_client.upsert.assert_called_once()
+        upserted = mock_client.upsert.call_args[1]["points"]
+        assert [point.id for point in upserted] == ["vec1", "vec2", "vec3"]
+        assert upserted[2].payload == {"i": 3}
+        mock_client.retrieve.assert_called_once_with(
+            collection_name="performance_test",
+            ids=["vec1", "vec2", "vec3"],
+            with_payload=False,
+            with_vectors=False
+        )
+
+    def test_store_vectors_missing_after_upsert(self, vector_initializer):
+        """Test that store_vectors fails when part of the batch is not found."""
+        mock_client = MagicMock()
+        vector_initializer.client = mock_client
+        mock_client.retrieve.return_value = [MagicMock(id="vec1")]
+        
+        with pytest.raises(RuntimeError, match="1 of 2 vectors not found"):
+            vector_initializer.store_vectors([("vec1", [0.1], None), ("vec2", [0.2], None)])
+
+    def test_store_vectors_validates_before_writing(self, vector_initializer):
+        """Test that one invalid point rejects the batch before any write."""
+        mock_client = MagicMock()
+        vector_initializer.client = mock_client
+        
+        with pytest.raises(ValueError, match="vec2"):
+            vector_initializer.store_vectors([("vec1", [0.1], None), ("vec2", ["bad"], None)])
+        mock_client.upsert.assert_not_called()
+
+
+class TestWriteDurabilityModes:
+    """Test the verify/ack/async write durability modes."""
+
+    @staticmethod
+    def _initializer(**qdrant_overrides):
+        config = {"qdrant": {"host": "localhost", "port": 6333, "collection_name": "durability_test"}}
+        config["qdrant"].update(qdrant_overrides)
+        initializer = VectorDBInitializer(config=config, test_mode=True)
+        initializer.client = MagicMock()
+        return initializer
+
+    def test_default_mode_is_verify(self):
+        """Test that existing behavior (read-back verification) is the default."""
+        initializer = self._initializer()
+        initializer.client.retrieve.return_value = [MagicMock(vector=[0.1, 0.2])]
+
+        initializer.store_vector("vec1", [0.1, 0.2])
+
+        assert initializer.write_durability == "verify"
+        assert initializer.client.upsert.call_args[1]["wait"] is True
+        initializer.client.retrieve.assert_called_once()
+
+    def test_ack_mode_skips_read_back(self):
+        """Test that ack mode waits for the upsert but does not retrieve."""
+        initializer = self._initializer(write_durability="ack")
+
+        assert initializer.store_vector("vec1", [0.1, 0.2]) == "vec1"
+
+        assert initializer.client.upsert.call_args[1]["wait"] is True
+        initializer.client.retrieve.assert_not_called()
+        assert initializer.get_write_stats()["writes"]["ack"] == 1
+
+    def test_per_call_override(self):
+        """Test that a call can request a different mode than configured."""
+        initializer = self._initializer(write_durability="verify")
+
+        initializer.store_vector("vec1", [0.1, 0.2], durability="ack")
+
+        initializer.client.retrieve.assert_not_called()
+        with pytest.raises(ValueError, match="Invalid write durability"):
+            initializer.store_vector("vec1", [0.1, 0.2], durability="fsync")
+
+    def test_async_mode_samples_verification_in_background(self):
+        """Test that async writes do not wait and sampled writes are read back later."""
+        initializer = self._initializer(write_durability="async", verify_sample_rate=1.0)
+        initializer.write_verifier.delay_seconds = 0
+        initializer.client.retrieve.return_value = [MagicMock(vector=[0.1, 0.2])]
+
+        initializer.store_vector("vec1", [0.1, 0.2])
+        initializer.store_vectors([("vec2", [0.3, 0.4], None)])
+
+        for call_args in initializer.client.upsert.call_args_list:
+            assert call_args[1]["wait"] is False
+        assert initializer.write_verifier.wait_idle()
+        stats = initializer.get_write_stats()
+        assert stats["writes"]["async"] == 2
+        assert stats["verification"]["verified"] == 2
+        initializer.client.retrieve.assert_called_with(
+            collection_name="durability_test", ids=["vec2"], with_vectors=True
+        )
+
+    def test_async_mode_reports_mismatches(self):
+        """Test that missing and corrupted sampled writes are counted, not raised."""
+        initializer = self._initializer(write_durability="async", verify_sample_rate=1.0)
+        initializer.write_verifier.delay_seconds = 0
+        initializer.client.retrieve.side_effect = [[], [], [], [MagicMock(vector=[0.1])]]
+
+        initializer.store_vector("missing", [0.1, 0.2])
+        assert initializer.write_verifier.wait_idle()
+        initializer.store_vector("corrupted", [0.1, 0.2])
+        assert initializer.write_verifier.wait_idle()
+
+        stats = initializer.get_write_stats()["verification"]
+        assert stats["missing"] == 1
+        assert stats["corrupted"] == 1
+        assert stats["verified"] == 0
+
+    def test_async_mode_zero_sample_rate_never_reads(self):
+        """Test that a zero sample rate disables background verification."""
+        initializer = self._initializer(write_durability="async", verify_sample_rate=0.0)
+
+        initializer.store_vector("vec1", [0.1, 0.2])
+
+        assert initializer.write_verifier.wait_idle()
+        initializer.client.retrieve.assert_not_called()
+        assert initializer.get_write_stats()["verification"]["sampled"] == 0
+
+    def test_write_counts_survive_concurrent_writers(self):
+        """Test that writes from several executor threads are all counted."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        initializer = self._initializer(write_durability="ack")
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda i: initializer.store_vector(f"vec{i}", [0.1, 0.2]), range(400)))
+
+        assert initializer.get_write_stats()["writes"]["ack"] == 400
+
+    def test_invalid_configured_mode_rejected(self):
+        """Test that an unknown configured mode fails fast."""
+        with pytest.raises(ValueError, match="Invalid write durability"):
+            self._initializer(write_durability="sometimes")
+
 
 class TestErrorRecoveryScenarios:
     """Test error recovery and edge case scenarios."""
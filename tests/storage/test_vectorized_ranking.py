@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized FactAwareRanker / HybridScorer ranking path.
+
+Tests cover:
+- Bit-identical scores and order against the previous per-result loop
+- Stable ordering of tied scores
+- Repeated result ids and duplicate contents
+- Per-text pattern match memoization
+"""
+
+import pytest
+
+from src.storage.fact_ranker import FactAwareRanker
+from src.storage.hybrid_scorer import HybridScorer, ScoringMode
+from tools.benchmarks.ranking_benchmark import (
+    QUERIES,
+    legacy_fact_ranking,
+    legacy_hybrid_scores,
+    synthetic_results,
+)
+
+
+@pytest.fixture
+def ranker():
+    return FactAwareRanker()
+
+
+@pytest.fixture
+def scorer(ranker):
+    return HybridScorer(fact_ranker=ranker)
+
+
+class TestVectorizedFactRanking:
+    """Test FactAwareRanker.apply_fact_ranking against the reference loop."""
+
+    @pytest.mark.parametrize("query", QUERIES + [""])
+    def test_matches_reference_exactly(self, ranker, query):
+        """Test boosts, final scores, labels and order are identical."""
+        results = synthetic_results(300, seed=3)
+
+        expected = legacy_fact_ranking(ranker, results, query)
+        actual = ranker.apply_fact_ranking(results, query)
+
+        assert [r.content for r in actual] == [e[0] for e in expected]
+        assert [r.fact_boost for r in actual] == [e[1] for e in expected]
+        assert [r.final_score for r in actual] == [e[2] for e in expected]
+        assert [r.matched_patterns for r in actual] == [e[3] for e in expected]
+
+    def test_ties_keep_input_order(self, ranker):
+        """Test equal final scores keep their original relative order."""
+        results = [{"content": f"neutral note {i}", "score": 0.5} for i in range(10)]
+        ranked = ranker.apply_fact_ranking(results)
+        assert [r.content for r in ranked] == [r["content"] for r in results]
+
+    def test_metadata_and_bounds(self, ranker):
+        """Test metadata is carried over and scores stay in [0, 1]."""
+        results = [
+            {"content": "My name is Ada and my email is ada@example.com", "score": 0.98, "metadata": {"k": 1}},
+            {"content": "What's my name?", "score": 0.01},
+        ]
+        ranked = ranker.apply_fact_ranking(results, "what's my name")
+        assert ranked[0].final_score == 1.0
+        assert ranked[0].metadata == {"k": 1}
+        assert ranked[-1].final_score == 0.0
+
+    def test_empty_results(self, ranker):
+        """Test no results gives no rankings."""
+        assert ranker.apply_fact_ranking([], "anything") == []
+
+    def test_pattern_matches_are_memoized(self, ranker):
+        """Test a text is only matched against the patterns once."""
+        ranker.apply_fact_ranking([{"content": "I live in Paris", "score": 0.3}], "where do i live")
+        ranker.apply_fact_ranking([{"content": "I live in Paris", "score": 0.7}], "what's my name")
+        info = ranker._cached_matches.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+
+class TestVectorizedHybridScoring:
+    """Test HybridScorer.compute_hybrid_score against the reference loop."""
+
+    @pytest.mark.parametrize("mode", [ScoringMode.FACT_OPTIMIZED, ScoringMode.GENERAL_SEARCH,
+                                      ScoringMode.SEMANTIC_HEAVY])
+    @pytest.mark.parametrize("query", QUERIES)
+    def test_matches_reference_exactly(self, scorer, mode, query):
+        """Test combined and final scores and order are identical."""
+        results = synthetic_results(200, seed=11)
+
+        expected = legacy_hybrid_scores(scorer, query, results, mode)
+        actual = scorer.compute_hybrid_score(query, results, scoring_mode=mode)
+
+        assert [s.metadata["result_id"] for s in actual] == [e[0] for e in expected]
+        assert [s.combined_score for s in actual] == [e[1] for e in expected]
+        assert [s.final_score for s in actual] == [e[2] for e in expected]
+
+    def test_duplicate_contents_and_missing_ids(self, scorer):
+        """Test fact boosts map to the first result with the same content."""
+        results = [
+            {"content": "My name is Ada", "score": 0.4},
+            {"id": "b", "content": "My name is Ada", "score": 0.6},
+            {"id": "c", "content": "What's my name?", "score": 0.6},
+        ]
+        mode = ScoringMode.FACT_OPTIMIZED
+        expected = legacy_hybrid_scores(scorer, "what's my name", results, mode)
+        actual = scorer.compute_hybrid_score("what's my name", results, scoring_mode=mode)
+
+        assert [(s.metadata["result_id"], s.final_score) for s in actual] == [(e[0], e[2]) for e in expected]
+        by_id = {s.metadata["result_id"]: s for s in actual}
+        assert by_id["0"].fact_pattern_score > 0
+        assert by_id["b"].fact_pattern_score == 0.0
+
+    def test_empty_results(self, scorer):
+        """Test no results gives no scores."""
+        assert scorer.compute_hybrid_score("what's my name", []) == []
@@ -320,6 +320,31 @@ class TestConfigValidator:
 
         os.unlink(f.name)
 
+    def test_validate_embedding_pipeline_settings(
+        self, validator: "ConfigValidator", valid_performance_config: Dict[str, Any]
+    ) -> None:
+        """Test embedding pipeline settings validation."""
+        config = valid_performance_config.copy()
+        config["vector_db"]["embedding"]["parse_workers"] = -1
+        config["vector_db"]["embedding"]["embed_concurrency"] = 0
+        config["vector_db"]["embedding"]["queue_batches"] = "2"
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
+            yaml.dump(config, f)
+            f.flush()
+
+            validator.validate_performance_config(f.name)
+
+            assert any(
+                "parse_workers must be a non-negative integer" in err for err in validator.errors
+            )
+            assert any(
+                "embed_concurrency must be a positive integer" in err for err in validator.errors
+            )
+            assert any("queue_batches must be a positive integer" in err for err in validator.errors)
+
+        os.unlink(f.name)
+
     def test_validate_search_settings(
         self, validator: "ConfigValidator", valid_performance_config: Dict[str, Any]
     ) -> None:
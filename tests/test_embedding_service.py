@@ -369,7 +369,10 @@ class TestConcurrentAccess:
         with patch('sentence_transformers.SentenceTransformer') as mock_st:
             mock_model = Mock()
             mock_model.get_sentence_embedding_dimension.return_value = 384
-            mock_model.encode.return_value = [0.1] * 384
+            # Concurrent requests are micro-batched into one encode(list) call
+            mock_model.encode.side_effect = lambda texts, **kwargs: (
+                [[0.1] * 384 for _ in texts] if isinstance(texts, list) else [0.1] * 384
+            )
             mock_st.return_value = mock_model
             
             service = EmbeddingService(config)
@@ -424,6 +427,106 @@ class TestConcurrentAccess:
             metrics = service.get_health_status()["metrics"] 
             assert metrics["cache_hits"] >= 4  # At least 4 cache hits
 
+class TestBatchEmbedding:
+    """Test the batch embedding API and the micro-batcher."""
+    
+    @staticmethod
+    def _batch_model():
+        """Mock model that returns one distinct vector per input text."""
+        mock_model = Mock()
+        mock_model.get_sentence_embedding_dimension.return_value = 384
+        vector = lambda text: [float(len(text))] * 384
+        mock_model.encode.side_effect = lambda texts, **kwargs: (
+            [vector(text) for text in texts] if isinstance(texts, list) else vector(texts)
+        )
+        return mock_model
+    
+    @pytest.mark.asyncio
+    async def test_generate_embeddings_batches_unique_misses(self):
+        """Test that generate_embeddings encodes unique cache misses in chunks."""
+        config = EmbeddingConfig(cache_enabled=True, batch_size=2)
+        
+        with patch('sentence_transformers.SentenceTransformer') as mock_st:
+            mock_model = self._batch_model()
+            mock_st.return_value = mock_model
+            
+            service = EmbeddingService(config)
+            await service.initialize()
+            await service.generate_embedding("a")  # pre-cached
+            
+            embeddings = await service.generate_embeddings(["a", "bb", "ccc", "bb", "dddd"])
+            
+            # Results in input order, duplicates share one encode
+            assert [embedding[0] for embedding in embeddings] == [1.0, 2.0, 3.0, 2.0, 4.0]
+            encoded = [c[0][0] for c in mock_model.encode.call_args_list[1:]]
+            assert encoded == [["bb", "ccc"], "dddd"]
+            assert service.get_health_status()["metrics"]["cache_hits"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_model_call(self):
+        """Test that concurrent single requests are encoded as one batch off the event loop."""
+        import threading
+        config = EmbeddingConfig(cache_enabled=False, batch_window_ms=20)
+        
+        with patch('sentence_transformers.SentenceTransformer') as mock_st:
+            mock_model = self._batch_model()
+            encode = mock_model.encode.side_effect
+            threads = []
+            mock_model.encode.side_effect = lambda texts, **kwargs: (
+                threads.append(threading.current_thread()) or encode(texts, **kwargs)
+            )
+            mock_st.return_value = mock_model
+            
+            service = EmbeddingService(config)
+            await service.initialize()
+            
+            texts = [f"text {'x' * i}" for i in range(8)]
+            results = await asyncio.gather(*(service.generate_embedding(text) for text in texts))
+            
+            assert mock_model.encode.call_count == 1
+            assert mock_model.encode.call_args[0][0] == texts
+            assert [result[0] for result in results] == [float(len(text)) for text in texts]
+            assert threading.main_thread() not in threads
+            assert service.get_health_status()["metrics"]["average_batch_size"] == 8
+    
+    @pytest.mark.asyncio
+    async def test_batching_disabled_with_zero_window(self):
+        """Test that batch_window_ms=0 encodes each request on its own."""
+        config = EmbeddingConfig(cache_enabled=False, batch_window_ms=0)
+        
+        with patch('sentence_transformers.SentenceTransformer') as mock_st:
+            mock_model = self._batch_model()
+            mock_st.return_value = mock_model
+            
+            service = EmbeddingService(config)
+            await service.initialize()
+            
+            await asyncio.gather(*(service.generate_embedding(f"text {i}") for i in range(3)))
+            
+            assert mock_model.encode.call_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_batch_failure_reaches_every_caller(self):
+        """Test that a failed batch raises EmbeddingError for each waiting request."""
+        config = EmbeddingConfig(cache_enabled=False, max_retries=1, batch_window_ms=20)
+        
+        with patch('sentence_transformers.SentenceTransformer') as mock_st:
+            mock_model = self._batch_model()
+            mock_model.encode.side_effect = Exception("CUDA out of memory")
+            mock_st.return_value = mock_model
+            
+            service = EmbeddingService(config)
+            await service.initialize()
+            
+            results = await asyncio.gather(
+                *(service.generate_embedding(f"text {i}") for i in range(3)),
+                return_exceptions=True
+            )
+            
+            assert all(isinstance(result, EmbeddingError) for result in results)
+            assert mock_model.encode.call_count == 1
+            assert service.get_health_status()["metrics"]["failed_requests"] == 3
+
 class TestEndToEndIntegration:
     """End-to-end integration tests."""
     
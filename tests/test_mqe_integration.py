@@ -283,6 +283,71 @@ class TestMQEParallelSearch(unittest.TestCase):
         asyncio.run(run_test())
 
 
+class TestMQEBatchedSearch(unittest.TestCase):
+    """Test batched multi-query search."""
+
+    def setUp(self):
+        reset_mqe_wrapper()
+        self.wrapper = MQERetrievalWrapper(
+            MQEConfig(enabled=True, num_paraphrases=2, apply_field_boosts=False)
+        )
+        self.wrapper._expander = MagicMock()
+        self.wrapper._expander.generate_paraphrases.return_value = [
+            "How to configure Neo4j?",
+            "Neo4j configuration steps",
+        ]
+
+    def tearDown(self):
+        reset_mqe_wrapper()
+
+    def test_multi_search_func_replaces_per_query_searches(self):
+        """Test all paraphrases go through one multi-query call with unchanged aggregation."""
+        async def run_test():
+            search_func = AsyncMock()
+            multi_search_func = AsyncMock(return_value=[
+                [{"id": "shared_doc", "score": 0.7}, {"id": "lexical_doc", "score": 0.5}],
+                [{"id": "shared_doc", "score": 0.9}],
+            ])
+
+            result = await self.wrapper.search_with_expansion(
+                query="How to configure Neo4j?",
+                search_func=search_func,
+                limit=10,
+                multi_search_func=multi_search_func,
+            )
+
+            search_func.assert_not_awaited()
+            multi_search_func.assert_awaited_once_with(
+                ["How to configure Neo4j?", "Neo4j configuration steps"], 10
+            )
+            self.assertFalse(result.fallback_used)
+            self.assertEqual([r["id"] for r in result.results], ["shared_doc", "lexical_doc"])
+            self.assertEqual(result.results[0]["score"], 0.9)
+            self.assertEqual(result.results[0]["source_query"], "Neo4j configuration steps")
+            self.assertEqual(self.wrapper.get_metrics()["batched_searches"], 1)
+
+        asyncio.run(run_test())
+
+    def test_batched_search_disabled_uses_per_query_searches(self):
+        """Test batched_search=False keeps one search per paraphrase."""
+        async def run_test():
+            self.wrapper.config.batched_search = False
+            search_func = AsyncMock(return_value=[{"id": "doc", "score": 0.5}])
+            multi_search_func = AsyncMock()
+
+            await self.wrapper.search_with_expansion(
+                query="How to configure Neo4j?",
+                search_func=search_func,
+                limit=10,
+                multi_search_func=multi_search_func,
+            )
+
+            self.assertEqual(search_func.await_count, 2)
+            multi_search_func.assert_not_awaited()
+
+        asyncio.run(run_test())
+
+
 class TestMQEAggregationStrategies(unittest.TestCase):
     """Test different aggregation strategies."""
 
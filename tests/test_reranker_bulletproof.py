@@ -4,6 +4,8 @@ Comprehensive unit tests for bulletproof reranker implementation
 Tests text extraction, reranking logic, fail-safes, and edge cases
 """
 
+import asyncio
+import threading
 import unittest
 from unittest.mock import Mock, patch, MagicMock
 from typing import Dict, List, Any
@@ -26,6 +28,7 @@ try:
         extract_chunk_text, 
         clamp_for_rerank, 
         BulletproofReranker, 
+        CrossEncoderBatcher,
         RerankerMetrics
     )
     DEPENDENCIES_AVAILABLE = True
@@ -315,6 +318,98 @@ class TestBulletproofReranker(unittest.TestCase):
         self.assertEqual(stats["request_count"], 0)
 
 
+@unittest.skipUnless(DEPENDENCIES_AVAILABLE and NUMERICAL_DEPS_AVAILABLE, "Reranker dependencies not available")
+class TestRerankerBatchingAndCache(unittest.TestCase):
+    """Test off-thread inference, request coalescing and the score cache"""
+    
+    def setUp(self):
+        self.mock_cross_encoder = Mock()
+        self.mock_model = Mock()
+        self.mock_cross_encoder.return_value = self.mock_model
+        self.mock_model.predict.side_effect = lambda pairs: [float(len(text)) for _, text in pairs]
+        
+        with patch('src.storage.reranker_bulletproof.CrossEncoder', self.mock_cross_encoder):
+            self.reranker = BulletproofReranker()
+        self.candidates = [
+            {"id": "short", "payload": {"text": "Short text"}, "score": 0.9},
+            {"id": "long", "payload": {"text": "A considerably longer text"}, "score": 0.5},
+        ]
+    
+    def test_repeated_candidates_are_served_from_cache(self):
+        """Test a repeated query does not call the model again"""
+        first = self.reranker.rerank("query", self.candidates)
+        second = self.reranker.rerank("query", self.candidates)
+        
+        self.assertEqual(self.mock_model.predict.call_count, 1)
+        self.assertEqual([c["id"] for c in second], [c["id"] for c in first])
+        self.assertEqual(second[0]["id"], "long")
+        self.assertEqual(self.reranker.score_cache.get_stats()["hits"], 2)
+    
+    def test_changed_content_is_rescored(self):
+        """Test the cache key includes the candidate content"""
+        self.reranker.rerank("query", self.candidates)
+        edited = [dict(self.candidates[0], payload={"text": "Edited and much longer text"}), self.candidates[1]]
+        
+        result = self.reranker.rerank("query", edited)
+        
+        self.assertEqual(self.mock_model.predict.call_count, 2)
+        self.assertEqual(self.mock_model.predict.call_args[0][0], [["query", "Edited and much longer text"]])
+        self.assertEqual(result[0]["id"], "short")
+    
+    def test_zero_scores_are_not_cached(self):
+        """Test failed predictions are retried rather than cached"""
+        self.mock_model.predict.side_effect = lambda pairs: [0.0] * len(pairs)
+        self.reranker.rerank("query", self.candidates)
+        self.reranker.rerank("query", self.candidates)
+        
+        self.assertEqual(self.mock_model.predict.call_count, 2)
+    
+    def test_arerank_runs_model_off_the_event_loop(self):
+        """Test async reranking scores on a reranker worker thread"""
+        threads = []
+        
+        def predict(pairs):
+            threads.append(threading.current_thread().name)
+            return [float(len(text)) for _, text in pairs]
+        
+        self.mock_model.predict.side_effect = predict
+        
+        result = asyncio.run(self.reranker.arerank("query", self.candidates))
+        
+        self.assertEqual(result[0]["id"], "long")
+        self.assertTrue(threads[0].startswith("reranker-"))
+    
+    def test_concurrent_requests_share_a_forward_pass(self):
+        """Test pairs from concurrent queries are coalesced into one batch"""
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        
+        def predict(pairs):
+            started.set()
+            release.wait(1)
+            calls.append(len(pairs))
+            return [1.0] * len(pairs)
+        
+        batcher = CrossEncoderBatcher(predict, max_batch_pairs=64, max_wait_ms=0, workers=1)
+        blocker = batcher.submit([["q0", "t0"]])  # Occupies the worker while the rest queue up
+        started.wait(1)
+        futures = [batcher.submit([[f"q{i}", "a"], [f"q{i}", "b"]]) for i in range(1, 4)]
+        release.set()
+        
+        self.assertEqual(blocker.result(1), [1.0])
+        self.assertEqual([f.result(1) for f in futures], [[1.0, 1.0]] * 3)
+        self.assertEqual(calls, [1, 6])
+        self.assertEqual(batcher.get_stats()["max_requests_per_batch"], 3)
+    
+    def test_batch_failure_propagates_to_every_request(self):
+        """Test a failed forward pass fails every coalesced request"""
+        batcher = CrossEncoderBatcher(Mock(side_effect=RuntimeError("CUDA OOM")), workers=1)
+        
+        with self.assertRaises(RuntimeError):
+            batcher.submit([["q", "t"]]).result(1)
+
+
 @unittest.skipUnless(DEPENDENCIES_AVAILABLE and NUMERICAL_DEPS_AVAILABLE, "Reranker dependencies not available")
 class TestIntegrationScenarios(unittest.TestCase):
     """Test real-world integration scenarios"""
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Tests for the pure-ASGI middleware pipeline.
+
+Tests cover:
+- Hook order matching a BaseHTTPMiddleware stack with the first stage outermost
+- Short-circuit responses and error handling seen only by outer stages
+- Header changes made when the response starts
+- Stages used alone through add_middleware and through dispatch
+- The API middleware composed into one pipeline
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+
+from src.api.middleware import (
+    ErrorHandlerMiddleware,
+    LoggingMiddleware,
+    MetricsMiddleware,
+    RateLimitMiddleware,
+    ValidationMiddleware,
+)
+from src.api.models import ErrorCode
+from src.utils.asgi_pipeline import MiddlewarePipeline, PipelineStage, RequestContext
+
+
+class RecordingStage(PipelineStage):
+    """Stage recording its hook calls, optionally answering or handling errors."""
+
+    def __init__(self, app=None, *, name, events, answer=None, handle_errors=False):
+        super().__init__(app)
+        self.name = name
+        self.events = events
+        self.answer = answer
+        self.handle_errors = handle_errors
+
+    async def on_request(self, ctx):
+        self.events.append(f"{self.name}.request")
+        if self.answer is not None:
+            return PlainTextResponse(self.answer, status_code=403)
+        return None
+
+    async def on_response(self, ctx, response):
+        self.events.append(f"{self.name}.response:{response.status_code}")
+        response.headers[f"X-{self.name}"] = "1"
+
+    async def on_error(self, ctx, error):
+        self.events.append(f"{self.name}.error")
+        if self.handle_errors:
+            return JSONResponse({"handled_by": self.name}, status_code=500)
+        return None
+
+
+def _app():
+    app = FastAPI()
+
+    @app.get("/ok")
+    async def ok():
+        return {"ok": True}
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    return app
+
+
+def _client(*stages):
+    app = _app()
+    app.add_middleware(MiddlewarePipeline, stages=list(stages))
+    return TestClient(app, raise_server_exceptions=False)
+
+
+class TestHookOrder:
+    """Test stages run like nested middleware."""
+
+    def test_request_outermost_first_response_innermost_first(self):
+        """Test on_request runs in stage order and on_response in reverse."""
+        events = []
+        client = _client(
+            RecordingStage(name="a", events=events),
+            RecordingStage(name="b", events=events),
+        )
+
+        response = client.get("/ok")
+
+        assert response.status_code == 200
+        assert events == ["a.request", "b.request", "b.response:200", "a.response:200"]
+        assert response.headers["X-a"] == response.headers["X-b"] == "1"
+
+    def test_short_circuit_skips_inner_stages(self):
+        """Test a response from on_request is only seen by outer stages."""
+        events = []
+        client = _client(
+            RecordingStage(name="a", events=events),
+            RecordingStage(name="b", events=events, answer="denied"),
+            RecordingStage(name="c", events=events),
+        )
+
+        response = client.get("/ok")
+
+        assert response.status_code == 403
+        assert response.text == "denied"
+        assert events == ["a.request", "b.request", "a.response:403"]
+        assert "X-b" not in response.headers
+
+    def test_error_handled_by_innermost_handler(self):
+        """Test errors go inside out and the handler's response goes outward."""
+        events = []
+        client = _client(
+            RecordingStage(name="a", events=events),
+            RecordingStage(name="b", events=events, handle_errors=True),
+            RecordingStage(name="c", events=events),
+        )
+
+        response = client.get("/boom")
+
+        assert response.json() == {"handled_by": "b"}
+        assert events == ["a.request", "b.request", "c.request", "c.error", "b.error", "a.response:500"]
+
+    def test_unhandled_error_propagates(self):
+        """Test errors no stage handles reach the server error handler."""
+        events = []
+        client = _client(RecordingStage(name="a", events=events))
+
+        response = client.get("/boom")
+
+        assert response.status_code == 500
+        assert events == ["a.request", "a.error"]
+
+    def test_default_hooks_skipped(self):
+        """Test stages only contribute the hooks they override."""
+        pipeline = MiddlewarePipeline(None, [PipelineStage(), ErrorHandlerMiddleware()])
+        assert pipeline._on_request == (None, None)
+        assert pipeline._on_response == (None, None)
+        assert pipeline._on_error[0] is None and pipeline._on_error[1] is not None
+
+    def test_non_http_scope_passes_through(self):
+        """Test lifespan and websocket scopes go straight to the app."""
+        seen = []
+
+        async def app(scope, receive, send):
+            seen.append(scope["type"])
+
+        pipeline = MiddlewarePipeline(app, [RecordingStage(name="a", events=[])])
+        asyncio.run(pipeline({"type": "lifespan"}, None, None))
+        assert seen == ["lifespan"]
+
+
+class TestStandaloneStage:
+    """Test a stage outside a pipeline."""
+
+    def test_add_middleware_single_stage(self):
+        """Test a stage class works directly with add_middleware."""
+        events = []
+        app = _app()
+        app.add_middleware(RecordingStage, name="a", events=events)
+
+        response = TestClient(app).get("/ok")
+
+        assert response.headers["X-a"] == "1"
+        assert events == ["a.request", "a.response:200"]
+
+    @pytest.mark.asyncio
+    async def test_dispatch_matches_pipeline(self):
+        """Test dispatch applies the same hooks around call_next."""
+        events = []
+        stage = RecordingStage(name="a", events=events, handle_errors=True)
+
+        async def call_next(request):
+            return Response("ok")
+
+        async def failing_call_next(request):
+            raise RuntimeError("boom")
+
+        response = await stage.dispatch(object(), call_next)
+        assert response.headers["X-a"] == "1"
+
+        response = await stage.dispatch(object(), failing_call_next)
+        assert response.status_code == 500
+        assert events == ["a.request", "a.response:200", "a.request", "a.error"]
+
+    @pytest.mark.asyncio
+    async def test_cancellation_reraised(self):
+        """Test on_cancel observes cancellation without suppressing it."""
+        cancelled = []
+
+        class CancelStage(PipelineStage):
+            async def on_cancel(self, ctx):
+                cancelled.append(isinstance(ctx, RequestContext))
+
+        async def call_next(request):
+            raise asyncio.CancelledError()
+
+        with pytest.raises(asyncio.CancelledError):
+            await CancelStage().dispatch(object(), call_next)
+        assert cancelled == [True]
+
+
+class TestComposedAPIMiddleware:
+    """Test the API middleware as stages of one pipeline."""
+
+    def _client(self, *extra_stages):
+        return _client(
+            LoggingMiddleware(),
+            MetricsMiddleware(),
+            ValidationMiddleware(),
+            ErrorHandlerMiddleware(),
+            *extra_stages,
+        )
+
+    def test_success_has_trace_id(self):
+        """Test the trace ID header is added to successful responses."""
+        response = self._client().get("/ok")
+
+        assert response.status_code == 200
+        assert len(response.headers["X-Trace-ID"]) == 8
+
+    def test_error_structured_and_logged(self):
+        """Test errors become structured responses carrying the logged trace ID."""
+        with patch("src.api.middleware.api_logger") as mock_logger:
+            response = self._client().get("/boom")
+
+        assert response.status_code == 500
+        error = response.json()["error"]
+        assert error["code"] == ErrorCode.INTERNAL_ERROR
+        assert error["trace_id"] == response.headers["X-Trace-ID"]
+        mock_logger.error.assert_called()
+
+    def test_rate_limit_stage(self):
+        """Test rate limit headers and the 429 pass through outer stages."""
+        client = self._client(RateLimitMiddleware(requests_per_minute=1))
+
+        response = client.get("/ok")
+        assert response.headers["X-RateLimit-Remaining"] == "0"
+
+        response = client.get("/ok")
+        assert response.status_code == 429
+        assert response.json()["error"]["code"] == ErrorCode.RATE_LIMIT_ERROR
+        assert "X-Trace-ID" in response.headers
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Deterministic in-memory stand-ins for Qdrant, Neo4j and Redis.
+
+Used by retrieval_load_benchmark.py to drive the real VectorBackend,
+GraphBackend and KVBackend (and the store_context endpoint) without any
+services. Each fake sleeps for a latency drawn from a configurable
+distribution on every round trip, so the storage executor, dispatcher
+timeouts and fan-out behave as they do against real databases.
+
+The Qdrant and Neo4j fakes answer from a synthetic corpus by hashing the
+query rather than computing similarity: the benchmark measures the Veris
+hot path around the databases, not the databases themselves. The Redis fake
+keeps real data, so the KV token index and cache invalidation do real work.
+"""
+
+import fnmatch
+import functools
+import hashlib
+import itertools
+import json
+import math
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List, Optional
+
+CONTEXT_TYPES = ["design", "decision", "trace", "sprint", "log"]
+
+
+class LatencyModel:
+    """
+    Per-round-trip latency distribution.
+
+    Specs are ``zero``, ``constant:MS``, ``uniform:LOW_MS:HIGH_MS`` or
+    ``lognormal:MEDIAN_MS:SIGMA`` (a long right tail, like real databases).
+    """
+
+    def __init__(self, spec: str = "zero", seed: int = 0):
+        self.spec = spec
+        parts = spec.split(":")
+        self.kind = parts[0]
+        self.params = [float(p) for p in parts[1:]]
+        expected = {"zero": 0, "constant": 1, "uniform": 2, "lognormal": 2}
+        if self.kind not in expected or len(self.params) != expected[self.kind]:
+            raise ValueError(f"Invalid latency spec: {spec!r}")
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample_ms(self) -> float:
+        """Draw one latency in milliseconds."""
+        if self.kind == "zero":
+            return 0.0
+        if self.kind == "constant":
+            return self.params[0]
+        with self._lock:
+            if self.kind == "uniform":
+                return self._rng.uniform(self.params[0], self.params[1])
+            median, sigma = self.params
+            return self._rng.lognormvariate(math.log(median), sigma)
+
+    def wait(self) -> None:
+        """Block the calling (storage executor) thread for one round trip."""
+        delay_ms = self.sample_ms()
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+
+class SyntheticContextCorpus:
+    """Random-access corpus of contexts with a Zipf-distributed vocabulary."""
+
+    def __init__(self, size: int, vocabulary_size: int = 20000, words_per_context: int = 24,
+                 seed: int = 42):
+        self.size = size
+        self.seed = seed
+        self.words_per_context = words_per_context
+        self.vocabulary = [f"term{i}" for i in range(vocabulary_size)]
+        self.cum_weights = list(
+            itertools.accumulate(1.0 / (rank + 1) for rank in range(vocabulary_size))
+        )
+        self._epoch = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    def words(self, rng: random.Random, count: int) -> List[str]:
+        return rng.choices(self.vocabulary, cum_weights=self.cum_weights, k=count)
+
+    @functools.lru_cache(maxsize=100000)
+    def context(self, index: int) -> Dict[str, Any]:
+        """The context at ``index``; the same index always yields the same context."""
+        rng = random.Random(self.seed * 1000003 + index)
+        words = self.words(rng, self.words_per_context)
+        return {
+            "id": f"ctx-{index}",
+            "type": CONTEXT_TYPES[index % len(CONTEXT_TYPES)],
+            "title": " ".join(words[:6]),
+            "description": " ".join(words[6:]),
+            "timestamp": (self._epoch + timedelta(minutes=index)).isoformat(),
+        }
+
+    def sample_indices(self, key: Any, count: int, population: Optional[int] = None) -> List[int]:
+        """Deterministic distinct indices for a query key."""
+        population = population or self.size
+        rng = random.Random(_stable_hash(key))
+        return rng.sample(range(population), min(count, population))
+
+    def query(self, rng: random.Random) -> str:
+        """A 1-4 term query drawn from the corpus vocabulary."""
+        return " ".join(self.words(rng, rng.randint(1, 4)))
+
+
+def _stable_hash(value: Any) -> int:
+    data = value if isinstance(value, bytes) else json.dumps(value, sort_keys=True, default=str).encode()
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+class HashingEmbedder:
+    """Deterministic embedding generator (no model) with batch support."""
+
+    def __init__(self, dimensions: int = 384):
+        self.dimensions = dimensions
+
+    def embed(self, text: str) -> List[float]:
+        rng = random.Random(_stable_hash(text.encode("utf-8")))
+        return [rng.uniform(-1.0, 1.0) for _ in range(self.dimensions)]
+
+    async def generate_embedding(self, text: Any, adjust_dimensions: bool = True) -> List[float]:
+        return self.embed(text if isinstance(text, str) else json.dumps(text, sort_keys=True))
+
+    async def generate_batch_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed(text) for text in texts]
+
+
+class FakeQdrantClient:
+    """Stand-in for VectorDBInitializer."""
+
+    def __init__(self, corpus: SyntheticContextCorpus, latency: LatencyModel):
+        self.corpus = corpus
+        self.latency = latency
+        self.stored: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get_collections(self):
+        self.latency.wait()
+        return SimpleNamespace(collections=[SimpleNamespace(name="context_embeddings")])
+
+    def create_collection(self, force: bool = False) -> bool:
+        return True
+
+    def store_vector(self, vector_id: str, embedding: List[float], metadata: Optional[Dict] = None) -> str:
+        self.latency.wait()
+        with self._lock:
+            self.stored[vector_id] = dict(metadata or {})
+        return vector_id
+
+    def search(self, query_vector: List[float], limit: int = 10, filter_dict=None) -> List[Any]:
+        self.latency.wait()
+        return self._points(query_vector, limit)
+
+    def search_batch(self, query_vectors: List[List[float]], limit: int = 10, filter_dict=None) -> List[List[Any]]:
+        self.latency.wait()
+        return [self._points(vector, limit) for vector in query_vectors]
+
+    def _points(self, query_vector: List[float], limit: int) -> List[Any]:
+        indices = self.corpus.sample_indices(query_vector[:8], limit)
+        points = []
+        for rank, index in enumerate(indices):
+            context = self.corpus.context(index)
+            payload = {
+                "content": {"title": context["title"], "description": context["description"]},
+                "type": context["type"],
+                "timestamp": context["timestamp"],
+            }
+            points.append(SimpleNamespace(id=context["id"], score=0.95 - rank * 0.02, payload=payload))
+        return points
+
+
+class FakeNeo4jClient:
+    """Stand-in for Neo4jInitializer."""
+
+    def __init__(self, corpus: SyntheticContextCorpus, latency: LatencyModel):
+        self.corpus = corpus
+        self.latency = latency
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.relationships = 0
+        self._node_ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def create_node(self, labels: List[str], properties: Dict[str, Any]) -> str:
+        self.latency.wait()
+        with self._lock:
+            node_id = str(next(self._node_ids))
+            self.nodes[properties.get("id", node_id)] = {**properties, "_node_id": node_id}
+        return node_id
+
+    def create_relationship(self, start_node: str, end_node: str, relationship_type: str = "RELATED_TO",
+                            properties: Optional[Dict] = None) -> bool:
+        self.latency.wait()
+        with self._lock:
+            self.relationships += 1
+        return True
+
+    def query(self, cypher: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        self.latency.wait()
+        parameters = parameters or {}
+        statement = cypher.lstrip().upper()
+        if statement.startswith(("CREATE", "DROP", "SHOW")):
+            return []
+        if "n.id = $id" in cypher:
+            node = self.nodes.get(parameters.get("id"))
+            return [{"node_id": node["_node_id"]}] if node else []
+
+        search_key = {k: v for k, v in parameters.items() if k != "limit"}
+        indices = self.corpus.sample_indices(search_key, int(parameters.get("limit", 10)))
+        return [
+            {"n": self.corpus.context(index), "score": 4.0 / (rank + 1)}
+            for rank, index in enumerate(indices)
+        ]
+
+
+def _match_keys(keys: List[str], pattern: str) -> List[str]:
+    """Glob-match keys, with a fast path for plain ``prefix*`` patterns."""
+    prefix = pattern[:-1]
+    if pattern.endswith("*") and not any(c in prefix for c in "*?[\\"):
+        return [key for key in keys if key.startswith(prefix)]
+    return [key for key in keys if fnmatch.fnmatchcase(key, pattern)]
+
+
+class FakePipeline:
+    """Queues commands and runs them in one simulated round trip."""
+
+    def __init__(self, redis: "FakeRedis"):
+        self.redis = redis
+        self.commands: List[Any] = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self) -> List[Any]:
+        self.redis.latency.wait()
+        with self.redis.lock:
+            return [getattr(self.redis, f"_{name}")(*args, **kwargs) for name, args, kwargs in self.commands]
+
+
+class FakeRedis:
+    """
+    Dict-backed subset of redis.Redis, also usable as a SimpleRedisClient.
+
+    ``client`` and ``redis_client`` point back at the instance so both
+    KVBackend and the server's simple_redis global can use it directly.
+    """
+
+    def __init__(self, latency: LatencyModel):
+        self.latency = latency
+        self.lock = threading.RLock()
+        self.strings: Dict[str, Any] = {}
+        self.sets: Dict[str, set] = {}
+        self.client = self
+        self.redis_client = self
+
+    def populate(self, corpus: SyntheticContextCorpus, count: int) -> None:
+        """Load ``count`` corpus contexts as fact keys without simulated latency."""
+        for index in range(min(count, corpus.size)):
+            context = corpus.context(index)
+            self.strings[f"fact:{context['id']}"] = f"{context['title']} {context['description']}"
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    def __getattr__(self, name):
+        # Every public command is one round trip around its locked implementation
+        implementation = None if name.startswith("_") else getattr(type(self), f"_{name}", None)
+        if implementation is None:
+            raise AttributeError(name)
+
+        def command(*args, **kwargs):
+            self.latency.wait()
+            with self.lock:
+                return implementation(self, *args, **kwargs)
+        return command
+
+    def ping(self) -> bool:
+        return True
+
+    def scan_iter(self, match: str = "*", count: Optional[int] = None) -> Iterable[str]:
+        return iter(self.keys(match))
+
+    def keys(self, pattern: str = "*") -> List[str]:
+        self.latency.wait()
+        with self.lock:
+            candidates = list(itertools.chain(self.strings, self.sets))
+        return _match_keys(candidates, pattern)
+
+    def scan(self, cursor: int = 0, match: str = "*", count: Optional[int] = None):
+        return 0, self.keys(match)
+
+    def _get(self, key):
+        return self.strings.get(key)
+
+    def _set(self, key, value, ex=None):
+        self.strings[key] = value
+        return True
+
+    def _setex(self, key, ttl, value):
+        self.strings[key] = value
+        return True
+
+    def _mget(self, keys):
+        return [self.strings.get(key) for key in keys]
+
+    def _incr(self, key):
+        self.strings[key] = str(int(self.strings.get(key) or 0) + 1)
+        return int(self.strings[key])
+
+    def _exists(self, key):
+        return int(key in self.strings or key in self.sets)
+
+    def _delete(self, *keys):
+        return sum(
+            int(self.strings.pop(key, None) is not None or self.sets.pop(key, None) is not None)
+            for key in keys
+        )
+
+    def _sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+        return len(members)
+
+    def _srem(self, key, *members):
+        self.sets.get(key, set()).difference_update(members)
+        return len(members)
+
+    def _smembers(self, key):
+        return set(self.sets.get(key, ()))
+
+    def _sinter(self, keys):
+        groups = sorted((self.sets.get(key, set()) for key in keys), key=len)
+        return set.intersection(*groups) if groups else set()
+
+    def _info(self, section=None):
+        return {"redis_version": "fake", "used_memory": 0}
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+API middleware overhead benchmark.
+
+Drives the REST API's middleware stack in-process (no server or sockets) on a
+trivial endpoint and reports requests per second and tracemalloc peak memory
+per in-flight request for three stacks:
+
+- bare: the endpoint with no middleware, as a floor
+- legacy: every middleware as its own BaseHTTPMiddleware layer, the previous
+  arrangement (each stage's dispatch wrapped, so the logic is identical)
+- pipeline: the current arrangement from create_app, with logging, metrics,
+  validation and error handling composed into one MiddlewarePipeline and the
+  rate limiter as a pure-ASGI stage inside CORS
+
+Structured log output is disabled for all stacks so the numbers measure the
+middleware machinery rather than JSON logging.
+
+Usage:
+    python tools/benchmarks/middleware_benchmark.py
+    python tools/benchmarks/middleware_benchmark.py --requests 5000 --concurrency 1 16 --export mw.json
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Add repository root to path so the src package resolves
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
+from fastapi.middleware.trustedhost import TrustedHostMiddleware  # noqa: E402
+from slowapi import Limiter  # noqa: E402
+from slowapi.util import get_remote_address  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+from src.api.middleware import (  # noqa: E402
+    ErrorHandlerMiddleware,
+    LoggingMiddleware,
+    MetricsMiddleware,
+    MiddlewarePipeline,
+    ValidationMiddleware,
+)
+from src.api.rate_limit_middleware import RateLimitMiddleware  # noqa: E402
+from src.utils.logging_middleware import api_logger  # noqa: E402
+
+# High enough that the benchmark never hits the limit
+RATE_LIMIT = "100000000/minute"
+
+
+@dataclass
+class MiddlewareBenchmarkResult:
+    """Throughput and memory of one stack at one concurrency."""
+    stack: str
+    concurrency: int
+    requests_per_second: float
+    peak_kb_per_request: float
+    retained_kb: float
+
+
+def _endpoint_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+def _add_cors(app: FastAPI) -> None:
+    app.add_middleware(TrustedHostMiddleware, allowed_hosts=["*"])
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+        allow_headers=["*"],
+    )
+
+
+def build_bare() -> FastAPI:
+    """The endpoint alone."""
+    return _endpoint_app()
+
+
+def build_legacy() -> FastAPI:
+    """One BaseHTTPMiddleware layer per middleware, as before."""
+    app = _endpoint_app()
+    limiter = Limiter(key_func=get_remote_address)
+    app.add_middleware(BaseHTTPMiddleware, dispatch=RateLimitMiddleware(None, limiter, RATE_LIMIT).dispatch)
+    _add_cors(app)
+    for stage in (ErrorHandlerMiddleware(), ValidationMiddleware(), MetricsMiddleware(), LoggingMiddleware()):
+        app.add_middleware(BaseHTTPMiddleware, dispatch=stage.dispatch)
+    return app
+
+
+def build_pipeline() -> FastAPI:
+    """The create_app arrangement: pure-ASGI stages, one pipeline."""
+    app = _endpoint_app()
+    limiter = Limiter(key_func=get_remote_address)
+    app.add_middleware(RateLimitMiddleware, limiter=limiter, limit=RATE_LIMIT)
+    _add_cors(app)
+    app.add_middleware(
+        MiddlewarePipeline,
+        stages=[LoggingMiddleware(), MetricsMiddleware(), ValidationMiddleware(), ErrorHandlerMiddleware()],
+    )
+    return app
+
+
+STACKS: Dict[str, Callable[[], FastAPI]] = {
+    "bare": build_bare,
+    "legacy": build_legacy,
+    "pipeline": build_pipeline,
+}
+
+
+async def _request(app: FastAPI, index: int) -> int:
+    """Send one GET /ping through the ASGI app and return the status."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver"), (b"user-agent", b"middleware-benchmark")],
+        # Distinct non-exempt clients so the rate limiter does real work
+        "client": (f"10.0.{index % 250}.{index % 200 + 1}", 50000),
+        "server": ("testserver", 80),
+    }
+    status = 0
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Block like a live connection until the response is done
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def _run_batch(app: FastAPI, total: int, concurrency: int) -> None:
+    index = 0
+    while index < total:
+        batch = min(concurrency, total - index)
+        statuses = await asyncio.gather(*(_request(app, index + i) for i in range(batch)))
+        if any(status != 200 for status in statuses):
+            raise RuntimeError(f"Unexpected statuses: {sorted(set(statuses))}")
+        index += batch
+
+
+def _throughput(app: FastAPI, total: int, concurrency: int, repeats: int) -> float:
+    """Median requests per second over repeats."""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        asyncio.run(_run_batch(app, total, concurrency))
+        samples.append(time.perf_counter() - start)
+    return total / statistics.median(samples)
+
+
+def _memory(app: FastAPI, concurrency: int) -> tuple:
+    """Peak KB per in-flight request and KB retained after one batch."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        asyncio.run(_run_batch(app, concurrency, concurrency))
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (peak - baseline) / 1024 / concurrency, (current - baseline) / 1024
+
+
+def run_benchmark(total: int, concurrencies: List[int], repeats: int,
+                  stacks: Optional[List[str]] = None) -> List[MiddlewareBenchmarkResult]:
+    """Measure every stack at every concurrency."""
+    results = []
+    for concurrency in concurrencies:
+        for name in stacks or list(STACKS):
+            app = STACKS[name]()
+            # Warm up route matching, pydantic serializers and middleware stack build
+            asyncio.run(_run_batch(app, 50, concurrency))
+            rps = _throughput(app, total, concurrency, repeats)
+            peak_kb, retained_kb = _memory(app, concurrency)
+            result = MiddlewareBenchmarkResult(
+                name, concurrency, round(rps, 1), round(peak_kb, 2), round(retained_kb, 2)
+            )
+            _print_result(result)
+            results.append(result)
+    return results
+
+
+def _print_result(result: MiddlewareBenchmarkResult) -> None:
+    print(
+        f"{result.stack:>9} | concurrency={result.concurrency:>3} | "
+        f"{result.requests_per_second:10.1f} req/s | "
+        f"peak={result.peak_kb_per_request:8.2f} KB/request | retained={result.retained_kb:8.2f} KB"
+    )
+
+
+def main() -> None:
+    """Entry point for the middleware benchmark."""
+    parser = argparse.ArgumentParser(description="API middleware overhead benchmark")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per timed run")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16],
+                        help="In-flight requests per batch")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per stack (median reported)")
+    parser.add_argument("--stacks", nargs="+", choices=list(STACKS), help="Stacks to measure")
+    parser.add_argument("--export", help="Export results to JSON file")
+    args = parser.parse_args()
+
+    # Identical for every stack; printing JSON per request would dominate the timings
+    api_logger.enable_console = False
+    api_logger.stdlib_logger.disabled = True
+    MetricsMiddleware.response_times = []
+
+    results = run_benchmark(args.requests, args.concurrency, args.repeats, args.stacks)
+
+    if args.export:
+        with open(args.export, "w") as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
+        print(f"✅ Results exported to: {args.export}")
+
+
+if __name__ == "__main__":
+    main()
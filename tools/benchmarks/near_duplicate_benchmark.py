@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate detection benchmark.
+
+Measures, per document:
+
+- MinHash and SimHash signatures with the previous per-token Python loops
+  (one MD5 per hash function and token, 64 bit tests per token) against the
+  vectorized signatures of src.storage.near_duplicate
+- The store_context lookup (shingling, signature and LSH query) at several
+  index sizes, as p50/p99 latency
+
+Usage:
+    python tools/benchmarks/near_duplicate_benchmark.py
+    python tools/benchmarks/near_duplicate_benchmark.py --tokens 50 200 1000 --index-sizes 1000 50000 --export nd.json
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import statistics
+import sys
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Callable, List
+
+# Add repository root to path so the src package resolves
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.storage.near_duplicate import (  # noqa: E402
+    MinHasher,
+    MinHashLSHIndex,
+    simhash,
+    word_shingles,
+)
+
+NUM_PERM = 128
+VOCABULARY = [f"word{i}" for i in range(5000)]
+
+
+@dataclass
+class SignatureBenchmarkResult:
+    """Time per signature of one implementation at one token count."""
+    signature: str
+    implementation: str
+    tokens: int
+    ms_per_document: float
+
+
+@dataclass
+class LookupBenchmarkResult:
+    """Latency of the store_context lookup at one index size."""
+    index_size: int
+    p50_ms: float
+    p99_ms: float
+    matched: float
+
+
+def legacy_hash_functions(num_hashes: int) -> List[Callable]:
+    """The previous closures: MD5 of the token, then (a * x + b) mod 2**32."""
+    rng = random.Random(1)
+    funcs = []
+    for _ in range(num_hashes):
+        a, b = rng.randint(1, 2**32 - 1), rng.randint(0, 2**32 - 1)
+
+        def hash_func(x, a=a, b=b):
+            x = int(hashlib.md5(x.encode()).hexdigest()[:8], 16)
+            return (a * x + b) % (2**32)
+
+        funcs.append(hash_func)
+    return funcs
+
+
+def legacy_minhash(hash_funcs: List[Callable], tokens: List[str]) -> List[int]:
+    """The previous MinHash loop."""
+    return [min(hash_func(token) for token in tokens) for hash_func in hash_funcs]
+
+
+def legacy_simhash(tokens: List[str]) -> int:
+    """The previous SimHash loop."""
+    v = [0] * 64
+    for token in tokens:
+        token_hash = int(hashlib.md5(token.encode()).hexdigest(), 16)
+        for i in range(64):
+            v[i] += 1 if token_hash & (1 << i) else -1
+    return sum(1 << i for i in range(64) if v[i] > 0)
+
+
+def _document(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(VOCABULARY) for _ in range(words))
+
+
+def _per_call_ms(func: Callable[[], object], min_seconds: float = 0.3) -> float:
+    """Median milliseconds per call over repeated timed runs."""
+    samples = []
+    deadline = time.perf_counter() + min_seconds
+    while time.perf_counter() < deadline or len(samples) < 3:
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def benchmark_signatures(token_counts: List[int]) -> List[SignatureBenchmarkResult]:
+    """Legacy and vectorized signatures for documents of each size."""
+    rng = random.Random(7)
+    hasher = MinHasher(NUM_PERM)
+    legacy_funcs = legacy_hash_functions(NUM_PERM)
+    results = []
+    for count in token_counts:
+        tokens = word_shingles(_document(rng, count + 2))
+        cases = [
+            ("minhash", "legacy", lambda: legacy_minhash(legacy_funcs, tokens)),
+            ("minhash", "vectorized", lambda: hasher.signature(tokens)),
+            ("simhash", "legacy", lambda: legacy_simhash(tokens)),
+            ("simhash", "vectorized", lambda: simhash(tokens)),
+        ]
+        for signature, implementation, func in cases:
+            result = SignatureBenchmarkResult(
+                signature, implementation, len(tokens), round(_per_call_ms(func), 4)
+            )
+            print(
+                f"{result.signature:>8} | {result.implementation:>10} | tokens={result.tokens:>5} | "
+                f"{result.ms_per_document:10.4f} ms/document"
+            )
+            results.append(result)
+    return results
+
+
+def benchmark_lookup(index_sizes: List[int], words: int, queries: int) -> List[LookupBenchmarkResult]:
+    """store_context lookups against indexes of stored documents.
+
+    Half of the queries are one-word edits of an indexed document, the other
+    half unseen documents.
+    """
+    results = []
+    hasher = MinHasher(NUM_PERM)
+    for size in index_sizes:
+        rng = random.Random(size)
+        index = MinHashLSHIndex(num_perm=NUM_PERM, threshold=0.9)
+        documents = [_document(rng, words) for _ in range(size)]
+        for i, document in enumerate(documents):
+            index.add(f"ctx-{i}", hasher.signature(word_shingles(document)))
+
+        probes = []
+        for i in range(queries):
+            if i % 2:
+                probes.append(_document(rng, words))
+            else:
+                edited = rng.choice(documents).split()
+                edited[rng.randrange(len(edited))] = "edited"
+                probes.append(" ".join(edited))
+
+        latencies = []
+        matched = 0
+        for probe in probes:
+            start = time.perf_counter()
+            matches = index.query(hasher.signature(word_shingles(probe)))
+            latencies.append((time.perf_counter() - start) * 1000)
+            matched += bool(matches)
+
+        latencies.sort()
+        result = LookupBenchmarkResult(
+            size,
+            round(latencies[len(latencies) // 2], 4),
+            round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))], 4),
+            round(matched / len(probes), 3),
+        )
+        print(
+            f"index={result.index_size:>7} | p50={result.p50_ms:8.4f} ms | "
+            f"p99={result.p99_ms:8.4f} ms | matched={result.matched:.1%}"
+        )
+        results.append(result)
+    return results
+
+
+def main() -> None:
+    """Entry point for the near-duplicate benchmark."""
+    parser = argparse.ArgumentParser(description="Near-duplicate detection benchmark")
+    parser.add_argument("--tokens", type=int, nargs="+", default=[50, 200, 1000],
+                        help="Shingles per document for the signature benchmark")
+    parser.add_argument("--index-sizes", type=int, nargs="+", default=[1000, 10000, 50000],
+                        help="Indexed documents for the lookup benchmark")
+    parser.add_argument("--words", type=int, default=200, help="Words per document in the index")
+    parser.add_argument("--queries", type=int, default=1000, help="Lookups per index size")
+    parser.add_argument("--export", help="Export results to JSON file")
+    args = parser.parse_args()
+
+    print("=== Signatures ===")
+    signatures = benchmark_signatures(args.tokens)
+    print("\n=== store_context lookup ===")
+    lookups = benchmark_lookup(args.index_sizes, args.words, args.queries)
+
+    if args.export:
+        with open(args.export, "w") as f:
+            json.dump(
+                {
+                    "signatures": [asdict(r) for r in signatures],
+                    "lookups": [asdict(r) for r in lookups],
+                },
+                f,
+                indent=2,
+            )
+        print(f"✅ Results exported to: {args.export}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Ranking benchmark for HybridScorer and FactAwareRanker.
+
+Generates synthetic candidate sets mixing declarative answers, questions and
+neutral text, then times the vectorized ranking path against the previous
+per-result implementation (kept here as the reference). The vectorized path
+is timed cold (pattern match cache cleared before every query) and warm (the
+same candidates ranked again, as when stored contexts recur across queries).
+Scores from both paths are compared and the largest difference is reported;
+it is expected to be exactly 0.
+
+Usage:
+    python tools/benchmarks/ranking_benchmark.py --sizes 50 200 1000
+    python tools/benchmarks/ranking_benchmark.py --sizes 1000 --repeats 200 --export ranking.json
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# Add repository root to path so the src package resolves
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.storage.fact_ranker import FactAwareRanker  # noqa: E402
+from src.storage.hybrid_scorer import HybridScorer, ScoringMode  # noqa: E402
+
+_TEMPLATES = [
+    "My name is {name} and I work as a {job}.",
+    "my email address is {name}@example.com",
+    "I live in {city}, which I love.",
+    "I'm {age} years old and I prefer {food}.",
+    "My favorite food is {food}.",
+    "What's my name?",
+    "Do you remember my {attr}?",
+    "Where do I live? I forgot.",
+    "Can you tell me about {city}?",
+    "The meeting about {city} deployment moved to Thursday.",
+    "Release notes: fixed cache invalidation for {attr} lookups.",
+    "I have a dog named {name}. What do I feed him?",
+]
+_FILL = {
+    "name": ["Ada", "Grace", "Linus", "Barbara", "Ken"],
+    "job": ["engineer", "teacher", "pilot", "chef"],
+    "city": ["Paris", "Lagos", "Osaka", "Lima"],
+    "age": ["29", "41", "63"],
+    "food": ["ramen", "tacos", "injera", "pierogi"],
+    "attr": ["email", "phone", "name", "birthday"],
+}
+QUERIES = ["What's my name?", "what's my email", "where do I live", "tell me about deployment"]
+
+
+@dataclass
+class RankingBenchmarkResult:
+    """Timing for one candidate count and component."""
+    component: str
+    candidates: int
+    repeats: int
+    legacy_ms: float
+    cold_ms: float
+    warm_ms: float
+    cold_speedup: float
+    warm_speedup: float
+    max_score_diff: float
+
+
+def synthetic_results(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Deterministic candidate list with vector and lexical scores."""
+    rng = random.Random(seed)
+    results = []
+    for i in range(count):
+        template = rng.choice(_TEMPLATES)
+        # Unique texts so cold runs never hit the pattern match cache
+        content = f"{template.format(**{k: rng.choice(v) for k, v in _FILL.items()})} [ref {i}]"
+        results.append({
+            "id": f"ctx-{i}",
+            "content": content,
+            "score": round(rng.random(), 4),
+            "lexical_score": round(rng.random(), 4),
+            "metadata": {"rank": i},
+        })
+    return results
+
+
+def legacy_fact_ranking(ranker: FactAwareRanker, results: List[Dict[str, Any]],
+                        query: str = "") -> List[Tuple[str, float, float, List[str]]]:
+    """Previous FactAwareRanker.apply_fact_ranking: one regex search per pattern per result."""
+    import re
+
+    ranked = []
+    for result in results:
+        content = result.get("content", "")
+        original_score = result.get("score", 0.0)
+        boost_score = 0.0
+        matched = []
+        for pattern, delta, label in ranker._compiled_boost:
+            if pattern.search(content):
+                boost_score += delta
+                matched.append(f"+{label}")
+        for pattern, delta, label in ranker._compiled_demote:
+            if pattern.search(content):
+                boost_score += delta
+                matched.append(f"-{label}")
+
+        query_boost = 0.0
+        if query:
+            query_lower = query.lower()
+            content_lower = content.lower()
+            if re.search(r"\bwhat'?s my name\b", query_lower) and re.search(r"\bmy name is\b", content_lower):
+                query_boost += 0.08
+            if re.search(r"\bwhat'?s my email\b", query_lower) and re.search(r"\bmy email.*is\b", content_lower):
+                query_boost += 0.08
+            if re.search(r"\bwhere do i live\b", query_lower) and re.search(r"\bi live in\b", content_lower):
+                query_boost += 0.08
+            if re.search(r"\bwhat.*my\b", query_lower) and re.search(r"\bmy.*is\b", content_lower):
+                query_boost += 0.04
+        boost_score += query_boost
+
+        final_score = max(0.0, min(1.0, original_score + boost_score))
+        ranked.append((content, boost_score, final_score, matched))
+    ranked.sort(key=lambda r: r[2], reverse=True)
+    return ranked
+
+
+def legacy_hybrid_scores(scorer: HybridScorer, query: str, results: List[Dict[str, Any]],
+                         scoring_mode: ScoringMode) -> List[Tuple[str, float, float]]:
+    """Previous HybridScorer.compute_hybrid_score arithmetic as (result_id, combined, final)."""
+    weights = scorer.scoring_modes[scoring_mode]
+    vector_scores = {}
+    lexical_scores = {}
+    for i, result in enumerate(results):
+        result_id = result.get("id", str(i))
+        vector_scores[result_id] = result.get("score", 0.0)
+        lexical_scores[result_id] = result.get("lexical_score", 0.0)
+
+    fact_scores = {}
+    if scorer.enable_fact_patterns and weights.fact_boost > 0:
+        for content, boost, _, _ in legacy_fact_ranking(scorer.fact_ranker, results, query):
+            for i, result in enumerate(results):
+                if result.get("content") == content:
+                    fact_scores[result.get("id", str(i))] = boost
+                    break
+
+    scored = []
+    for i, result in enumerate(results):
+        result_id = result.get("id", str(i))
+        combined = (
+            weights.alpha_dense * vector_scores.get(result_id, 0.0) +
+            weights.beta_lexical * lexical_scores.get(result_id, 0.0) +
+            weights.gamma_graph * 0.0
+        )
+        final = combined + (weights.fact_boost * fact_scores.get(result_id, 0.0))
+        final = max(scorer.score_floor, min(scorer.score_ceiling, final))
+        scored.append((result_id, combined, final))
+    scored.sort(key=lambda s: s[2], reverse=True)
+    return scored
+
+
+def _time_ms(fn, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run_benchmark(sizes: List[int], repeats: int) -> List[RankingBenchmarkResult]:
+    """Time legacy and vectorized ranking for each candidate count."""
+    ranker = FactAwareRanker()
+    scorer = HybridScorer(fact_ranker=ranker, config={"enable_score_explanation": False})
+    mode = ScoringMode.FACT_OPTIMIZED
+    clear_cache = ranker._cached_matches.cache_clear
+    output = []
+
+    for size in sizes:
+        results = synthetic_results(size)
+
+        # Fact ranking
+        diff = 0.0
+        for query in QUERIES:
+            legacy = legacy_fact_ranking(ranker, results, query)
+            current = ranker.apply_fact_ranking(results, query)
+            diff = max(diff, max(
+                (abs(a[2] - b.final_score) + abs(a[1] - b.fact_boost) for a, b in zip(legacy, current)),
+                default=0.0,
+            ))
+        legacy_ms = _time_ms(lambda: [legacy_fact_ranking(ranker, results, q) for q in QUERIES], repeats)
+        cold_ms = _time_ms(
+            lambda: [(clear_cache(), ranker.apply_fact_ranking(results, q)) for q in QUERIES], repeats
+        )
+        warm_ms = _time_ms(lambda: [ranker.apply_fact_ranking(results, q) for q in QUERIES], repeats)
+        output.append(_result("fact_ranker", size, repeats, legacy_ms, cold_ms, warm_ms, diff))
+
+        # Hybrid scoring
+        diff = 0.0
+        for query in QUERIES:
+            legacy = legacy_hybrid_scores(scorer, query, results, mode)
+            current = scorer.compute_hybrid_score(query, results, scoring_mode=mode)
+            diff = max(diff, max(
+                (abs(a[2] - b.final_score) + abs(a[1] - b.combined_score) for a, b in zip(legacy, current)),
+                default=0.0,
+            ))
+        legacy_ms = _time_ms(lambda: [legacy_hybrid_scores(scorer, q, results, mode) for q in QUERIES], repeats)
+        cold_ms = _time_ms(
+            lambda: [(clear_cache(), scorer.compute_hybrid_score(q, results, scoring_mode=mode)) for q in QUERIES],
+            repeats,
+        )
+        warm_ms = _time_ms(
+            lambda: [scorer.compute_hybrid_score(q, results, scoring_mode=mode) for q in QUERIES], repeats
+        )
+        output.append(_result("hybrid_scorer", size, repeats, legacy_ms, cold_ms, warm_ms, diff))
+
+    return output
+
+
+def _result(component: str, size: int, repeats: int, legacy_ms: float,
+            cold_ms: float, warm_ms: float, diff: float) -> RankingBenchmarkResult:
+    """Per-query timings (the timed runs cover every query in QUERIES)."""
+    result = RankingBenchmarkResult(
+        component, size, repeats,
+        round(legacy_ms / len(QUERIES), 4),
+        round(cold_ms / len(QUERIES), 4),
+        round(warm_ms / len(QUERIES), 4),
+        round(legacy_ms / cold_ms, 2),
+        round(legacy_ms / warm_ms, 2),
+        diff,
+    )
+    _print_result(result)
+    return result
+
+
+def _print_result(result: RankingBenchmarkResult) -> None:
+    print(
+        f"{result.component:>13} | candidates={result.candidates:>5} | "
+        f"legacy={result.legacy_ms:8.3f}ms cold={result.cold_ms:8.3f}ms warm={result.warm_ms:8.3f}ms | "
+        f"speedup cold={result.cold_speedup:5.2f}x warm={result.warm_speedup:5.2f}x | "
+        f"max diff={result.max_score_diff:g}"
+    )
+
+
+def main() -> None:
+    """Entry point for the ranking benchmark."""
+    parser = argparse.ArgumentParser(description="Vectorized ranking benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000],
+                        help="Candidate counts to benchmark")
+    parser.add_argument("--repeats", type=int, default=50, help="Timed runs per size (median reported)")
+    parser.add_argument("--export", help="Export results to JSON file")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.sizes, args.repeats)
+
+    if args.export:
+        with open(args.export, "w") as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
+        print(f"✅ Results exported to: {args.export}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+In-process load test for the Veris Memory retrieval hot path.
+
+Builds a QueryDispatcher over the real VectorBackend, GraphBackend and
+KVBackend, backed by the deterministic in-memory stand-ins in
+fake_backends.py, and replays a seeded mix of RetrievalCore.search calls and
+/tools/store_context calls against synthetic corpora of 10k-1M contexts. No
+services are needed, so hot-path regressions show up on a laptop.
+
+For every corpus size the report has, per operation kind, throughput and
+p50/p95/p99 latency, per-stage time (dispatcher backend timings, MQE, and
+the storage executor's per-operation run and queue wait times) and a
+separate tracemalloc pass measuring peak and retained allocations.
+
+The retrieval pipeline follows the usual environment switches
+(MQE_ENABLED, QUERY_NORMALIZATION_ENABLED, SEARCH_ENHANCEMENTS_ENABLED, ...).
+The store_context path needs src.mcp_server.main to import; if it cannot,
+writes are reported as unavailable and only searches are replayed.
+
+Usage:
+    python tools/benchmarks/retrieval_load_benchmark.py --sizes 10000 100000
+    python tools/benchmarks/retrieval_load_benchmark.py --sizes 1000000 --operations 5000 \\
+        --concurrency 32 --vector-latency lognormal:4:0.6 --export load.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import random
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from unittest.mock import patch
+
+# Add repository root to path so the src package resolves
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.backends.graph_backend import GraphBackend  # noqa: E402
+from src.backends.kv_backend import KVBackend  # noqa: E402
+from src.backends.vector_backend import VectorBackend  # noqa: E402
+from src.core.query_dispatcher import QueryDispatcher  # noqa: E402
+from src.core.retrieval_core import RetrievalCore  # noqa: E402
+from src.core.storage_executor import get_storage_executor, reset_storage_executor  # noqa: E402
+from src.utils import logging_middleware  # noqa: E402
+
+try:
+    from .fake_backends import (
+        CONTEXT_TYPES, FakeNeo4jClient, FakeQdrantClient, FakeRedis, HashingEmbedder,
+        LatencyModel, SyntheticContextCorpus,
+    )
+except ImportError:
+    from fake_backends import (  # noqa: E402
+        CONTEXT_TYPES, FakeNeo4jClient, FakeQdrantClient, FakeRedis, HashingEmbedder,
+        LatencyModel, SyntheticContextCorpus,
+    )
+
+DEFAULT_MIX = {"hybrid": 0.6, "vector": 0.2, "graph": 0.1, "kv": 0.1}
+
+
+@dataclass
+class LoadConfig:
+    """Parameters of one load test run."""
+    sizes: List[int] = field(default_factory=lambda: [10000, 100000])
+    operations: int = 2000
+    concurrency: int = 16
+    write_ratio: float = 0.1
+    search_mix: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    limit: int = 10
+    vector_latency: str = "lognormal:2:0.5"
+    graph_latency: str = "lognormal:3:0.6"
+    redis_latency: str = "lognormal:0.3:0.4"
+    kv_keys: int = 10000
+    alloc_operations: int = 200
+    seed: int = 42
+
+
+@dataclass
+class Stack:
+    """The retrieval stack under test and the fakes behind it."""
+    corpus: SyntheticContextCorpus
+    dispatcher: QueryDispatcher
+    core: RetrievalCore
+    qdrant: FakeQdrantClient
+    neo4j: FakeNeo4jClient
+    redis: FakeRedis
+    embedder: HashingEmbedder
+
+
+def build_stack(corpus: SyntheticContextCorpus, config: LoadConfig) -> Stack:
+    """Wire the real backends and RetrievalCore to fresh fakes."""
+    embedder = HashingEmbedder()
+    qdrant = FakeQdrantClient(corpus, LatencyModel(config.vector_latency, seed=config.seed))
+    neo4j = FakeNeo4jClient(corpus, LatencyModel(config.graph_latency, seed=config.seed + 1))
+    redis = FakeRedis(LatencyModel(config.redis_latency, seed=config.seed + 2))
+    redis.populate(corpus, config.kv_keys)
+
+    dispatcher = QueryDispatcher()
+    dispatcher.register_backend("vector", VectorBackend(qdrant, embedder))
+    dispatcher.register_backend("graph", GraphBackend(neo4j))
+    dispatcher.register_backend("kv", KVBackend(simple_redis=redis))
+    return Stack(corpus, dispatcher, RetrievalCore(dispatcher), qdrant, neo4j, redis, embedder)
+
+
+class StoreContextDriver:
+    """Calls the store_context endpoint in-process with the server globals pointed at the fakes."""
+
+    def __init__(self, stack: Stack):
+        self.stack = stack
+        self.error: Optional[str] = None
+        try:
+            import src.embedding as embedding
+            from src.mcp_server import main as server
+        except Exception as e:  # server dependencies missing in this environment
+            self.server = None
+            self.error = f"{type(e).__name__}: {e}"
+            return
+        self.server = server
+        self.embedding = embedding
+
+    @property
+    def available(self) -> bool:
+        return self.server is not None
+
+    @contextlib.contextmanager
+    def installed(self):
+        """Point the server's storage globals and embedding service at the fakes."""
+        if not self.available:
+            yield
+            return
+        with patch.multiple(
+            self.server,
+            qdrant_client=self.stack.qdrant,
+            neo4j_client=self.stack.neo4j,
+            simple_redis=self.stack.redis,
+            retrieval_core=self.stack.core,
+        ), patch.object(self.embedding, "generate_embedding", self.stack.embedder.generate_embedding):
+            yield
+
+    async def store(self, payload: Dict[str, Any]) -> None:
+        request = self.server.StoreContextRequest(**payload)
+        response = await self.server.store_context(request, api_key_info=None)
+        if not response.get("success"):
+            raise RuntimeError(response.get("message") or "store_context failed")
+
+
+def generate_operations(corpus: SyntheticContextCorpus, config: LoadConfig, count: int,
+                        seed: int, include_writes: bool) -> List[Tuple[str, Any]]:
+    """Seeded list of ("search:<mode>", query) and ("store", payload) operations."""
+    rng = random.Random(seed)
+    modes, weights = zip(*config.search_mix.items())
+    operations: List[Tuple[str, Any]] = []
+    stored_ids: List[str] = []
+    for i in range(count):
+        if include_writes and rng.random() < config.write_ratio:
+            words = corpus.words(rng, corpus.words_per_context)
+            payload = {
+                "content": {"title": " ".join(words[:6]), "description": " ".join(words[6:])},
+                "type": rng.choice(CONTEXT_TYPES),
+                "metadata": {"source": "load-benchmark", "sequence": i},
+            }
+            if stored_ids and rng.random() < 0.3:
+                payload["relationships"] = [{"target": rng.choice(stored_ids), "type": "RELATED_TO"}]
+            stored_ids.append(f"load-{i}")
+            operations.append(("store", payload))
+        else:
+            mode = rng.choices(modes, weights=weights)[0]
+            operations.append((f"search:{mode}", corpus.query(rng)))
+    return operations
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * fraction))
+    return sorted_values[index]
+
+
+def _latency_summary(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered), 3) if ordered else 0.0,
+        "p50_ms": round(_percentile(ordered, 0.50), 3),
+        "p95_ms": round(_percentile(ordered, 0.95), 3),
+        "p99_ms": round(_percentile(ordered, 0.99), 3),
+        "max_ms": round(ordered[-1], 3) if ordered else 0.0,
+    }
+
+
+class Replay:
+    """Runs operations through the stack with a fixed number of concurrent workers."""
+
+    def __init__(self, stack: Stack, driver: StoreContextDriver, limit: int):
+        self.stack = stack
+        self.driver = driver
+        self.limit = limit
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.stages: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def run(self, operations: List[Tuple[str, Any]], concurrency: int) -> float:
+        """Replay operations; returns wall-clock seconds."""
+        cursor = iter(operations)
+
+        async def worker() -> None:
+            for kind, argument in cursor:
+                await self._execute(kind, argument)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+        return time.perf_counter() - start
+
+    async def _execute(self, kind: str, argument: Any) -> None:
+        if kind == "store" and not self.driver.available:
+            return
+        start = time.perf_counter()
+        try:
+            if kind == "store":
+                await self.driver.store(argument)
+            else:
+                response = await self.stack.core.search(
+                    argument, limit=self.limit, search_mode=kind.split(":", 1)[1], use_cache=False
+                )
+                for stage, elapsed_ms in (response.backend_timings or {}).items():
+                    self.stages[f"backend.{stage}"].append(elapsed_ms)
+        except Exception:
+            self.errors[kind] += 1
+        self.latencies[kind].append((time.perf_counter() - start) * 1000)
+
+
+async def run_size(size: int, config: LoadConfig) -> Dict[str, Any]:
+    """Build a corpus of ``size`` contexts, warm up, replay and measure allocations."""
+    build_start = time.perf_counter()
+    corpus = SyntheticContextCorpus(size, seed=config.seed)
+    stack = build_stack(corpus, config)
+    driver = StoreContextDriver(stack)
+    build_s = time.perf_counter() - build_start
+
+    with driver.installed():
+        # Warm-up: KV index backfill, full-text index probe, MQE/normalizer singletons
+        warmup = Replay(stack, driver, config.limit)
+        await warmup.run(generate_operations(corpus, config, 50, config.seed + 7, False), 1)
+
+        reset_storage_executor()
+        operations = generate_operations(
+            corpus, config, config.operations, config.seed, include_writes=driver.available
+        )
+        replay = Replay(stack, driver, config.limit)
+        elapsed_s = await replay.run(operations, config.concurrency)
+        executor_stats = get_storage_executor().get_stats()
+
+        allocations = await measure_allocations(stack, driver, corpus, config)
+
+    total_ops = sum(len(samples) for samples in replay.latencies.values())
+    stages = {stage: _latency_summary(samples) for stage, samples in sorted(replay.stages.items())}
+    for operation, stats in sorted(executor_stats["operations"].items()):
+        stages[f"storage.{operation}"] = {
+            "count": stats["calls"],
+            "mean_ms": round(stats["avg_run_ms"], 3),
+            "max_ms": round(stats["max_run_ms"], 3),
+        }
+    stages["storage.queue_wait"] = {
+        "mean_ms": round(executor_stats["avg_wait_ms"], 3),
+        "max_ms": round(executor_stats["max_wait_ms"], 3),
+        "peak_queue_depth": executor_stats["peak_queue_depth"],
+    }
+
+    result = {
+        "corpus_size": size,
+        "corpus_build_s": round(build_s, 3),
+        "operations": total_ops,
+        "concurrency": config.concurrency,
+        "elapsed_s": round(elapsed_s, 3),
+        "throughput_ops": round(total_ops / elapsed_s, 1) if elapsed_s else 0.0,
+        "latency": _latency_summary([s for samples in replay.latencies.values() for s in samples]),
+        "by_operation": {
+            kind: {**_latency_summary(samples), "errors": replay.errors.get(kind, 0)}
+            for kind, samples in sorted(replay.latencies.items())
+        },
+        "stages": stages,
+        "allocations": allocations,
+        "store_context": "ok" if driver.available else f"unavailable ({driver.error})",
+    }
+    _print_result(result)
+    return result
+
+
+async def measure_allocations(stack: Stack, driver: StoreContextDriver,
+                              corpus: SyntheticContextCorpus, config: LoadConfig) -> Dict[str, Any]:
+    """Replay a short sequential run under tracemalloc (kept out of the timed run)."""
+    if config.alloc_operations <= 0:
+        return {}
+    operations = generate_operations(
+        corpus, config, config.alloc_operations, config.seed + 13, include_writes=driver.available
+    )
+    replay = Replay(stack, driver, config.limit)
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        await replay.run(operations, 1)
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    diff = after.compare_to(before, "filename")
+    retained = sum(stat.size_diff for stat in diff)
+    return {
+        "operations": len(operations),
+        "peak_kb": round((peak - baseline) / 1024, 1),
+        "retained_kb": round(retained / 1024, 1),
+        "retained_blocks": sum(stat.count_diff for stat in diff),
+        "top_retained": [
+            {"file": stat.traceback[0].filename, "kb": round(stat.size_diff / 1024, 1)}
+            for stat in sorted(diff, key=lambda s: s.size_diff, reverse=True)[:5]
+        ],
+    }
+
+
+def _print_result(result: Dict[str, Any]) -> None:
+    latency = result["latency"]
+    print(
+        f"docs={result['corpus_size']:>9,} | ops={result['operations']:>6} "
+        f"@ {result['throughput_ops']:>8.1f}/s | p50={latency['p50_ms']:8.3f}ms "
+        f"p95={latency['p95_ms']:8.3f}ms p99={latency['p99_ms']:8.3f}ms | "
+        f"alloc peak={result['allocations'].get('peak_kb', 0):,.0f}KB"
+    )
+    for kind, stats in result["by_operation"].items():
+        print(f"    {kind:>15}: n={stats['count']:>6} p50={stats['p50_ms']:8.3f}ms "
+              f"p99={stats['p99_ms']:8.3f}ms errors={stats['errors']}")
+
+
+async def run_benchmark(config: LoadConfig) -> Dict[str, Any]:
+    """Run every corpus size and return the JSON report."""
+    results = [await run_size(size, config) for size in config.sizes]
+    reset_storage_executor()
+    return {"config": config.__dict__, "results": results}
+
+
+def _parse_mix(spec: str) -> Dict[str, float]:
+    mix = {}
+    for part in spec.split(","):
+        mode, _, weight = part.partition("=")
+        mix[mode.strip()] = float(weight)
+    return mix
+
+
+def main() -> None:
+    """Entry point for the in-process load test."""
+    parser = argparse.ArgumentParser(description="In-process RetrievalCore load test")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000],
+                        help="Corpus sizes (contexts) to benchmark")
+    parser.add_argument("--operations", type=int, default=2000, help="Operations per corpus size")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent in-flight operations")
+    parser.add_argument("--write-ratio", type=float, default=0.1,
+                        help="Fraction of operations that call store_context")
+    parser.add_argument("--mix", type=_parse_mix, default=dict(DEFAULT_MIX),
+                        help="Search mode weights, e.g. hybrid=0.6,vector=0.2,graph=0.1,kv=0.1")
+    parser.add_argument("--limit", type=int, default=10, help="Results per search")
+    parser.add_argument("--vector-latency", default="lognormal:2:0.5",
+                        help="Qdrant round trip: zero | constant:MS | uniform:LO:HI | lognormal:MEDIAN:SIGMA")
+    parser.add_argument("--graph-latency", default="lognormal:3:0.6", help="Neo4j round trip")
+    parser.add_argument("--redis-latency", default="lognormal:0.3:0.4", help="Redis round trip")
+    parser.add_argument("--kv-keys", type=int, default=10000, help="Corpus contexts loaded into Redis")
+    parser.add_argument("--alloc-operations", type=int, default=200,
+                        help="Operations replayed under tracemalloc (0 to skip)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for corpus and query mix")
+    parser.add_argument("--structured-logs", action="store_true",
+                        help="Keep the per-request JSON console logs of the backends")
+    parser.add_argument("--export", help="Export the JSON report to this file")
+    args = parser.parse_args()
+
+    # Per-request console logging would dominate the timings and the output
+    logging.disable(logging.WARNING)
+    if not args.structured_logs:
+        for structured_logger in (logging_middleware.search_logger, logging_middleware.backend_logger,
+                                  logging_middleware.api_logger, logging_middleware.ranking_logger):
+            structured_logger.enable_console = False
+
+    config = LoadConfig(
+        sizes=args.sizes, operations=args.operations, concurrency=args.concurrency,
+        write_ratio=args.write_ratio, search_mix=args.mix, limit=args.limit,
+        vector_latency=args.vector_latency, graph_latency=args.graph_latency,
+        redis_latency=args.redis_latency, kv_keys=args.kv_keys,
+        alloc_operations=args.alloc_operations, seed=args.seed,
+    )
+    report = asyncio.run(run_benchmark(config))
+
+    if args.export:
+        with open(args.export, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Results exported to: {args.export}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+BM25 text index benchmark for the Veris Memory text search backend.
+
+Builds synthetic corpora with a Zipf-distributed vocabulary, indexes them in
+an in-process TextSearchBackend and reports query latency percentiles. With
+--compare-scan the legacy full-corpus scan (BM25Scorer.score_document over
+every document) is timed on the same corpus for comparison.
+
+Usage:
+    python tools/benchmarks/text_index_benchmark.py --sizes 10000 100000 1000000
+    python tools/benchmarks/text_index_benchmark.py --sizes 10000 --compare-scan --export bm25.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import sys
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import List
+
+# Add repository root to path so the src package resolves
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.backends.text_backend import TextSearchBackend  # noqa: E402
+from src.interfaces.backend_interface import SearchOptions  # noqa: E402
+
+
+@dataclass
+class IndexBenchmarkResult:
+    """Latency figures for one corpus size and engine."""
+    engine: str
+    document_count: int
+    vocabulary_size: int
+    index_build_s: float
+    query_count: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    avg_candidates: float
+
+
+class SyntheticCorpus:
+    """Deterministic Zipf-distributed corpus and query generator."""
+
+    def __init__(self, vocabulary_size: int = 50000, doc_length: int = 24, seed: int = 42):
+        self.rng = random.Random(seed)
+        self.vocabulary = [f"term{i}" for i in range(vocabulary_size)]
+        self.doc_length = doc_length
+        # Zipf weights (s=1) expressed as cumulative weights for random.choices
+        self.cum_weights = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(vocabulary_size)))
+
+    def documents(self, count: int):
+        """Yield (doc_id, text) pairs."""
+        for i in range(count):
+            length = self.rng.randint(self.doc_length // 2, self.doc_length * 3 // 2)
+            words = self.rng.choices(self.vocabulary, cum_weights=self.cum_weights, k=length)
+            yield f"doc-{i}", " ".join(words)
+
+    def queries(self, count: int) -> List[str]:
+        """Generate 1-4 term queries drawn from the same distribution."""
+        return [
+            " ".join(self.rng.choices(self.vocabulary, cum_weights=self.cum_weights, k=self.rng.randint(1, 4)))
+            for _ in range(count)
+        ]
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * fraction))
+    return sorted_values[index]
+
+
+def _summarize(engine: str, backend: TextSearchBackend, build_s: float,
+               timings: List[float], candidates: List[int]) -> IndexBenchmarkResult:
+    timings.sort()
+    return IndexBenchmarkResult(
+        engine=engine,
+        document_count=len(backend.documents),
+        vocabulary_size=len(backend.postings),
+        index_build_s=round(build_s, 2),
+        query_count=len(timings),
+        p50_ms=round(_percentile(timings, 0.50), 3),
+        p95_ms=round(_percentile(timings, 0.95), 3),
+        p99_ms=round(_percentile(timings, 0.99), 3),
+        max_ms=round(timings[-1] if timings else 0.0, 3),
+        avg_candidates=round(sum(candidates) / len(candidates), 1) if candidates else 0.0,
+    )
+
+
+async def run_inverted_index(backend: TextSearchBackend, queries: List[str],
+                             build_s: float, limit: int) -> IndexBenchmarkResult:
+    """Time queries through TextSearchBackend.search."""
+    options = SearchOptions(limit=limit)
+    timings, candidates = [], []
+    for query in queries:
+        terms = set(backend.tokenize(query))
+        candidates.append(len(set().union(*(backend.postings.get(t, {}).keys() for t in terms))))
+        start = time.perf_counter()
+        await backend.search(query, options)
+        timings.append((time.perf_counter() - start) * 1000)
+    return _summarize("inverted_index", backend, build_s, timings, candidates)
+
+
+def run_full_scan(backend: TextSearchBackend, queries: List[str],
+                  build_s: float, limit: int) -> IndexBenchmarkResult:
+    """Time the legacy path that scores every document in the corpus."""
+    timings, candidates = [], []
+    total_docs = len(backend.documents)
+    avg_doc_length = backend.total_doc_length / total_docs
+    for query in queries:
+        terms = backend.tokenize(query)
+        start = time.perf_counter()
+        backend.scorer.idf_cache.clear()
+        scored = [
+            (doc_id, backend.scorer.score_document(terms, doc, avg_doc_length, total_docs,
+                                                   backend.term_doc_frequencies))
+            for doc_id, doc in backend.documents.items()
+        ]
+        sorted(scored, key=lambda item: item[1], reverse=True)[:limit]
+        timings.append((time.perf_counter() - start) * 1000)
+        candidates.append(total_docs)
+    return _summarize("full_scan", backend, build_s, timings, candidates)
+
+
+async def run_benchmark(sizes: List[int], query_count: int, limit: int, doc_length: int,
+                        compare_scan: bool, scan_max_docs: int) -> List[IndexBenchmarkResult]:
+    """Benchmark every corpus size, growing one index incrementally."""
+    corpus = SyntheticCorpus(doc_length=doc_length)
+    queries = corpus.queries(query_count)
+    backend = TextSearchBackend()
+    documents = corpus.documents(max(sizes))
+    results: List[IndexBenchmarkResult] = []
+    build_s = 0.0
+
+    for size in sorted(sizes):
+        start = time.perf_counter()
+        for doc_id, text in itertools.islice(documents, size - len(backend.documents)):
+            await backend.index_document(doc_id, text)
+        build_s += time.perf_counter() - start
+
+        result = await run_inverted_index(backend, queries, build_s, limit)
+        results.append(result)
+        _print_result(result)
+
+        if compare_scan and size <= scan_max_docs:
+            scan_result = run_full_scan(backend, queries[: max(10, query_count // 10)], build_s, limit)
+            results.append(scan_result)
+            _print_result(scan_result)
+
+    return results
+
+
+def _print_result(result: IndexBenchmarkResult) -> None:
+    print(
+        f"{result.engine:>15} | docs={result.document_count:>9,} | "
+        f"p50={result.p50_ms:8.3f}ms p95={result.p95_ms:8.3f}ms p99={result.p99_ms:8.3f}ms | "
+        f"avg candidates={result.avg_candidates:,.0f} | build={result.index_build_s}s"
+    )
+
+
+def main() -> None:
+    """Entry point for the BM25 index benchmark."""
+    parser = argparse.ArgumentParser(description="BM25 inverted index benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000],
+                        help="Corpus sizes to benchmark")
+    parser.add_argument("--queries", type=int, default=500, help="Queries per corpus size")
+    parser.add_argument("--limit", type=int, default=10, help="Top-k results per query")
+    parser.add_argument("--doc-length", type=int, default=24, help="Average tokens per document")
+    parser.add_argument("--compare-scan", action="store_true",
+                        help="Also time the legacy full-corpus scan")
+    parser.add_argument("--scan-max-docs", type=int, default=100000,
+                        help="Largest corpus to run the full scan on")
+    parser.add_argument("--export", help="Export results to JSON file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmark(
+        args.sizes, args.queries, args.limit, args.doc_length,
+        args.compare_scan, args.scan_max_docs
+    ))
+
+    if args.export:
+        with open(args.export, "w") as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
+        print(f"✅ Results exported to: {args.export}")
+
+
+if __name__ == "__main__":
+    main()